@@ -0,0 +1,294 @@
+"""
+Synthetic fuselage barrels (:mod:`benchmarks.fuselage`)
+=======================================================
+
+.. currentmodule:: benchmarks.fuselage
+
+A cylindrical barrel with skin panels, stringers and frames is generated with
+any number of SEs, together with the mapping files read by
+:class:`.StructModel` and a synthetic force dataset replacing the OP2
+results.
+
+Each cell between two stringers and two frames gives 5 SEs:
+
+- one :class:`.Panel` with 2x2 CQUAD4 skin elements
+- one :class:`.Stringer` with 2 CBAR elements
+- one :class:`.OuterFlange`, one :class:`.Web` with 2x2 CQUAD4 elements and
+  one :class:`.InnerFlange` with 2 CBAR elements each, at the forward frame
+
+The aft end frame closing the last bay adds 3 SEs per stringer.
+
+Every SE has its own property, such that the sizing creates one design
+variable per SE.
+
+"""
+from __future__ import division, print_function
+
+import os
+
+import numpy as np
+
+
+SES_PER_CELL = 5
+
+
+class Barrel(object):
+    """Fuselage barrel geometry and element numbering
+
+    ==================  ======================================================
+    Attribute           Description
+    ==================  ======================================================
+    `nstr`              `int` number of stringers
+    `nbays`             `int` number of frame bays
+    `grids`             `np.ndarray` with the grid ids
+    `xyz`               `np.ndarray` of shape `(ngrids, 3)` with the positions
+    `quads`             `np.ndarray` of shape `(nquads, 6)` with the `eid`,
+                        `pid` and grid ids of the CQUAD4 elements
+    `bars`              `np.ndarray` of shape `(nbars, 6)` with the `eid`,
+                        `pid`, grid ids and orientation index of the CBAR
+                        elements
+    `ses`               `list` of `(setype, name, pid, eids)` tuples
+    `sas`               `list` of `(satype, name, senames)` tuples
+    ==================  ======================================================
+
+    Parameters
+    ----------
+    nses : int
+        The approximate number of SEs.
+    radius : float, optional
+        The skin radius.
+    frame_pitch : float, optional
+        The distance between frames.
+    frame_height : float, optional
+        The height of the frame webs.
+
+    """
+    def __init__(self, nses, radius=2000., frame_pitch=500.,
+                 frame_height=100.):
+        ncells = max(4, int(round(nses/SES_PER_CELL)))
+        self.nstr = max(4, int(round(np.sqrt(ncells/2.))))
+        self.nbays = max(1, int(round(ncells/self.nstr)))
+        self.radius = radius
+        self.frame_pitch = frame_pitch
+        self.frame_height = frame_height
+        self._build()
+
+
+    def _build(self):
+        nstr, nbays = self.nstr, self.nbays
+        nx = 2*nbays + 1
+        nt = 2*nstr
+        theta = 2*np.pi*np.arange(nt)/nt
+        x = self.frame_pitch*np.arange(nx)/2.
+
+        # skin grids, then the mid and inner grids of the frame webs
+        skin = 1 + np.arange(nx*nt).reshape(nx, nt)
+        nfr = nbays + 1
+        mid = skin.max() + 1 + np.arange(nfr*nt).reshape(nfr, nt)
+        inner = mid.max() + 1 + np.arange(nfr*nt).reshape(nfr, nt)
+        xyz = []
+        for ids, xs, r in ((skin, x, self.radius),
+                           (mid, x[0::2], self.radius -
+                            self.frame_height/2.),
+                           (inner, x[0::2], self.radius -
+                            self.frame_height)):
+            xx, tt = np.meshgrid(xs, theta, indexing='ij')
+            xyz.append(np.column_stack((xx.ravel(), r*np.cos(tt.ravel()),
+                                        r*np.sin(tt.ravel()))))
+        self.grids = np.concatenate((skin.ravel(), mid.ravel(),
+                                     inner.ravel()))
+        self.xyz = np.concatenate(xyz)
+
+        it = np.arange(nt)
+        it1 = (it + 1) % nt
+        quads = []
+        bars = []
+        self.ses = []
+        self.sas = []
+        eid = [1]
+        pid = [1]
+
+        def new_se(setype, name, elements, container):
+            eids = eid[0] + np.arange(len(elements))
+            eid[0] += len(elements)
+            for e, nodes in zip(eids.tolist(), elements):
+                container.append((e, pid[0]) + tuple(nodes))
+            self.ses.append((setype, name, pid[0], eids.tolist()))
+            pid[0] += 1
+            return name
+
+        def new_frame(ifr, js):
+            t0, t1 = 2*js, 2*js + 1
+            cell = '%d.%d' % (ifr + 1, js + 1)
+            new_se('OuterFlange', 'OuterFlange.' + cell, [
+                (skin[2*ifr, t], skin[2*ifr, it1[t]], t, 1)
+                for t in (t0, t1)], bars)
+            web = new_se('Web', 'Web.' + cell, [
+                (a[ifr, t], a[ifr, it1[t]], b[ifr, it1[t]], b[ifr, t])
+                for a, b in ((skin[0::2], mid), (mid, inner))
+                for t in (t0, t1)], quads)
+            new_se('InnerFlange', 'InnerFlange.' + cell, [
+                (inner[ifr, t], inner[ifr, it1[t]], t, 1)
+                for t in (t0, t1)], bars)
+            return web
+
+        for ib in range(nbays):
+            f0 = 2*ib
+            for js in range(nstr):
+                t0, t1 = 2*js, 2*js + 1
+                cell = '%d.%d' % (ib + 1, js + 1)
+                panel = new_se('Panel', 'Panel.' + cell, [
+                    (skin[f0 + i, t], skin[f0 + i + 1, t],
+                     skin[f0 + i + 1, it1[t]], skin[f0 + i, it1[t]])
+                    for i in range(2) for t in (t0, t1)], quads)
+                stringer = new_se('Stringer', 'Stringer.' + cell, [
+                    (skin[f0 + i, t0], skin[f0 + i + 1, t0], t0, 0)
+                    for i in range(2)], bars)
+                web = new_frame(ib, js)
+                # the aft frame of the last bay is the end frame below
+                fr2 = 'Web.%d.%d' % (ib + 2, js + 1)
+                str2 = 'Stringer.%d.%d' % (ib + 1, (js + 1) % nstr + 1)
+                self.sas.append(('StiffenedPanelAssembly', 'SPA.' + cell,
+                                 [panel, web, fr2, stringer, str2]))
+        for js in range(nstr):
+            new_frame(nbays, js)
+        self.quads = np.array(quads, dtype=np.int64).reshape(-1, 6)
+        self.bars = np.array(bars, dtype=np.int64).reshape(-1, 6)
+        self._theta = theta
+
+
+    def write_bdf(self, path, nsubcases=3):
+        """Write the barrel as a NASTRAN input file with free field cards"""
+        with open(path, 'w') as f:
+            f.write('SOL 101\nCEND\n')
+            for sub in range(1, nsubcases + 1):
+                f.write('SUBCASE %d\n  LABEL = LOAD CASE %d\n' % (sub, sub))
+            f.write('BEGIN BULK\n')
+            f.write('MAT1,1,70000.,,0.33,2.7e-9\n')
+            for gid, (x, y, z) in zip(self.grids.tolist(),
+                                      self.xyz.tolist()):
+                f.write('GRID,%d,,%.4f,%.4f,%.4f\n' % (gid, x, y, z))
+            for setype, name, pid, eids in self.ses:
+                if setype in ('Panel', 'Web'):
+                    f.write('PSHELL,%d,1,%.3f,1,,1\n' %
+                            (pid, 2. if setype == 'Panel' else 1.5))
+                else:
+                    f.write('PBAR,%d,1,150.,20000.,5000.,100.\n' % pid)
+            for row in self.quads.tolist():
+                f.write('CQUAD4,%d,%d,%d,%d,%d,%d\n' % tuple(row))
+            for eid, pid, ga, gb, t, kind in self.bars.tolist():
+                if kind == 0:
+                    v = (0., np.cos(self._theta[t]), np.sin(self._theta[t]))
+                else:
+                    v = (1., 0., 0.)
+                f.write('CBAR,%d,%d,%d,%d,%.4f,%.4f,%.4f\n' %
+                        ((eid, pid, ga, gb) + v))
+            f.write('ENDDATA\n')
+
+
+    def write_mappings(self, sefilepath, safilepath):
+        """Write the SE and SA mapping files read by :class:`.StructModel`"""
+        with open(sefilepath, 'w') as f:
+            f.write('# SE type; SE name; element ids\n')
+            for setype, name, pid, eids in self.ses:
+                f.write('%s; %s; %s\n' % (setype, name,
+                                          '; '.join(map(str, eids))))
+        with open(safilepath, 'w') as f:
+            f.write('# SA type; SA name; SE names\n')
+            for satype, name, senames in self.sas:
+                f.write('%s; %s; %s\n' % (satype, name, '; '.join(senames)))
+
+
+    def write(self, outdir, nsubcases=3):
+        """Write all input files to `outdir`
+
+        Returns
+        -------
+        paths : tuple
+            The paths of the bdf, SE mapping and SA mapping files.
+
+        """
+        if not os.path.isdir(outdir):
+            os.makedirs(outdir)
+        bdfpath = os.path.join(outdir, 'barrel.bdf')
+        sefilepath = os.path.join(outdir, 'MappingSE2FE.txt')
+        safilepath = os.path.join(outdir, 'MappingSEA2SE.txt')
+        self.write_bdf(bdfpath, nsubcases)
+        self.write_mappings(sefilepath, safilepath)
+        return bdfpath, sefilepath, safilepath
+
+
+    def sizing_table(self, t_lb=0.5, t_ub=5., Fcy=300., method=1):
+        """Sizing table of all :class:`.Panel` and :class:`.Web` SEs
+
+        See :func:`.read_sizing_table` for the format.
+
+        """
+        names = [name for setype, name, pid, eids in self.ses
+                 if setype in ('Panel', 'Web')]
+        n = len(names)
+        table = np.zeros(n, dtype=[('name', 'U32'), ('t_lb', 'f8'),
+                                   ('t_ub', 'f8'), ('Fcy', 'f8'),
+                                   ('method', 'i8')])
+        table['name'] = names
+        table['t_lb'] = t_lb
+        table['t_ub'] = t_ub
+        table['Fcy'] = Fcy
+        table['method'] = method
+        return table
+
+
+class _ForceVector(object):
+    def __init__(self, element, data):
+        self.element = element
+        self.element_node = np.column_stack((element,
+                                             np.zeros_like(element)))
+        self.data = data
+
+
+class SyntheticResults(object):
+    """Element forces with the layout of PyNastran's OP2 results
+
+    The barrel is loaded by a vertical bending moment and a torque varying
+    with each subcase, giving axial and shear flows that depend on the
+    circumferential position, plus a small random scatter.
+
+    Only `subcases`, `cbar_force`, `cquad4_force` and `ctria3_force` are
+    defined, as used by :func:`.read_forces_1d` and :func:`.read_forces_2d`.
+
+    Parameters
+    ----------
+    barrel : :class:`.Barrel`
+        The barrel.
+    nsubcases : int, optional
+        The number of subcases.
+    seed : int, optional
+        The seed of the random scatter.
+
+    """
+    def __init__(self, barrel, nsubcases=3, seed=0):
+        rng = np.random.RandomState(seed)
+        self.subcases = list(range(1, nsubcases + 1))
+        self.cbar_force = {}
+        self.cquad4_force = {}
+        self.ctria3_force = {}
+        grid_pos = dict(zip(barrel.grids.tolist(), range(barrel.grids.size)))
+        qz = barrel.xyz[[grid_pos[g] for g in barrel.quads[:, 2].tolist()]]
+        bz = barrel.xyz[[grid_pos[g] for g in barrel.bars[:, 2].tolist()]]
+        qtheta = np.arctan2(qz[:, 2], qz[:, 1])
+        btheta = np.arctan2(bz[:, 2], bz[:, 1])
+        for sub in self.subcases:
+            phase = 2*np.pi*sub/nsubcases
+            data = np.zeros((1, barrel.quads.shape[0], 8))
+            # membrane forces: mx, my, mxy
+            data[0, :, 0] = 200.*np.cos(qtheta + phase)
+            data[0, :, 1] = 20.*np.sin(qtheta)
+            data[0, :, 2] = 80.*np.sin(qtheta + phase)
+            # bending moments and transverse shear
+            data[0, :, 3:8] = rng.normal(0., 5., (barrel.quads.shape[0], 5))
+            data[0, :, :3] *= 1. + rng.normal(0., 0.05,
+                                              (barrel.quads.shape[0], 1))
+            self.cquad4_force[sub] = _ForceVector(barrel.quads[:, 0], data)
+            data = rng.normal(0., 1.e3, (1, barrel.bars.shape[0], 8))
+            data[0, :, 6] = 3.e4*np.cos(btheta + phase)
+            self.cbar_force[sub] = _ForceVector(barrel.bars[:, 0], data)
@@ -0,0 +1,183 @@
+"""
+Benchmark suite (:mod:`benchmarks.run_benchmarks`)
+==================================================
+
+.. currentmodule:: benchmarks.run_benchmarks
+
+Times the hot paths of :mod:`structmanager` on synthetic fuselage barrels,
+see :mod:`benchmarks.fuselage`. For each model size the stages are:
+
+==================  ==========================================================
+Stage               Description
+==================  ==========================================================
+`build`             :class:`.StructModel` reading the bdf and mapping files
+`read_forces`       :meth:`.StructModel.read_forces` from synthetic results
+`sizing`            :meth:`.StructModel.apply_sizing_table` creating the
+                    design variables and the von Mises and buckling
+                    constraints of all panels and webs
+`screening`         :meth:`.StructModel.screen_constraints`
+`print_model`       :meth:`.SOL200.print_model`
+==================  ==========================================================
+
+The elapsed time and the peak of the memory allocated by Python during each
+stage, tracked with :mod:`tracemalloc`, are reported. The results can be
+saved as JSON and compared against a previous run to find regressions::
+
+    python run_benchmarks.py --sizes 1000 10000 --output v0.4.0.json
+    python run_benchmarks.py --sizes 1000 10000 --compare v0.4.0.json
+
+"""
+from __future__ import division, print_function
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+from structmanager import StructModel
+from structmanager.optimization.sol200 import SOL200
+
+from fuselage import Barrel, SyntheticResults
+
+
+STAGES = ['build', 'read_forces', 'sizing', 'screening', 'print_model']
+SIZES = [1000, 10000, 100000]
+
+
+class Timer(object):
+    """Context manager measuring the time and memory peak of a stage"""
+    def __init__(self, results, stage):
+        self.results = results
+        self.stage = stage
+
+
+    def __enter__(self):
+        if tracemalloc is not None:
+            tracemalloc.start()
+        self.t0 = time.time()
+        return self
+
+
+    def __exit__(self, *exc):
+        elapsed = time.time() - self.t0
+        peak = float('nan')
+        if tracemalloc is not None:
+            peak = tracemalloc.get_traced_memory()[1]/1024.**2
+            tracemalloc.stop()
+        self.results[self.stage] = {'time': elapsed, 'peak_MB': peak}
+        return False
+
+
+def run(nses, outdir, nsubcases=3):
+    """Run all stages for one model size
+
+    Parameters
+    ----------
+    nses : int
+        The approximate number of SEs.
+    outdir : str
+        Directory for the generated input and output files.
+    nsubcases : int, optional
+        The number of subcases.
+
+    Returns
+    -------
+    results : dict
+        The time in seconds and the memory peak in MB of each stage.
+
+    """
+    barrel = Barrel(nses)
+    bdfpath, sefilepath, safilepath = barrel.write(outdir, nsubcases)
+    op2 = SyntheticResults(barrel, nsubcases)
+    results = {'nses': len(barrel.ses)}
+
+    with Timer(results, 'build'):
+        model = StructModel(sefilepath, safilepath, bdfpath)
+    model.nastranmodel.op2 = op2
+    with Timer(results, 'read_forces'):
+        model.read_forces()
+    model.optmodel = SOL200()
+    with Timer(results, 'sizing'):
+        model.apply_sizing_table(barrel.sizing_table())
+    with Timer(results, 'screening'):
+        model.screen_constraints()
+    model.optmodel.set_output_file(os.path.join(outdir, 'sol200.bdf'))
+    with Timer(results, 'print_model'):
+        model.optmodel.print_model()
+    return results
+
+
+def report(all_results, baseline=None, tolerance=0.25):
+    """Print the results, flagging the stages slower than the baseline"""
+    print('%10s %-12s %10s %10s %s' % ('SEs', 'stage', 'time [s]',
+                                        'peak [MB]', ''))
+    regressions = 0
+    for size, results in sorted(all_results.items(), key=lambda x: int(x[0])):
+        for stage in STAGES:
+            if stage not in results:
+                continue
+            value = results[stage]
+            note = ''
+            if baseline is not None and stage in baseline.get(size, {}):
+                ref = baseline[size][stage]['time']
+                if ref > 0:
+                    ratio = value['time']/ref
+                    note = '%+.0f%%' % (100*(ratio - 1))
+                    if ratio > 1 + tolerance:
+                        note += ' REGRESSION'
+                        regressions += 1
+            print('%10d %-12s %10.3f %10.1f %s' % (results['nses'], stage,
+                                                   value['time'],
+                                                   value['peak_MB'], note))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='structmanager benchmarks')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES,
+                        help='approximate numbers of SEs')
+    parser.add_argument('--subcases', type=int, default=3)
+    parser.add_argument('--output', help='save the results as JSON')
+    parser.add_argument('--compare', help='JSON results of a previous run')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='relative slow down reported as regression')
+    parser.add_argument('--keep', help='directory keeping the model files')
+    args = parser.parse_args(argv)
+
+    all_results = {}
+    for nses in args.sizes:
+        outdir = args.keep
+        if outdir is None:
+            outdir = tempfile.mkdtemp(prefix='structmanager_bench_')
+        else:
+            outdir = os.path.join(outdir, str(nses))
+        try:
+            all_results[str(nses)] = run(nses, outdir, args.subcases)
+        finally:
+            if args.keep is None:
+                shutil.rmtree(outdir, ignore_errors=True)
+
+    baseline = None
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    regressions = report(all_results, baseline, args.tolerance)
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(all_results, f, indent=2, sort_keys=True)
+    return 1 if regressions > 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
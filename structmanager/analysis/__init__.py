@@ -0,0 +1,7 @@
+"""
+Analysis methods (:mod:`structmanager.analysis`)
+================================================
+
+.. currentmodule:: structmanager.analysis
+
+"""
@@ -0,0 +1,869 @@
+"""
+Assembly analysis (:mod:`structmanager.analysis.assemblies`)
+============================================================
+
+.. currentmodule:: structmanager.analysis.assemblies
+
+Strength checks of the structural assemblies of :mod:`.sas` using the forces
+already read for their SEs, see :meth:`.StructModel.read_forces`. The SE
+properties are gathered once in arrays and the assemblies are evaluated for
+all subcases at once through index arrays pointing to their SEs.
+
+- :func:`.stringer_column_buckling`: each stringer of a
+  :class:`.StiffenedPanelAssembly` with the effective width of skin given by
+  von Karman's formula `be = k t sqrt(E/sigma)`, as a column between the
+  frames
+- :func:`.frame_general_instability`: Shanley's criterion on the frames of
+  :class:`.FrameAssembly` and :class:`.FrameShearClipAssembly`, with the
+  fuselage bending moment at each frame computed from the axial forces of
+  the stringers and skin panels of the adjacent bays
+- :func:`.wing_bay_buckling`: global buckling of each :class:`.WingBay` as
+  a stiffened plate with smeared stringers, see :mod:`.wingbay`
+- :func:`.super_stringer_column_buckling`: column buckling of the stringer
+  of each :class:`.SuperStringer` with the load redistributed from the
+  buckled skin, see :mod:`.superstringer`, and
+  :func:`.super_stringer_load_factors` the resulting stringer load factors
+- :func:`.assembly_diagonal_tension`: Kuhn's diagonal tension of the skin
+  of :class:`.StiffenedPanelAssembly` and of the web of
+  :class:`.FrameAssembly` and :class:`.FrameShearClipAssembly`, see
+  :mod:`.diagonal_tension`
+- :func:`.three_pocket_diagonal_tension`: diagonal tension of the central
+  pocket of each :class:`.ThreePocketAssembly`, with its stringers loaded
+  by the pockets on both sides
+
+The fuselage axis is taken along `x`, as for :class:`.Panel`.
+
+"""
+from __future__ import division
+
+import numpy as np
+
+from ..optimization.sol200.sections import se_section_properties
+from .diagonal_tension import se_diagonal_tension
+from .superstringer import effective_width_redistribution
+from .wingbay import global_buckling_eigenvalue
+
+
+# Shanley's frame stiffness coefficient
+CF_SHANLEY = 1./16000.
+
+
+def _subcases(ses):
+    subcases = set()
+    for se in ses:
+        forces = getattr(se, 'forces', None)
+        if forces is None:
+            continue
+        if isinstance(forces.forces, dict):
+            subcases.update(forces.forces.keys())
+        elif forces.subcases is not None:
+            subcases.update(forces.subcases)
+    return np.array(sorted(subcases), dtype=np.int64)
+
+
+def axial_forces(ses, subcases, reduce=np.mean, component=0):
+    """Axial force of 1D SEs and membrane force of 2D SEs for each subcase
+
+    Parameters
+    ----------
+    ses : list
+        The SEs.
+    subcases : array-like
+        The subcase ids.
+    reduce : function, optional
+        Reduction over the elements of each SE, called with `axis=0`.
+    component : int, optional
+        The membrane force of the 2D SEs, `0` for `Nxx`, `1` for `Nyy` and
+        `2` for `Nxy`.
+
+    Returns
+    -------
+    forces : np.ndarray
+        Array of shape `(len(ses), len(subcases))`, `NaN` where the forces
+        are missing.
+
+    """
+    subcases = list(subcases)
+    isub = dict((sub, j) for j, sub in enumerate(subcases))
+    out = np.full((len(ses), len(subcases)), np.nan)
+    for i, se in enumerate(ses):
+        forces = getattr(se, 'forces', None)
+        if forces is None:
+            continue
+        if isinstance(forces.forces, dict):
+            # Forces2D, last time step
+            for sub, force in forces.forces.items():
+                if sub in isub and force.shape[1] > 0:
+                    out[i, isub[sub]] = reduce(force[-1, :, component],
+                                               axis=0)
+        else:
+            # Forces1D, axial force
+            for j, sub in enumerate(forces.subcases):
+                if sub in isub:
+                    out[i, isub[sub]] = reduce(forces.axial[:, j], axis=0)
+    return out
+
+
+def _attr(ses, name):
+    values = [getattr(se, name, None) for se in ses]
+    return np.array([np.nan if v is None else v for v in values],
+                    dtype=np.float64)
+
+
+def _poisson(ses):
+    values = [getattr(getattr(se, 'material', None), 'nu', None)
+              for se in ses]
+    return np.array([np.nan if v is None else v for v in values],
+                    dtype=np.float64)
+
+
+def _modulus(ses):
+    values = []
+    for se in ses:
+        mat = getattr(se, 'material', None)
+        E = getattr(mat, 'E', getattr(mat, 'E1', None))
+        values.append(np.nan if E is None else E)
+    return np.array(values, dtype=np.float64)
+
+
+def _centroids(ses):
+    return np.array([se.get_centroid() for se in ses],
+                    dtype=np.float64).reshape(-1, 3)
+
+
+def _web_height(web):
+    if getattr(web, 'b', None) is not None:
+        return web.b
+    if web is None or not web.elements:
+        return np.nan
+    x = np.concatenate([e.get_node_positions() for e in web.elements])
+    r = np.sqrt(x[:, 1]**2 + x[:, 2]**2)
+    return r.max() - r.min()
+
+
+def _unique(ses):
+    ses = [se for se in ses if se is not None]
+    index = {}
+    unique = []
+    for se in ses:
+        if id(se) not in index:
+            index[id(se)] = len(unique)
+            unique.append(se)
+    return unique, index
+
+
+def _column_buckling(P, A, ZC, IN, E, t, be, Le, Fcy):
+    """Stress, critical stress and margin of stringers with skin width `be`
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sigma = P/A
+        comp = sigma < 0
+        Ak = be*t
+        zbar = (A*ZC - Ak*t/2.)/(A + Ak)
+        I = IN + A*(ZC - zbar)**2 + be*t**3/12. + Ak*(t/2. + zbar)**2
+        sigma_cr = np.pi**2*E*I/(A + Ak)/Le**2
+        if Fcy is not None:
+            sigma_cr = np.where(sigma_cr > Fcy/2.,
+                                Fcy - Fcy**2/(4.*sigma_cr), sigma_cr)
+        ms = np.where(comp, sigma_cr/np.abs(sigma) - 1., np.inf)
+    ms[np.isnan(sigma) | np.isnan(sigma_cr)] = np.nan
+    sigma_cr = np.broadcast_to(sigma_cr, ms.shape)
+    return sigma, sigma_cr, ms
+
+
+def stringer_column_buckling(spas, subcases=None, c=1., Fcy=None, k=1.9):
+    """Column buckling of the stringers of stiffened panel assemblies
+
+    Each stringer is a column of length `panel.a / sqrt(c)` made of the
+    stringer profile and the effective width of skin, see
+    :func:`.se_section_properties` for the profile properties. The skin
+    stress is taken equal to the stringer stress and the effective width
+    `be = k t sqrt(E/sigma)` is limited to the panel width `panel.b`. The
+    critical stress is Euler's or, given `Fcy`, Johnson's parabola when
+    above `Fcy/2`.
+
+    Parameters
+    ----------
+    spas : list
+        The :class:`.StiffenedPanelAssembly` objects.
+    subcases : array-like or None, optional
+        The subcase ids, by default all subcases with forces.
+    c : float, optional
+        The end fixity coefficient.
+    Fcy : float or None, optional
+        The compressive yield stress of the stringers.
+    k : float, optional
+        The coefficient of the effective width.
+
+    Returns
+    -------
+    subcases : np.ndarray
+        The subcase ids.
+    results : dict
+        Arrays of shape `(len(spas), nsubcases)` for the critical stringer
+        of each assembly: `'sigma'` the stringer stress, `'sigma_cr'` the
+        critical stress and `'ms'` the margin of safety, infinite for
+        stringers in tension and `NaN` with missing data.
+
+    """
+    panels, ipanel = _unique([sa.panel for sa in spas])
+    stringers, istr = _unique([s for sa in spas for s in (sa.str1, sa.str2)])
+    if subcases is None:
+        subcases = _subcases(stringers)
+    subcases = np.asarray(subcases, dtype=np.int64)
+    nsa = len(spas)
+
+    # SE arrays
+    props = se_section_properties(stringers, ['A', 'ZC', 'IN'])
+    props['E'] = _modulus(stringers)
+    props['P'] = axial_forces(stringers, subcases, np.min)
+    skin = dict(t=_attr(panels, 't'), a=_attr(panels, 'a'),
+                b=_attr(panels, 'b'), E=_modulus(panels))
+
+    # gathers, arrays of shape (nsa, 2) and (nsa, 2, nsub)
+    nan = len(stringers)
+    index = np.array([[istr.get(id(s), nan) for s in (sa.str1, sa.str2)]
+                      for sa in spas], dtype=np.int64).reshape(nsa, 2)
+    for key, value in props.items():
+        pad = np.full((1,) + value.shape[1:], np.nan)
+        props[key] = np.concatenate((value, pad))[index]
+    p = np.array([ipanel.get(id(sa.panel), len(panels)) for sa in spas],
+                 dtype=np.int64)
+    for key, value in skin.items():
+        skin[key] = np.append(value, np.nan)[p][:, None, None]
+    A, ZC, IN, E = [props[key][:, :, None] for key in ('A', 'ZC', 'IN', 'E')]
+    t, a, b, Ek = skin['t'], skin['a'], skin['b'], skin['E']
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        be = np.minimum(k*t*np.sqrt(Ek/np.abs(props['P']/A)), b)
+    sigma, sigma_cr, ms = _column_buckling(props['P'], A, ZC, IN, E, t, be,
+                                           a/np.sqrt(c), Fcy)
+
+    # critical stringer of each assembly
+    crit = np.argmin(np.where(np.isnan(ms), np.inf, ms), axis=1)[:, None, :]
+    results = {}
+    for key, value in (('sigma', sigma), ('sigma_cr', sigma_cr),
+                       ('ms', ms)):
+        results[key] = np.take_along_axis(value, crit, axis=1)[:, 0, :]
+    results['ms'][np.isnan(ms).all(axis=1)] = np.nan
+    return subcases, results
+
+
+def _stations(x, xtol):
+    """Group the positions `x` closer than `xtol`, `NaN` alone"""
+    order = np.argsort(x, kind='mergesort')
+    xs = x[order]
+    with np.errstate(invalid='ignore'):
+        new = np.ones(x.shape[0], dtype=bool)
+        new[1:] = ~(np.diff(xs) <= xtol)
+    station = np.empty(x.shape[0], dtype=np.int64)
+    station[order] = np.cumsum(new) - 1
+    return station
+
+
+def frame_general_instability(frames, spas, subcases=None, Cf=CF_SHANLEY,
+                              xtol=1.):
+    """Shanley's general instability criterion of fuselage frames
+
+    The required bending stiffness of a frame is `Cf M D**2/L`, where `M`
+    is the fuselage bending moment, `D` the fuselage diameter and `L` the
+    frame pitch. `M` is the bending moment of the fuselage section at the
+    frame station, computed about the `x` axis from the mean axial forces
+    of the panels, times their width, and of the first stringer of all the
+    stiffened panel assemblies having a frame web of the station as `fr1` or
+    `fr2`, averaging the bays on both sides of the station. The frame
+    webs with centroids closer than `xtol` along `x` belong to the same
+    station, webs without FE model are stations on their own. The frame
+    section is made of the outer flange, the web of height `web.b`, or the
+    radial extent of its elements, and the inner flange.
+
+    Parameters
+    ----------
+    frames : list
+        The :class:`.FrameAssembly` or :class:`.FrameShearClipAssembly`
+        objects.
+    spas : list
+        The :class:`.StiffenedPanelAssembly` objects.
+    subcases : array-like or None, optional
+        The subcase ids, by default all subcases with forces.
+    Cf : float, optional
+        The frame stiffness coefficient.
+    xtol : float, optional
+        The distance along `x` below which frame webs are at the same
+        station.
+
+    Returns
+    -------
+    subcases : np.ndarray
+        The subcase ids.
+    results : dict
+        With `'EI'` the frame bending stiffness, array of shape
+        `(len(frames),)`, and arrays of shape `(len(frames), nsubcases)`
+        with `'M'` the bending moment, `'EI_req'` the required stiffness and
+        `'ms'` the margin of safety.
+
+    """
+    spas = [sa for sa in spas if sa.panel is not None]
+    panels, ipanel = _unique([sa.panel for sa in spas])
+    stringers, istr = _unique([sa.str1 for sa in spas])
+    if subcases is None:
+        subcases = _subcases(panels + stringers)
+    subcases = np.asarray(subcases, dtype=np.int64)
+    nsub = subcases.shape[0]
+
+    # frame sections
+    webs = [fr.web for fr in frames]
+    outer = se_section_properties([fr.outerflange for fr in frames],
+                                  ['A', 'ZC', 'IN'])
+    inner = se_section_properties([fr.innerflange for fr in frames],
+                                  ['A', 'ZC', 'IN'])
+    tw = _attr(webs, 't')
+    h = np.array([_web_height(w) for w in webs], dtype=np.float64)
+    Aw = tw*h
+    zo = -outer['ZC']
+    zi = h + inner['ZC']
+    area = outer['A'] + Aw + inner['A']
+    zbar = (outer['A']*zo + Aw*h/2. + inner['A']*zi)/area
+    EI = _modulus(webs)*(outer['IN'] + outer['A']*(zo - zbar)**2 +
+                         tw*h**3/12. + Aw*(h/2. - zbar)**2 +
+                         inner['IN'] + inner['A']*(zi - zbar)**2)
+
+    # bay contributions, force times position
+    Fp = axial_forces(panels, subcases)*_attr(panels, 'b')[:, None]
+    Fs = axial_forces(stringers, subcases)
+    xp = _centroids(panels)
+    xs = _centroids(stringers)
+    p = np.array([ipanel[id(sa.panel)] for sa in spas], dtype=np.int64)
+    s = np.array([istr.get(id(sa.str1), -1) for sa in spas],
+                 dtype=np.int64)
+    moment = np.zeros((len(spas), nsub, 2))
+    moment[:, :, 0] = Fp[p]*xp[p, 2][:, None]
+    moment[:, :, 1] = -Fp[p]*xp[p, 1][:, None]
+    has = s >= 0
+    moment[has, :, 0] += Fs[s[has]]*xs[s[has], 2][:, None]
+    moment[has, :, 1] -= Fs[s[has]]*xs[s[has], 1][:, None]
+    radius = np.sqrt(xp[p, 1]**2 + xp[p, 2]**2)
+    pitch = _attr(panels, 'a')[p]
+
+    # frame stations of the webs of the frames and of the assemblies
+    allwebs, iweb = _unique(webs + [getattr(sa, attr) for sa in spas
+                                    for attr in ('fr1', 'fr2')])
+    station = _stations(_centroids(allwebs)[:, 0], xtol)
+    nst = station.max() + 1 if len(allwebs) > 0 else 0
+
+    # assembly -> station index arrays, one side for fr1 and one for fr2
+    Msum = np.zeros((nst, 2, nsub, 2))
+    count = np.zeros((nst, 2))
+    rsum = np.zeros(nst)
+    asum = np.zeros(nst)
+    nsum = np.zeros(nst)
+    for side, attr in enumerate(('fr1', 'fr2')):
+        ist = np.array([station[iweb[id(getattr(sa, attr))]]
+                        if getattr(sa, attr) is not None else -1
+                        for sa in spas], dtype=np.int64)
+        check = ist >= 0
+        np.add.at(Msum[:, side], ist[check], moment[check])
+        np.add.at(count[:, side], ist[check], 1)
+        np.add.at(rsum, ist[check], radius[check])
+        np.add.at(asum, ist[check], pitch[check])
+        np.add.at(nsum, ist[check], 1)
+    ifr = np.array([station[iweb[id(w)]] if w is not None else nst
+                    for w in webs], dtype=np.int64)
+    # frames without web get an empty station
+    Msum = np.concatenate((Msum, np.zeros((1, 2, nsub, 2))))[ifr]
+    count = np.concatenate((count, np.zeros((1, 2))))[ifr]
+    rsum, asum, nsum = [np.append(v, 0.)[ifr] for v in (rsum, asum, nsum)]
+    nsides = (count > 0).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        M = np.sqrt((Msum.sum(axis=1)**2).sum(axis=-1))/nsides[:, None]
+        D = 2*rsum/nsum
+        L = asum/nsum
+        EI_req = Cf*M*(D**2/L)[:, None]
+        ms = EI[:, None]/EI_req - 1.
+    ms[M == 0] = np.inf
+    ms[np.isnan(M) | np.isnan(EI)[:, None] | (nsides == 0)[:, None]] = np.nan
+    return subcases, dict(M=M, EI=EI, EI_req=EI_req, ms=ms)
+
+
+def bay_properties(bays):
+    """Smeared properties of wing bays
+
+    The skin properties are averaged over the panels and the stringer
+    properties over the stringers of each bay.
+
+    Parameters
+    ----------
+    bays : list
+        The :class:`.WingBay` objects.
+
+    Returns
+    -------
+    props : dict
+        Arrays of shape `(len(bays),)` with the arguments of
+        :func:`.stiffened_plate_stiffness` and `'a'`, `'b'` and `'nstr'`,
+        the number of stringers, as keys.
+
+    """
+    nb = len(bays)
+    panels = [p for bay in bays for p in bay.panels]
+    stringers = [s for bay in bays for s in bay.stringers]
+    pown = np.repeat(np.arange(nb), [len(bay.panels) for bay in bays])
+    sown = np.repeat(np.arange(nb), [len(bay.stringers) for bay in bays])
+    npan = np.bincount(pown, minlength=nb)
+    nstr = np.bincount(sown, minlength=nb)
+
+    def mean(values, owner, count):
+        out = np.zeros(nb)
+        np.add.at(out, owner, values)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return out/count
+
+    props = dict(t=mean(_attr(panels, 't'), pown, npan),
+                 E=mean(_modulus(panels), pown, npan),
+                 nu=mean(_poisson(panels), pown, npan))
+    section = se_section_properties(stringers, ['A', 'ZC', 'IN'])
+    props['As'] = mean(section['A'], sown, nstr)
+    props['ZC'] = mean(section['ZC'], sown, nstr)
+    props['IN'] = mean(section['IN'], sown, nstr)
+    props['Es'] = mean(_modulus(stringers), sown, nstr)
+    # unstiffened bays
+    for key in ('As', 'ZC', 'IN', 'Es'):
+        props[key][nstr == 0] = 0.
+    props['a'] = _attr(bays, 'a')
+    props['b'] = _attr(bays, 'b')
+    with np.errstate(divide='ignore'):
+        props['ds'] = props['b']/nstr
+    props['nstr'] = nstr
+    return props
+
+
+def wing_bay_buckling(bays, subcases=None, m=8, n=8):
+    """Global buckling of wing bays
+
+    The skin forces are averaged over the panels of each bay and the mean
+    axial force of the stringers is smeared over the bay width and added to
+    `Nxx`. See :func:`.global_buckling_eigenvalue`.
+
+    Parameters
+    ----------
+    bays : list
+        The :class:`.WingBay` objects.
+    subcases : array-like or None, optional
+        The subcase ids, by default all subcases with forces.
+    m, n : int, optional
+        The number of terms of the buckling mode.
+
+    Returns
+    -------
+    subcases : np.ndarray
+        The subcase ids.
+    results : dict
+        Arrays of shape `(len(bays), nsubcases)`: `'Nxx'`, `'Nyy'` and
+        `'Nxy'` the smeared forces, `'eig'` the buckling eigenvalue and
+        `'ms'` the margin of safety `eig - 1`.
+
+    """
+    nb = len(bays)
+    panels = [p for bay in bays for p in bay.panels]
+    stringers = [s for bay in bays for s in bay.stringers]
+    if subcases is None:
+        subcases = _subcases(panels + stringers)
+    subcases = np.asarray(subcases, dtype=np.int64)
+    nsub = subcases.shape[0]
+    props = bay_properties(bays)
+
+    pown = np.repeat(np.arange(nb), [len(bay.panels) for bay in bays])
+    sown = np.repeat(np.arange(nb), [len(bay.stringers) for bay in bays])
+    npan = np.bincount(pown, minlength=nb)[:, None]
+    loads = {}
+    for component, key in enumerate(('Nxx', 'Nyy', 'Nxy')):
+        value = np.zeros((nb, nsub))
+        np.add.at(value, pown, axial_forces(panels, subcases,
+                                            component=component))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            loads[key] = value/npan
+    Ps = np.zeros((nb, nsub))
+    np.add.at(Ps, sown, axial_forces(stringers, subcases))
+    loads['Nxx'] = loads['Nxx'] + Ps/props['b'][:, None]
+
+    args = [props[key][:, None] for key in ('t', 'E', 'nu', 'As', 'Es',
+                                            'ZC', 'IN', 'ds', 'a', 'b')]
+    args += [loads['Nxx'], loads['Nyy'], loads['Nxy']]
+    args = np.broadcast_arrays(*args)
+    check = np.isfinite(np.array(args[:6] + args[8:])).all(axis=0)
+    eig = np.full((nb, nsub), np.nan)
+    if check.any():
+        eig[check] = global_buckling_eigenvalue(*[v[check] for v in args],
+                                                m=m, n=n)
+    results = dict(loads)
+    results['eig'] = eig
+    results['ms'] = eig - 1.
+    return subcases, results
+
+
+def super_stringer_column_buckling(sss, subcases=None, c=1., Fcy=None,
+                                   kc=4., tol=1e-6, maxiter=50):
+    """Column buckling of super-stringers after load redistribution
+
+    The stringer load is obtained with :func:`.effective_width_redistribution`
+    from the stringer force and the mean `Nxx` of the adjacent panels. The
+    column is made of the stringer and the effective widths of both panels,
+    with length `a / sqrt(c)`, `a` being the mean length of the panels. The
+    critical stress is computed as in :func:`.stringer_column_buckling`.
+
+    Parameters
+    ----------
+    sss : list
+        The :class:`.SuperStringer` objects. A missing panel, at a free
+        edge, carries no load.
+    subcases : array-like or None, optional
+        The subcase ids, by default all subcases with forces.
+    c : float, optional
+        The end fixity coefficient.
+    Fcy : float or None, optional
+        The compressive yield stress of the stringers.
+    kc, tol, maxiter : optional
+        See :func:`.effective_width_redistribution`.
+
+    Returns
+    -------
+    subcases : np.ndarray
+        The subcase ids.
+    results : dict
+        Arrays of shape `(len(sss), nsubcases)`: `'P_linear'` and `'P'` the
+        stringer force before and after the redistribution, `'be'` the
+        total effective width of skin, `'sigma'` the stringer stress,
+        `'sigma_cr'` the critical stress and `'ms'` the margin of safety.
+
+    """
+    stringers = [ss.stringer for ss in sss]
+    panels, ipanel = _unique([p for ss in sss for p in (ss.panel1,
+                                                        ss.panel2)])
+    if subcases is None:
+        subcases = _subcases([se for se in stringers + panels
+                              if se is not None])
+    subcases = np.asarray(subcases, dtype=np.int64)
+    nss = len(sss)
+
+    section = se_section_properties(stringers, ['A', 'ZC', 'IN'])
+    A, ZC, IN = [section[key][:, None] for key in ('A', 'ZC', 'IN')]
+    Es = _modulus(stringers)[:, None]
+    Ps = axial_forces(stringers, subcases)
+
+    # panel arrays of shape (nss, nsub, 2), zeros for missing panels
+    index = np.array([[ipanel.get(id(p), len(panels)) for p in
+                       (ss.panel1, ss.panel2)] for ss in sss],
+                     dtype=np.int64).reshape(nss, 2)
+    skin = dict(t=_attr(panels, 't'), a=_attr(panels, 'a'),
+                b=_attr(panels, 'b'), E=_modulus(panels),
+                nu=_poisson(panels))
+    for key, value in skin.items():
+        skin[key] = np.append(value, 0.)[index][:, None, :]
+    Nx = np.concatenate((axial_forces(panels, subcases),
+                         np.zeros((1, subcases.shape[0]))))
+    Nx = Nx[index].transpose(0, 2, 1)
+    red = effective_width_redistribution(Ps, A, Es, Nx, skin['t'],
+                                         skin['b'], skin['E'], skin['nu'],
+                                         kc=kc, tol=tol, maxiter=maxiter)
+
+    be = red['w'].sum(axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = (skin['t']*red['w']).sum(axis=-1)/be
+        a = skin['a'].sum(axis=-1)/(skin['a'] > 0).sum(axis=-1)
+    sigma, sigma_cr, ms = _column_buckling(red['P'], A, ZC, IN, Es, t, be,
+                                           a/np.sqrt(c), Fcy)
+    results = dict(P_linear=Ps, P=red['P'], be=be, sigma=sigma,
+                   sigma_cr=np.array(sigma_cr), ms=ms)
+    return subcases, results
+
+
+def super_stringer_load_factors(sss, subcases=None, kc=4., tol=1e-6,
+                                maxiter=50):
+    """Stringer load factors of the post-buckled super-stringers
+
+    The ratio of the redistributed to the linear stringer force of
+    :func:`.super_stringer_column_buckling`, maximum over the subcases with
+    the stringer in compression. It scales the force read by the SOL200
+    stringer buckling constraint, see
+    :meth:`.SuperStringer.constrain_buckling`.
+
+    Parameters
+    ----------
+    sss : list
+        The :class:`.SuperStringer` objects.
+    subcases : array-like or None, optional
+        The subcase ids, by default all subcases with forces.
+    kc, tol, maxiter : optional
+        See :func:`.effective_width_redistribution`.
+
+    Returns
+    -------
+    load_factors : np.ndarray
+        The load factor of each super-stringer, `1` when the stringer is
+        never in compression.
+
+    """
+    subcases, results = super_stringer_column_buckling(
+        sss, subcases, kc=kc, tol=tol, maxiter=maxiter)
+    Ps = results['P_linear']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ratio = np.where(Ps < 0, results['P']/Ps, 1.)
+    ratio[np.isnan(ratio)] = 1.
+    return np.maximum(ratio, 1.).max(axis=1, initial=1.)
+
+
+def _member_area(ses):
+    """Cross-section area of 1D SEs and of 2D SEs used as frames, `t*b`"""
+    A = se_section_properties(ses, ['A'])['A']
+    for i, se in enumerate(ses):
+        if se is not None and np.isnan(A[i]):
+            A[i] = getattr(se, 't', None) or np.nan
+            A[i] *= getattr(se, 'b', None) or np.nan
+    return A
+
+
+def _pair_mean(values):
+    """Mean over the last axis ignoring `NaN`, `0` when all are `NaN`"""
+    check = ~np.isnan(values)
+    count = check.sum(axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out = np.where(check, values, 0.).sum(axis=-1)/count
+    out[count == 0] = 0.
+    return out
+
+
+def assembly_diagonal_tension(sas, subcases=None, Fsu=None, **kwargs):
+    """Diagonal tension of the skins and webs of assemblies
+
+    For :class:`.StiffenedPanelAssembly` the stringers are the members along
+    `x` and the frames those along `y`. For :class:`.FrameAssembly` and
+    :class:`.FrameShearClipAssembly` the flanges are the members along `x`,
+    without uprights. The area of each member is the mean of the two
+    members of the assembly, see :func:`.se_diagonal_tension`.
+
+    Parameters
+    ----------
+    sas : list
+        The assemblies.
+    subcases : array-like or None, optional
+        The subcase ids, by default all subcases with forces.
+    Fsu : float, array-like or None, optional
+        The allowable shear stress of the skins and webs.
+    kwargs : optional
+        Passed to :func:`.diagonal_tension`.
+
+    Returns
+    -------
+    subcases : np.ndarray
+        The subcase ids.
+    results : dict
+        Arrays of shape `(len(sas), nsubcases)`, see
+        :func:`.diagonal_tension`.
+
+    """
+    from ..sas import StiffenedPanelAssembly
+
+    webs = []
+    xmembers = []
+    ymembers = []
+    for sa in sas:
+        if isinstance(sa, StiffenedPanelAssembly):
+            webs.append(sa.panel)
+            xmembers.append((sa.str1, sa.str2))
+            ymembers.append((sa.fr1, sa.fr2))
+        else:
+            webs.append(sa.web)
+            xmembers.append((sa.outerflange, sa.innerflange))
+            ymembers.append((None, None))
+    nsa = len(sas)
+
+    def members(pairs):
+        ses = [se for pair in pairs for se in pair]
+        A = _member_area(ses).reshape(nsa, 2)
+        E = _modulus(ses).reshape(nsa, 2)
+        return _pair_mean(A), _pair_mean(E)
+
+    Ax, Ex = members(xmembers)
+    Ay, Ey = members(ymembers)
+    # members without material take the material of the web
+    Ew = _modulus(webs)
+    Ex = np.where(Ex > 0, Ex, Ew)
+    Ey = np.where(Ey > 0, Ey, Ew)
+    return se_diagonal_tension(webs, subcases, Ax=Ax, Ex=Ex, Ay=Ay, Ey=Ey,
+                               Fsu=Fsu, **kwargs)
+
+
+def three_pocket_diagonal_tension(tpas, subcases=None, Fsu=None,
+                                  **kwargs):
+    """Diagonal tension of three-pocket assemblies
+
+    Each pocket is evaluated with :func:`.se_diagonal_tension`, the frames
+    being the members along `y` and the stringers those along `x`, the
+    outer pockets having only the stringer shared with the central pocket.
+    The axial force of each stringer of the central pocket collects the
+    diagonal tension of the half pockets on both sides::
+
+        P = -sum(k tau t b cot(alpha)/2) A/(A + sum((1 - k) t b/4))
+
+    where the second sum is the skin working with the stringer. A missing
+    outer pocket, at a cutout or a free edge, loads the stringer from one
+    side only. With identical pockets `P` is the force `Px` of
+    :func:`.diagonal_tension`.
+
+    Parameters
+    ----------
+    tpas : list
+        The :class:`.ThreePocketAssembly` objects.
+    subcases : array-like or None, optional
+        The subcase ids, by default all subcases with forces.
+    Fsu : float, array-like or None, optional
+        The allowable shear stress of the skins.
+    kwargs : optional
+        Passed to :func:`.diagonal_tension`.
+
+    Returns
+    -------
+    subcases : np.ndarray
+        The subcase ids.
+    results : dict
+        Arrays of shape `(len(tpas), nsubcases)` for the central pocket,
+        see :func:`.diagonal_tension`, with `'Px1'` and `'Px2'` the forces
+        of `str1` and `str2` and with `'sigma_x'` and `'Px'` those of the
+        stringer under the highest compressive stress.
+
+    """
+    ntp = len(tpas)
+    pockets = [se for sa in tpas for se in (sa.panel1, sa.panel2,
+                                            sa.panel3)]
+    stringers = [se for sa in tpas for se in (sa.str1, sa.str2)]
+    frames = [se for sa in tpas for se in (sa.fr1, sa.fr2)]
+    if subcases is None:
+        subcases = _subcases([se for se in pockets + stringers
+                              if se is not None])
+    subcases = np.asarray(subcases, dtype=np.int64)
+
+    # members of the pockets, arrays of shape (ntp, 3)
+    As = _member_area(stringers).reshape(ntp, 2)
+    Es = _modulus(stringers).reshape(ntp, 2)
+    nan = np.full((ntp, 1), np.nan)
+
+    def sides(values):
+        left = np.concatenate((values[:, :1], values), axis=1)
+        right = np.concatenate((nan, values[:, 1:], values[:, 1:]), axis=1)
+        return _pair_mean(np.stack((left, right), axis=-1))
+
+    Ew = _modulus(pockets).reshape(ntp, 3)
+    Ax = sides(As)
+    Ex = np.where(sides(Es) > 0, sides(Es), Ew)
+    Ay = np.repeat(_pair_mean(_member_area(frames).reshape(ntp, 2))[:, None],
+                   3, axis=1)
+    Ey = np.repeat(_pair_mean(_modulus(frames).reshape(ntp, 2))[:, None], 3,
+                   axis=1)
+    Ey = np.where(Ey > 0, Ey, Ew)
+    subcases, res = se_diagonal_tension(pockets, subcases, Ax=Ax.ravel(),
+                                        Ex=Ex.ravel(), Ay=Ay.ravel(),
+                                        Ey=Ey.ravel(), Fsu=Fsu, **kwargs)
+    nsub = subcases.shape[0]
+    for key, value in res.items():
+        res[key] = value.reshape(ntp, 3, nsub)
+
+    # half pockets on both sides of the stringers, zero when missing
+    t = _attr(pockets, 't').reshape(ntp, 3, 1)
+    b = _attr(pockets, 'b').reshape(ntp, 3, 1)
+    k = res['k']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        force = -k*res['tau']*t*b/np.tan(res['alpha'])/2.
+        skin = (1. - k)*t*b/4.
+    present = np.array([se is not None for se in pockets],
+                       dtype=bool).reshape(ntp, 3, 1)
+    force = np.where(present, force, 0.)
+    skin = np.where(present, skin, 0.)
+    A = As[:, :, None]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        Px = ((force[:, :2] + force[:, 1:])*A/
+              (A + skin[:, :2] + skin[:, 1:]))
+        sigma_x = Px/A
+
+    results = dict((key, value[:, 1]) for key, value in res.items())
+    results['Px1'] = Px[:, 0]
+    results['Px2'] = Px[:, 1]
+    crit = np.argmin(np.where(np.isnan(sigma_x), np.inf, sigma_x),
+                     axis=1)[:, None, :]
+    results['sigma_x'] = np.take_along_axis(sigma_x, crit, axis=1)[:, 0, :]
+    results['Px'] = np.take_along_axis(Px, crit, axis=1)[:, 0, :]
+    return subcases, results
+
+
+def analyze_assemblies(sas, c=1., Fcy=None, k=1.9, Cf=CF_SHANLEY,
+                       Fsu=None):
+    """Evaluate all assembly checks at once
+
+    The margins are also stored in the `margins` attribute of each
+    assembly, with the check names as keys and `dict` values with the
+    subcases as keys.
+
+    Parameters
+    ----------
+    sas : list
+        The assemblies, those of other types are skipped.
+    c, Fcy, k :
+        See :func:`.stringer_column_buckling`, `c` and `Fcy` are also used
+        by :func:`.super_stringer_column_buckling`.
+    Cf : float, optional
+        See :func:`.frame_general_instability`.
+    Fsu : float or None, optional
+        The allowable shear stress of the skins and webs. Given, the
+        `'diagonal_tension'` and `'three_pocket_diagonal_tension'` checks
+        are evaluated, see :func:`.assembly_diagonal_tension` and
+        :func:`.three_pocket_diagonal_tension`.
+
+    Returns
+    -------
+    results : dict
+        The tuples `(subcases, results)` with `'column_buckling'`,
+        `'frame_instability'`, `'global_buckling'`,
+        `'postbuckled_column_buckling'`, `'diagonal_tension'` and
+        `'three_pocket_diagonal_tension'` as keys.
+
+    """
+    from ..sas import (FrameAssembly, FrameShearClipAssembly,
+                       StiffenedPanelAssembly, SuperStringer,
+                       ThreePocketAssembly, WingBay)
+
+    spas = [sa for sa in sas if isinstance(sa, StiffenedPanelAssembly)]
+    frames = [sa for sa in sas if isinstance(sa, (FrameAssembly,
+                                                  FrameShearClipAssembly))]
+    bays = [sa for sa in sas if isinstance(sa, WingBay)]
+    sss = [sa for sa in sas if isinstance(sa, SuperStringer)]
+    tpas = [sa for sa in sas if isinstance(sa, ThreePocketAssembly)]
+    ses = [se for sa in spas for se in (sa.panel, sa.str1, sa.str2)
+           if se is not None]
+    ses += [se for bay in bays for se in bay.panels + bay.stringers]
+    ses += [se for ss in sss for se in (ss.stringer, ss.panel1, ss.panel2)
+            if se is not None]
+    ses += [se for tpa in tpas for se in (tpa.panel1, tpa.panel2,
+                                          tpa.panel3, tpa.str1, tpa.str2)
+            if se is not None]
+    subcases = _subcases(ses)
+    out = {}
+    out['column_buckling'] = stringer_column_buckling(spas, subcases, c=c,
+                                                      Fcy=Fcy, k=k)
+    out['frame_instability'] = frame_general_instability(frames, spas,
+                                                         subcases, Cf=Cf)
+    out['global_buckling'] = wing_bay_buckling(bays, subcases)
+    out['postbuckled_column_buckling'] = super_stringer_column_buckling(
+        sss, subcases, c=c, Fcy=Fcy)
+    checks = [('column_buckling', spas), ('frame_instability', frames),
+              ('global_buckling', bays), ('postbuckled_column_buckling', sss)]
+    if Fsu is not None:
+        out['diagonal_tension'] = assembly_diagonal_tension(spas + frames,
+                                                            subcases, Fsu)
+        checks.append(('diagonal_tension', spas + frames))
+        out['three_pocket_diagonal_tension'] = three_pocket_diagonal_tension(
+            tpas, subcases, Fsu)
+        checks.append(('three_pocket_diagonal_tension', tpas))
+    for name, group in checks:
+        subs, results = out[name]
+        for sa, ms in zip(group, results['ms']):
+            sa.margins[name] = dict(zip(subs.tolist(), ms.tolist()))
+    return out
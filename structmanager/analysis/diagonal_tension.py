@@ -0,0 +1,213 @@
+"""
+Diagonal tension (:mod:`structmanager.analysis.diagonal_tension`)
+==================================================================
+
+.. currentmodule:: structmanager.analysis.diagonal_tension
+
+Kuhn's incomplete diagonal tension theory for webs and skin panels loaded in
+shear beyond buckling, following Bruhn's chapter C11. The panel has length
+`a` along `x` and width `b` along `y`, with stiffening members along `x`
+spaced by `b` (web flanges or stringers) and along `y` spaced by `a`
+(uprights or frames).
+
+The shear buckling stress, with `bs` the short side of the panel and the
+curvature term of Kuhn for curved skins::
+
+    tau_cr = ks pi**2 E/(12 (1 - nu**2)) (t/bs)**2 + 0.1 E t/r
+
+    ks = 5.35 + 4 (bs/bl)**2
+
+The diagonal tension factor, with the term `300 t b/(r a)` only for curved
+skins::
+
+    k = tanh((0.5 + 300 t b/(r a)) log10(tau/tau_cr)),   tau > tau_cr
+
+The angle `alpha` of the diagonal tension, measured from `x`, is obtained
+iterating::
+
+    tan(alpha)**2 = (eps - eps_x)/(eps - eps_y + (a/r)**2/24)
+
+    eps = tau/E (2 k/sin(2 alpha) + (1 - k) (1 + nu) sin(2 alpha))
+
+    sigma_x = -k tau cot(alpha)/(Ax/(b t) + (1 - k)/2)
+    sigma_y = -k tau tan(alpha)/(Ay/(a t) + (1 - k)/2)
+
+where `sigma_x` and `sigma_y` are the stresses of the members, with strains
+`eps_x` and `eps_y`. The peak web stress neglects the flexibility of the
+members, `tau_max = tau (1 + k**2 (1/sin(2 alpha) - 1))`.
+
+All panels and subcases are iterated at once, each sweep being one array
+evaluation.
+
+"""
+from __future__ import division
+
+import numpy as np
+
+
+def shear_buckling_stress(t, a, b, E, nu, r=np.inf, ks=None):
+    """Shear buckling stress of simply supported flat or curved panels
+
+    Parameters
+    ----------
+    t, a, b, E, nu : float or array-like
+        The thickness, the length and width and the material.
+    r : float or array-like, optional
+        The radius of curved panels.
+    ks : float, array-like or None, optional
+        The shear buckling coefficient, by default for simply supported
+        edges.
+
+    Returns
+    -------
+    tau_cr : np.ndarray
+        The shear buckling stress.
+
+    """
+    t, a, b, E, nu, r = np.broadcast_arrays(*[
+        np.asarray(v, dtype=np.float64) for v in (t, a, b, E, nu, r)])
+    bs = np.minimum(a, b)
+    bl = np.maximum(a, b)
+    if ks is None:
+        ks = 5.35 + 4.*(bs/bl)**2
+    return (ks*np.pi**2*E/(12.*(1. - nu**2))*(t/bs)**2 +
+            0.1*E*t/r)
+
+
+def diagonal_tension(tau, t, a, b, E, nu, Ax=0., Ex=None, Ay=0., Ey=None,
+                     r=np.inf, ks=None, Fsu=None, tol=1e-6, maxiter=50):
+    """Incomplete diagonal tension of webs and skin panels
+
+    All the parameters are broadcast against each other.
+
+    Parameters
+    ----------
+    tau : float or array-like
+        The applied shear stress.
+    t, a, b, E, nu, r, ks :
+        See :func:`.shear_buckling_stress`.
+    Ax, Ay : float or array-like, optional
+        The area of the members along `x` and `y`.
+    Ex, Ey : float, array-like or None, optional
+        The Young's modulus of the members, by default `E`.
+    Fsu : float, array-like or None, optional
+        The allowable shear stress of the web.
+    tol : float, optional
+        The convergence tolerance on `alpha`, in radians.
+    maxiter : int, optional
+        The maximum number of sweeps.
+
+    Returns
+    -------
+    results : dict
+        `'tau_cr'` the buckling stress, `'k'` the diagonal tension factor,
+        `'alpha'` the angle in radians, `'sigma_x'` and `'sigma_y'` the
+        stresses of the members, `'Px'` and `'Py'` their axial forces,
+        `'tau_max'` the peak web stress and, given `Fsu`, `'ms'` its margin
+        of safety.
+
+    """
+    if Ex is None:
+        Ex = E
+    if Ey is None:
+        Ey = E
+    params = np.broadcast_arrays(*[np.asarray(v, dtype=np.float64) for v in
+                                   (tau, t, a, b, E, nu, Ax, Ex, Ay, Ey, r)])
+    tau, t, a, b, E, nu, Ax, Ex, Ay, Ey, r = params
+    tau = np.abs(tau)
+    tau_cr = shear_buckling_stress(t, a, b, E, nu, r, ks)
+    curved = np.where(np.isinf(r), 0., 300.*t*b/(r*a))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ratio = np.maximum(tau/tau_cr, 1.)
+        k = np.tanh((0.5 + curved)*np.log10(ratio))
+        cx = Ax/(b*t) + 0.5*(1. - k)
+        cy = Ay/(a*t) + 0.5*(1. - k)
+        extra = np.where(np.isinf(r), 0., (a/r)**2/24.)
+
+        alpha = np.full(tau.shape, np.pi/4.)
+        for _ in range(maxiter):
+            s2a = np.sin(2.*alpha)
+            eps = tau/E*(2.*k/s2a + (1. - k)*(1. + nu)*s2a)
+            eps_x = -k*tau/np.tan(alpha)/cx/Ex
+            eps_y = -k*tau*np.tan(alpha)/cy/Ey
+            tan2 = (eps - eps_x)/(eps - eps_y + extra)
+            new = np.arctan(np.sqrt(np.where(tan2 > 0, tan2, np.nan)))
+            # panels without diagonal tension
+            new = np.where(k > 0, new, np.pi/4.)
+            change = np.abs(new - alpha)
+            alpha = new
+            change = change[~np.isnan(change)]
+            if change.size == 0 or change.max() <= tol:
+                break
+
+        sigma_x = -k*tau/np.tan(alpha)/cx
+        sigma_y = -k*tau*np.tan(alpha)/cy
+        tau_max = tau*(1. + k**2*(1./np.sin(2.*alpha) - 1.))
+    results = dict(tau_cr=tau_cr, k=k, alpha=alpha, sigma_x=sigma_x,
+                   sigma_y=sigma_y, Px=sigma_x*Ax, Py=sigma_y*Ay,
+                   tau_max=tau_max)
+    if Fsu is not None:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            results['ms'] = Fsu/tau_max - 1.
+    return results
+
+
+def se_diagonal_tension(ses, subcases=None, Ax=0., Ex=None, Ay=0., Ey=None,
+                        Fsu=None, **kwargs):
+    """Diagonal tension of many Web and Panel SEs
+
+    The shear stress is the mean `Nxy` of the elements divided by the SE
+    thickness, see :func:`.axial_forces`. The radius of the SEs without an
+    `r` attribute is infinite.
+
+    Parameters
+    ----------
+    ses : list
+        The 2D SEs.
+    subcases : array-like or None, optional
+        The subcase ids, by default all subcases with forces.
+    Ax, Ex, Ay, Ey : float or array-like, optional
+        The members of each SE, arrays of shape `(len(ses),)`, see
+        :func:`.diagonal_tension`.
+    Fsu : float, array-like or None, optional
+        The allowable shear stress.
+    kwargs : optional
+        Passed to :func:`.diagonal_tension`.
+
+    Returns
+    -------
+    subcases : np.ndarray
+        The subcase ids.
+    results : dict
+        Arrays of shape `(len(ses), nsubcases)`, see
+        :func:`.diagonal_tension`, with also `'tau'` the shear stress.
+
+    """
+    from .assemblies import _attr, _modulus, _poisson, _subcases, axial_forces
+
+    if subcases is None:
+        subcases = _subcases(ses)
+    subcases = np.asarray(subcases, dtype=np.int64)
+    t = _attr(ses, 't')[:, None]
+    r = _attr(ses, 'r')
+    r = np.where(np.isnan(r), np.inf, r)[:, None]
+    E = _modulus(ses)[:, None]
+
+    def column(value):
+        if value is None:
+            return None
+        value = np.asarray(value, dtype=np.float64)
+        return value[:, None] if value.ndim == 1 else value
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        tau = axial_forces(ses, subcases, component=2)/t
+    results = diagonal_tension(tau, t, _attr(ses, 'a')[:, None],
+                               _attr(ses, 'b')[:, None], E,
+                               _poisson(ses)[:, None], Ax=column(Ax),
+                               Ex=column(Ex), Ay=column(Ay), Ey=column(Ey),
+                               r=r, Fsu=column(Fsu), **kwargs)
+    results['tau'] = np.abs(tau)
+    shape = tau.shape
+    for key, value in results.items():
+        results[key] = np.array(np.broadcast_to(value, shape))
+    return subcases, results
@@ -0,0 +1,268 @@
+"""
+Laminate stiffness (:mod:`structmanager.analysis.laminate`)
+============================================================
+
+.. currentmodule:: structmanager.analysis.laminate
+
+The `A`, `B` and `D` matrices of classical laminate theory are computed for
+many laminates at once, with the plies of all laminates stacked in padded
+arrays. Since many SEs share a few layups, the results are cached by the
+signature of the ply stack: thickness, angle and material properties of each
+ply and the offset `z0` of the bottom surface.
+
+"""
+from __future__ import division
+
+import numpy as np
+
+
+_CACHE = {}
+
+
+def clear_cache():
+    """Remove all the cached laminates"""
+    _CACHE.clear()
+
+
+def ply_stiffness(E1, E2, G12, nu12):
+    """Reduced stiffness matrix of orthotropic plies
+
+    Parameters
+    ----------
+    E1, E2, G12, nu12 : float or array-like
+        The engineering constants of the plies.
+
+    Returns
+    -------
+    Q : np.ndarray
+        Array of shape `(..., 3, 3)`.
+
+    """
+    E1, E2, G12, nu12 = np.broadcast_arrays(
+        *[np.asarray(v, dtype=np.float64) for v in (E1, E2, G12, nu12)])
+    nu21 = nu12*E2/E1
+    den = 1. - nu12*nu21
+    Q = np.zeros(E1.shape + (3, 3))
+    Q[..., 0, 0] = E1/den
+    Q[..., 0, 1] = Q[..., 1, 0] = nu12*E2/den
+    Q[..., 1, 1] = E2/den
+    Q[..., 2, 2] = G12
+    return Q
+
+
+def strain_transformation(theta):
+    """Transformation of engineering strains to plies rotated by `theta`
+
+    Parameters
+    ----------
+    theta : float or array-like
+        The ply angles in degrees.
+
+    Returns
+    -------
+    T : np.ndarray
+        Array of shape `theta.shape + (3, 3)` giving the strains
+        `[e1, e2, g12]` in the ply axes from `[ex, ey, gxy]`.
+
+    """
+    theta = np.deg2rad(np.asarray(theta, dtype=np.float64))
+    c = np.cos(theta)
+    s = np.sin(theta)
+    c2, s2, cs = c**2, s**2, c*s
+    T = np.zeros(theta.shape + (3, 3))
+    T[..., 0, 0] = c2
+    T[..., 0, 1] = s2
+    T[..., 0, 2] = cs
+    T[..., 1, 0] = s2
+    T[..., 1, 1] = c2
+    T[..., 1, 2] = -cs
+    T[..., 2, 0] = -2*cs
+    T[..., 2, 1] = 2*cs
+    T[..., 2, 2] = c2 - s2
+    return T
+
+
+def rotated_stiffness(Q, theta):
+    """Reduced stiffness of plies rotated by `theta` degrees
+
+    Parameters
+    ----------
+    Q : np.ndarray
+        Array of shape `(..., 3, 3)`, see :func:`.ply_stiffness`.
+    theta : float or array-like
+        The ply angles in degrees, broadcast against `Q[..., 0, 0]`.
+
+    Returns
+    -------
+    Qbar : np.ndarray
+        Array of shape `(..., 3, 3)`.
+
+    """
+    theta = np.broadcast_to(np.asarray(theta, dtype=np.float64),
+                            np.broadcast(theta, Q[..., 0, 0]).shape)
+    # Qbar = T.T Q T
+    T = strain_transformation(theta)
+    return np.einsum('...ji,...jk,...kl->...il', T, Q, T)
+
+
+def abd_matrices(thicknesses, angles, Q, z0=None):
+    """`A`, `B` and `D` matrices of many laminates
+
+    Laminates with fewer plies are padded with plies of zero thickness.
+
+    Parameters
+    ----------
+    thicknesses : array-like
+        Ply thicknesses, array of shape `(nlam, nply)`.
+    angles : array-like
+        Ply angles in degrees, array of shape `(nlam, nply)`.
+    Q : array-like
+        Reduced stiffness of each ply, array of shape `(nlam, nply, 3, 3)`.
+    z0 : array-like or None, optional
+        The coordinate of the bottom surface of each laminate, by default
+        half the laminate thickness below the reference plane.
+
+    Returns
+    -------
+    A, B, D : np.ndarray
+        Arrays of shape `(nlam, 3, 3)`.
+
+    """
+    h = np.atleast_2d(np.asarray(thicknesses, dtype=np.float64))
+    Qbar = rotated_stiffness(np.asarray(Q, dtype=np.float64), angles)
+    if z0 is None:
+        z0 = -h.sum(axis=1)/2.
+    z0 = np.broadcast_to(np.asarray(z0, dtype=np.float64), h.shape[:1])
+    z = np.concatenate((z0[:, None], z0[:, None] + np.cumsum(h, axis=1)),
+                       axis=1)
+    A = np.einsum('lp,lpij->lij', z[:, 1:] - z[:, :-1], Qbar)
+    B = np.einsum('lp,lpij->lij', (z[:, 1:]**2 - z[:, :-1]**2)/2., Qbar)
+    D = np.einsum('lp,lpij->lij', (z[:, 1:]**3 - z[:, :-1]**3)/3., Qbar)
+    return A, B, D
+
+
+def _material_constants(mat):
+    if mat.type == 'MAT8':
+        return (mat.e11, mat.e22, mat.g12, mat.nu12)
+    elif mat.type == 'MAT1':
+        nu = mat.nu if mat.nu is not None else mat.e/(2.*mat.g) - 1.
+        g = mat.g if mat.g is not None else mat.e/(2.*(1. + nu))
+        return (mat.e, mat.e, g, nu)
+    raise NotImplementedError('%s not supported!' % mat.type)
+
+
+def pcomp_signature(pcomp, materials):
+    """Signature of the ply stack of a PCOMP property
+
+    Parameters
+    ----------
+    pcomp : PyNastran's PCOMP
+        The property.
+    materials : dict
+        The materials of the model, with the material ids as keys.
+
+    Returns
+    -------
+    signature : tuple
+        The offset `z0` followed by `(t, theta, E1, E2, G12, nu12)` for each
+        ply.
+
+    """
+    plies = tuple((float(pcomp.Thickness(i)), float(pcomp.Theta(i))) +
+                  tuple(float(v) for v in
+                        _material_constants(materials[pcomp.Mid(i)]))
+                  for i in range(pcomp.nplies))
+    z0 = getattr(pcomp, 'z0', None)
+    return (None if z0 is None else float(z0),) + plies
+
+
+def stack_plies(signatures):
+    """Stack the plies of many laminates in padded arrays
+
+    Parameters
+    ----------
+    signatures : list
+        The signatures, see :func:`.pcomp_signature`.
+
+    Returns
+    -------
+    plies : np.ndarray
+        Array of shape `(nlam, nply, 6)` with `(t, theta, E1, E2, G12,
+        nu12)` for each ply. The padding plies have zero thickness and a
+        non-singular material.
+    z : np.ndarray
+        Array of shape `(nlam, nply + 1)` with the coordinates of the ply
+        interfaces.
+    valid : np.ndarray
+        Array of shape `(nlam, nply)`, ``False`` for the padding plies.
+
+    """
+    nply = max([len(s) - 1 for s in signatures] + [1])
+    plies = np.zeros((len(signatures), nply, 6))
+    plies[:, :, 2:6] = [1., 1., 1., 0.]
+    valid = np.zeros((len(signatures), nply), dtype=bool)
+    z0 = np.full(len(signatures), np.nan)
+    for i, s in enumerate(signatures):
+        if len(s) > 1:
+            plies[i, :len(s) - 1] = s[1:]
+            valid[i, :len(s) - 1] = True
+        if s[0] is not None:
+            z0[i] = s[0]
+    h = plies[:, :, 0]
+    z0 = np.where(np.isnan(z0), -h.sum(axis=1)/2., z0)
+    z = np.concatenate((z0[:, None], z0[:, None] + np.cumsum(h, axis=1)),
+                       axis=1)
+    return plies, z, valid
+
+
+def laminate_abd(signatures):
+    """`A`, `B` and `D` matrices from ply stack signatures, cached
+
+    The laminates not found in the cache are computed in one batched pass.
+
+    Parameters
+    ----------
+    signatures : list
+        The signatures, see :func:`.pcomp_signature`.
+
+    Returns
+    -------
+    abd : list
+        One tuple `(A, B, D)` for each signature.
+
+    """
+    missing = [s for s in set(signatures) if s not in _CACHE]
+    if len(missing) > 0:
+        plies, z, valid = stack_plies(missing)
+        Q = ply_stiffness(plies[:, :, 2], plies[:, :, 3], plies[:, :, 4],
+                          plies[:, :, 5])
+        A, B, D = abd_matrices(plies[:, :, 0], plies[:, :, 1], Q, z[:, 0])
+        for i, s in enumerate(missing):
+            _CACHE[s] = (A[i], B[i], D[i])
+    return [_CACHE[s] for s in signatures]
+
+
+def se_laminates(ses):
+    """`A`, `B` and `D` matrices of the PCOMP properties of many SEs
+
+    Parameters
+    ----------
+    ses : list
+        The SEs, SEs without elements from a loaded FE model or without a
+        PCOMP property are skipped.
+
+    Returns
+    -------
+    abd : dict
+        The tuples `(A, B, D)` with the indices in `ses` as keys.
+
+    """
+    index = []
+    signatures = []
+    for i, se in enumerate(ses):
+        if not se.elements or se.ptype != 'PCOMP':
+            continue
+        bdf = se.model.nastranmodel.bdf
+        index.append(i)
+        signatures.append(pcomp_signature(se.elements[0].pid, bdf.materials))
+    return dict(zip(index, laminate_abd(signatures)))
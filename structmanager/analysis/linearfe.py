@@ -0,0 +1,280 @@
+"""
+Linear plane FE model (:mod:`structmanager.analysis.linearfe`)
+==============================================================
+
+.. currentmodule:: structmanager.analysis.linearfe
+
+A small linear static FE model with rods and constant strain membrane
+triangles in the `xy` plane, used as a stand-in for the full solver when
+running sizing loops locally, see :class:`.LinearFEBackend`.
+
+The element stiffness matrices are linear in the rod areas and in the
+triangle thicknesses, such that the derivatives of the displacements with
+respect to a property are obtained from one solution with the factorized
+stiffness matrix::
+
+    K du/dp = -dK/dp u
+
+The element forces follow the output of the SEs, with the axial force of the
+rods as first component and `Nx`, `Ny` and `Nxy` as first components of the
+triangles.
+
+"""
+from __future__ import division
+
+from collections import OrderedDict
+
+import numpy as np
+from scipy.linalg import cho_factor, cho_solve
+
+
+class LinearFE(object):
+    """Plane FE model of rods and membrane triangles
+
+    ==================  ======================================================
+    Attribute           Description
+    ==================  ======================================================
+    `nodes`             `np.ndarray` of shape `(nnodes, 2)` with the node
+                        coordinates
+    `eids`              `np.ndarray` with the element ids, rods first
+    `conn`              `np.ndarray` of shape `(nelem, 3)` with the node
+                        indices, `-1` as third node of the rods
+    `pids`              `np.ndarray` with the property id of each element
+    `E`, `nu`, `rho`    `np.ndarray` with the material of each element
+    `properties`        `dict` with the area of the rods or the thickness of
+                        the triangles, with the property ids as keys
+    `spcs`              `np.ndarray` of shape `(nnodes, 2)`, `True` for the
+                        constrained degrees of freedom
+    `loads`             `dict` with arrays of shape `(nnodes, 2)` with the
+                        nodal forces, with the subcase ids as keys
+    ==================  ======================================================
+
+    Parameters
+    ----------
+    nodes : array-like
+        The node coordinates, array of shape `(nnodes, 2)`.
+
+    """
+    def __init__(self, nodes):
+        self.nodes = np.asarray(nodes, dtype=np.float64).reshape(-1, 2)
+        self.eids = np.zeros(0, dtype=np.int64)
+        self.conn = np.zeros((0, 3), dtype=np.int64)
+        self.pids = np.zeros(0, dtype=np.int64)
+        self.E = np.zeros(0, dtype=np.float64)
+        self.nu = np.zeros(0, dtype=np.float64)
+        self.rho = np.zeros(0, dtype=np.float64)
+        self.properties = {}
+        self.spcs = np.zeros(self.nodes.shape, dtype=bool)
+        self.loads = OrderedDict()
+
+
+    def _add(self, eids, conn, pids, E, nu, rho):
+        eids = np.atleast_1d(np.asarray(eids, dtype=np.int64))
+        n = eids.shape[0]
+
+        def column(value, dtype):
+            return np.broadcast_to(np.asarray(value, dtype=dtype),
+                                   (n,)).astype(dtype)
+
+        self.eids = np.concatenate((self.eids, eids))
+        self.conn = np.concatenate((self.conn, conn))
+        self.pids = np.concatenate((self.pids, column(pids, np.int64)))
+        self.E = np.concatenate((self.E, column(E, np.float64)))
+        self.nu = np.concatenate((self.nu, column(nu, np.float64)))
+        self.rho = np.concatenate((self.rho, column(rho, np.float64)))
+
+
+    def add_rods(self, eids, conn, pids, E, rho=0.):
+        """Add many rods
+
+        Parameters
+        ----------
+        eids : array-like
+            The element ids.
+        conn : array-like
+            The node indices, array of shape `(nrods, 2)`.
+        pids : int or array-like
+            The property ids, see :attr:`.properties`.
+        E, rho : float or array-like
+            The Young's modulus and the density.
+
+        """
+        conn = np.asarray(conn, dtype=np.int64).reshape(-1, 2)
+        conn = np.hstack((conn, np.full((conn.shape[0], 1), -1)))
+        self._add(eids, conn, pids, E, 0., rho)
+
+
+    def add_trias(self, eids, conn, pids, E, nu, rho=0.):
+        """Add many membrane triangles
+
+        Parameters
+        ----------
+        eids : array-like
+            The element ids.
+        conn : array-like
+            The node indices, array of shape `(ntrias, 3)`.
+        pids : int or array-like
+            The property ids, see :attr:`.properties`.
+        E, nu, rho : float or array-like
+            The Young's modulus, the Poisson's ratio and the density.
+
+        """
+        conn = np.asarray(conn, dtype=np.int64).reshape(-1, 3)
+        self._add(eids, conn, pids, E, nu, rho)
+
+
+    def add_spc(self, nodes, components='12'):
+        """Constrain the components `'1'` (`x`) and `'2'` (`y`) of nodes"""
+        for c in str(components):
+            self.spcs[np.asarray(nodes, dtype=np.int64), int(c) - 1] = True
+
+
+    def add_load(self, subcase, nodes, fx=0., fy=0.):
+        """Add nodal forces to a subcase"""
+        load = self.loads.setdefault(subcase, np.zeros(self.nodes.shape))
+        nodes = np.atleast_1d(np.asarray(nodes, dtype=np.int64))
+        np.add.at(load[:, 0], nodes, fx)
+        np.add.at(load[:, 1], nodes, fy)
+
+
+    def unit_matrices(self):
+        """Element matrices per unit area or thickness
+
+        Returns
+        -------
+        dofs : np.ndarray
+            The degrees of freedom of each element, array of shape
+            `(nelem, 6)`, `-1` for the unused ones.
+        K : np.ndarray
+            The stiffness matrices, array of shape `(nelem, 6, 6)`.
+        S : np.ndarray
+            The force recovery matrices, array of shape `(nelem, 3, 6)`.
+        size : np.ndarray
+            The length of the rods and the area of the triangles.
+
+        """
+        n = self.eids.shape[0]
+        conn = self.conn
+        rod = conn[:, 2] < 0
+        dofs = np.full((n, 6), -1, dtype=np.int64)
+        dofs[:, 0::2] = np.where(conn >= 0, 2*conn, -1)
+        dofs[:, 1::2] = np.where(conn >= 0, 2*conn + 1, -1)
+        K = np.zeros((n, 6, 6))
+        S = np.zeros((n, 3, 6))
+        size = np.zeros(n)
+
+        i = np.flatnonzero(rod)
+        d = self.nodes[conn[i, 1]] - self.nodes[conn[i, 0]]
+        L = np.sqrt((d**2).sum(axis=1))
+        c, s = d[:, 0]/L, d[:, 1]/L
+        b = np.stack((-c, -s, c, s), axis=1)*(self.E[i]/L)[:, None]
+        K[i, :4, :4] = b[:, :, None]*b[:, None, :]*(L/self.E[i])[:, None,
+                                                                 None]
+        S[i, 0, :4] = b
+        size[i] = L
+
+        i = np.flatnonzero(~rod)
+        xy = self.nodes[conn[i]]
+        x, y = xy[..., 0], xy[..., 1]
+        bi = y[:, [1, 2, 0]] - y[:, [2, 0, 1]]
+        ci = x[:, [2, 0, 1]] - x[:, [1, 2, 0]]
+        area = 0.5*(bi[:, 0]*ci[:, 1] - bi[:, 1]*ci[:, 0])
+        B = np.zeros((i.shape[0], 3, 6))
+        B[:, 0, 0::2] = bi
+        B[:, 1, 1::2] = ci
+        B[:, 2, 0::2] = ci
+        B[:, 2, 1::2] = bi
+        B /= (2.*area)[:, None, None]
+        E, nu = self.E[i], self.nu[i]
+        D = np.zeros((i.shape[0], 3, 3))
+        D[:, 0, 0] = D[:, 1, 1] = 1.
+        D[:, 0, 1] = D[:, 1, 0] = nu
+        D[:, 2, 2] = 0.5*(1. - nu)
+        D *= (E/(1. - nu**2))[:, None, None]
+        S[i] = np.einsum('nij,njk->nik', D, B)
+        K[i] = np.einsum('nji,njk->nik', B, S[i])*area[:, None, None]
+        size[i] = np.abs(area)
+        return dofs, K, S, size
+
+
+    def solve(self, properties=None, gradients=False):
+        """Linear static solution of all subcases
+
+        Parameters
+        ----------
+        properties : dict or None, optional
+            Replaces the values of :attr:`.properties`.
+        gradients : bool, optional
+            If the derivatives with respect to the properties are computed.
+
+        Returns
+        -------
+        results : dict
+            `'subcases'` the subcase ids, `'eids'` the sorted element ids,
+            `'u'` the displacements of shape `(nsubcases, nnodes, 2)`,
+            `'forces'` the element forces of shape `(nsubcases, nelem, 8)`
+            and `'mass'` the total mass. With `gradients` also `'pids'` the
+            property ids, `'dforces'` of shape `(nsubcases, nelem, 8,
+            npids)` and `'dmass'` of shape `(npids,)`.
+
+        """
+        props = dict(self.properties)
+        if properties is not None:
+            props.update(properties)
+        upids = np.unique(self.pids)
+        missing = [pid for pid in upids.tolist() if pid not in props]
+        if missing:
+            raise ValueError('Properties not defined: %s' %
+                             ', '.join(map(str, missing)))
+        p = np.array([props[pid] for pid in self.pids.tolist()],
+                     dtype=np.float64)
+        ipid = np.searchsorted(upids, self.pids)
+
+        dofs, Ku, S, size = self.unit_matrices()
+        ndof = self.nodes.size
+        valid = dofs >= 0
+        rows = np.broadcast_to(dofs[:, :, None], Ku.shape)
+        cols = np.broadcast_to(dofs[:, None, :], Ku.shape)
+        mask = valid[:, :, None] & valid[:, None, :]
+        K = np.zeros((ndof, ndof))
+        np.add.at(K, (rows[mask], cols[mask]), (Ku*p[:, None, None])[mask])
+        free = np.flatnonzero(~self.spcs.ravel())
+        subcases = np.array(list(self.loads.keys()), dtype=np.int64)
+        F = np.array([self.loads[sub].ravel() for sub in subcases.tolist()])
+        F = F.reshape(subcases.shape[0], ndof)
+        factor = cho_factor(K[np.ix_(free, free)])
+        u = np.zeros((subcases.shape[0], ndof))
+        u[:, free] = cho_solve(factor, F[:, free].T).T
+
+        def element_forces(u, p):
+            ue = np.where(valid, u[:, np.where(valid, dofs, 0)], 0.)
+            f = np.einsum('nij,snj->sni', S, ue)*p[:, None]
+            return np.concatenate((f, np.zeros(f.shape[:2] + (5,))), axis=2)
+
+        order = np.argsort(self.eids)
+        results = dict(subcases=subcases, eids=self.eids[order],
+                       u=u.reshape(subcases.shape[0], -1, 2),
+                       forces=element_forces(u, p)[:, order],
+                       mass=float((self.rho*size*p).sum()))
+        if not gradients:
+            return results
+
+        npid = upids.shape[0]
+        dforces = np.zeros(results['forces'].shape + (npid,))
+        dmass = np.zeros(npid)
+        for k in range(npid):
+            ek = ipid == k
+            # dK/dp u of the elements of the property
+            ue = np.where(valid[ek], u[:, np.where(valid[ek], dofs[ek], 0)],
+                          0.)
+            fe = np.einsum('nij,snj->sni', Ku[ek], ue)
+            dKu = np.zeros((subcases.shape[0], ndof))
+            for s in range(subcases.shape[0]):
+                np.add.at(dKu[s], dofs[ek][valid[ek]], fe[s][valid[ek]])
+            du = np.zeros_like(u)
+            du[:, free] = -cho_solve(factor, dKu[:, free].T).T
+            df = element_forces(du, p) + element_forces(u, ek.astype(float))
+            dforces[..., k] = df[:, order]
+            dmass[k] = (self.rho*size)[ek].sum()
+        results.update(pids=upids, dforces=dforces, dmass=dmass)
+        return results
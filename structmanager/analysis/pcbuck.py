@@ -0,0 +1,237 @@
+"""
+Composite panel buckling (:mod:`structmanager.analysis.pcbuck`)
+================================================================
+
+.. currentmodule:: structmanager.analysis.pcbuck
+
+Native implementation of the `'BUCK_PC'` external response of the `PCBUCK`
+group, see :func:`.constrain_buckling` of the composite panels, replacing
+the FORTRAN subroutine `R3SVALD` compiled for NASTRAN.
+
+The linear buckling eigenvalue of a simply supported curved panel is
+computed with Donnell's shallow shell theory. The deflection is approximated
+by the Ritz series::
+
+    w = sum_ij W_ij sin(i pi x/a) sin(j pi y/b)
+
+and the membrane displacements are condensed using the Airy stress function
+expanded in the same series, such that the constitutive stiffness is diagonal
+and only the shear load `Nxy` couples the terms. The eigenvalues of many
+panels are computed at once with :func:`numpy.linalg.eigvalsh`.
+
+The laminate is smeared as in the FORTRAN subroutine, with `D = t**2/12 A`.
+The fraction `p45` of the thickness is made of the same material rotated by
++/-45 degrees.
+
+"""
+from __future__ import division
+
+import numpy as np
+
+
+# arguments of the 'BUCK_PC' DRESP3, in the order given in the card
+ARGS = ['t', 'p45', 'a', 'b', 'r', 'E1', 'E2', 'G12', 'nu12', 'nu21', 'Nxx',
+        'Nyy', 'Nxy']
+
+# value returned when the loads do not cause buckling, as in the FORTRAN
+# subroutine
+NO_BUCKLING = 666.
+
+
+def smeared_stiffness(E1, E2, G12, nu12, nu21, p45=0.):
+    """Reduced stiffness of the smeared laminate
+
+    Parameters
+    ----------
+    E1, E2, G12, nu12, nu21 : float or array-like
+        The engineering constants of the material.
+    p45 : float or array-like, optional
+        The fraction of the laminate rotated by +/-45 degrees.
+
+    Returns
+    -------
+    Q11, Q12, Q22, Q66 : np.ndarray
+        The reduced stiffness terms, `A = t Q` and `D = t**3/12 Q`.
+
+    """
+    E1, E2, G12, nu12, nu21, p45 = np.broadcast_arrays(
+        *[np.asarray(v, dtype=np.float64) for v in (E1, E2, G12, nu12, nu21,
+                                                    p45)])
+    den = 1. - nu12*nu21
+    Q11 = E1/den
+    Q22 = E2/den
+    Q12 = nu12*E2/den
+    Q66 = G12
+    # balanced +/-45 plies, the coupling terms Q16 and Q26 cancel
+    Q11_45 = (Q11 + Q22 + 2*Q12 + 4*Q66)/4.
+    Q12_45 = (Q11 + Q22 - 4*Q66)/4. + Q12/2.
+    Q66_45 = (Q11 + Q22 - 2*Q12 - 2*Q66)/4. + Q66/2.
+    p0 = 1. - p45
+    return (p0*Q11 + p45*Q11_45, p0*Q12 + p45*Q12_45, p0*Q22 + p45*Q11_45,
+            p0*Q66 + p45*Q66_45)
+
+
+def _shear_coupling(m, n):
+    """Dimensionless coupling of the Ritz terms due to `Nxy`"""
+    i = np.arange(1, m + 1)
+    j = np.arange(1, n + 1)
+
+    def c(k):
+        # c[k1, k2] = k1 * integral of cos(k1 t)*sin(k2 t) over [0, pi]
+        k1, k2 = np.meshgrid(k, k, indexing='ij')
+        odd = (k1 + k2) % 2 == 1
+        out = np.zeros(k1.shape)
+        out[odd] = k1[odd]*2.*k2[odd]/(k2[odd]**2 - k1[odd]**2)
+        return out
+
+    cx = c(i)
+    cy = c(j)
+    # terms ordered with i varying fastest, S[j, i, l, k]
+    S = (cx[None, :, None, :]*cy.T[:, None, :, None] +
+         cx.T[None, :, None, :]*cy[:, None, :, None])
+    return S.reshape(m*n, m*n)
+
+
+def buckling_eigenvalue(t, a, b, r, E1, E2, G12, nu12, nu21, Nxx, Nyy, Nxy,
+                        p45=0., m=12, n=12, chunk=256):
+    """Buckling eigenvalue of simply supported orthotropic curved panels
+
+    All the panel parameters can be arrays, broadcast against each other.
+
+    Parameters
+    ----------
+    t : float or array-like
+        The laminate thickness.
+    a, b : float or array-like
+        The panel length along `x` and circumferential width along `y`.
+    r : float or array-like
+        The panel radius, `np.inf` or a large value for a flat plate.
+    E1, E2, G12, nu12, nu21 : float or array-like
+        The engineering constants of the material.
+    Nxx, Nyy, Nxy : float or array-like
+        The applied membrane forces per unit length, negative in
+        compression.
+    p45 : float or array-like, optional
+        The fraction of the laminate rotated by +/-45 degrees.
+    m, n : int, optional
+        The number of Ritz terms along `x` and `y`.
+    chunk : int, optional
+        The maximum number of panels solved at once, bounding the memory.
+
+    Returns
+    -------
+    eig : np.ndarray
+        The factor multiplying the applied loads causing buckling, with the
+        shape of the broadcast parameters. :data:`.NO_BUCKLING` is returned
+        for panels that do not buckle under the applied loads.
+
+    """
+    params = np.broadcast_arrays(*[np.asarray(v, dtype=np.float64) for v in
+                                   (t, E1, E2, G12, nu12, nu21, p45)])
+    t, E1, E2, G12, nu12, nu21, p45 = params
+    Q = np.zeros(t.shape + (3, 3))
+    (Q[..., 0, 0], Q[..., 0, 1], Q[..., 1, 1],
+     Q[..., 2, 2]) = smeared_stiffness(E1, E2, G12, nu12, nu21, p45)
+    Q[..., 1, 0] = Q[..., 0, 1]
+    A = t[..., None, None]*Q
+    D = (t**3/12.)[..., None, None]*Q
+    return laminate_buckling_eigenvalue(A, D, a, b, r, Nxx, Nyy, Nxy, m=m,
+                                        n=n, chunk=chunk)
+
+
+def laminate_buckling_eigenvalue(A, D, a, b, r, Nxx, Nyy, Nxy, m=12, n=12,
+                                 chunk=256):
+    """Buckling eigenvalue of simply supported curved panels from `A` and `D`
+
+    The coupling terms `A16`, `A26`, `D16`, `D26` and the `B` matrix are
+    neglected, see :mod:`.laminate` to compute the matrices.
+
+    Parameters
+    ----------
+    A, D : array-like
+        The laminate stiffness matrices, arrays of shape `(..., 3, 3)`.
+    a, b, r, Nxx, Nyy, Nxy, m, n, chunk :
+        See :func:`.buckling_eigenvalue`.
+
+    Returns
+    -------
+    eig : np.ndarray
+        The buckling eigenvalues, with the shape of the broadcast
+        parameters.
+
+    """
+    A = np.asarray(A, dtype=np.float64)
+    D = np.asarray(D, dtype=np.float64)
+    params = np.broadcast_arrays(*[np.asarray(v, dtype=np.float64) for v in
+                                   (A[..., 0, 0], a, b, r, Nxx, Nyy, Nxy)])
+    shape = params[0].shape
+    a, b, r, Nxx, Nyy, Nxy = [p.ravel() for p in params[1:]]
+    A11, A12, A22, A66 = [np.broadcast_to(A[..., i, j], shape).ravel()
+                          for i, j in ((0, 0), (0, 1), (1, 1), (2, 2))]
+    D11, D12, D22, D66 = [np.broadcast_to(D[..., i, j], shape).ravel()
+                          for i, j in ((0, 0), (0, 1), (1, 1), (2, 2))]
+    # membrane compliance
+    det = A11*A22 - A12**2
+    a11, a12, a22, a66 = A22/det, -A12/det, A11/det, 1./A66
+
+    ii, jj = np.meshgrid(np.arange(1, m + 1), np.arange(1, n + 1))
+    ii = ii.ravel()
+    jj = jj.ravel()
+    alpha = ii[None, :]*np.pi/a[:, None]
+    beta = jj[None, :]*np.pi/b[:, None]
+    al2 = alpha**2
+    be2 = beta**2
+    with np.errstate(divide='ignore'):
+        curv = 1./r**2
+    # constitutive stiffness, diagonal, and diagonal geometric stiffness
+    # both divided by a*b/4
+    K = (D11[:, None]*al2**2 + 2*(D12 + 2*D66)[:, None]*al2*be2 +
+         D22[:, None]*be2**2 +
+         curv[:, None]*al2**2/(a22[:, None]*al2**2 +
+                                (2*a12 + a66)[:, None]*al2*be2 +
+                                a11[:, None]*be2**2))
+    KG = Nxx[:, None]*al2 + Nyy[:, None]*be2
+    # smallest eigenvalue of K**-1/2 KG K**-1/2
+    mu = (KG/K).min(axis=1)
+    S0 = _shear_coupling(m, n)
+    # Nxy only couples terms with the same parity of i + j
+    blocks = [np.flatnonzero((ii + jj) % 2 == parity) for parity in (0, 1)]
+    shear = np.flatnonzero(Nxy != 0)
+    for start in range(0, shear.shape[0], chunk):
+        p = shear[start:start + chunk]
+        for block in blocks:
+            Kb = K[p][:, block]
+            G = (Nxy[p, None, None]*S0[np.ix_(block, block)][None, :, :]*4./
+                 (a[p]*b[p])[:, None, None]/np.sqrt(Kb[:, :, None]*
+                                                    Kb[:, None, :]))
+            diag = np.arange(block.shape[0])
+            G[:, diag, diag] += KG[p][:, block]/Kb
+            mu[p] = np.minimum(mu[p], np.linalg.eigvalsh(G)[:, 0])
+    eig = np.full(a.shape[0], NO_BUCKLING)
+    check = mu < 0
+    eig[check] = -1./mu[check]
+    return eig.reshape(shape)
+
+
+def buck_pc(args):
+    """Evaluate the `'BUCK_PC'` responses
+
+    Parameters
+    ----------
+    args : array-like
+        The arguments in the order of :data:`.ARGS`, an array of shape
+        `(13,)` for one response or `(13, nresp)` for many responses.
+
+    Returns
+    -------
+    values : np.ndarray
+        The buckling eigenvalues, see :func:`.buckling_eigenvalue`.
+
+    """
+    args = np.asarray(args, dtype=np.float64)
+    if args.shape[0] != len(ARGS):
+        raise ValueError('BUCK_PC takes %d arguments, %d given' %
+                         (len(ARGS), args.shape[0]))
+    (t, p45, a, b, r, E1, E2, G12, nu12, nu21, Nxx, Nyy, Nxy) = args
+    return buckling_eigenvalue(t, a, b, r, E1, E2, G12, nu12, nu21, Nxx, Nyy,
+                               Nxy, p45=p45)
@@ -0,0 +1,273 @@
+"""
+Ply failure (:mod:`structmanager.analysis.ply_failure`)
+========================================================
+
+.. currentmodule:: structmanager.analysis.ply_failure
+
+Failure indices of composite laminates from the element resultants read by
+:func:`.read_forces_2d`. For each element the mid-plane strains and
+curvatures are recovered with the inverse of the cached `ABD` matrix, see
+:mod:`.laminate`, and the strains and stresses in the material axes are
+computed at the bottom and top of every ply.
+
+Supported criteria, with the index reaching `1` at failure:
+
+==================  ==========================================================
+Criterion           Index
+==================  ==========================================================
+`'TSAI-WU'`         `F1 s1 + F2 s2 + F11 s1**2 + F22 s2**2 + F66 s12**2 +
+                    2 F12 s1 s2`, with `F12 = -sqrt(F11 F22)/2`
+`'HASHIN'`          maximum of the fiber and matrix modes in tension or
+                    compression, with the in-plane shear strength `S` also
+                    used as the transverse shear strength
+`'MAX-STRAIN'`      maximum ratio of the ply strains to the strains at
+                    failure, `Xt/E1`, `Xc/E1`, `Yt/E2`, `Yc/E2` and `S/G12`
+==================  ==========================================================
+
+The resultants are expected in the material coordinate system, as given by
+:meth:`.NastranModel.read_op2`, with the ply angles measured from the
+material `x` axis.
+
+"""
+from __future__ import division
+
+import numpy as np
+
+from .laminate import (laminate_abd, pcomp_signature, ply_stiffness,
+                       stack_plies, strain_transformation)
+
+
+CRITERIA = ['TSAI-WU', 'HASHIN', 'MAX-STRAIN']
+
+
+def ply_strengths(mat):
+    """Strengths `(Xt, Xc, Yt, Yc, S)` of a material
+
+    Missing strengths are infinite. Compression strengths are positive.
+
+    Parameters
+    ----------
+    mat : PyNastran's MAT8 or MAT1
+        The material.
+
+    """
+    if mat.type == 'MAT8':
+        values = [mat.Xt, mat.Xc, mat.Yt, mat.Yc, mat.S]
+    elif mat.type == 'MAT1':
+        values = [mat.St, mat.Sc, mat.St, mat.Sc, mat.Ss]
+    else:
+        raise NotImplementedError('%s not supported!' % mat.type)
+    return tuple(np.inf if v in (None, 0.) else abs(float(v))
+                 for v in values)
+
+
+def failure_indices(stress, strain, moduli, strengths, criteria=CRITERIA):
+    """Failure indices of plies
+
+    All the arguments are broadcast against each other.
+
+    Parameters
+    ----------
+    stress, strain : np.ndarray
+        The stresses `[s1, s2, s12]` and the engineering strains `[e1, e2,
+        g12]` in the material axes, arrays of shape `(..., 3)`.
+    moduli : np.ndarray
+        The moduli `[E1, E2, G12]`, array of shape `(..., 3)`.
+    strengths : np.ndarray
+        The strengths `[Xt, Xc, Yt, Yc, S]`, array of shape `(..., 5)`.
+    criteria : list, optional
+        The criteria, see :data:`.CRITERIA`.
+
+    Returns
+    -------
+    indices : dict
+        The failure indices with the criteria as keys.
+
+    """
+    s1, s2, s12 = stress[..., 0], stress[..., 1], stress[..., 2]
+    Xt, Xc, Yt, Yc, S = [strengths[..., i] for i in range(5)]
+    indices = {}
+    for criterion in criteria:
+        criterion = criterion.upper()
+        if criterion == 'TSAI-WU':
+            F11 = 1./(Xt*Xc)
+            F22 = 1./(Yt*Yc)
+            F12 = -0.5*np.sqrt(F11*F22)
+            index = ((1./Xt - 1./Xc)*s1 + (1./Yt - 1./Yc)*s2 + F11*s1**2 +
+                     F22*s2**2 + (s12/S)**2 + 2*F12*s1*s2)
+        elif criterion == 'HASHIN':
+            shear = (s12/S)**2
+            fiber = np.where(s1 >= 0, (s1/Xt)**2 + shear, (s1/Xc)**2)
+            matrix = np.where(s2 >= 0, (s2/Yt)**2 + shear,
+                              (s2/(2*S))**2 + ((Yc/(2*S))**2 - 1)*s2/Yc +
+                              shear)
+            index = np.maximum(fiber, matrix)
+        elif criterion == 'MAX-STRAIN':
+            e1, e2, g12 = strain[..., 0], strain[..., 1], strain[..., 2]
+            E1, E2, G12 = moduli[..., 0], moduli[..., 1], moduli[..., 2]
+            index = np.maximum.reduce([
+                np.where(e1 >= 0, e1*E1/Xt, -e1*E1/Xc),
+                np.where(e2 >= 0, e2*E2/Yt, -e2*E2/Yc),
+                np.abs(g12)*G12/S])
+        else:
+            raise ValueError('Invalid criterion: %s' % criterion)
+        indices[criterion] = index
+    return indices
+
+
+def laminate_failure(resultants, lams, signatures, strengths,
+                     criteria=CRITERIA, chunk=2048):
+    """Critical failure index of laminated elements
+
+    Parameters
+    ----------
+    resultants : np.ndarray
+        The forces `[Nx, Ny, Nxy, Mx, My, Mxy]`, array of shape `(nsub,
+        nelem, 6)`.
+    lams : np.ndarray
+        The laminate of each element, the index in `signatures`.
+    signatures : list
+        The ply stack signatures, see :func:`.pcomp_signature`.
+    strengths : list
+        For each laminate a tuple with the strengths of each ply, see
+        :func:`.ply_strengths`.
+    criteria : list, optional
+        The criteria, see :data:`.CRITERIA`.
+    chunk : int, optional
+        The maximum number of elements evaluated at once, bounding the
+        memory.
+
+    Returns
+    -------
+    indices : dict
+        Arrays of shape `(nsub, nelem)` with the maximum index among the
+        plies of each element, with the criteria as keys.
+
+    """
+    resultants = np.asarray(resultants, dtype=np.float64)
+    lams = np.asarray(lams, dtype=np.int64)
+    plies, z, valid = stack_plies(signatures)
+    nlam, nply = valid.shape
+    abd = np.zeros((nlam, 6, 6))
+    for i, (A, B, D) in enumerate(laminate_abd(signatures)):
+        abd[i] = np.block([[A, B], [B, D]])
+    compliance = np.linalg.inv(abd)
+    moduli = plies[:, :, [2, 3, 4]]
+    Q = ply_stiffness(plies[:, :, 2], plies[:, :, 3], plies[:, :, 4],
+                      plies[:, :, 5])
+    T = strain_transformation(plies[:, :, 1])
+    allow = np.full((nlam, nply, 5), np.inf)
+    for i, values in enumerate(strengths):
+        allow[i, :len(values)] = values
+    # bottom and top of each ply
+    zs = np.stack((z[:, :-1], z[:, 1:]), axis=-1)
+
+    nsub, nelem = resultants.shape[:2]
+    indices = dict((c.upper(), np.full((nsub, nelem), np.nan))
+                   for c in criteria)
+    for start in range(0, nelem, chunk):
+        sl = slice(start, start + chunk)
+        lam = lams[sl]
+        # mid-plane strains and curvatures, shape (nsub, ne, 6)
+        ek = np.einsum('eij,sej->sei', compliance[lam], resultants[:, sl])
+        # strains in the laminate axes, shape (nsub, ne, nply, 2, 3)
+        strain = (ek[:, :, None, None, :3] +
+                  zs[lam][None, :, :, :, None]*ek[:, :, None, None, 3:])
+        strain = np.einsum('epij,sepzj->sepzi', T[lam], strain)
+        stress = np.einsum('epij,sepzj->sepzi', Q[lam], strain)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = failure_indices(stress, strain,
+                                     moduli[lam][None, :, :, None, :],
+                                     allow[lam][None, :, :, None, :],
+                                     criteria)
+        for criterion, index in result.items():
+            index = np.where(valid[lam][None, :, :, None], index, np.nan)
+            index = np.fmax.reduce(np.fmax.reduce(index, axis=3), axis=2)
+            indices[criterion][:, sl] = index
+    return indices
+
+
+def se_failure_indices(ses, criteria=CRITERIA, chunk=2048):
+    """Critical failure index of each PCOMP SE and subcase
+
+    The forces must have been read with :meth:`.StructModel.read_forces`.
+
+    Parameters
+    ----------
+    ses : list
+        The SEs. SEs without forces or without a PCOMP property get `NaN`.
+    criteria : list, optional
+        The criteria, see :data:`.CRITERIA`.
+    chunk : int, optional
+        The maximum number of elements evaluated at once.
+
+    Returns
+    -------
+    subcases : np.ndarray
+        The subcase ids.
+    indices : dict
+        Arrays of shape `(len(ses), nsubcases)` with the maximum index among
+        all plies and elements of each SE, with the criteria as keys.
+
+    """
+    selected = []
+    for i, se in enumerate(ses):
+        forces = se.forces
+        if (not se.elements or se.ptype != 'PCOMP' or forces is None or
+                getattr(forces, 'eids', None) is None):
+            continue
+        selected.append(i)
+    subcases = np.array(sorted(set(sub for i in selected
+                                   for sub in ses[i].forces.forces)),
+                        dtype=np.int64)
+    nsub = subcases.shape[0]
+    isub = dict((sub, j) for j, sub in enumerate(subcases.tolist()))
+
+    keys = {}
+    signatures = []
+    strengths = []
+    blocks = []
+    owners = []
+    lams = []
+    for i in selected:
+        se = ses[i]
+        pcomp = se.elements[0].pid
+        materials = se.model.nastranmodel.bdf.materials
+        signature = pcomp_signature(pcomp, materials)
+        strength = tuple(ply_strengths(materials[pcomp.Mid(k)])
+                         for k in range(pcomp.nplies))
+        key = (signature, strength)
+        if key not in keys:
+            keys[key] = len(signatures)
+            signatures.append(signature)
+            strengths.append(strength)
+        eids = se.forces.eids
+        all_eids = np.unique(np.concatenate(
+            [np.asarray(eids[sub], dtype=np.int64)
+             for sub in se.forces.forces]))
+        block = np.full((nsub, all_eids.shape[0], 6), np.nan)
+        for sub, force in se.forces.forces.items():
+            # last time step, [Nx, Ny, Nxy, Mx, My, Mxy]
+            pos = np.searchsorted(all_eids, eids[sub])
+            block[isub[sub], pos] = force[-1, :, :6]
+        blocks.append(block)
+        owners.append(np.full(all_eids.shape[0], i, dtype=np.int64))
+        lams.append(np.full(all_eids.shape[0], keys[key], dtype=np.int64))
+
+    indices = dict((c.upper(), np.full((len(ses), nsub), np.nan))
+                   for c in criteria)
+    if len(blocks) == 0:
+        return subcases, indices
+    resultants = np.concatenate(blocks, axis=1)
+    owners = np.concatenate(owners)
+    lams = np.concatenate(lams)
+    elem = laminate_failure(np.nan_to_num(resultants), lams, signatures,
+                            strengths, criteria, chunk)
+    missing = np.isnan(resultants).any(axis=2)
+    # the elements are contiguous for each SE
+    starts = np.flatnonzero(np.r_[True, owners[1:] != owners[:-1]])
+    for criterion, index in elem.items():
+        index[missing] = np.nan
+        indices[criterion][owners[starts]] = np.fmax.reduceat(
+            index, starts, axis=1).T
+    return subcases, indices
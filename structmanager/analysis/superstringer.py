@@ -0,0 +1,93 @@
+"""
+Post-buckled load redistribution (:mod:`structmanager.analysis.superstringer`)
+==============================================================================
+
+.. currentmodule:: structmanager.analysis.superstringer
+
+Load redistribution of a :class:`.SuperStringer`, a stringer with half of
+each adjacent skin panel. Above the panel buckling stress only an effective
+width of the skin next to the stringer carries further compression, such
+that the load of the linear analysis moves from the skin onto the stringer.
+
+The total axial load of the super-stringer is kept and the strain is the same
+in the stringer and in the effective skin. The effective half-width of each
+panel follows von Karman::
+
+    w = b/2 sqrt(sigma_cr/sigma),   sigma > sigma_cr
+
+    sigma_cr = kc pi**2 E/(12 (1 - nu**2)) (t/b)**2
+
+with `sigma` the compressive skin stress at the stringer. Since `w` decreases
+with the strain and the strain decreases with `w`, the fixed-point iteration
+converges monotonically, with the change of `w` reduced at least by half in
+each sweep. All super-stringers and subcases are iterated at once, each
+sweep being one array evaluation.
+
+"""
+from __future__ import division
+
+import numpy as np
+
+
+def effective_width_redistribution(Ps, As, Es, Nx, t, b, E, nu, kc=4.,
+                                   tol=1e-6, maxiter=50):
+    """Redistribute the skin load of buckled panels onto the stringers
+
+    The stringer parameters are broadcast against each other with shape
+    `shape`, the panel parameters with shape `shape + (npanels,)`.
+
+    Parameters
+    ----------
+    Ps, As, Es : float or array-like
+        The stringer axial force of the linear analysis, the area and the
+        Young's modulus.
+    Nx : array-like
+        The skin membrane force per unit length along the stringer of the
+        linear analysis, negative in compression.
+    t, b, E, nu : array-like
+        The skin thickness, the panel width across the stringers and the
+        skin material. Panels with `b = 0` are ignored.
+    kc : float or array-like, optional
+        The compression buckling coefficient of the panels.
+    tol : float, optional
+        The convergence tolerance on the effective width, relative to
+        `b/2`.
+    maxiter : int, optional
+        The maximum number of sweeps.
+
+    Returns
+    -------
+    results : dict
+        `'P'` the stringer axial force, `'Pskin'` the force carried by the
+        effective width of each panel, `'w'` the effective half-width of
+        each panel, `'eps'` the axial strain and `'sigma_cr'` the panel
+        buckling stress. `'niter'` is the number of sweeps.
+
+    """
+    Ps, As, Es = np.broadcast_arrays(*[np.asarray(v, dtype=np.float64)
+                                       for v in (Ps, As, Es)])
+    Nx, t, b, E, nu, kc = np.broadcast_arrays(*[
+        np.asarray(v, dtype=np.float64) for v in (Nx, t, b, E, nu, kc)])
+    half = b/2.
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sigma_cr = kc*np.pi**2*E/(12.*(1. - nu**2))*(t/b)**2
+    sigma_cr = np.where(b > 0, sigma_cr, np.inf)
+    total = Ps + (Nx*half).sum(axis=-1)
+    EAs = Es*As
+    Et = E*t
+    w = half
+    niter = 0
+    for niter in range(1, maxiter + 1):
+        eps = total/(EAs + (Et*w).sum(axis=-1))
+        sigma = -E*eps[..., None]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            new = np.where(sigma > sigma_cr,
+                           half*np.sqrt(sigma_cr/sigma), half)
+            change = np.abs(new - w)/half
+        w = new
+        change = change[~np.isnan(change)]
+        if change.size == 0 or change.max() <= tol:
+            break
+    eps = total/(EAs + (Et*w).sum(axis=-1))
+    return dict(P=EAs*eps, Pskin=Et*w*eps[..., None], w=w, eps=eps,
+                sigma_cr=sigma_cr, niter=niter)
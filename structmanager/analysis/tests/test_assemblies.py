@@ -0,0 +1,180 @@
+import numpy as np
+
+from structmanager.analysis.assemblies import (CF_SHANLEY,
+                                               frame_general_instability,
+                                               stringer_column_buckling,
+                                               super_stringer_load_factors,
+                                               three_pocket_diagonal_tension)
+from structmanager.analysis.diagonal_tension import diagonal_tension
+from structmanager.analysis.superstringer import (
+    effective_width_redistribution)
+from structmanager.sas import (FrameAssembly, StiffenedPanelAssembly,
+                               SuperStringer, ThreePocketAssembly)
+
+
+class Material(object):
+    E = 70000.
+    nu = 0.3
+
+
+class SE(object):
+    def __init__(self, centroid=(np.nan, np.nan, np.nan), forces=None,
+                 **kwargs):
+        self.material = Material()
+        self.centroid = np.array(centroid, dtype=np.float64)
+        self.forces = forces
+        self.elements = []
+        self.__dict__.update(kwargs)
+
+    def get_centroid(self):
+        return self.centroid
+
+
+class Forces1D(object):
+    def __init__(self, axial):
+        self.subcases = [1]
+        self.axial = np.array([[axial], [axial]])
+        self.forces = np.zeros((8, 2, 1))
+
+
+class Forces2D(object):
+    def __init__(self, nxx, nxy=0.):
+        self.subcases = [1]
+        self.forces = {1: np.array([[[nxx, 0., nxy] + [0.]*5]*4])}
+
+
+def test_frame_moment_whole_section():
+    # barrel of two bays with one frame segment per stringer
+    R, pitch, nstr = 2000., 500., 24
+    width = 2*np.pi*R/nstr
+    theta = 2*np.pi*np.arange(nstr)/nstr
+    half = theta + np.pi/nstr
+    frames = [[FrameAssembly('Frame.%d.%d' % (i, j), [
+        SE(profile='t_b', t=3., b=40.),
+        SE(centroid=(i*pitch, R*np.cos(th), R*np.sin(th)), t=2., b=100.),
+        SE(profile='t_b', t=3., b=40.)])
+        for j, th in enumerate(half)] for i in range(3)]
+    spas = []
+    for bay in range(2):
+        x = (bay + 0.5)*pitch
+        stringers = [SE((x, R*np.cos(th), R*np.sin(th)),
+                        Forces1D(-1.e3*np.sin(th))) for th in theta]
+        for j, th in enumerate(half):
+            panel = SE((x, R*np.cos(th), R*np.sin(th)),
+                       Forces2D(-10.*np.sin(th)), t=1.5, a=pitch, b=width)
+            spas.append(StiffenedPanelAssembly('SPA', [
+                panel, frames[bay][j].web, frames[bay + 1][j].web,
+                stringers[j], stringers[(j + 1) % nstr]]))
+    frames = [fr for station in frames for fr in station]
+    subcases, res = frame_general_instability(frames, spas)
+    # section moment about y, sum of F z
+    M = abs((-1.e3*np.sin(theta)*R*np.sin(theta)).sum() +
+            (-10.*np.sin(half)*width*R*np.sin(half)).sum())
+    assert np.allclose(res['M'][:, 0], M)
+    assert np.allclose(res['EI_req'][:, 0], CF_SHANLEY*M*(2*R)**2/pitch)
+    # frame section: two flanges of 120 and a web of 200 around z = 50
+    Af = 120.
+    EI = Material.E*(2*(40.*3.**3/12. + Af*51.5**2) + 2.*100.**3/12.)
+    assert np.allclose(res['EI'], EI)
+
+
+def column(P, t, a, b, ts, bs, c=1., k=1.9):
+    """Stringer stress and Euler stress of a flat bar with effective skin"""
+    E = Material.E
+    A, ZC, IN = ts*bs, ts/2., bs*ts**3/12.
+    sigma = P/A
+    be = min(k*t*np.sqrt(E/abs(sigma)), b)
+    Ak = be*t
+    zbar = (A*ZC - Ak*t/2.)/(A + Ak)
+    I = IN + A*(ZC - zbar)**2 + be*t**3/12. + Ak*(t/2. + zbar)**2
+    return sigma, np.pi**2*E*I/(A + Ak)/(a/np.sqrt(c))**2
+
+
+def test_stringer_column_buckling():
+    t, a, b, ts, bs = 1.5, 500., 150., 3., 30.
+
+    def spa(P1, P2):
+        stringers = [SE(forces=Forces1D(P), profile='t_b', t=ts, b=bs)
+                     if P is not None else None for P in (P1, P2)]
+        panel = SE(t=t, a=a, b=b)
+        return StiffenedPanelAssembly('SPA', [panel, None, None] +
+                                      stringers)
+
+    spas = [spa(-1000., -4000.), spa(-4000., None), spa(2000., 500.)]
+    subcases, res = stringer_column_buckling(spas)
+    assert subcases.tolist() == [1]
+    # the most compressed stringer is critical
+    sigma, sigma_cr = column(-4000., t, a, b, ts, bs)
+    assert np.allclose(res['sigma'][:2, 0], sigma)
+    assert np.allclose(res['sigma_cr'][:2, 0], sigma_cr)
+    assert np.allclose(res['ms'][:2, 0], sigma_cr/abs(sigma) - 1.)
+    # stringers in tension do not buckle
+    assert res['ms'][2, 0] == np.inf
+    # Euler's stress with the end fixity
+    subcases, clamped = stringer_column_buckling(spas, c=4.)
+    assert np.allclose(clamped['sigma_cr'][:2], 4.*res['sigma_cr'][:2])
+    # Johnson's parabola above Fcy/2
+    Fcy = 1.5*sigma_cr
+    subcases, johnson = stringer_column_buckling(spas, Fcy=Fcy)
+    assert np.allclose(johnson['sigma_cr'][:2, 0],
+                       Fcy - Fcy**2/(4.*sigma_cr))
+    assert (johnson['ms'][:2] < res['ms'][:2]).all()
+
+
+def test_three_pocket_diagonal_tension():
+    t, a, b, Nxy = 1., 500., 150., 100.
+
+    def pocket():
+        return SE(forces=Forces2D(0., Nxy), t=t, a=a, b=b)
+
+    stringers = [SE(profile='t_b', t=2., b=30.) for i in range(2)]
+    frames = [SE(profile='t_b', t=2., b=50.) for i in range(2)]
+    full = ThreePocketAssembly('TPA1', [pocket(), pocket(), pocket()] +
+                               stringers + frames)
+    edge = ThreePocketAssembly('TPA2', [pocket(), pocket(), None] +
+                               stringers + frames)
+    subcases, res = three_pocket_diagonal_tension([full, edge])
+    assert subcases.tolist() == [1]
+    ref = diagonal_tension(Nxy/t, t, a, b, Material.E, Material.nu,
+                           Ax=60., Ay=100.)
+    assert 0. < ref['k'] < 1.
+    for key in ('k', 'alpha', 'tau_max', 'Py'):
+        assert np.allclose(res[key], ref[key]), key
+    # identical pockets load both stringers as in diagonal_tension
+    assert np.isclose(res['Px1'][0, 0], ref['Px'])
+    assert np.isclose(res['Px2'][0, 0], ref['Px'])
+    # a single pocket loads the stringer at the free edge
+    k, alpha = res['k'][1, 0], res['alpha'][1, 0]
+    Px = -k*Nxy*b/np.tan(alpha)/2.*60./(60. + (1. - k)*t*b/4.)
+    assert np.isclose(res['Px2'][1, 0], Px)
+    assert np.isclose(res['Px1'][1, 0], ref['Px'])
+    # the critical stringer is the most compressed
+    assert np.isclose(res['Px'][1, 0], ref['Px'])
+    assert np.isclose(res['sigma_x'][1, 0], ref['Px']/60.)
+
+
+def test_super_stringer_load_factors():
+    E, t, a, b, ts, bs = 70000., 1.2, 500., 150., 3., 30.
+
+    def ss(eps):
+        stringer = SE(forces=Forces1D(E*ts*bs*eps), profile='t_b', t=ts,
+                      b=bs)
+        panels = [SE(forces=Forces2D(E*t*eps), t=t, a=a, b=b)
+                  for i in range(2)]
+        return SuperStringer('SS', [stringer] + panels)
+
+    sss = [ss(-0.004), ss(-0.0001), ss(0.004)]
+    factors = super_stringer_load_factors(sss)
+    red = effective_width_redistribution(E*ts*bs*-0.004, ts*bs, E,
+                                         [E*t*-0.004]*2, t, b, E, 0.3)
+    assert np.isclose(factors[0], red['P']/(E*ts*bs*-0.004))
+    assert factors[0] > 1.
+    # skins below buckling and stringers in tension
+    assert np.allclose(factors[1:], 1.)
+
+
+if __name__ == '__main__':
+    test_frame_moment_whole_section()
+    test_stringer_column_buckling()
+    test_three_pocket_diagonal_tension()
+    test_super_stringer_load_factors()
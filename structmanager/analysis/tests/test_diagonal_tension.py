@@ -0,0 +1,63 @@
+import numpy as np
+
+from structmanager.analysis.diagonal_tension import (diagonal_tension,
+                                                     shear_buckling_stress)
+
+
+E, NU = 70000., 0.3
+
+
+def test_shear_buckling_stress():
+    t, a, b = 1., 150., 100.
+    tau_cr = shear_buckling_stress(t, a, b, E, NU)
+    ks = 5.35 + 4.*(b/a)**2
+    assert np.isclose(tau_cr, ks*np.pi**2*E/(12.*(1. - NU**2))*(t/b)**2)
+    # same panel rotated
+    assert np.isclose(shear_buckling_stress(t, b, a, E, NU), tau_cr)
+    # curvature term of Kuhn
+    assert np.isclose(shear_buckling_stress(t, a, b, E, NU, r=2000.),
+                      tau_cr + 0.1*E*t/2000.)
+
+
+def test_below_buckling():
+    t, a, b = 2., 150., 100.
+    tau_cr = shear_buckling_stress(t, a, b, E, NU)
+    res = diagonal_tension(0.9*tau_cr, t, a, b, E, NU, Ax=100., Ay=50.)
+    assert res['k'] == 0.
+    assert np.isclose(res['alpha'], np.pi/4.)
+    assert res['Px'] == 0. and res['Py'] == 0.
+    assert np.isclose(res['tau_max'], 0.9*tau_cr)
+
+
+def test_incomplete_diagonal_tension_factor():
+    t, a, b = 1., 150., 100.
+    tau_cr = shear_buckling_stress(t, a, b, E, NU)
+    res = diagonal_tension(10.*tau_cr, t, a, b, E, NU, Ax=100., Ay=50.)
+    # flat webs, k = tanh(0.5 log10(tau/tau_cr))
+    assert np.isclose(res['k'], np.tanh(0.5))
+    k = res['k']
+    assert np.isclose(res['sigma_y'], -k*10.*tau_cr*np.tan(res['alpha'])/
+                      (50./(a*t) + 0.5*(1. - k)))
+
+
+def test_complete_diagonal_tension():
+    # with k = 1 the angle of Wagner's complete diagonal tension is
+    # tan(alpha)**4 = (1 + b t/Ax)/(1 + a t/Ay)
+    t, a, b, tau = 1., 150., 100., 100.
+    for Ax, Ay in ((100., 50.), (20., 200.), (1e9, 1e9)):
+        res = diagonal_tension(tau, t, a, b, E, NU, Ax=Ax, Ay=Ay, ks=1e-30,
+                               tol=1e-12)
+        assert np.isclose(res['k'], 1.)
+        tan4 = (1. + b*t/Ax)/(1. + a*t/Ay)
+        assert np.isclose(np.tan(res['alpha'])**4, tan4)
+        # member loads balancing the tension field
+        assert np.isclose(res['Px'], -tau*b*t/np.tan(res['alpha']))
+        assert np.isclose(res['Py'], -tau*a*t*np.tan(res['alpha']))
+        assert np.isclose(res['tau_max'], tau/np.sin(2.*res['alpha']))
+
+
+if __name__ == '__main__':
+    test_shear_buckling_stress()
+    test_below_buckling()
+    test_incomplete_diagonal_tension_factor()
+    test_complete_diagonal_tension()
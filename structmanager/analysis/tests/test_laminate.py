@@ -0,0 +1,61 @@
+import numpy as np
+
+from structmanager.analysis.laminate import (abd_matrices, clear_cache,
+                                             laminate_abd, ply_stiffness)
+
+
+E1, E2, G12, NU12 = 140000., 10000., 5000., 0.3
+
+
+def test_isotropic_plate():
+    E, nu, t = 70000., 0.3, 2.
+    Q = ply_stiffness(E, E, E/(2.*(1. + nu)), nu)
+    A, B, D = abd_matrices([[t]], [[0.]], Q[None, None])
+    Aref = E*t/(1. - nu**2)*np.array([[1., nu, 0.], [nu, 1., 0.],
+                                      [0., 0., (1. - nu)/2.]])
+    assert np.allclose(A[0], Aref)
+    assert np.allclose(B[0], 0.)
+    assert np.allclose(D[0], Aref*t**2/12.)
+
+
+def test_quasi_isotropic():
+    angles = [0., 45., -45., 90., 90., -45., 45., 0.]
+    Q = ply_stiffness(E1, E2, G12, NU12)
+    A, B, D = abd_matrices([[0.125]*8], [angles], np.tile(Q, (1, 8, 1, 1)))
+    A = A[0]
+    assert np.isclose(A[0, 0], A[1, 1])
+    assert np.isclose(A[2, 2], (A[0, 0] - A[0, 1])/2.)
+    assert np.allclose(A[:2, 2], 0., atol=1e-8*A[0, 0])
+    assert np.allclose(B, 0., atol=1e-8*A[0, 0])
+
+
+def test_unsymmetric_cross_ply():
+    t = 0.25
+    Q = ply_stiffness(E1, E2, G12, NU12)
+    A, B, D = abd_matrices([[t, t]], [[0., 90.]], np.tile(Q, (1, 2, 1, 1)))
+    # the 0 degree ply below the reference plane
+    assert np.isclose(B[0, 0, 0], (Q[1, 1] - Q[0, 0])*t**2/2.)
+    assert np.isclose(B[0, 1, 1], -B[0, 0, 0])
+    assert np.isclose(A[0, 0, 0], (Q[0, 0] + Q[1, 1])*t)
+
+
+def test_laminate_abd_cache():
+    clear_cache()
+    mat = (E1, E2, G12, NU12)
+    s1 = (None, (0.2, 0.) + mat)
+    s2 = (None, (0.1, 45.) + mat, (0.1, -45.) + mat, (0.1, 0.) + mat)
+    abd = laminate_abd([s2, s1, s2])
+    Q = ply_stiffness(*mat)
+    A, B, D = abd_matrices([[0.1, 0.1, 0.1]], [[45., -45., 0.]],
+                           np.tile(Q, (1, 3, 1, 1)))
+    assert np.allclose(abd[0][1], B[0])
+    assert np.allclose(abd[0][2], D[0])
+    assert np.allclose(abd[1][0], 0.2*Q)
+    assert abd[2] is abd[0]
+
+
+if __name__ == '__main__':
+    test_isotropic_plate()
+    test_quasi_isotropic()
+    test_unsymmetric_cross_ply()
+    test_laminate_abd_cache()
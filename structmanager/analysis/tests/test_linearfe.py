@@ -0,0 +1,51 @@
+import numpy as np
+
+from structmanager.analysis.linearfe import LinearFE
+
+
+def model():
+    fe = LinearFE([[0., 0.], [1., 0.], [1., 1.], [0., 1.], [2., 0.5]])
+    fe.add_trias([1, 2], [[0, 1, 2], [0, 2, 3]], 10, 70000., 0.3, rho=2.7)
+    fe.add_rods([3, 4, 5], [[1, 4], [2, 4], [3, 4]], [20, 21, 21], 70000.,
+                rho=2.7)
+    fe.properties = {10: 0.1, 20: 0.05, 21: 0.08}
+    fe.add_spc([0, 3])
+    fe.add_load(1, 4, fy=-100.)
+    fe.add_load(2, [2, 4], fx=50.)
+    return fe
+
+
+def test_rod_forces():
+    fe = model()
+    res = fe.solve()
+    # the rods carry the load applied at their common node
+    i = np.searchsorted(res['eids'], [3, 4, 5])
+    d = fe.nodes[4] - fe.nodes[[1, 2, 3]]
+    L = np.sqrt((d**2).sum(axis=1))
+    for s, load in enumerate([(0., -100.), (50., 0.)]):
+        N = res['forces'][s, i, 0]
+        assert np.allclose((N[:, None]*d/L[:, None]).sum(axis=0), load)
+    assert np.isclose(res['mass'], 2.7*(0.1 + 0.05*L[0] +
+                                        0.08*(L[1] + L[2])))
+
+
+def test_gradients():
+    fe = model()
+    res = fe.solve(gradients=True)
+    assert res['pids'].tolist() == [10, 20, 21]
+    h = 1e-6
+    for k, pid in enumerate(res['pids'].tolist()):
+        p = fe.properties[pid]
+        fwd = fe.solve({pid: p*(1 + h)})
+        bwd = fe.solve({pid: p*(1 - h)})
+        dforces = (fwd['forces'] - bwd['forces'])/(2*h*p)
+        dmass = (fwd['mass'] - bwd['mass'])/(2*h*p)
+        scale = np.abs(res['dforces'][..., k]).max()
+        assert np.allclose(res['dforces'][..., k], dforces, rtol=0,
+                           atol=1e-6*scale), pid
+        assert np.isclose(res['dmass'][k], dmass), pid
+
+
+if __name__ == '__main__':
+    test_rod_forces()
+    test_gradients()
@@ -0,0 +1,52 @@
+import numpy as np
+
+from structmanager.analysis.pcbuck import NO_BUCKLING, buck_pc, ARGS
+
+
+E = 70000.
+NU = 0.3
+G = E/(2.*(1. + NU))
+T = 1.
+D = E*T**3/(12.*(1. - NU**2))
+
+
+def eig(a, b, r, Nxx, Nyy, Nxy):
+    args = dict(t=T, p45=0., a=a, b=b, r=r, E1=E, E2=E, G12=G, nu12=NU,
+                nu21=NU, Nxx=Nxx, Nyy=Nyy, Nxy=Nxy)
+    return buck_pc(np.array([args[k] for k in ARGS]))
+
+
+def test_plate_compression():
+    b = 100.
+    for a in (100., 200., 300.):
+        k = eig(a, b, np.inf, -1., 0., 0.)*b**2/(np.pi**2*D)
+        assert abs(k - 4.) < 1e-6
+
+
+def test_plate_shear():
+    b = 100.
+    k = eig(b, b, np.inf, 0., 0., 1.)*b**2/(np.pi**2*D)
+    # 9.34 for the square plate, upper bound from the Ritz series
+    assert 9.3 < k < 9.4
+    # reversing the shear gives the same buckling load
+    assert np.isclose(eig(b, b, np.inf, 0., 0., -1.), eig(b, b, np.inf, 0.,
+                                                          0., 1.))
+
+
+def test_cylinder_compression():
+    r = 1000.
+    classical = E*T**2/(r*np.sqrt(3.*(1. - NU**2)))
+    # panels large compared to the axisymmetric half-wave length
+    ratio = eig(400., 400., r, -1., 0., 0.)/classical
+    assert 1. <= ratio < 1.01
+
+
+def test_tension():
+    assert eig(100., 100., np.inf, 1., 1., 0.) == NO_BUCKLING
+
+
+if __name__ == '__main__':
+    test_plate_compression()
+    test_plate_shear()
+    test_cylinder_compression()
+    test_tension()
@@ -0,0 +1,45 @@
+import numpy as np
+
+from structmanager.analysis.ply_failure import (failure_indices,
+                                                laminate_failure)
+
+
+E1, E2, G12, NU12 = 140000., 10000., 5000., 0.3
+STRENGTHS = (1500., 1200., 50., 200., 70.)
+
+
+def test_uniaxial_strength():
+    moduli = np.array([E1, E2, G12])
+    allow = np.array(STRENGTHS)
+    Xt, Xc, Yt, Yc, S = STRENGTHS
+    stress = np.array([[Xt, 0., 0.], [-Xc, 0., 0.], [0., Yt, 0.],
+                       [0., -Yc, 0.], [0., 0., S]])
+    strain = stress/moduli
+    indices = failure_indices(stress, strain, moduli, allow)
+    for criterion in ('TSAI-WU', 'HASHIN', 'MAX-STRAIN'):
+        assert np.allclose(indices[criterion], 1.), criterion
+
+
+def test_single_ply_laminate():
+    t = 0.5
+    mat = (E1, E2, G12, NU12)
+    signatures = [(None, (t, 0.) + mat)]
+    Xt, Xc = STRENGTHS[:2]
+    M = 10.
+    # axial tension at the strength, then pure bending
+    resultants = np.array([[[Xt*t, 0., 0., 0., 0., 0.],
+                            [0., 0., 0., M, 0., 0.]]])
+    indices = laminate_failure(resultants, [0, 0], signatures,
+                               [(STRENGTHS,)], criteria=['MAX-STRAIN',
+                                                         'HASHIN'])
+    assert np.allclose(indices['MAX-STRAIN'][0, 0], 1.)
+    assert np.allclose(indices['HASHIN'][0, 0], 1.)
+    # outer fiber stress 6 M/t**2, the compressive side is critical
+    smax = 6.*M/t**2
+    assert np.isclose(indices['MAX-STRAIN'][0, 1], smax/min(Xt, Xc))
+    assert np.isclose(indices['HASHIN'][0, 1], (smax/min(Xt, Xc))**2)
+
+
+if __name__ == '__main__':
+    test_uniaxial_strength()
+    test_single_ply_laminate()
@@ -0,0 +1,44 @@
+import numpy as np
+
+from structmanager.analysis.superstringer import (
+    effective_width_redistribution)
+
+
+E, NU = 70000., 0.3
+T, B, AS = 1.2, 150., 80.
+SIGMA_CR = 4.*np.pi**2*E/(12.*(1. - NU**2))*(T/B)**2
+
+
+def redistribute(eps0):
+    Ps = E*AS*eps0
+    Nx = np.array([E*T*eps0, E*T*eps0])
+    return effective_width_redistribution(Ps, AS, E, Nx, T, B, E, NU)
+
+
+def test_below_buckling():
+    eps0 = -0.5*SIGMA_CR/E
+    res = redistribute(eps0)
+    assert np.isclose(res['P'], E*AS*eps0)
+    assert np.allclose(res['w'], B/2.)
+    assert np.isclose(res['sigma_cr'][0], SIGMA_CR)
+
+
+def test_above_buckling():
+    eps0 = -5.*SIGMA_CR/E
+    res = redistribute(eps0)
+    # E eps (As + t b sqrt(sigma_cr/(E |eps|))) = E eps0 (As + t b), a
+    # quadratic equation in u = sqrt(|eps|)
+    total = E*abs(eps0)*(AS + T*B)
+    c = T*B*np.sqrt(SIGMA_CR/E)
+    u = (-c + np.sqrt(c**2 + 4.*AS*total/E))/(2.*AS)
+    assert np.isclose(res['eps'], -u**2)
+    assert np.isclose(res['P'], -E*AS*u**2)
+    assert np.allclose(res['w'], B/2.*np.sqrt(SIGMA_CR/(E*u**2)))
+    # the total load is kept
+    assert np.isclose(res['P'] + res['Pskin'].sum(), -total)
+    assert res['P'] < E*AS*eps0
+
+
+if __name__ == '__main__':
+    test_below_buckling()
+    test_above_buckling()
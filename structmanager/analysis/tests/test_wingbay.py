@@ -0,0 +1,53 @@
+import numpy as np
+
+from structmanager.analysis.wingbay import (buck_wb,
+                                            global_buckling_eigenvalue,
+                                            stiffened_plate_stiffness)
+
+
+E, NU = 70000., 0.3
+
+
+def test_unstiffened_plate():
+    t, a, b = 2., 600., 200.
+    eig = global_buckling_eigenvalue(t, E, NU, 0., E, 0., 0., 50., a, b,
+                                     -1., 0., 0.)
+    D = E*t**3/(12.*(1. - NU**2))
+    assert np.isclose(eig*b**2/(np.pi**2*D), 4.)
+
+
+def test_smeared_stringers():
+    t, As, ZC, IN, ds = 2., 60., 15., 2.*30.**3/12., 50.
+    A, D = stiffened_plate_stiffness(t, E, NU, As, E, ZC, IN, ds)
+    # neutral axis of one skin strip and its stringer
+    Ak = E*t/(1. - NU**2)*ds/E
+    zbar = As*(t/2. + ZC)/(Ak + As)
+    EI = (E/(1. - NU**2)*ds*t**3/12. + E*Ak*zbar**2 +
+          E*(IN + As*(t/2. + ZC - zbar)**2))
+    assert np.isclose(D[0, 0], EI/ds)
+    assert np.isclose(A[0, 0], E*(Ak + As)/ds)
+    assert np.isclose(D[1, 1], E*t**3/(12.*(1. - NU**2)))
+    # orthotropic plate in compression, minimum over the half-waves
+    a, b = 600., 200.
+    m = np.arange(1, 9)
+    Ncr = np.pi**2/a**2*(D[0, 0]*m**2 + 2*(D[0, 1] + 2*D[2, 2])*(a/b)**2 +
+                         D[1, 1]*(a/b)**4/m**2)
+    eig = global_buckling_eigenvalue(t, E, NU, As, E, ZC, IN, ds, a, b, -1.,
+                                     0., 0.)
+    assert np.isclose(eig, Ncr.min())
+
+
+def test_buck_wb_stringer_load():
+    t, As, ZC, IN, ds, a, b, Nxx = 2., 60., 15., 2250., 50., 600., 200., -10.
+    args = [1.5, 2.5, E, NU, As, E, ZC, IN, ds, a, b, Nxx, 0., 0.]
+    # same strain in skin and stringers, mean skin thickness
+    Ntot = Nxx*(1. + As/(ds*t))
+    ref = global_buckling_eigenvalue(t, E, NU, As, E, ZC, IN, ds, a, b, Ntot,
+                                     0., 0.)
+    assert np.isclose(buck_wb(args), ref)
+
+
+if __name__ == '__main__':
+    test_unstiffened_plate()
+    test_smeared_stringers()
+    test_buck_wb_stringer_load()
@@ -0,0 +1,142 @@
+"""
+Wing bay buckling (:mod:`structmanager.analysis.wingbay`)
+=========================================================
+
+.. currentmodule:: structmanager.analysis.wingbay
+
+Global buckling of the stiffened skin between two ribs of a wing box, see
+:class:`.WingBay`. The stringers are smeared over the skin, giving a flat
+orthotropic plate simply supported on the ribs and spars. The bending
+stiffness along the stringers is taken about the neutral axis of the skin
+and the stringers, the torsional stiffness of the open stringers is
+neglected. The eigenvalues of many bays are computed at once with
+:func:`.laminate_buckling_eigenvalue`.
+
+The same evaluation is used for the `'BUCK_WB'` external response of the
+`WINGBAY` group, see :func:`.constrain_global_buckling`, with the arguments:
+
+==================  ==========================================================
+Argument            Description
+==================  ==========================================================
+`t1, t2, ...`       skin thicknesses of the panels, averaged
+`E`, `nu`           skin material
+`As`, `Es`          stringer area and Young's modulus
+`ZC`, `IN`          stringer centroid distance to the skin and inertia about
+                    its centroid, see :mod:`.sections`
+`ds`                stringer pitch
+`a`, `b`            bay length, along the stringers, and width
+`Nxx`, `Nyy`,       skin membrane forces per unit length, negative in
+`Nxy`               compression
+==================  ==========================================================
+
+For the external response the stringer load is added to `Nxx` assuming the
+same strain in the stringers and in the skin.
+
+"""
+from __future__ import division
+
+import numpy as np
+
+from .pcbuck import laminate_buckling_eigenvalue
+
+
+# arguments of the 'BUCK_WB' DRESP3 following the skin thicknesses
+ARGS = ['E', 'nu', 'As', 'Es', 'ZC', 'IN', 'ds', 'a', 'b', 'Nxx', 'Nyy',
+        'Nxy']
+
+
+def stiffened_plate_stiffness(t, E, nu, As, Es, ZC, IN, ds):
+    """`A` and `D` matrices of a skin with smeared stringers along `x`
+
+    All the parameters can be arrays, broadcast against each other.
+
+    Parameters
+    ----------
+    t, E, nu : float or array-like
+        The skin thickness and material.
+    As, Es : float or array-like
+        The stringer area and Young's modulus.
+    ZC, IN : float or array-like
+        The distance from the skin to the stringer centroid and the stringer
+        inertia about its centroid.
+    ds : float or array-like
+        The stringer pitch.
+
+    Returns
+    -------
+    A, D : np.ndarray
+        Arrays of shape `(..., 3, 3)`.
+
+    """
+    params = np.broadcast_arrays(*[np.asarray(v, dtype=np.float64) for v in
+                                   (t, E, nu, As, Es, ZC, IN, ds)])
+    t, E, nu, As, Es, ZC, IN, ds = params
+    Q = np.zeros(t.shape + (3, 3))
+    Q[..., 0, 0] = Q[..., 1, 1] = E/(1. - nu**2)
+    Q[..., 0, 1] = Q[..., 1, 0] = nu*E/(1. - nu**2)
+    Q[..., 2, 2] = E/(2.*(1. + nu))
+    A = t[..., None, None]*Q
+    D = (t**3/12.)[..., None, None]*Q
+    # stringers about the neutral axis, e measured from the skin mid-plane
+    e = t/2. + ZC
+    EA = Es*As/ds
+    A[..., 0, 0] += EA
+    D[..., 0, 0] += Es*(IN + As*e**2)/ds - (EA*e)**2/A[..., 0, 0]
+    return A, D
+
+
+def global_buckling_eigenvalue(t, E, nu, As, Es, ZC, IN, ds, a, b, Nxx, Nyy,
+                               Nxy, m=8, n=8, chunk=256):
+    """Global buckling eigenvalue of stiffened bays
+
+    Parameters
+    ----------
+    t, E, nu, As, Es, ZC, IN, ds :
+        See :func:`.stiffened_plate_stiffness`.
+    a, b : float or array-like
+        The bay length along the stringers and width.
+    Nxx, Nyy, Nxy : float or array-like
+        The smeared membrane forces per unit length, including the stringer
+        loads, negative in compression.
+    m, n, chunk : int, optional
+        See :func:`.buckling_eigenvalue`.
+
+    Returns
+    -------
+    eig : np.ndarray
+        The factor multiplying the applied loads causing buckling, with the
+        shape of the broadcast parameters.
+
+    """
+    A, D = stiffened_plate_stiffness(t, E, nu, As, Es, ZC, IN, ds)
+    return laminate_buckling_eigenvalue(A, D, a, b, np.inf, Nxx, Nyy, Nxy,
+                                        m=m, n=n, chunk=chunk)
+
+
+def buck_wb(args):
+    """Evaluate the `'BUCK_WB'` responses
+
+    Parameters
+    ----------
+    args : array-like
+        The skin thicknesses followed by the arguments in the order of
+        :data:`.ARGS`, an array of shape `(nargs,)` for one response or
+        `(nargs, nresp)` for many responses.
+
+    Returns
+    -------
+    values : np.ndarray
+        The buckling eigenvalues, see :func:`.global_buckling_eigenvalue`.
+
+    """
+    args = np.asarray(args, dtype=np.float64)
+    nt = args.shape[0] - len(ARGS)
+    if nt < 1:
+        raise ValueError('BUCK_WB takes at least %d arguments, %d given' %
+                         (len(ARGS) + 1, args.shape[0]))
+    t = args[:nt].mean(axis=0)
+    E, nu, As, Es, ZC, IN, ds, a, b, Nxx, Nyy, Nxy = args[nt:]
+    # stringer load from the skin strain
+    Nxx = Nxx + Es*As/ds*(Nxx - nu*Nyy)/(E*t)
+    return global_buckling_eigenvalue(t, E, nu, As, Es, ZC, IN, ds, a, b,
+                                      Nxx, Nyy, Nxy)
@@ -8,3 +8,4 @@ Derived from "Python Programming on Win32" by Mark Hammond and Andy Robinson.
 
 """
 from excel import *
+from .reader import read_sheet, find_anchor, read_block
@@ -1,3 +1,62 @@
+"""
+Excel wrapper (:mod:`structmanager.excel.excel`)
+================================================
+
+.. currentmodule:: structmanager.excel.excel
+
+Each call to :meth:`.Excel.get_cell` or :meth:`.Excel.set_cell` is one round
+trip to Excel. Large tables should be transferred at once using
+:meth:`.Excel.get_used_range`, :meth:`.Excel.get_range` and
+:meth:`.Excel.set_range`, which exchange NumPy arrays.
+
+The class :class:`.ExcelLocal` has the same interface as :class:`.Excel` but
+uses the `openpyxl` module, without requiring Excel. Use
+:func:`.open_workbook` to choose the available backend.
+
+"""
+import numpy as np
+
+
+def _to_array(data):
+    if data is None:
+        return np.empty((0, 0), dtype=object)
+    if not isinstance(data, (tuple, list)):
+        data = ((data,),)
+    nrows = len(data)
+    ncols = max([len(row) for row in data]) if nrows > 0 else 0
+    values = np.empty((nrows, ncols), dtype=object)
+    for i, row in enumerate(data):
+        values[i, :len(row)] = row
+    return values
+
+
+def _to_rows(data):
+    data = np.asarray(data, dtype=object)
+    if data.ndim == 1:
+        data = data[None, :]
+    rows = []
+    for row in data.tolist():
+        newrow = []
+        for value in row:
+            if isinstance(value, np.generic):
+                value = value.item()
+            if isinstance(value, float) and value != value:
+                value = None
+            newrow.append(value)
+        rows.append(tuple(newrow))
+    return tuple(rows)
+
+
+def _offset(values, row, col, dtype):
+    nrows, ncols = values.shape
+    out = np.empty((row - 1 + nrows, col - 1 + ncols), dtype=object)
+    out[row - 1:, col - 1:] = values
+    if np.dtype(dtype) == np.dtype(object):
+        return out
+    out[np.equal(out, None)] = np.nan
+    return out.astype(dtype)
+
+
 class Excel(object):
     """Wrapper class to deal with Excel files
 
@@ -18,6 +77,15 @@ class Excel(object):
         else:
             self.xlBook = self.xlApp.Workbooks.Add()
             self.filename = ''
+        self._sheets = {}
+
+
+    def _sheet(self, sheet):
+        sht = self._sheets.get(sheet)
+        if sht is None:
+            sht = self.xlBook.Worksheets(sheet)
+            self._sheets[sheet] = sht
+        return sht
 
 
     def save(self, newfilename=None):
@@ -48,6 +116,7 @@ class Excel(object):
 
     def close(self):
         """Closes the current Excel file"""
+        self._sheets = {}
         self.xlBook.Close(SaveChanges=0)
         del self.xlApp
 
@@ -80,8 +149,7 @@ class Excel(object):
             The value of the corresponding cell.
 
         """
-        sht = self.xlBook.Worksheets(sheet)
-        return sht.Cells(row, col).Value
+        return self._sheet(sheet).Cells(row, col).Value
 
 
     def set_cell(self, sheet, row, col, value):
@@ -99,8 +167,7 @@ class Excel(object):
             The new value for the cell.
 
         """
-        sht = self.xlBook.Worksheets(sheet)
-        sht.Cells(row, col).Value = value
+        self._sheet(sheet).Cells(row, col).Value = value
 
 
     def get_range(self, sheet, row1, col1, row2, col2):
@@ -120,11 +187,34 @@ class Excel(object):
             The last column of the range box.
 
         """
-        sht = self.xlBook.worksheets(sheet)
+        sht = self._sheet(sheet)
         return sht.Range(sht.Cells(row1, col1), sht.Cells(row2,
         col2)).Value
 
 
+    def get_used_range(self, sheet, dtype=object):
+        """Get all the values of a sheet in one call
+
+        Parameters
+        ----------
+        sheet : str or int
+            The Excel sheet name or index starting at ``1``.
+        dtype : data-type, optional
+            The data type of the returned array. With `dtype=float` empty
+            cells become `NaN`.
+
+        Returns
+        -------
+        values : np.ndarray
+            A 2d array where `values[i, j]` is the value of the cell at row
+            ``i+1`` and column ``j+1``.
+
+        """
+        used = self._sheet(sheet).UsedRange
+        values = _to_array(used.Value)
+        return _offset(values, used.Row, used.Column, dtype)
+
+
     def set_range(self, sheet, leftCol, topRow, data):
         """Set a range in Excel from a 2d array (tuple of tuples)
 
@@ -139,13 +229,15 @@ class Excel(object):
             The left column of the range box.
         topRow : int
             The upper row of the range box.
-        data : tuple of tuples
-            A tuple of tuples representing the 2d array of values.
+        data : tuple of tuples or np.ndarray
+            A tuple of tuples or a 2d array of values. For arrays, `NaN`
+            values are written as empty cells.
 
         """
+        data = _to_rows(data)
         bottomRow = topRow + len(data) - 1
         rightCol = leftCol + len(data[0]) - 1
-        sht = self.xlBook.Worksheets(sheet)
+        sht = self._sheet(sheet)
         sht.Range(sht.Cells(topRow, leftCol), sht.Cells(bottomRow,
         rightCol)).Value = data
 
@@ -153,3 +245,137 @@ class Excel(object):
 #        self.xlBook.Run(name)
 #        self.xlBook.DisplayAlerts = 0
 
+
+class ExcelLocal(object):
+    """Local stand-in for :class:`.Excel` based on `openpyxl`
+
+    It has the same interface of :class:`.Excel` and works without Excel,
+    for `.xlsx` and `.xlsm` files.
+
+    Parameters
+    ----------
+    filename : str
+        The name to the Excel file.
+
+    """
+    def __init__(self, filename=None):
+        try:
+            import openpyxl
+        except ImportError:
+            raise ImportError('Python "openpyxl" module required')
+
+        if filename:
+            self.filename = filename
+            self.xlBook = openpyxl.load_workbook(filename)
+        else:
+            self.xlBook = openpyxl.Workbook()
+            self.filename = ''
+        self._sheets = {}
+
+
+    def _sheet(self, sheet):
+        sht = self._sheets.get(sheet)
+        if sht is None:
+            if isinstance(sheet, int):
+                sht = self.xlBook.worksheets[sheet - 1]
+            else:
+                sht = self.xlBook[sheet]
+            self._sheets[sheet] = sht
+        return sht
+
+
+    def save(self, newfilename=None):
+        """Saves the Excel file
+
+        See :meth:`.Excel.save`.
+
+        """
+        if newfilename is not None:
+            self.filename = newfilename
+        if not self.filename:
+            raise RuntimeError(
+                'For a new Excel file the "newfilename" must be given!')
+        self.xlBook.save(self.filename)
+
+
+    def close(self):
+        """Closes the current Excel file"""
+        self._sheets = {}
+        self.xlBook.close()
+
+
+    def show(self):
+        """Does nothing, kept for compatibility with :class:`.Excel`"""
+        pass
+
+
+    def hide(self):
+        """Does nothing, kept for compatibility with :class:`.Excel`"""
+        pass
+
+
+    def get_cell(self, sheet, row, col):
+        """Get value of one cell, see :meth:`.Excel.get_cell`"""
+        return self._sheet(sheet).cell(row, col).value
+
+
+    def set_cell(self, sheet, row, col, value):
+        """Set value of one cell, see :meth:`.Excel.set_cell`"""
+        self._sheet(sheet).cell(row, col).value = value
+
+
+    def get_range(self, sheet, row1, col1, row2, col2):
+        """Get a range as a 2d array, see :meth:`.Excel.get_range`"""
+        sht = self._sheet(sheet)
+        return tuple(sht.iter_rows(min_row=row1, min_col=col1, max_row=row2,
+                                   max_col=col2, values_only=True))
+
+
+    def get_used_range(self, sheet, dtype=object):
+        """Get all the values of a sheet, see :meth:`.Excel.get_used_range`"""
+        sht = self._sheet(sheet)
+        rows = tuple(sht.iter_rows(min_row=sht.min_row,
+                                   min_col=sht.min_column,
+                                   max_row=sht.max_row,
+                                   max_col=sht.max_column, values_only=True))
+        return _offset(_to_array(rows), sht.min_row, sht.min_column, dtype)
+
+
+    def set_range(self, sheet, leftCol, topRow, data):
+        """Set a range from a 2d array, see :meth:`.Excel.set_range`"""
+        sht = self._sheet(sheet)
+        for i, row in enumerate(_to_rows(data)):
+            for j, value in enumerate(row):
+                sht.cell(topRow + i, leftCol + j).value = value
+
+
+def open_workbook(filename=None, backend=None):
+    """Open a workbook with the available backend
+
+    Parameters
+    ----------
+    filename : str, optional
+        The name to the Excel file. A new workbook is created if not given.
+    backend : str or None, optional
+        `'excel'` for :class:`.Excel` or `'openpyxl'` for
+        :class:`.ExcelLocal`. If ``None``, :class:`.Excel` is used when the
+        `win32com` module is available.
+
+    Returns
+    -------
+    workbook : :class:`.Excel` or :class:`.ExcelLocal`
+        The opened workbook.
+
+    """
+    if backend is None:
+        try:
+            import win32com.client
+            backend = 'excel'
+        except ImportError:
+            backend = 'openpyxl'
+    if backend == 'excel':
+        return Excel(filename)
+    elif backend == 'openpyxl':
+        return ExcelLocal(filename)
+    else:
+        raise ValueError('Invalid backend: %s' % backend)
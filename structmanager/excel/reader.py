@@ -0,0 +1,156 @@
+"""
+Workbook reader (:mod:`structmanager.excel.reader`)
+===================================================
+
+.. currentmodule:: structmanager.excel.reader
+
+Functions to read tables from workbooks without Excel. The whole worksheet is
+loaded at once into a 2-D NumPy object array, where the tables are located
+using anchor strings such as `'DLINK'` or `'DISPLACEMENT CONSTRAINTS'`.
+
+Supported files are `.xlsx` and `.xlsm` workbooks, read using the `openpyxl`
+module, and CSV files.
+
+"""
+import csv
+
+import numpy as np
+
+try:
+    basestring
+except NameError:
+    basestring = str
+
+
+def _convert(value):
+    if value is None:
+        return None
+    if not isinstance(value, basestring):
+        return value
+    value = value.strip()
+    if value == '':
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def read_sheet(path, sheet=1, delimiter=','):
+    """Read all values of a worksheet in one bulk operation
+
+    Parameters
+    ----------
+    path : str
+        The path to the workbook (`.xlsx` or `.xlsm`) or to a CSV file.
+    sheet : int or str, optional
+        The worksheet index starting at ``1`` or the worksheet name. Ignored
+        for CSV files.
+    delimiter : str, optional
+        The delimiter used in CSV files.
+
+    Returns
+    -------
+    values : np.ndarray
+        A 2-D object array with the cell values, where empty cells are
+        ``None``. The value at `values[i, j]` corresponds to the cell at row
+        ``i+1`` and column ``j+1``.
+
+    """
+    if path.lower().endswith(('.csv', '.txt')):
+        with open(path) as f:
+            rows = [[_convert(v) for v in row]
+                    for row in csv.reader(f, delimiter=delimiter)]
+    else:
+        try:
+            import openpyxl
+        except ImportError:
+            raise ImportError('Python "openpyxl" module required')
+        wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            if isinstance(sheet, int):
+                ws = wb.worksheets[sheet - 1]
+            else:
+                ws = wb[sheet]
+            rows = [[_convert(v) for v in row]
+                    for row in ws.iter_rows(values_only=True)]
+        finally:
+            wb.close()
+
+    nrows = len(rows)
+    ncols = max([len(row) for row in rows]) if nrows > 0 else 0
+    values = np.empty((nrows, ncols), dtype=object)
+    for i, row in enumerate(rows):
+        values[i, :len(row)] = row
+    return values
+
+
+def find_anchor(values, text, exact=True):
+    """Find the first cell containing a given text
+
+    The cells are searched row by row.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        The 2-D object array returned by :func:`.read_sheet`.
+    text : str
+        The anchor text.
+    exact : bool, optional
+        If ``False`` the cells that contain `text` as a substring are also
+        matched.
+
+    Returns
+    -------
+    anchor : tuple or None
+        The `(row, col)` indices of the cell in `values`, or ``None`` if the
+        text was not found.
+
+    """
+    if values.size == 0:
+        return None
+    strvalues = np.array([v if isinstance(v, basestring) else ''
+                          for v in values.ravel()])
+    if exact:
+        check = strvalues == text
+    else:
+        check = np.char.find(strvalues, text) > -1
+    pos = np.flatnonzero(check)
+    if pos.shape[0] == 0:
+        return None
+    return divmod(int(pos[0]), values.shape[1])
+
+
+def read_block(values, row, col, ncols=None):
+    """Read a table starting at a given cell
+
+    The table ends at the first empty cell in column `col`.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        The 2-D object array returned by :func:`.read_sheet`.
+    row, col : int
+        The indices of the upper-left cell of the table in `values`.
+    ncols : int or None, optional
+        The number of columns of the table. If ``None`` all the columns until
+        the last one in `values` are taken.
+
+    Returns
+    -------
+    block : np.ndarray
+        A 2-D object array with the table values.
+
+    """
+    if ncols is None:
+        ncols = values.shape[1] - col
+    block = values[row:, col:col + ncols]
+    if block.shape[1] < ncols:
+        pad = np.empty((block.shape[0], ncols - block.shape[1]), dtype=object)
+        block = np.hstack((block, pad))
+    if block.shape[0] == 0:
+        return block
+    empty = np.equal(block[:, 0], None)
+    if empty.any():
+        block = block[:np.argmax(empty)]
+    return block
@@ -0,0 +1,61 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from structmanager.excel.excel import ExcelLocal, open_workbook
+from structmanager.excel.reader import read_sheet
+
+
+def test_local_round_trip():
+    data = np.array([[1., 2., np.nan], [4., 5., 6.]])
+    tmpdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmpdir, 'table.xlsx')
+        xl = ExcelLocal()
+        xl.set_cell('Sheet', 1, 1, 'TABLE')
+        xl.set_range('Sheet', 3, 2, data)
+        xl.set_range(1, 1, 5, (('a', 'b'), (7, None)))
+        xl.xlBook.create_sheet('DATA')
+        xl.set_range('DATA', 3, 2, data)
+        xl.save(path)
+        xl.close()
+
+        xl = open_workbook(path, backend='openpyxl')
+        assert isinstance(xl, ExcelLocal)
+        assert xl.get_cell('Sheet', 1, 1) == 'TABLE'
+        assert xl.get_range('Sheet', 2, 3, 3, 5) == ((1., 2., None),
+                                                     (4., 5., 6.))
+        values = xl.get_used_range(1)
+        assert values.shape == (6, 5)
+        assert values[0, 0] == 'TABLE'
+        assert values[4, 1] == 'b'
+        assert values[5, 1] is None
+        # numbers only with empty cells as NaN
+        values = xl.get_used_range('DATA', dtype=float)
+        assert values.shape == (3, 5)
+        assert np.allclose(values[1:, 2:], data, equal_nan=True)
+        assert np.isnan(values[0]).all()
+        # changes are kept after saving again
+        xl.set_cell('Sheet', 6, 2, 8.)
+        xl.save()
+        xl.close()
+        values = read_sheet(path)
+        assert values[5, 0] == 7 and values[5, 1] == 8.
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_invalid_backend():
+    try:
+        open_workbook(backend='calc')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('invalid backend accepted')
+
+
+if __name__ == '__main__':
+    test_local_round_trip()
+    test_invalid_backend()
@@ -19,7 +19,11 @@ GENESIS.
 .. automodule:: structmanager.genesis.sizing_data
     :members:
 
+.. automodule:: structmanager.genesis.deck
+    :members:
+
 """
 from .cards_opt import *
 from .cards_solver import *
 from .genesis import Genesis
+from .deck import DeckTemplate
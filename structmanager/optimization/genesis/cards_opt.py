@@ -224,14 +224,13 @@ class DRESP2(DRESP23):
     methods: :meth:`.add_dvar`, :meth:`.add_dtable` and :meth:`.add_dresp1`.
 
     """
-    uniqueid = 8000000
-
     def __init__(self, label, eqid, region=None):
         if region is None:
             region = ''
         super(DRESP2, self).__init__()
-        self.id = DRESP2.uniqueid
-        DRESP2.uniqueid += 1
+        # sharing the ids with DRESP1, all responses are referenced by DCONS
+        self.id = DRESP1.uniqueid
+        DRESP1.uniqueid += 1
         self.label = label
         self.eqid = eqid
         self.region = region
@@ -282,14 +281,13 @@ class DRESP3(DRESP23):
     methods: :meth:`.add_dvar`, :meth:`.add_dtable` and :meth:`.add_dresp1`.
 
     """
-    uniqueid = 8000000
-
     def __init__(self, label, libid, region=None):
         if region is None:
             region = ''
         super(DRESP3, self).__init__()
-        self.id = DRESP3.uniqueid
-        DRESP3.uniqueid += 1
+        # sharing the ids with DRESP1, all responses are referenced by DCONS
+        self.id = DRESP1.uniqueid
+        DRESP1.uniqueid += 1
         self.label = label
         self.libid = libid
         self.region = region
@@ -0,0 +1,248 @@
+"""
+Deck templates (:mod:`structmanager.genesis.deck`)
+==================================================
+
+.. currentmodule:: structmanager.genesis.deck
+
+The executive control, the constraint screening and the optimization
+parameters written by :func:`.merge_temp_files` are defined by a
+:class:`.DeckTemplate`, sized from the optimization model and from the local
+machine.
+
+"""
+from __future__ import division
+import os
+import multiprocessing
+
+import numpy as np
+
+
+DEFAULTS = dict(
+    threads=8,
+    lenvec=16000,
+    dscreen_trs=-0.5,
+    dscreen_nstr=80,
+    iredca=22222,
+    optm=1,
+    delx=0.5,
+    dxmin=0.1,
+    )
+
+
+def machine_resources():
+    """Number of cores and physical memory of the local machine
+
+    Returns
+    -------
+    ncores : int
+        The number of cores.
+    ram : int or None
+        The physical memory in bytes, or ``None`` if it cannot be
+        determined.
+
+    """
+    try:
+        ncores = multiprocessing.cpu_count()
+    except NotImplementedError:
+        ncores = 1
+    try:
+        ram = os.sysconf('SC_PAGE_SIZE')*os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        ram = None
+    return ncores, ram
+
+
+# element cards counted by :func:`.count_elements`
+ELEMENT_CARDS = frozenset([
+    'CBAR', 'CBEAM', 'CBEND', 'CBUSH', 'CBUSH1D', 'CDAMP1', 'CDAMP2',
+    'CDAMP3', 'CDAMP4', 'CELAS1', 'CELAS2', 'CELAS3', 'CELAS4', 'CGAP',
+    'CHEXA', 'CONROD', 'CPENTA', 'CPYRAM', 'CQUAD', 'CQUAD4', 'CQUAD8',
+    'CQUADR', 'CROD', 'CSHEAR', 'CTETRA', 'CTRIA3', 'CTRIA6', 'CTRIAR',
+    'CTUBE', 'CVISC', 'CWELD',
+    ])
+
+
+def count_elements(path):
+    """Count the element cards of a NASTRAN input file
+
+    The file is read line by line. Only the cards of :data:`.ELEMENT_CARDS`
+    in the bulk data are counted, after `BEGIN BULK` when the file has one,
+    in free-field, small-field and large-field formats. Included files are
+    not read.
+
+    Parameters
+    ----------
+    path : str
+        The path to the NASTRAN input file.
+
+    Returns
+    -------
+    nelems : int
+        The number of element cards.
+
+    """
+    # element cards before and after BEGIN BULK
+    counts = [0, 0]
+    bulk = 0
+    with open(path, 'r') as f:
+        for line in f:
+            if [w.upper() for w in line.split()[:2]] == ['BEGIN', 'BULK']:
+                bulk = 1
+                continue
+            if ',' in line[:10]:
+                name = line.split(',', 1)[0]
+            else:
+                name = line[:8]
+            name = name.strip().rstrip('*').upper()
+            if name == 'ENDDATA':
+                break
+            if name in ELEMENT_CARDS:
+                counts[bulk] += 1
+    return counts[bulk]
+
+
+class DeckTemplate(object):
+    """Executive control and optimization parameters of a GENESIS deck
+
+    ==================  ======================================================
+    Attribute           Description
+    ==================  ======================================================
+    `threads`           `int` number of threads (`THREADS`)
+    `lenvec`            `int` memory in millions of words (`LENVEC`)
+    `dscreen_trs`       `float` constraint screening threshold (`DSCREEN`)
+    `dscreen_nstr`      `int` retained constraints per region (`DSCREEN`)
+    `iredca`            `int` approximation flags (`DOPT`)
+    `optm`              `int` optimizer (`DOPT`)
+    `delx`              `float` move limit (`DOPT`)
+    `dxmin`             `float` minimum move limit (`DOPT`)
+    `auto`              `bool` if :meth:`.size` is called for each run
+    `overrides`         `dict` with the values that are kept by
+                        :meth:`.size`
+    ==================  ======================================================
+
+    Without `auto` the values of :data:`.DEFAULTS` are written, the settings
+    used before the decks were sized.
+
+    Parameters
+    ----------
+    auto : bool, optional
+        If the parameters are sized from the model and the machine before
+        each run.
+    overrides : keyword arguments
+        Values for any of the attributes above, kept fixed for all the runs.
+
+    """
+    def __init__(self, auto=False, **overrides):
+        for key in overrides:
+            if key not in DEFAULTS:
+                raise ValueError('Invalid deck parameter: %s' % key)
+        self.auto = auto
+        self.overrides = overrides
+        for key, value in DEFAULTS.items():
+            setattr(self, key, overrides.get(key, value))
+
+
+    def size(self, ndvars, nsubcases, nelems=None, ncores=None, ram=None,
+             word_size=8, mem_fraction=0.5):
+        """Size the parameters from the model and the machine
+
+        Parameters
+        ----------
+        ndvars : int
+            The number of design variables.
+        nsubcases : int
+            The number of subcases.
+        nelems : int or None, optional
+            The number of elements.
+        ncores, ram : int or None, optional
+            The number of cores and the physical memory in bytes, by default
+            taken from :func:`.machine_resources`.
+        word_size : int, optional
+            The size of one word in bytes.
+        mem_fraction : float, optional
+            The fraction of the physical memory given to the solver.
+
+        """
+        machine_ncores, machine_ram = machine_resources()
+        if ncores is None:
+            ncores = machine_ncores
+        if ram is None:
+            ram = machine_ram
+
+        # one thread per 20000 elements, limited by the machine
+        if nelems is None:
+            threads = ncores
+        else:
+            threads = int(np.clip(np.ceil(nelems/20000.), 1, ncores))
+        if ram is None:
+            lenvec = DEFAULTS['lenvec']
+        else:
+            lenvec = max(1, int(mem_fraction*ram/word_size/1e6))
+
+        # at most one active constraint per design variable is expected at
+        # the optimum, twice as many are retained over all subcases
+        nsubcases = max(nsubcases, 1)
+        dscreen_nstr = int(np.clip(np.ceil(2.*ndvars/nsubcases), 20, 500))
+
+        # smaller move limits for larger problems
+        if ndvars <= 1000:
+            delx = 0.5
+        elif ndvars <= 10000:
+            delx = 0.3
+        else:
+            delx = 0.2
+
+        sized = dict(threads=threads, lenvec=lenvec,
+                     dscreen_nstr=dscreen_nstr, delx=delx,
+                     dxmin=round(delx/5., 4))
+        for key, value in sized.items():
+            setattr(self, key, self.overrides.get(key, value))
+
+
+    def write_executive(self, file):
+        """Write the executive control
+
+        Parameters
+        ----------
+        file : file
+            File object with a :meth:`write` method.
+
+        """
+        file.write('$ Executive Control\n')
+        file.write('$\n')
+        file.write('POST = PUNCH\n')
+        file.write('SOL COMPAT1\n')
+        file.write('THREADS = %d\n' % self.threads)
+        file.write('LENVEC=%dM\n' % self.lenvec)
+        file.write('CEND\n')
+
+
+    def write_dscreen(self, file):
+        """Write the constraint screening card
+
+        Parameters
+        ----------
+        file : file
+            File object with a :meth:`write` method.
+
+        """
+        file.write('DSCREEN,STRESS,%s,%d\n' % (str(self.dscreen_trs),
+                                               self.dscreen_nstr))
+
+
+    def write_dopt(self, file, num_cycles):
+        """Write the optimization parameters
+
+        Parameters
+        ----------
+        file : file
+            File object with a :meth:`write` method.
+        num_cycles : int
+            The number of design cycles.
+
+        """
+        file.write('DOPT,' + str(num_cycles) + '\n')
+        file.write('+,IREDCA,%d\n' % self.iredca)
+        file.write('+,OPTM,%d\n' % self.optm)
+        file.write('+,DELX,%s\n' % str(self.delx))
+        file.write('+,DXMIN,%s\n' % str(self.dxmin))
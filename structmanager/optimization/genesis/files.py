@@ -1,34 +1,155 @@
+"""
+Merging of temporary files (:mod:`structmanager.genesis.files`)
+================================================================
+
+.. currentmodule:: structmanager.genesis.files
+
+"""
+import shutil
+
+from .deck import DeckTemplate, count_elements
+
+
+# element cards whose property ids are replaced, see :func:`.copy_bulk_data`
+SHELL_CARDS = ('CQUAD4', 'CQUAD8', 'CQUADR', 'CTRIA3', 'CTRIA6', 'CTRIAR')
+
+
+def _is_continuation(line):
+    first = line[:1]
+    if first in ('+', '*', ','):
+        return True
+    if first in (' ', '\t'):
+        # small and large-field continuations may have a blank first field
+        return line.strip() != '' and line[:8].strip() == ''
+    return False
+
+
+def _card_name_pid(line):
+    """Return the card name and the content of its first field"""
+    if ',' in line[:10]:
+        fields = line.split(',')
+        name = fields[0].strip()
+        field = fields[1].strip() if len(fields) > 1 else ''
+    elif line[:8].strip().endswith('*'):
+        name = line[:8].strip()
+        field = line[8:24].strip()
+    else:
+        name = line[:8].strip()
+        field = line[8:16].strip()
+    return name.rstrip('*').upper(), field
+
+
+def _set_pid(line, pid):
+    """Replace the property id of an element card"""
+    line = line.rstrip('\n')
+    if ',' in line[:10]:
+        fields = line.split(',')
+        fields[2] = str(pid)
+        return ','.join(fields)
+    elif line[:8].strip().endswith('*'):
+        return line.ljust(40)[:24] + ('%16d' % pid) + line[40:]
+    return line.ljust(24)[:16] + ('%8d' % pid) + line[24:]
+
+
+def copy_bulk_data(nastranfile, mergedfile, skip_pids, newpids=None):
+    """Copy the NASTRAN bulk data, line by line
+
+    Comments, `PARAM` cards and the `ENDDATA` are removed. The property
+    cards replaced by new properties are skipped together with their
+    continuation lines, for free-field, small-field and large-field
+    formats. The shell elements of `newpids` are assigned their new
+    property, see :data:`.SHELL_CARDS`.
+
+    Parameters
+    ----------
+    nastranfile : file
+        The NASTRAN input file, iterated only once.
+    mergedfile : file
+        File object with a :meth:`write` method.
+    skip_pids : dict
+        A `set` of property ids to skip for each property card name.
+    newpids : dict or None, optional
+        The new property ids, with the element ids as keys, see
+        :meth:`.TopometryResults.create_properties`.
+
+    """
+    newpids = newpids or {}
+    bulk = False
+    skip_flag = False
+    for line in nastranfile:
+        if not bulk:
+            if line.find('BEGIN BULK') > -1:
+                bulk = True
+            continue
+        if line[:1] == '$' or len(line.strip()) <= 1:
+            continue
+        if line[:7].upper() == 'ENDDATA':
+            break
+        if _is_continuation(line):
+            if skip_flag:
+                continue
+        else:
+            skip_flag = False
+            name, field = _card_name_pid(line)
+            if name == 'PARAM':
+                skip_flag = True
+                continue
+            pids = skip_pids.get(name)
+            if pids:
+                try:
+                    pid = int(field)
+                except ValueError:
+                    pid = None
+                if pid in pids:
+                    skip_flag = True
+                    continue
+            if newpids and name in SHELL_CARDS:
+                try:
+                    eid = int(field)
+                except ValueError:
+                    eid = None
+                if eid in newpids:
+                    line = _set_pid(line, newpids[eid])
+            if name == 'CBAR' and ',' not in line[:10]:
+                mergedfile.write(line.rstrip()[:64] + '\n')
+                continue
+        if ',' in line:
+            mergedfile.write(line.rstrip() + '\n')
+        else:
+            mergedfile.write(line.rstrip()[:72] + '\n')
+
+
 def merge_temp_files(self):
     """Merge temporary files
 
+    The GENESIS and NASTRAN data are copied in a streaming fashion, such that
+    the memory use does not depend on the file sizes. The elements listed in
+    the attribute `newpids` are assigned their new properties. The executive
+    control and the optimization parameters are given by the attribute
+    `deck`, see :class:`.DeckTemplate`, sized for each run when its `auto`
+    flag is set. Without `deck` the default settings are written.
+
     """
-    #merging NASTRAN and GENESIS .dat files
     self.genesisfile.close()
-    self.genesisfile = open(self.genesisfile.name, 'r')
-    genfile = self.genesisfile
-    genesislines = genfile.readlines(1000000000)
-    if not genesislines:
-        print 'GENESIS BULK DATA NOT FOUND!'
-        raise
-    genfile.close()
-    #
     self.nastranfile.close()
-    nastranfile = open(self.nastranfile.name, 'r')
-    nastranlines = nastranfile.readlines(1000000000)
-    if not nastranlines:
-        print 'NASTRAN BULK DATA NOT FOUND!'
-        raise
-    nastranfile.close()
+    with open(self.genesisfile.name, 'r') as genfile:
+        if not genfile.readline():
+            raise RuntimeError('GENESIS BULK DATA NOT FOUND!')
+    with open(self.nastranfile.name, 'r') as nastranfile:
+        if not nastranfile.readline():
+            raise RuntimeError('NASTRAN BULK DATA NOT FOUND!')
+    skip_pids = dict((pcard, set(props.keys()))
+                     for pcard, props in self.newprops.items())
+    deck = self.deck
+    if deck is None:
+        deck = DeckTemplate()
+    elif deck.auto:
+        deck.size(len(self.dvars), len(self.loads_list),
+                  count_elements(self.nastranfile.name))
     #
     mergedfile = open(self.datname, 'w')
     #writing GENESIS card initial data
-    mergedfile.write('$ Executive Control\n')
-    mergedfile.write('$\n')
-    mergedfile.write('POST = PUNCH\n')
-    mergedfile.write('SOL COMPAT1\n')
-    mergedfile.write('THREADS = 8\n')
-    mergedfile.write('LENVEC=16000M\n')
-    mergedfile.write('CEND\n')
+    deck.write_executive(mergedfile)
     mergedfile.write('$\n')
     mergedfile.write('$ Solution Control\n')
     mergedfile.write('$\n')
@@ -58,7 +179,7 @@ def merge_temp_files(self):
         mergedfile.write('   LOAD = ' + str(self.loads_list[i]) + '\n')
         mergedfile.write('   SPC = '  + str(self.spcs_list[i] ) + '\n')
     mergedfile.write('BEGIN BULK\n')
-    mergedfile.write('DSCREEN,STRESS,-0.5,80\n')
+    deck.write_dscreen(mergedfile)
     mergedfile.write('$\n')
     mergedfile.write('$ Parameters\n')
     mergedfile.write('$\n')
@@ -69,11 +190,7 @@ def merge_temp_files(self):
     mergedfile.write('$\n')
     mergedfile.write('$The following parameter activates BIGDOT\n')
     #mergedfile.write('DOPT,10\n')
-    mergedfile.write('DOPT,' + str(self.num_cycles) + '\n')
-    mergedfile.write('+,IREDCA,22222\n')
-    mergedfile.write('+,OPTM,1\n')
-    mergedfile.write('+,DELX,0.5\n')
-    mergedfile.write('+,DXMIN,0.1\n')
+    deck.write_dopt(mergedfile, self.num_cycles)
     mergedfile.write('$\n')
     #copying GENESIS data
     mergedfile.write('$______________________________________________\n')
@@ -82,9 +199,8 @@ def merge_temp_files(self):
     mergedfile.write('$        BEGINNING GENESIS BULK DATA\n')
     mergedfile.write('$______________________________________________\n')
     mergedfile.write('$______________________________________________\n')
-    for i in genesislines:
-        mergedfile.write (i)
-    startnext=False
+    with open(self.genesisfile.name, 'r') as genfile:
+        shutil.copyfileobj(genfile, mergedfile)
     #copying NASTRAN data
     mergedfile.write('$______________________________________________\n')
     mergedfile.write('$______________________________________________\n')
@@ -92,34 +208,8 @@ def merge_temp_files(self):
     mergedfile.write('$        BEGINNING NASTRAN BULK DATA\n')
     mergedfile.write('$______________________________________________\n')
     mergedfile.write('$______________________________________________\n')
-    skip_flag = False
-    for i in nastranlines:
-        if i[:5]=='PARAM': continue
-        if startnext==True:
-            if i.find(',') > -1:
-                mergedfile.write(i)
-            elif i.strip()[0:1] == '$':
-                continue
-            elif len(i.strip()) <= 1:
-                continue
-            elif i.find('ENDDATA') > -1:
-                continue
-            elif skip_flag:
-                if i[:8].strip() == '+':
-                    continue
-                else:
-                    skip_flag = False
-            elif i[:4] == 'CBAR':
-                mergedfile.write(i.strip()[:64] + '\n')
-                continue
-            if i[:8].strip() in self.newprops.keys():
-                pcard = i[:8].strip()
-                pid = int(i[8:16].strip())
-                if pid in self.newprops[ pcard ].keys():
-                    skip_flag = True
-                    continue
-            mergedfile.write(i.strip()[:72] + '\n')
-        if i.find('BEGIN BULK')>-1 and startnext==False:
-            startnext = True
+    with open(self.nastranfile.name, 'r') as nastranfile:
+        copy_bulk_data(nastranfile, mergedfile, skip_pids,
+                       getattr(self, 'newpids', None))
     mergedfile.write('ENDDATA\n')
     mergedfile.close()
@@ -3,7 +3,9 @@ import cPickle as pickle
 from pprint import pformat
 from collections import Iterable
 
-from .output_codes import OUTC, get_output_code
+import numpy as np
+
+from .output_codes import OUTC, DISP_CODES, get_output_code
 from .cards_opt import *
 from .cards_solver import *
 
@@ -28,6 +30,8 @@ class Genesis(object):
     `dlinks`            `dict` of :class:`.DLINK` objects
     `newprops`          `dict` with different NASTRAN cards, see
                           :meth:`.reset_newprops`
+    `newpids`           `dict` with the new property ids of the elements,
+                          see :meth:`.reset_newprops`
     `nodal_displ`       `dict` with the nodal displacements constraints as
                           detailed in :meth:`.nodal_displ_from_excel`
     `loads_list`        `list` containing the load cases' ids
@@ -37,6 +41,9 @@ class Genesis(object):
     `outputdir`         `str` path to the output directory
     `genesisfile`       `file` handler to GENESIS's output file
     `nastranfile`       `file` handler to NASTRAN's output file
+    `deck`              :class:`.DeckTemplate` or `None` with the executive
+                          control and optimization parameters, `None` for
+                          the default ones, see :meth:`.merge_temp_files`
     ==================  ======================================================
 
     """
@@ -50,6 +57,7 @@ class Genesis(object):
         self.dvars = {}
         self.dvar_codes = {}
         self.dlinks = {}
+        self._shared_deqatns = {}
         #TODO future implementation
         #self.externalDRESP3 = {}
         # Description
@@ -64,6 +72,7 @@ class Genesis(object):
         self.genesisfile = None
         self.nastranfile = None
         self.datname = None
+        self.deck = None
 
 
     def nodal_displ_from_excel(self, xls_file):
@@ -109,130 +118,18 @@ class Genesis(object):
             return None
 
         ex = Excel(xls_file)
-        found = False
-        for row in range(1, 100):
-            for col in range(1, 23):
-                refvalue = str(ex.get_cell(1, row, col))
-                if refvalue.find('DISPLACEMENT CONSTRAINTS') > -1:
-                    found = True
-                    break
-            if found:
-                break
-        nd = {}
-        irow = row + 2
         #TODO this try/except block is mainly to avoid Excel from being
         #     a defunct
         try:
-            for row in range(irow, 65536):
-                load_id = ex.get_cell(1, row, col)
-                if load_id.__class__.__name__ == 'NoneType':
-                    break
-                #
-                load_id = int(load_id)
-                node_id = ex.get_cell(1, row, col + 1)
-                node_id = int(node_id)
-                output = ex.get_cell(1, row, col + 2)
-                output = str(output)
-                minvalue = ex.get_cell(1, row, col + 3)
-                minvalue = float(minvalue)
-                maxvalue = ex.get_cell(1, row, col + 4)
-                maxvalue = float(maxvalue)
-                if not load_id in nd.keys():
-                    nd[load_id] = {}
-                if not node_id in nd[load_id].keys():
-                    nd[load_id][node_id] = {}
-                nd[load_id][node_id][output] = [minvalue, maxvalue]
+            values = ex.get_used_range(1)
             ex.close()
-            self.nodal_displ = nd
-
         except:
             ex.close()
             print('nodal_displ_from_excel() failed!')
 
             return None
 
-        for load_id in nd.keys():
-            for node_id in nd[load_id].keys():
-                for con_name in nd[load_id][node_id].keys():
-                    con_minvalue = nd[load_id][node_id][con_name][0]
-                    con_maxvalue = nd[load_id][node_id][con_name][1]
-
-                    for k, v in OUTC['DISP'].iteritems():
-                        if v.find(con_name) > -1:
-                            code = k
-                            break
-
-                    if code == 7:
-                        #DRESP1 x
-                        labelx = 'x' + str(node_id)
-                        dresp1 = DRESP1(labelx, 'DISP', '', '', 1, [node_id])
-                        self.dresps[dresp1.id] = dresp1
-                        dresp1xid = dresp1.id
-
-                        #DRESP1 y
-                        labely = 'y' + str(node_id)
-                        dresp1 = DRESP1(labely, 'DISP', '', '', 2, [node_id])
-                        self.dresps[dresp1.id] = dresp1
-                        dresp1yid = dresp1.id
-
-                        #DRESP1 z
-                        labelz = 'z' + str(node_id)
-                        dresp1 = DRESP1(labelz, 'DISP', '', '', 3, [node_id])
-                        self.dresps[dresp1.id] = dresp1
-                        dresp1zid = dresp1.id
-
-                        #DEQATN
-                        eq = ('T(%s,%s,%s)=SQRT(%s**2+%s**2+%s**2)' %
-                        (labelx, labely, labelz, labelx, labely, labelz))
-                        deqatn = DEQATN(eq)
-                        self.deqatns[deqatn.id] = deqatn
-
-                        #DRESP23
-                        label = 'r' + str(node_id)
-                        dresp23 =  DRESP23(label, deqatn.id)
-                        dresp23.add_dresp1(dresp1xid)
-                        dresp23.add_dresp1(dresp1yid)
-                        dresp23.add_dresp1(dresp1zid)
-                        self.dresps[dresp23.id] = dresp23
-
-                        #DCONS
-                        stress_type = 'positive'
-                        lid_lb_ub = [str(load_id), con_minvalue, con_maxvalue]
-                        self.dcons[dresp23.id] = DCONS(dresp23.id, lid_lb_ub,
-                                                       stress_type)
-                    elif (code == 8 or code == 9 or code == 10):
-                        #DRESP1
-                        label = 'a' + str(node_id)
-                        dresp1 = DRESP1(label, 'DISP', '', '', code, [node_id])
-                        self.dresps[dresp1.id] = dresp1
-
-                        #DEQATN
-                        eq = 'D(%s)=ABS(%s)' % (label, label)
-                        deqatn = DEQATN(eq)
-                        self.deqatns[deqatn.id] = deqatn
-
-                        #DRESP23
-                        label = 'r' + str(node_id)
-                        dresp23 = DRESP23(label, deqatn.id)
-                        dresp23.add_dresp1(dresp23.id)
-                        self.dresps[dresp23.id] = dresp23
-
-                        #DCONS
-                        stress_type = 'positive'
-                        lid_lb_ub = [str(load_id), con_minvalue, con_maxvalue]
-                        self.dcons[dresp23.id] = DCONS(dresp23.id, lid_lb_ub,
-                                                       stress_type)
-                    else:
-                        #DRESP1
-                        label = 'r' + str(node_id)
-                        dresp1 = DRESP1(label, 'DISP', '', '', code, [node_id])
-                        self.dresps[dresp1.id] = dresp1
-
-                        #DCONS
-                        stress_type = 'both'
-                        lid_lb_ub = [str(load_id), con_minvalue, con_maxvalue]
-                        self.dcons[dresp1.id] = DCONS(dresp1.id, lid_lb_ub,
-                                                      stress_type)
+        return self._nodal_displ_from_values(values, xls_file)
 
 
     def dlinks_from_excel(self, xls_file):
@@ -261,53 +158,249 @@ class Genesis(object):
         from structmanager.excel import Excel
 
         ex = Excel(xls_file)
-        found = False
         print('Reading Excel File %s...' % xls_file)
-        for row in range(1, 101):
-            for col in range(1, 256):
-                rvalue = ex.get_cell(1, row, col)
-                if 'DLINK' == rvalue:
-                    found = True
-                    break
-            if found:
-                break
-        dlinks = {}
-        count = -1
-        irow = row + 3
-        for row in range(irow, 65536):
-            dvar_code = ex.get_cell(1, row, col)
-            if dvar_code is None:
-                break
-            print('    creating DLINK for variable: %s' % dvar_code)
-            c0 = ex.get_cell(1, row, col + 1)
-            c = ex.get_cell(1, row, col + 2)
-            ivar_code_1 = ex.get_cell(1, row, col + 3)
-            c_1 = ex.get_cell(1, row, col + 4)
-            ivar_code_2 = ex.get_cell(1, row, col + 5)
-            c_2 = ex.get_cell(1, row, col + 6)
-            ivar_code_3 = ex.get_cell(1, row, col + 7)
-            c_3 = ex.get_cell(1, row, col + 8)
+        try:
+            values = ex.get_used_range(1)
+        finally:
+            ex.close()
+        self._dlinks_from_values(values, xls_file)
+
+
+    def nodal_displ_from_table(self, path, sheet=1):
+        """Create nodal displacement constraints based on a workbook or CSV
+
+        Same as :meth:`.nodal_displ_from_excel`, but the whole sheet is read
+        at once using :func:`.read_sheet`, without requiring Excel. The table
+        starts two rows below the cell containing `'DISPLACEMENT
+        CONSTRAINTS'`, with the columns: load case id, grid id, output,
+        minimum and maximum values.
+
+        Parameters
+        ----------
+        path : str
+            The path to the workbook (`.xlsx` or `.xlsm`) or to a CSV file.
+        sheet : int or str, optional
+            The worksheet index starting at ``1`` or the worksheet name.
+
+        Returns
+        -------
+        nd : dict
+            The nodal displacement constraints, also stored in the attribute
+            `nodal_displ`.
+
+        """
+        from structmanager.excel.reader import read_sheet
+
+        return self._nodal_displ_from_values(read_sheet(path, sheet), path)
+
+
+    def _nodal_displ_from_values(self, values, path):
+        from structmanager.excel.reader import find_anchor, read_block
+
+        anchor = find_anchor(values, 'DISPLACEMENT CONSTRAINTS', exact=False)
+        if anchor is None:
+            raise ValueError('"DISPLACEMENT CONSTRAINTS" not found in %s' %
+                             path)
+        row, col = anchor
+        block = read_block(values, row + 2, col, ncols=5)
+        load_ids = block[:, 0].astype(np.float64).astype(np.int64)
+        node_ids = block[:, 1].astype(np.float64).astype(np.int64)
+        outputs = [str(output).strip() for output in block[:, 2]]
+        minvalues = block[:, 3].astype(np.float64)
+        maxvalues = block[:, 4].astype(np.float64)
+
+        nd = {}
+        for load_id, node_id, output, minvalue, maxvalue in zip(
+                load_ids.tolist(), node_ids.tolist(), outputs,
+                minvalues.tolist(), maxvalues.tolist()):
+            nd.setdefault(load_id, {}).setdefault(node_id, {})[output] = \
+                    [minvalue, maxvalue]
+        self.nodal_displ = nd
+        self.constrain_nodal_displ(load_ids, node_ids, outputs, minvalues,
+                                   maxvalues)
+
+        return nd
+
 
+    def dlinks_from_table(self, path, sheet=1):
+        """Read links between variables from a workbook or CSV
+
+        Same as :meth:`.dlinks_from_excel`, but the whole sheet is read at
+        once using :func:`.read_sheet`, without requiring Excel. Any number of
+        independent variables can be given in each row.
+
+        Parameters
+        ----------
+        path : str
+            The path to the workbook (`.xlsx` or `.xlsm`) or to a CSV file.
+        sheet : int or str, optional
+            The worksheet index starting at ``1`` or the worksheet name.
+
+        """
+        from structmanager.excel.reader import read_sheet
+
+        self._dlinks_from_values(read_sheet(path, sheet), path)
+
+
+    def _dlinks_from_values(self, values, path):
+        from structmanager.excel.reader import find_anchor, read_block
+
+        anchor = find_anchor(values, 'DLINK')
+        if anchor is None:
+            raise ValueError('"DLINK" not found in %s' % path)
+        row, col = anchor
+        block = read_block(values, row + 3, col)
+        if block.shape[0] == 0:
+            return
+        ncols = block.shape[1] - (block.shape[1] - 3) % 2
+        c0s = block[:, 1].astype(np.float64)
+        cs = block[:, 2].astype(np.float64)
+        ivar_codes = block[:, 3:ncols:2]
+        ivar_cs = block[:, 4:ncols:2]
+        ivar_used = ~np.equal(ivar_codes, None)
+
+        for i, dvar_code in enumerate(block[:, 0].tolist()):
             dvar = self.dvar_codes[dvar_code]
-            ivar_1 = self.dvar_codes[ivar_code_1]
+            dvi_ci = []
+            for ivar_code, ci in zip(ivar_codes[i, ivar_used[i]].tolist(),
+                                     ivar_cs[i, ivar_used[i]].tolist()):
+                try:
+                    ci = float(ci)
+                except (TypeError, ValueError):
+                    ci = str(ci)
+                dvi_ci += [self.dvar_codes[ivar_code].id, ci]
+            dlink = DLINK(dvar.id, dvi_ci, c0=c0s[i], cmult=cs[i])
+            self.dlinks[dlink.id] = dlink
+
 
-            try:
-                dvi_ci = [ivar_1.id, float(c_1)]
-            except:
-                dvi_ci = [ivar_1.id, str(c_1)]
+    def _create_nodal_displ_cons(self, nd):
+        """Create the nodal displacement constraints
 
-            if ivar_code_2.__class__.__name__ <> 'NoneType':
-                ivar_2 = self.dvar_codes[ivar_code_2]
-                dvi_ci = dvi_ci + [ivar_2.id, float(c_2)]
+        Parameters
+        ----------
+        nd : dict
+            The nodal displacement constraints in the format detailed in
+            :meth:`.nodal_displ_from_excel`.
 
-            if ivar_code_3.__class__.__name__ <> 'NoneType':
-                ivar_3 = self.dvar_codes[ivar_code_3]
-                dvi_ci = dvi_ci + [ivar_3.id, float(c_3)]
+        """
+        load_ids = []
+        node_ids = []
+        outputs = []
+        minvalues = []
+        maxvalues = []
+        for load_id, nodes in nd.items():
+            for node_id, cons in nodes.items():
+                for output, (minvalue, maxvalue) in cons.items():
+                    load_ids.append(load_id)
+                    node_ids.append(node_id)
+                    outputs.append(output)
+                    minvalues.append(minvalue)
+                    maxvalues.append(maxvalue)
+        self.constrain_nodal_displ(load_ids, node_ids, outputs, minvalues,
+                                   maxvalues)
+
+
+    def _shared_deqatn(self, eq):
+        deqatn = self._shared_deqatns.get(eq)
+        if deqatn is None:
+            deqatn = DEQATN(eq)
+            self.deqatns[deqatn.id] = deqatn
+            self._shared_deqatns[eq] = deqatn
+        return deqatn
+
+
+    def constrain_nodal_displ(self, load_ids, node_ids, outputs, minvalues,
+                              maxvalues):
+        """Create nodal displacement constraints from arrays
+
+        Each grid and output gets one response, constrained for all the given
+        load cases with a single :class:`.DCONS`. The total translation and
+        the absolute values are computed with :class:`.DRESP2` responses that
+        share one :class:`.DEQATN` per output type.
 
-            count += 1
-            self.dlinks[count] = DLINK(dvar.id, dvi_ci, c0=c0, cmult=c)
+        Parameters
+        ----------
+        load_ids : array-like
+            The load case ids.
+        node_ids : array-like
+            The grid ids.
+        outputs : array-like
+            The output names, as listed in :meth:`.nodal_displ_from_excel`,
+            or the corresponding output codes.
+        minvalues, maxvalues : array-like
+            The minimum and maximum displacement values.
+
+        Scalar inputs are broadcast to the length of the other arrays.
+
+        """
+        load_ids, node_ids, outputs, minvalues, maxvalues = [
+            np.atleast_1d(a) for a in np.broadcast_arrays(
+                np.asarray(load_ids, dtype=np.int64),
+                np.asarray(node_ids, dtype=np.int64),
+                np.asarray(outputs),
+                np.asarray(minvalues, dtype=np.float64),
+                np.asarray(maxvalues, dtype=np.float64))]
+        if load_ids.shape[0] == 0:
+            return
+
+        # resolving the output codes only once per distinct output
+        uoutputs, inverse = np.unique(outputs.astype(str), return_inverse=True)
+        ucodes = []
+        for output in uoutputs.tolist():
+            output = output.strip()
+            if output.isdigit() and int(output) in OUTC['DISP']:
+                ucodes.append(int(output))
+            elif output.upper() in DISP_CODES:
+                ucodes.append(DISP_CODES[output.upper()])
+            else:
+                raise ValueError('Invalid displacement output: %s' % output)
+        codes = np.array(ucodes, dtype=np.int64)[inverse.ravel()]
+
+        # one response per grid and output, sorted such that the load cases
+        # of each response are contiguous
+        order = np.lexsort((load_ids, codes, node_ids))
+        node_ids = node_ids[order]
+        codes = codes[order]
+        lids = load_ids[order].astype(str)
+        minvalues = minvalues[order]
+        maxvalues = maxvalues[order]
+        new = np.ones(order.shape[0], dtype=bool)
+        new[1:] = (node_ids[1:] != node_ids[:-1]) | (codes[1:] != codes[:-1])
+        starts = np.flatnonzero(new)
+        ends = np.append(starts[1:], order.shape[0])
+
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            node_id = int(node_ids[start])
+            code = int(codes[start])
+            if code == 7:
+                deqatn = self._shared_deqatn('T(x,y,z)=SQRT(x**2+y**2+z**2)')
+                dresp = DRESP2('r' + str(node_id), deqatn.id)
+                for label, atta in (('x', 1), ('y', 2), ('z', 3)):
+                    dresp1 = DRESP1(label + str(node_id), 'DISP', '', '',
+                                    atta, [node_id])
+                    self.dresps[dresp1.id] = dresp1
+                    dresp.add_dresp1(dresp1.id)
+                stress_type = 'positive'
+            elif code in (8, 9, 10):
+                deqatn = self._shared_deqatn('D(a)=ABS(a)')
+                dresp = DRESP2('r' + str(node_id), deqatn.id)
+                dresp1 = DRESP1('a' + str(node_id), 'DISP', '', '', code,
+                                [node_id])
+                self.dresps[dresp1.id] = dresp1
+                dresp.add_dresp1(dresp1.id)
+                stress_type = 'positive'
+            else:
+                dresp = DRESP1('r' + str(node_id), 'DISP', '', '', code,
+                               [node_id])
+                stress_type = 'both'
+            self.dresps[dresp.id] = dresp
 
-        ex.close()
+            lid_lb_ub = np.empty((end - start, 3), dtype=object)
+            lid_lb_ub[:, 0] = lids[start:end]
+            lid_lb_ub[:, 1] = minvalues[start:end].tolist()
+            lid_lb_ub[:, 2] = maxvalues[start:end].tolist()
+            self.dcons[dresp.id] = DCONS(dresp.id, lid_lb_ub.ravel().tolist(),
+                                         stress_type)
 
 
     def set_output_file(self, path):
@@ -364,7 +457,8 @@ class Genesis(object):
         """Reset the dictionary `newprops`.
 
         This dictionary contains NASTRAN property cards that should be created
-        along with the optimization model.
+        along with the optimization model. The dictionary `newpids` maps the
+        element ids to the new property ids of the elements moved to them.
 
         The supported cards are those corresponding to the classes defined in
         :mod:`.cards_solver`.
@@ -377,6 +471,7 @@ class Genesis(object):
         self.newprops['PBEAM'] = {}
         self.newprops['PBEAML'] = {}
         self.newprops['PCOMP'] = {}
+        self.newpids = {}
 
 
     def create_dvars(self):
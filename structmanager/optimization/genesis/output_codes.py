@@ -10,6 +10,11 @@ throught::
     from output_codes import OUTC
 
 """
+import numpy as np
+
+from ...token_index import build_index
+from ..sol200.output_codes import OUTC as NASTRAN_OUTC
+
 OUTC={} # OUTC ==> output_code
 OUTC['DISP'] = {}
 OUTC['DISP'][1]  = 'Translation X'
@@ -22,8 +27,13 @@ OUTC['DISP'][7]  = 'Translation Total'
 OUTC['DISP'][8]  = 'Absolute X'
 OUTC['DISP'][9]  = 'Absolute Y'
 OUTC['DISP'][10] = 'Absolute Z'
-for key in OUTC['DISP'].keys():
+for key in list(OUTC['DISP'].keys()):
     OUTC['DISP'][OUTC['DISP'][key]] = key
+# reverse index of the displacement outputs, accepting any letter case
+DISP_CODES = {}
+for key in OUTC['DISP'].keys():
+    if isinstance(key, int):
+        DISP_CODES[OUTC['DISP'][key].upper()] = key
 OUTC['STRESS'] = {}
 OUTC['STRESS']['SOLID'] = {}
 OUTC['STRESS']['SOLID'][1] = 'Max shear Bottom'
@@ -40,9 +50,10 @@ OUTC['STRESS']['SOLID'][11] = 'Minor Principal Top'
 OUTC['STRESS']['SOLID'][12] = 'Normal X Top'
 OUTC['STRESS']['SOLID'][13] = 'Normal Y Top'
 OUTC['STRESS']['SOLID'][14] = 'Shear XY Top'
-for key in OUTC['STRESS']['SOLID'].keys():
+for key in list(OUTC['STRESS']['SOLID'].keys()):
     value = OUTC['STRESS']['SOLID'][key]
     OUTC['STRESS']['SOLID'][value] = key
+OUTC['STRESS']['SHELL'] = OUTC['STRESS']['SOLID']
 OUTC['STRESS']['SQUARE'] = {}
 OUTC['STRESS']['SQUARE'][1]  = 'Normal X Point 1 at end A'
 OUTC['STRESS']['SQUARE'][2]  = 'Normal X Point 2 at end A'
@@ -60,28 +71,98 @@ OUTC['STRESS']['SQUARE'][13] = 'Shear XZ Point 13 at end B'
 OUTC['STRESS']['SQUARE'][14] = 'Shear XY Point 14 at end B'
 OUTC['STRESS']['SQUARE'][15] = 'Shear XZ Point 15 at end B'
 OUTC['STRESS']['SQUARE'][16] = 'Shear XY Point 16 at end B'
-for key in OUTC['STRESS']['SQUARE'].keys():
+for key in list(OUTC['STRESS']['SQUARE'].keys()):
     value = OUTC['STRESS']['SQUARE'][key]
     OUTC['STRESS']['SQUARE'][value] = key
 OUTC['STRESS']['RECT'] = OUTC['STRESS']['SQUARE']
-#        OUTC['FORCE'] = {}
-#        OUTC['FORCE']['BAR'] = {}
-#        OUTC['FORCE']['BAR'][1] = 'Axial force at end A'
-#        OUTC['FORCE']['BAR'][2] = 'Shear in plane 1 at end A'
-#        OUTC['FORCE']['BAR'][3] = 'Shear in plane 2 at end A'
-#        OUTC['FORCE']['BAR'][4] = 'Torque at end A'
-#        OUTC['FORCE']['BAR'][5] = 'Moment in plane 2 at end A'
-#        OUTC['FORCE']['BAR'][6] = 'Moment in plane 1 at end A'
-#        OUTC['FORCE']['BAR'][7] = 'Axial force at end B'
-#        OUTC['FORCE']['BAR'][8] = 'Shear in plane 1 at end B'
-#        OUTC['FORCE']['BAR'][9] = 'Shear in plane 2 at end B'
-#        OUTC['FORCE']['BAR'][10] = 'Torque at end B'
-#        OUTC['FORCE']['BAR'][11] = 'Moment in plane 2 at end B'
-#        OUTC['FORCE']['BAR'][12] = 'Moment in plane 1 at end B'
+OUTC['FORCE'] = {}
+OUTC['FORCE']['BAR'] = {}
+OUTC['FORCE']['BAR'][1] = 'Axial force at end A'
+OUTC['FORCE']['BAR'][2] = 'Shear in plane 1 at end A'
+OUTC['FORCE']['BAR'][3] = 'Shear in plane 2 at end A'
+OUTC['FORCE']['BAR'][4] = 'Torque at end A'
+OUTC['FORCE']['BAR'][5] = 'Moment in plane 2 at end A'
+OUTC['FORCE']['BAR'][6] = 'Moment in plane 1 at end A'
+OUTC['FORCE']['BAR'][7] = 'Axial force at end B'
+OUTC['FORCE']['BAR'][8] = 'Shear in plane 1 at end B'
+OUTC['FORCE']['BAR'][9] = 'Shear in plane 2 at end B'
+OUTC['FORCE']['BAR'][10] = 'Torque at end B'
+OUTC['FORCE']['BAR'][11] = 'Moment in plane 2 at end B'
+OUTC['FORCE']['BAR'][12] = 'Moment in plane 1 at end B'
+for key in list(OUTC['FORCE']['BAR'].keys()):
+    value = OUTC['FORCE']['BAR'][key]
+    OUTC['FORCE']['BAR'][value] = key
+OUTC['FORCE']['SHELL'] = {}
+OUTC['FORCE']['SHELL'][1] = 'Membrane force X'
+OUTC['FORCE']['SHELL'][2] = 'Membrane force Y'
+OUTC['FORCE']['SHELL'][3] = 'Membrane force XY'
+OUTC['FORCE']['SHELL'][4] = 'Bending moment X'
+OUTC['FORCE']['SHELL'][5] = 'Bending moment Y'
+OUTC['FORCE']['SHELL'][6] = 'Twisting moment XY'
+OUTC['FORCE']['SHELL'][7] = 'Transverse shear X'
+OUTC['FORCE']['SHELL'][8] = 'Transverse shear Y'
+for key in list(OUTC['FORCE']['SHELL'].keys()):
+    value = OUTC['FORCE']['SHELL'][key]
+    OUTC['FORCE']['SHELL'][value] = key
+
+# GENESIS names of the NASTRAN outputs, by response type and NASTRAN element
+# type, with the GENESIS element type
+NASTRAN_NAMES = {}
+NASTRAN_NAMES['STRESS', 'CBAR'] = ('RECT', {
+    'End A-Point C': 'Normal X Point 1 at end A',
+    'End A-Point D': 'Normal X Point 2 at end A',
+    'End A-Point E': 'Normal X Point 3 at end A',
+    'End A-Point F': 'Normal X Point 4 at end A',
+    'End B-Point C': 'Normal X Point 9 at end B',
+    'End B-Point D': 'Normal X Point 10 at end B',
+    'End B-Point E': 'Normal X Point 11 at end B',
+    'End B-Point F': 'Normal X Point 12 at end B',
+    })
+NASTRAN_NAMES['FORCE', 'CBAR'] = ('BAR', {
+    'Bending End A plane 1': 'Moment in plane 1 at end A',
+    'Bending End A plane 2': 'Moment in plane 2 at end A',
+    'Bending End B plane 1': 'Moment in plane 1 at end B',
+    'Bending End B plane 2': 'Moment in plane 2 at end B',
+    'Shear plane 1': 'Shear in plane 1 at end A',
+    'Shear plane 2': 'Shear in plane 2 at end A',
+    'Axial force': 'Axial force at end A',
+    'Torque': 'Torque at end A',
+    })
+NASTRAN_NAMES['STRESS', 'CQUAD4'] = ('SHELL', {
+    'Normal x at Z1': 'Normal X Bottom',
+    'Normal y at Z1': 'Normal Y Bottom',
+    'Shear xy at Z1': 'Shear XY Bottom',
+    'Major principal at Z1': 'Major Principal Bottom',
+    'Minor principal at Z1': 'Minor Principal Bottom',
+    'von Mises or maximum shear at Z1': 'von Mises Bottom',
+    'Normal x at Z2': 'Normal X Top',
+    'Normal y at Z2': 'Normal Y Top',
+    'Shear xy at Z2': 'Shear XY Top',
+    'Major principal at Z2': 'Major Principal Top',
+    'Minor principal at Z2': 'Minor Principal Top',
+    'von Mises or maximum shear at Z2': 'von Mises Top',
+    })
+NASTRAN_NAMES['FORCE', 'CQUAD4'] = ('SHELL', {
+    'Membrane force x': 'Membrane force X',
+    'Membrane force y': 'Membrane force Y',
+    'Membrane force xy': 'Membrane force XY',
+    'Bending moment x': 'Bending moment X',
+    'Bending moment y': 'Bending moment Y',
+    'Bending moment xy': 'Twisting moment XY',
+    'Shear x': 'Transverse shear X',
+    'Shear y': 'Transverse shear Y',
+    })
+
+INDEX = build_index(OUTC)
+
 
 def get_output_code(rtype, eltype, outstr):
     """Translate an output string into a code
 
+    Names not found exactly are matched by their words through
+    :data:`.INDEX`, e.g. `'Point 4 end A'` matches `'Normal X Point 4 at end
+    A'`.
+
     Parameters
     ----------
     rtype : str
@@ -101,6 +182,86 @@ def get_output_code(rtype, eltype, outstr):
 
     """
     if type(outstr) is str:
-        return OUTC[rtype][eltype][outstr]
+        table = OUTC[rtype][eltype]
+        if outstr in table:
+            return table[outstr]
+        code = INDEX[rtype][eltype].find(outstr)
+        if code is None:
+            raise ValueError('Matching output code not found for "%s"' %
+                             outstr)
+        return code
     else:
         return outstr
+
+
+def get_output_codes(rtype, eltype, names):
+    """Translate many output strings into codes at once
+
+    Parameters
+    ----------
+    rtype : str
+        Response type.
+    eltype : str
+        Element type.
+    names : array-like
+        The output strings, see :func:`.get_output_code`.
+
+    Returns
+    -------
+    codes : np.ndarray
+        The output codes.
+
+    """
+    names = np.atleast_1d(np.asarray(names, dtype=str))
+    unames, inverse = np.unique(names, return_inverse=True)
+    ucodes = [get_output_code(rtype, eltype, name)
+              for name in unames.tolist()]
+    return np.array(ucodes, dtype=np.int64)[inverse.ravel()]
+
+
+def from_nastran(rtype, eltype, atta):
+    """Translate a NASTRAN output code into a GENESIS code
+
+    The NASTRAN name of the output is translated through
+    :data:`.NASTRAN_NAMES` and looked up with :func:`.get_output_code`. The
+    displacement components are the same in both solvers.
+
+    Parameters
+    ----------
+    rtype : str
+        Response type.
+    eltype : str
+        NASTRAN element type, such as `'CBAR'`.
+    atta : int or str
+        The NASTRAN output code or its name. Strings not found among the
+        NASTRAN names are taken as GENESIS names.
+
+    Returns
+    -------
+    code : int
+        The GENESIS output code.
+
+    """
+    if rtype == 'DISP':
+        if type(atta) is not str:
+            return atta
+        if atta.upper() not in DISP_CODES:
+            raise ValueError('Unknown displacement output "%s"' % atta)
+        return DISP_CODES[atta.upper()]
+    if (rtype, eltype) not in NASTRAN_NAMES:
+        raise ValueError('Output of %s %s not supported by GENESIS' %
+                         (eltype, rtype))
+    geltype, names = NASTRAN_NAMES[rtype, eltype]
+    if type(atta) is not str:
+        table = NASTRAN_OUTC[rtype][eltype]
+        found = [k for k, v in table.items() if v == atta]
+        if not found:
+            raise ValueError('Unknown %s %s output code %s' %
+                             (eltype, rtype, atta))
+        atta = found[0]
+    if atta in names:
+        atta = names[atta]
+    elif atta in NASTRAN_OUTC[rtype][eltype]:
+        raise ValueError('Output "%s" of %s %s not supported by GENESIS' %
+                         (atta, eltype, rtype))
+    return get_output_code(rtype, geltype, atta)
@@ -0,0 +1,17 @@
+from structmanager.optimization.genesis.output_codes import (OUTC,
+                                                             get_output_code)
+
+
+def test_all_names():
+    for rtype, tables in OUTC.items():
+        for eltype, table in tables.items():
+            if not isinstance(table, dict):
+                continue
+            for name, code in table.items():
+                if isinstance(name, str):
+                    assert get_output_code(rtype, eltype, name) == code, (
+                        rtype, eltype, name)
+
+
+if __name__ == '__main__':
+    test_all_names()
@@ -0,0 +1,140 @@
+import os
+import shutil
+import tempfile
+
+from structmanager.optimization.genesis.deck import (DeckTemplate,
+                                                     count_elements)
+from structmanager.optimization.genesis.files import merge_temp_files
+from structmanager.optimization.sol200.topometry import TopometryResults
+
+
+BULK = ('CQUAD4  1       1       1       2       3       4\n')
+
+
+class Model(object):
+    def __init__(self, tmpdir, deck=None, bulk=BULK):
+        self.genesisfile = open(os.path.join(tmpdir, 'genesis.tmp'), 'w')
+        self.genesisfile.write('DESVAR,1,T1,1.,0.1,10.\n')
+        self.nastranfile = open(os.path.join(tmpdir, 'nastran.tmp'), 'w')
+        self.nastranfile.write('SOL 101\nCEND\nBEGIN BULK\n'
+                               'PARAM,POST,-1\n' + bulk + 'ENDDATA\n')
+        self.datname = os.path.join(tmpdir, 'merged.dat')
+        self.newprops = {'PSHELL': {}}
+        self.dvars = {1: None}
+        self.loads_list = [10]
+        self.spcs_list = [20]
+        self.num_cycles = 15
+        self.deck = deck
+
+
+def merged_lines(deck):
+    tmpdir = tempfile.mkdtemp()
+    try:
+        model = Model(tmpdir, deck)
+        merge_temp_files(model)
+        with open(model.datname) as f:
+            return f.read().splitlines()
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_default_deck():
+    lines = merged_lines(None)
+    assert lines[:7] == ['$ Executive Control', '$', 'POST = PUNCH',
+                         'SOL COMPAT1', 'THREADS = 8', 'LENVEC=16000M',
+                         'CEND']
+    assert 'DSCREEN,STRESS,-0.5,80' in lines
+    i = lines.index('DOPT,15')
+    assert lines[i+1:i+5] == ['+,IREDCA,22222', '+,OPTM,1', '+,DELX,0.5',
+                              '+,DXMIN,0.1']
+    assert 'PARAM,POST,-1' not in lines
+    assert lines[-2:] == ['CQUAD4  1       1       1       2       3'
+                          '       4', 'ENDDATA']
+
+
+def test_auto_deck():
+    deck = DeckTemplate(auto=True, threads=2)
+    lines = merged_lines(deck)
+    assert 'THREADS = 2' in lines
+    # at least 20 retained constraints
+    assert 'DSCREEN,STRESS,-0.5,20' in lines
+    assert DeckTemplate().auto is False
+
+
+def test_count_elements():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmpdir, 'model.bdf')
+        with open(path, 'w') as f:
+            f.write('SOL 101\n'
+                    'CEND\n'
+                    'CSTRESS = ALL\n'
+                    'begin bulk\n'
+                    '$ CQUAD4 comment\n'
+                    'CORD2R,1,0,0.,0.,0.,0.,0.,1.\n'
+                    '+,1.,0.,0.\n'
+                    'CONM2,9,4,,1.\n'
+                    'CQUAD4  1       1       1       2       3       4\n'
+                    'CTRIA3,2,1,1,2,3\n'
+                    'CBAR*   3               2               1\n'
+                    '*       2\n'
+                    'ENDDATA\n'
+                    'CROD,4,1,1,2\n')
+        assert count_elements(path) == 3
+        # bulk data only
+        with open(path, 'w') as f:
+            f.write('CQUAD4,1,1,1,2,3,4\nCHEXA,2,1,1,2,3,4,5,6\n')
+        assert count_elements(path) == 2
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+class SE(object):
+    def __init__(self, name, eids):
+        self.name = name
+        self.eids = eids
+
+
+def test_topometry_properties():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        pch = os.path.join(tmpdir, 'topo.pch')
+        with open(pch, 'w') as f:
+            f.write('1 1.0\n2 1.1\n3 4.0\n')
+        bulk = ('PSHELL  1       1       2.0\n'
+                'CQUAD4  1       1       1       2       3       4\n'
+                'CTRIA3,2,1,2,3,5\n'
+                'CQUAD4* 3               1               3               4\n'
+                '*       5               6\n'
+                'CQUAD4  4       1       4       5       6       7\n')
+        model = Model(tmpdir, bulk=bulk)
+        model.newprops = {}
+        res = TopometryResults(pch)
+        res.create_properties([SE('a', [1, 2, 3])], model, maxgrad=2.,
+                              pid0=9000000, mid=1)
+        pshells = model.newprops['PSHELL']
+        assert sorted(pshells.keys()) == [9000000, 9000001]
+        for pshell in pshells.values():
+            pshell.print_card(model.genesisfile)
+        merge_temp_files(model)
+        with open(model.datname) as f:
+            lines = f.read().splitlines()
+    finally:
+        shutil.rmtree(tmpdir)
+    assert 'PSHELL,9000000,1,1.1,1,1.0,,0.833333,0.0' in lines
+    assert 'PSHELL,9000001,1,4.0,1,1.0,,0.833333,0.0' in lines
+    # the elements point to the new properties
+    assert 'CQUAD4  1        90000001       2       3       4' in lines
+    assert 'CTRIA3,2,9000000,2,3,5' in lines
+    assert ('CQUAD4* 3                        90000013               4'
+            in lines)
+    # elements without results keep their property
+    assert 'CQUAD4  4       1       4       5       6       7' in lines
+    assert 'PSHELL  1       1       2.0' in lines
+
+
+if __name__ == '__main__':
+    test_default_deck()
+    test_auto_deck()
+    test_count_elements()
+    test_topometry_properties()
@@ -1,3 +1,4 @@
 from .cards_opt import *
 from .cards_solver import *
 from .sol200 import SOL200
+from .dvar_array import DESVARArray
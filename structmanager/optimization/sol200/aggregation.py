@@ -0,0 +1,133 @@
+"""
+Constraint aggregation (:mod:`structmanager.sol200.aggregation`)
+=================================================================
+
+.. currentmodule:: structmanager.sol200.aggregation
+
+Many responses of one SE, such as the element stresses, can be replaced by a
+single smooth upper bound of their maximum, computed with a :class:`.DRESP2`:
+
+- Kreisselmeier-Steinhauser (`'KS'`)::
+
+    KS = M + LOG(SUM(EXP(rho*(x_i - M))))/rho,  M = MAX(x_i)
+
+- p-norm (`'PNORM'`)::
+
+    PN = M*SUM((ABS(x_i)/M)**p)**(1/p),  M = MAX(ABS(x_i))
+
+The responses are first divided by the allowable, such that the aggregated
+response is constrained to be at most `1`. Large groups are aggregated
+hierarchically in chunks, keeping the size of each :class:`.DEQATN` bounded.
+One equation is shared by all the DRESP2 with the same number of arguments.
+
+"""
+from __future__ import division
+
+from .cards_opt import DRESP2
+
+
+AGGREGATIONS = {'KS': 50., 'PNORM': 20.}
+
+
+def aggregation_equation(kind, n, param, scaled=True):
+    """Equation aggregating `n` responses
+
+    Parameters
+    ----------
+    kind : str
+        `'KS'` or `'PNORM'`.
+    n : int
+        The number of responses.
+    param : float
+        The parameter `rho` of `'KS'` or the exponent `p` of `'PNORM'`.
+    scaled : bool, optional
+        If ``True`` the first argument `F` divides all the responses.
+
+    Returns
+    -------
+    eq : str
+        The equation, see :class:`.DEQATN`.
+
+    """
+    param = repr(float(param))
+    xs = ['X%d' % (i + 1) for i in range(n)]
+    args = (['F'] if scaled else []) + xs
+    div = '/F' if scaled else ''
+    if kind == 'KS':
+        eq = ('M(%s)=MAX(%s)%s;' % (','.join(args), ','.join(xs), div) +
+              'KS=M+LOG(%s)/%s' % ('+'.join(['EXP(%s*(%s%s-M))' %
+                                             (param, x, div)
+                                             for x in xs]), param))
+    elif kind == 'PNORM':
+        eq = ('M(%s)=MAX(%s,1.E-30)%s;' % (','.join(args),
+              ','.join(['ABS(%s)' % x for x in xs]), div) +
+              'PN=M*(%s)**(1./%s)' % ('+'.join(['(ABS(%s)%s/M)**%s' %
+                                                (x, div, param)
+                                                for x in xs]), param))
+    else:
+        raise ValueError('Invalid aggregation: %s' % kind)
+    return eq
+
+
+def aggregate_responses(optmodel, rids, allow, kind='KS', param=None,
+                        chunk=32, label='AGG'):
+    """Aggregate many responses into one normalized response
+
+    Parameters
+    ----------
+    optmodel : :class:`.SOL200`
+        The optimization model receiving the cards.
+    rids : list
+        The ids of the responses to be aggregated.
+    allow : float
+        The allowable dividing the responses.
+    kind : str, optional
+        `'KS'` or `'PNORM'`.
+    param : float or None, optional
+        The parameter `rho` of `'KS'` or the exponent `p` of `'PNORM'`, see
+        :data:`.AGGREGATIONS` for the default values.
+    chunk : int, optional
+        The maximum number of responses aggregated by one :class:`.DRESP2`.
+    label : str, optional
+        The label of the created responses.
+
+    Returns
+    -------
+    dresps : list
+        The created :class:`.DRESP2` objects. The last one is the aggregated
+        response.
+
+    """
+    kind = kind.upper()
+    if kind not in AGGREGATIONS:
+        raise ValueError('Invalid aggregation: %s' % kind)
+    if param is None:
+        param = AGGREGATIONS[kind]
+    rids = list(rids)
+    if len(rids) == 0:
+        raise ValueError('No responses to aggregate')
+    if chunk < 2:
+        raise ValueError('chunk must be at least 2')
+    key = optmodel._shared_dtable('AGGF', allow)
+    dresps = []
+    level = rids
+    scaled = True
+    while len(level) > 1 or scaled:
+        upper = []
+        for i in range(0, len(level), chunk):
+            group = level[i:i + chunk]
+            eq = aggregation_equation(kind, len(group), param, scaled)
+            dresp = DRESP2(label, optmodel._shared_deqatn(eq).id)
+            if scaled:
+                dresp.add_dtable(key)
+            for rid in group:
+                if isinstance(optmodel.dresps.get(rid), DRESP2):
+                    dresp.add_dresp2(rid)
+                else:
+                    dresp.add_dresp1(rid)
+            optmodel.dresps[dresp.id] = dresp
+            dresps.append(dresp)
+            upper.append(dresp.id)
+        level = upper
+        scaled = False
+    return dresps
@@ -0,0 +1,330 @@
+"""
+Solver backends (:mod:`structmanager.sol200.backends`)
+=======================================================
+
+.. currentmodule:: structmanager.sol200.backends
+
+The solvers called by the :class:`.Driver` at each design cycle. A backend
+is any object with the methods of :class:`.Backend`, returning the element
+forces of a design as a :class:`.Solution`. Available are
+:class:`.LinearFEBackend`, solving the local :class:`.LinearFE` model with
+the force and mass derivatives, and :class:`.StructModelBackend`, running an
+external solver and reading the element forces of the SEs from its op2 file.
+
+The design variables are mapped to the properties with the DVPREL1 and
+DVPREL2 relations of the optimization model, see :class:`.PropertyMap`.
+
+"""
+from __future__ import division
+
+import numpy as np
+
+from .cards_opt import DVPREL1, DVPREL2
+from .equations import BUILTINS, compile_deqatn
+from .screening import ElementForces
+
+
+def design_variables(optmodel):
+    """Design variables of an optimization model sorted by id
+
+    Returns
+    -------
+    dvids, xinit, xlb, xub : np.ndarray
+        The ids, the initial values and the bounds.
+
+    """
+    ids = [np.array(list(optmodel.dvars.keys()), dtype=np.int64)]
+    values = [np.array([[d.xinit, d.xlb, d.xub] for d in
+                        optmodel.dvars.values()],
+                       dtype=np.float64).reshape(-1, 3)]
+    for dvar_array in optmodel.dvar_arrays:
+        ids.append(dvar_array.ids)
+        values.append(np.column_stack((dvar_array.xinit, dvar_array.xlb,
+                                       dvar_array.xub)))
+    ids = np.concatenate(ids)
+    values = np.concatenate(values)
+    order = np.argsort(ids, kind='mergesort')
+    return (ids[order], values[order, 0], values[order, 1],
+            values[order, 2])
+
+
+def update_design(optmodel, dvids, x):
+    """Set the initial values of the design variables
+
+    Parameters
+    ----------
+    optmodel : :class:`.SOL200`
+        The optimization model.
+    dvids : array-like
+        The DESVAR ids.
+    x : array-like
+        The new values.
+
+    """
+    x = dict(zip(np.asarray(dvids).tolist(),
+                 np.asarray(x, dtype=np.float64).tolist()))
+    for dvid, dvar in optmodel.dvars.items():
+        if dvid in x:
+            dvar.xinit = x[dvid]
+    for dvar_array in optmodel.dvar_arrays:
+        for i, dvid in enumerate(dvar_array.ids.tolist()):
+            if dvid in x:
+                dvar_array.xinit[i] = x[dvid]
+
+
+class PropertyMap(object):
+    """Property values of many designs at once
+
+    ==================  ======================================================
+    Attribute           Description
+    ==================  ======================================================
+    `dvids`             `np.ndarray` with the DESVAR ids, in the order of the
+                        design vectors
+    `keys`              `list` of tuples `(ptype, pid, pname)`
+    `c0`                `np.ndarray` with the constant terms of the DVPREL1
+    `C`                 `np.ndarray` of shape `(nkeys, ndvids)` with the
+                        DVPREL1 multipliers
+    `equations`         `list` of tuples `(index, equation, dvars, tables)`
+                        for the DVPREL2
+    ==================  ======================================================
+
+    Parameters
+    ----------
+    optmodel : :class:`.SOL200`
+        The optimization model.
+    dvids : array-like
+        The DESVAR ids.
+
+    """
+    def __init__(self, optmodel, dvids):
+        self.dvids = np.asarray(dvids, dtype=np.int64)
+        pos = dict((dvid, i) for i, dvid in enumerate(self.dvids.tolist()))
+        self.keys = []
+        index = {}
+
+        def key(ptype, pid, pname):
+            k = (str(ptype).upper(), int(pid), str(pname).upper())
+            if k not in index:
+                index[k] = len(self.keys)
+                self.keys.append(k)
+            return index[k]
+
+        rows, cols, coeffs, c0 = [], [], [], {}
+        for dvar_array in optmodel.dvar_arrays:
+            for i in range(len(dvar_array)):
+                k = key(dvar_array.ptypes[i], dvar_array.pids[i],
+                        dvar_array.pnames[i])
+                rows.append(k)
+                cols.append(pos[int(dvar_array.ids[i])])
+                coeffs.append(dvar_array.coeffs[i])
+                c0[k] = dvar_array.c0s[i]
+        self.equations = []
+        for dvprel in optmodel.dvprels.values():
+            k = key(dvprel.type, dvprel.pid, dvprel.pname)
+            if isinstance(dvprel, DVPREL1):
+                rows += [k]*len(dvprel.dvids)
+                cols += [pos[dvid] for dvid in dvprel.dvids]
+                coeffs += list(dvprel.coeffs)
+                c0[k] = dvprel.c0
+            elif isinstance(dvprel, DVPREL2):
+                if str(dvprel.eqid).upper() in BUILTINS:
+                    eq = BUILTINS[str(dvprel.eqid).upper()]
+                else:
+                    eq = compile_deqatn(optmodel.deqatns[dvprel.eqid])
+                tables = [float(optmodel.dtables[t]) for t in dvprel.dtable]
+                self.equations.append((k, eq, [pos[d] for d in dvprel.dvars],
+                                       tables))
+        self.c0 = np.zeros(len(self.keys))
+        for k, value in c0.items():
+            self.c0[k] = value
+        self.C = np.zeros((len(self.keys), self.dvids.shape[0]))
+        np.add.at(self.C, (np.array(rows, dtype=np.int64),
+                           np.array(cols, dtype=np.int64)), coeffs)
+
+
+    def __call__(self, X):
+        """Property values
+
+        Parameters
+        ----------
+        X : array-like
+            The designs, array of shape `(ndesigns, ndvids)`.
+
+        Returns
+        -------
+        P : np.ndarray
+            Array of shape `(ndesigns, nkeys)`.
+
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        P = self.c0 + X.dot(self.C.T)
+        for k, eq, dvars, tables in self.equations:
+            args = [X[:, i] for i in dvars] + tables
+            with np.errstate(all='ignore'):
+                P[:, k] = eq(*args)
+        return P
+
+
+    def jacobian(self, x, step=1e-6):
+        """Derivatives of the property values with respect to the design
+
+        The DVPREL2 relations are differentiated by forward differences.
+
+        Returns
+        -------
+        J : np.ndarray
+            Array of shape `(nkeys, ndvids)`.
+
+        """
+        J = self.C.copy()
+        if len(self.equations) == 0:
+            return J
+        x = np.asarray(x, dtype=np.float64)
+        h = step*np.maximum(np.abs(x), 1.)
+        P = self(np.vstack((x, x + np.diag(h))))
+        ks = [k for k, eq, dvars, tables in self.equations]
+        J[ks] = ((P[1:, ks] - P[0, ks])/h[:, None]).T
+        return J
+
+
+    def find(self, ptype, pname):
+        """Property ids and indices of the keys of one property field"""
+        found = [(pid, i) for i, (t, pid, n) in enumerate(self.keys)
+                 if t == ptype.upper() and n == pname.upper()]
+        return dict(found)
+
+
+class Solution(object):
+    """Solution of one design
+
+    ==================  ======================================================
+    Attribute           Description
+    ==================  ======================================================
+    `ef`                :class:`.ElementForces` with the element forces
+    `dforces`           `np.ndarray` of shape `(nsubcases, nelem, 8,
+                        ndvids)` with the derivatives of the element forces,
+                        or `None` when not available
+    `mass`              `float` with the structural mass or `None`
+    `dmass`             `np.ndarray` with the derivatives of the mass or
+                        `None`
+    ==================  ======================================================
+
+    """
+    def __init__(self, ef, dforces=None, mass=None, dmass=None):
+        self.ef = ef
+        self.dforces = dforces
+        self.mass = mass
+        self.dmass = dmass
+
+
+class Backend(object):
+    """Base class of the solver backends"""
+    def setup(self, optmodel, dvids):
+        """Called by the :class:`.Driver` before the first solution
+
+        Parameters
+        ----------
+        optmodel : :class:`.SOL200`
+            The optimization model.
+        dvids : np.ndarray
+            The DESVAR ids, in the order of the design vectors.
+
+        """
+        self.optmodel = optmodel
+        self.dvids = dvids
+        self.property_map = PropertyMap(optmodel, dvids)
+
+
+    def solve(self, x):
+        """Solve one design
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The design variable values.
+
+        Returns
+        -------
+        solution : :class:`.Solution`
+            The solution.
+
+        """
+        raise NotImplementedError('Backends must implement solve()')
+
+
+class LinearFEBackend(Backend):
+    """Solve the designs with a :class:`.LinearFE` model
+
+    The designed properties are the areas `'A'` of `'PROD'` properties and
+    the thicknesses `'T'` of `'PSHELL'` properties. The derivatives of the
+    element forces and of the mass are given.
+
+    Parameters
+    ----------
+    fe : :class:`.LinearFE`
+        The FE model.
+
+    """
+    def __init__(self, fe):
+        self.fe = fe
+
+
+    def solve(self, x):
+        pmap = self.property_map
+        P = pmap(x[None, :])[0]
+        J = pmap.jacobian(x)
+        keys = pmap.find('PROD', 'A')
+        keys.update(pmap.find('PSHELL', 'T'))
+        keys = dict((pid, i) for pid, i in keys.items()
+                    if pid in self.fe.pids)
+        properties = dict((pid, P[i]) for pid, i in keys.items())
+        res = self.fe.solve(properties, gradients=True)
+
+        # derivatives of the properties of the FE model
+        dp = np.zeros((res['pids'].shape[0], x.shape[0]))
+        for j, pid in enumerate(res['pids'].tolist()):
+            if pid in keys:
+                dp[j] = J[keys[pid]]
+        props = dict(self.fe.properties)
+        props.update(properties)
+        order = np.argsort(self.fe.eids)
+        tria = (self.fe.conn[:, 2] >= 0)[order]
+        pids = self.fe.pids[order]
+        t = np.where(tria, [props[pid] for pid in pids.tolist()], np.nan)
+        ef = ElementForces.from_arrays(res['subcases'], res['eids'],
+                                       res['forces'], t, pids)
+        return Solution(ef, res['dforces'].dot(dp), res['mass'],
+                        res['dmass'].dot(dp))
+
+
+class StructModelBackend(Backend):
+    """Solve the designs with an external solver
+
+    For each design the initial values of the design variables are updated
+    and `run` is called. The element forces are read from the returned op2
+    file into the SEs, see :meth:`.StructModel.read_forces`. The force
+    derivatives and the mass are not available, such that the element forces
+    are kept constant between the solutions.
+
+    Parameters
+    ----------
+    structmodel : :class:`.StructModel`
+        The structural model, with the Nastran model read.
+    run : function
+        Called with the optimization model, writes the input deck of the new
+        design, runs the solver and returns the path of the op2 file.
+
+    """
+    def __init__(self, structmodel, run):
+        self.structmodel = structmodel
+        self.run = run
+
+
+    def solve(self, x):
+        update_design(self.optmodel, self.dvids, x)
+        op2path = self.run(self.optmodel)
+        self.structmodel.nastranmodel.read_op2(op2path)
+        self.structmodel.read_forces()
+        ses = [se for d in self.structmodel.ses.values()
+               for se in d.values()]
+        return Solution(ElementForces(ses))
@@ -0,0 +1,378 @@
+"""
+Bulk sizing of panels (:mod:`structmanager.sol200.bulk_sizing`)
+================================================================
+
+.. currentmodule:: structmanager.sol200.bulk_sizing
+
+Sizing data for many :class:`.Panel` and :class:`.Web` SEs can be given in
+a table instead of setting attributes and calling the constraint methods of
+each SE in a script. The table can be a NumPy record array, a CSV file or a
+Parquet file, with the columns:
+
+==============  ==============================================================
+Column          Description
+==============  ==============================================================
+`name`          SE name (required)
+`t`             initial thickness (optional, taken from the SE otherwise)
+`t_lb`          thickness lower bound (required)
+`t_ub`          thickness upper bound (required)
+`Fcy`           von Mises allowable (optional, `NaN` or `0` to skip)
+`method`        buckling method (optional, `0` to skip)
+`ms`            minimum margin of safety for buckling (optional, default
+                `0.1`)
+==============  ==============================================================
+
+The thickness design variables are created in one
+:class:`.DESVARArray`, the von Mises constraints are defined at the property
+level and the buckling responses of all SEs share one :class:`.DEQATN` per
+method.
+
+"""
+from __future__ import print_function
+
+import numpy as np
+
+from .aggregation import aggregate_responses
+from .cards_opt import DCONSTR, DEQATN, DRESP1, DRESP2, DRESP3
+from .output_codes import get_output_code
+
+
+SETYPES = {'panel': 'PAN', 'web': 'WEB'}
+
+# Bruhn's buckling coefficients for simply supported edges, Figs. C5.2,
+# C5.11 and C5.15, the same used in :meth:`.Web.constrain_buckling`
+KC = 4.
+KS = 5.6
+KB = 23.9
+
+
+def buckling_equation(method, kc=KC, ks=KS, kb=KB):
+    """Equation of the buckling margin of safety of the plates
+
+    The compressive force is taken as positive, such that tension never
+    buckles. For methods `3` and `4` the compression and the in-plane
+    bending are obtained from the membrane forces `Nx1` and `Nx2` at both
+    edges, `Nc = -(Nx1 + Nx2)/2` and `Nb = |Nx1 - Nx2|/2`.
+
+    Parameters
+    ----------
+    method : int
+        - `1` : compression only with Bruhn's Eq. C5.12
+        - `2` : compression and shear with the interaction equation Eq.
+          C5.11, `RC + RS**2 = 1`
+        - `3` : compression and bending with the interaction equation Eq.
+          C5.8, `RC + RB**1.75 = 1`, the margin being `1/(RC + RB**1.75) -
+          1`, exact at zero margin
+        - `4` : compression, shear and bending, approximating the curves
+          of Fig. C5.18 by `RC + RB**2 + RS**2 = 1`, which gives Eq. C5.11
+          without bending and `RB**2 + RS**2 = 1` without compression
+    kc, ks, kb : float, optional
+        The compression, shear and bending buckling coefficients.
+
+    Returns
+    -------
+    eq : str
+        The :class:`.DEQATN` equation, with arguments `t, b, E, nu, Nxx`
+        and `Nxy` for method `2`, `t, b, E, nu, Nx1, Nx2` for method `3`
+        and `t, b, E, nu, Nx1, Nx2, Nxy` for method `4`.
+
+    """
+    # compressive force, negative Nxx in NASTRAN
+    Nxx = 'Nxx = MAX(-Nxx, 1.E-8);'
+    Nc = 'Nc = MAX(-(Nx1 + Nx2)/2., 1.E-8);'
+    Nb = 'Nb = MAX(ABS(Nx1 - Nx2)/2., 1.E-8);'
+    FCcr = 'FCcr = %0.3f*PI(1)**2*E*t**2/D;' % kc
+    FScr = 'FScr = %0.3f*PI(1)**2*E*t**2/D;' % ks
+    FBcr = 'FBcr = %0.3f*PI(1)**2*E*t**2/D;' % kb
+    if method == 1:
+        return ('D(t,b,E,nu,Nxx) = 12.*(1.-nu**2)*b**2;' + FCcr + Nxx +
+                'MS = FCcr*t/Nxx - 1.')
+    elif method == 2:
+        return ('D(t,b,E,nu,Nxx,Nxy) = 12.*(1.-nu**2)*b**2;' + FCcr +
+                FScr + Nxx +
+                'RC = Nxx/(FCcr*t);' +
+                'RS = Nxy/(FScr*t);' +
+                'MS = 2./(RC + SQRT(RC**2 + 4.*RS**2)) - 1.')
+    elif method == 3:
+        return ('D(t,b,E,nu,Nx1,Nx2) = 12.*(1.-nu**2)*b**2;' + FCcr +
+                FBcr + Nc + Nb +
+                'RC = Nc/(FCcr*t);' +
+                'RB = Nb/(FBcr*t);' +
+                'MS = 1./(RC + RB**1.75) - 1.')
+    elif method == 4:
+        return ('D(t,b,E,nu,Nx1,Nx2,Nxy) = 12.*(1.-nu**2)*b**2;' + FCcr +
+                FScr + FBcr + Nc + Nb +
+                'RC = Nc/(FCcr*t);' +
+                'RS = Nxy/(FScr*t);' +
+                'RB = Nb/(FBcr*t);' +
+                'MS = 2./(RC + SQRT(RC**2 + 4.*(RB**2 + RS**2))) - 1.')
+    raise NotImplementedError('Only methods 1 to 4 are implemented!')
+
+
+DEQATNS_BUCKLING = {
+    1: buckling_equation(1),
+    2: buckling_equation(2),
+    }
+
+
+def read_sizing_table(table, delimiter=','):
+    """Read a sizing table
+
+    Parameters
+    ----------
+    table : str or np.ndarray
+        A NumPy record (structured) array or the path to a CSV or a Parquet
+        (`.parquet`) file. CSV files must have a header with the column names.
+    delimiter : str, optional
+        The delimiter used in CSV files.
+
+    Returns
+    -------
+    table : np.recarray
+        The sizing table.
+
+    """
+    if isinstance(table, np.ndarray):
+        if table.dtype.names is None:
+            raise ValueError('A structured array with named columns is '
+                             'required')
+        return table.view(np.recarray)
+    path = str(table)
+    if path.lower().endswith('.parquet'):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError('Python "pyarrow" module required')
+        pqtable = pq.read_table(path)
+        names = [str(n) for n in pqtable.column_names]
+        arrays = [np.asarray(pqtable.column(n).to_pylist()) for n in names]
+        return np.rec.fromarrays(arrays, names=names)
+    data = np.genfromtxt(path, delimiter=delimiter, names=True, dtype=None,
+                         encoding='utf-8', autostrip=True)
+    return np.atleast_1d(data).view(np.recarray)
+
+
+def _column(table, name, default, dtype=np.float64):
+    if name in table.dtype.names:
+        return np.asarray(table[name], dtype=dtype)
+    return np.full(table.shape[0], default, dtype=dtype)
+
+
+def _add_dtables(optmodel, prefix, values):
+    """Add DTABLE constants in bulk, sharing entries with equal values
+
+    Returns the DTABLE keys corresponding to each value.
+
+    """
+    values = np.asarray(values, dtype=np.float64)
+    uvalues, inverse = np.unique(values, return_inverse=True)
+    count = optmodel.dtable_prefixes.get(prefix, -1)
+    keys = []
+    for value in uvalues.tolist():
+        count += 1
+        key = prefix + str(count).rjust(8 - len(prefix), '0')
+        if len(key) > 8:
+            raise ValueError('Too many DTABLE entries for prefix %s' % prefix)
+        optmodel.dtables[key] = value
+        keys.append(key)
+    optmodel.dtable_prefixes[prefix] = count
+    return np.array(keys)[inverse.ravel()]
+
+
+def apply_sizing_table(model, table, optmodel=None, dcid_vonMises=1,
+                       dcid_buckling=1, aggregate=None, param=None, chunk=32):
+    """Apply a sizing table to the :class:`.Panel` and :class:`.Web` SEs
+
+    Parameters
+    ----------
+    model : :class:`.StructModel`
+        The structural model whose `ses` will be sized.
+    table : str or np.ndarray
+        The sizing table, see :func:`.read_sizing_table`.
+    optmodel : :class:`.SOL200` or None, optional
+        The optimization model receiving the cards. If not given
+        `model.optmodel` is used.
+    dcid_vonMises : int, optional
+        Design constraint set id for the von Mises constraints.
+    dcid_buckling : int, optional
+        Design constraint set id for the buckling constraints.
+    aggregate : str or None, optional
+        `'KS'` or `'PNORM'` to replace the von Mises constraints of each
+        property by one aggregated constraint per SE over all its elements,
+        see :func:`.aggregate_responses`.
+    param : float or None, optional
+        The aggregation parameter, `rho` for `'KS'` or `p` for `'PNORM'`.
+    chunk : int, optional
+        The maximum number of responses aggregated by one DRESP2.
+
+    Returns
+    -------
+    ses : list
+        The SEs that have been sized, in the order of the table.
+
+    """
+    if optmodel is None:
+        optmodel = model.optmodel
+    if optmodel is None:
+        raise ValueError('An optimization model is required')
+    table = read_sizing_table(table)
+
+    # matching the table against all candidate SEs
+    candidates = {}
+    for setype in SETYPES:
+        for name, se in model.ses.get(setype, {}).items():
+            candidates[name] = se
+    names = np.asarray(table['name']).astype(str)
+    senames = np.array(sorted(candidates.keys()), dtype=str)
+    pos = np.clip(np.searchsorted(senames, names), 0,
+                  max(senames.shape[0] - 1, 0))
+    found = (senames[pos] == names) if senames.shape[0] > 0 else \
+            np.zeros(names.shape[0], dtype=bool)
+    for name in names[~found]:
+        print('WARNING - SE "{0}" not found in the model'.format(name))
+    ses = [candidates[name] for name in names[found]]
+    if len(ses) == 0:
+        return ses
+
+    t_lb = _column(table, 't_lb', np.nan)[found]
+    t_ub = _column(table, 't_ub', np.nan)[found]
+    if np.any(np.isnan(t_lb) | np.isnan(t_ub)):
+        raise ValueError('Columns "t_lb" and "t_ub" are required')
+    t_se = np.array([np.nan if se.t is None else se.t for se in ses],
+                    dtype=np.float64)
+    t = _column(table, 't', np.nan)[found]
+    t = np.where(np.isnan(t), t_se, t)
+    t = np.where(np.isnan(t), t_lb, t)
+    Fcy = np.nan_to_num(_column(table, 'Fcy', np.nan)[found])
+    method = _column(table, 'method', 0, dtype=np.int64)[found]
+    ms = _column(table, 'ms', 0.1)[found]
+
+    for se, ti, lbi, ubi in zip(ses, t.tolist(), t_lb.tolist(),
+                                t_ub.tolist()):
+        se.t = ti
+        se.t_lb = lbi
+        se.t_ub = ubi
+
+    # thickness design variables, one per property
+    ptypes = np.array([str(se.ptype) for se in ses])
+    pids = np.array([-1 if se.pid is None else se.pid for se in ses],
+                    dtype=np.int64)
+    valid = (ptypes == 'PSHELL') & (pids > 0)
+    for se in np.array(ses, dtype=object)[~valid]:
+        print('WARNING - SE "{0}" skipped, only PSHELL properties from a '
+              'loaded FE model are supported'.format(se.name))
+    upids, first = np.unique(pids[valid], return_index=True)
+    ivalid = np.flatnonzero(valid)
+    dvar_array = optmodel.create_thickness_dvars(upids, t[ivalid][first],
+            t_lb[ivalid][first], t_ub[ivalid][first])
+    dvids = dvar_array.find(pids)
+    for i in ivalid.tolist():
+        se = ses[i]
+        se.dvars_created = True
+        se.dvar_ids[SETYPES[se.__class__.__name__.lower()] + 't'] = dvids[i]
+
+    # von Mises constraints at the property level or aggregated per SE
+    OUTC_Z1 = get_output_code('STRESS', 'CQUAD4',
+                              'von Mises or maximum shear at Z1')
+    OUTC_Z2 = get_output_code('STRESS', 'CQUAD4',
+                              'von Mises or maximum shear at Z2')
+    check = valid & (Fcy > 0)
+    if check.any():
+        optmodel.dcids.add(dcid_vonMises)
+    if aggregate is not None:
+        for i in np.flatnonzero(check).tolist():
+            rids = []
+            for eid in ses[i].eids:
+                for label, atta in (('VMZ1', OUTC_Z1), ('VMZ2', OUTC_Z2)):
+                    dresp1 = DRESP1(label, 'STRESS', 'ELEM', None, atta, None,
+                                    eid)
+                    optmodel.dresps[dresp1.id] = dresp1
+                    rids.append(dresp1.id)
+            dresps = aggregate_responses(optmodel, rids, float(Fcy[i]),
+                                         kind=aggregate, param=param,
+                                         chunk=chunk, label='VMAGG')
+            dconstr = DCONSTR(dcid_vonMises, dresps[-1].id, None, 1.)
+            optmodel.dconstrs[dconstr.id] = dconstr
+    else:
+        upids, first = np.unique(pids[check], return_index=True)
+        for pid, allow in zip(upids.tolist(), Fcy[check][first].tolist()):
+            for label, atta in (('VMZ1', OUTC_Z1), ('VMZ2', OUTC_Z2)):
+                dresp1 = DRESP1(label, 'STRESS', 'PSHELL', None, atta, None,
+                                pid)
+                dconstr = DCONSTR(dcid_vonMises, dresp1.id, None, allow)
+                optmodel.dresps[dresp1.id] = dresp1
+                optmodel.dconstrs[dconstr.id] = dconstr
+
+    # buckling constraints with shared equations
+    check = valid & (method > 0)
+    if not check.any():
+        return ses
+    optmodel.dcids.add(dcid_buckling)
+    code_Nxx = get_output_code('FORCE', 'CQUAD4', 'Membrane force x')
+    code_Nxy = get_output_code('FORCE', 'CQUAD4', 'Membrane force xy')
+    sel = np.flatnonzero(check)
+    props = {}
+    for prop in ['r', 'a', 'b']:
+        values = [getattr(ses[i], prop, None) for i in sel]
+        props[prop] = np.array([np.nan if v is None else v for v in values],
+                               dtype=np.float64)
+    props['E'] = np.array([ses[i].material.E if ses[i].material is not None
+                           else np.nan for i in sel])
+    props['nu'] = np.array([ses[i].material.nu if ses[i].material is not None
+                            else np.nan for i in sel])
+    keys = {}
+    for prop, values in props.items():
+        keys[prop] = np.zeros(sel.shape[0], dtype='U8')
+        ok = ~np.isnan(values)
+        if ok.any():
+            keys[prop][ok] = _add_dtables(optmodel, 'BS' + prop, values[ok])
+    deqatns = {}
+    for k, i in enumerate(sel.tolist()):
+        se = ses[i]
+        prefix = SETYPES[se.__class__.__name__.lower()]
+        mi = int(method[i])
+        central = se.get_central_element()
+        if central is None:
+            print('WARNING - SE "{0}" has no elements, buckling constraint '
+                  'skipped'.format(se.name))
+            continue
+        if prefix == 'PAN' and mi != 1:
+            raise NotImplementedError('Only method 1 is implemented for '
+                                      'Panel SEs')
+        if prefix == 'WEB' and mi not in DEQATNS_BUCKLING:
+            raise NotImplementedError('Only methods 1 and 2 are implemented '
+                                      'for Web SEs')
+        needed = ['r', 'a', 'b', 'E', 'nu'] if prefix == 'PAN' else \
+                 ['b', 'E', 'nu']
+        if any(keys[prop][k] == '' for prop in needed):
+            print('WARNING - SE "{0}" has undefined geometric or material '
+                  'properties, buckling constraint skipped'.format(se.name))
+            continue
+        eid = central.eid
+        dresp_Nxx = DRESP1(prefix + 'fNxx', 'FORCE', 'ELEM', region=None,
+                           atta=code_Nxx, attb=None, atti=eid)
+        optmodel.dresps[dresp_Nxx.id] = dresp_Nxx
+        dresp_Nxy = None
+        if prefix == 'PAN' or mi == 2:
+            dresp_Nxy = DRESP1(prefix + 'fNxy', 'FORCE', 'ELEM', region=None,
+                               atta=code_Nxy, attb=None, atti=eid)
+            optmodel.dresps[dresp_Nxy.id] = dresp_Nxy
+        if prefix == 'PAN':
+            dresp = DRESP3('PANBUCK1', 'PANBUCK', 'METHOD1')
+            optmodel.groups.add(dresp.group)
+        else:
+            if mi not in deqatns:
+                deqatns[mi] = DEQATN(DEQATNS_BUCKLING[mi])
+                optmodel.deqatns[deqatns[mi].id] = deqatns[mi]
+            dresp = DRESP2('WEBBUCK', deqatns[mi].id)
+        dresp.add_dvar(int(dvids[i]))
+        for prop in needed:
+            dresp.add_dtable(keys[prop][k])
+        dresp.add_dresp1(dresp_Nxx.id)
+        if dresp_Nxy is not None:
+            dresp.add_dresp1(dresp_Nxy.id)
+        optmodel.dresps[dresp.id] = dresp
+        dconstr = DCONSTR(dcid_buckling, dresp.id, float(ms[i]), None)
+        optmodel.dconstrs[dconstr.id] = dconstr
+
+    return ses
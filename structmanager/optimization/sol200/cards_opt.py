@@ -19,6 +19,7 @@ module. The input cards more related to the solver are contained in module
     structmanager.sol200.cards_opt.DRESP1
     structmanager.sol200.cards_opt.DRESP2
     structmanager.sol200.cards_opt.DRESP3
+    structmanager.sol200.cards_opt.DSCREEN
     structmanager.sol200.cards_opt.DTABLE
     structmanager.sol200.cards_opt.DVPREL1
 
@@ -475,6 +476,40 @@ class DCONSTR(object):
         file.write(dconstr + '\n')
 
 
+class DSCREEN(object):
+    """Constraint screening parameters of one response type
+
+    Parameters
+    ----------
+    rtype : str
+        Response type, such as `'STRESS'`, `'FORCE'` or `'EQUA'` for DRESP2
+        responses.
+    trs : float, optional
+        Truncation threshold, constraints with smaller normalized values are
+        not retained.
+    nstr : int, optional
+        Maximum number of constraints retained per region and load case.
+
+    """
+    def __init__(self, rtype, trs=-0.5, nstr=20):
+        self.rtype = rtype
+        self.trs = trs
+        self.nstr = nstr
+
+    def print_card(self, file):
+        """Print the corresponding input card
+
+        Parameters
+        ----------
+        file : file
+            File object with a :meth:`write` method.
+
+        """
+        dscreen = ('%s% 8s%s% 8d' % ('DSCREEN'.ljust(8), self.rtype,
+            ff(self.trs), self.nstr))
+        file.write(dscreen + '\n')
+
+
 class DLINK(object):
     r"""Link between design variables
 
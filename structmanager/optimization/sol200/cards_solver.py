@@ -62,3 +62,48 @@ class PBARL(SOL200):
         pbarlstr = pbarlstr + ',' + str(self.nsm)
         file.write (pbarlstr + '\n')
 
+
+
+class PSHELL(object):
+    """Shell element property
+
+    ==============  ==========================================================
+    Attribute       Description
+    ==============  ==========================================================
+    ``id``          ``int`` - property id
+    ``mid``         ``int`` - membrane material id
+    ``t``           ``float`` - thickness
+    ``mid2``        ``int`` - bending material id, by default ``mid``
+    ``bendratio``   ``float`` - bending stiffness parameter 12I/T**3
+    ``mid3``        ``int`` or ``None`` - transverse shear material id
+    ``tsratio``     ``float`` - transverse shear thickness ratio TS/T
+    ``nsm``         ``float`` - non-structural mass per unit area
+    ==============  ==========================================================
+
+    """
+    def __init__(self, id, mid, t, mid2=None, bendratio=1., mid3=None,
+                 tsratio=0.833333, nsm=0.):
+        self.id = int(id)
+        self.mid = int(mid)
+        self.t = float(t)
+        self.mid2 = self.mid if mid2 is None else int(mid2)
+        self.bendratio = bendratio
+        self.mid3 = mid3
+        self.tsratio = tsratio
+        self.nsm = nsm
+
+    def print_card(self, file):
+        """Prints the corresponding input card
+
+        Parameters
+        ----------
+        file : file
+            File object with a :meth:`write` method.
+
+        """
+        mid3 = '' if self.mid3 is None else str(int(self.mid3))
+        pshellstr = ('%s,%d,%d,%s,%d,%s,%s,%s,%s' % ('PSHELL', self.id,
+                     self.mid, str(self.t), self.mid2,
+                     str(float(self.bendratio)), mid3,
+                     str(float(self.tsratio)), str(float(self.nsm))))
+        file.write(pshellstr + '\n')
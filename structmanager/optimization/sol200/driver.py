@@ -0,0 +1,412 @@
+"""
+Local optimization driver (:mod:`structmanager.sol200.driver`)
+===============================================================
+
+.. currentmodule:: structmanager.sol200.driver
+
+Sizing loops run without the optimizer of the solver. Each design cycle
+calls a solver backend, see :mod:`.backends`, and then optimizes an
+approximate problem around the solved design, where the design responses
+are evaluated locally with :func:`.evaluate_design` from approximate element
+forces. The solver is called again at the improved design, such that many
+cheap approximate iterations run between the expensive full solutions.
+
+The element forces `F` are approximated from the solution at `x0` with the
+force derivatives `dF/dx` given by the backend, linearly or in the
+reciprocal variables::
+
+    F(x) = F0 + dF/dx (x - x0)                       'linear'
+
+    F(x) = F0 + dF/dx x0 (1 - x0/x)                  'reciprocal'
+
+where the reciprocal approximation falls back to the linear one for design
+variables with `x0 <= 0`. Without force derivatives the element forces are
+kept constant. The stresses are recomputed with the thickness of the
+approximate design, see :class:`.PropertyMap`.
+
+The approximate problem is solved within move limits around `x0` with the
+SLSQP method of SciPy or with a sequence of linear programs (SLP) using
+`linprog`, where an elastic variable keeps the linear programs feasible,
+with the first method of :data:`.LINPROG_METHODS` available in the
+installed SciPy. The gradients of the approximate responses are computed by
+forward differences, evaluating all perturbed designs at once.
+
+The dependent design variables of DLINK cards follow the independent ones.
+
+"""
+from __future__ import division, print_function
+
+import numpy as np
+from scipy.optimize import linprog, minimize
+
+from .backends import PropertyMap, design_variables, update_design
+from .screening import ElementForces, constraint_margins, evaluate_design
+
+
+APPROXIMATIONS = ('linear', 'reciprocal')
+METHODS = ('SLSQP', 'SLP')
+# linprog methods by preference, the older SciPy versions lack 'highs' and
+# the newer ones 'interior-point' and 'simplex'
+LINPROG_METHODS = ['highs', 'interior-point', 'simplex']
+
+
+def _linprog(c, **kwargs):
+    """Call `linprog` with the first available method"""
+    while True:
+        try:
+            return linprog(c, method=LINPROG_METHODS[0], **kwargs)
+        except ValueError as e:
+            if ('Unknown solver' not in str(e)
+                    or len(LINPROG_METHODS) == 1):
+                raise
+            LINPROG_METHODS.pop(0)
+
+
+class Driver(object):
+    """Local optimization driver
+
+    ==================  ======================================================
+    Attribute           Description
+    ==================  ======================================================
+    `dvids`             `np.ndarray` with the ids of all design variables
+    `free`              `np.ndarray` with the indices in `dvids` of the
+                        independent design variables
+    `x`                 `np.ndarray` with the current values of the
+                        independent design variables
+    `xlb`, `xub`        `np.ndarray` with their bounds
+    `solution`          :class:`.Solution` of the last solved design
+    `history`           `list` of `dict` with the exact objective
+                        `'objective'`, the maximum normalized constraint
+                        `'gmax'` and the design `'x'` of each solved design
+    ==================  ======================================================
+
+    Parameters
+    ----------
+    optmodel : :class:`.SOL200`
+        The optimization model, providing the design variables, the design
+        responses and the constraints.
+    backend : :class:`.Backend`
+        The solver backend.
+    objective : int or None, optional
+        The id of the objective DRESP, minimized taking the largest value
+        over the subcases. By default the mass given by the backend.
+    method : str, optional
+        `'SLSQP'` or `'SLP'`.
+    approximation : str, optional
+        `'linear'` or `'reciprocal'`, the force approximation.
+    move_limit : float, optional
+        The move limit of each design cycle, relative to the design variable
+        values or, for zero values, to the range of the bounds.
+    threshold : float, optional
+        The constraints with normalized values below `threshold` at the
+        solved design are ignored in the approximate problem, see
+        :func:`.constraint_margins`.
+    maxiter : int, optional
+        The maximum number of iterations of each approximate problem.
+    step : float, optional
+        The relative step of the forward differences.
+    chunk : int, optional
+        The maximum number of designs evaluated at once.
+
+    """
+    def __init__(self, optmodel, backend, objective=None, method='SLSQP',
+                 approximation='reciprocal', move_limit=0.2, threshold=-0.5,
+                 maxiter=20, step=1e-6, chunk=64):
+        if str(method).upper() not in METHODS:
+            raise ValueError('Invalid method: %s' % method)
+        if approximation not in APPROXIMATIONS:
+            raise ValueError('Invalid approximation: %s' % approximation)
+        self.optmodel = optmodel
+        self.backend = backend
+        self.objective = objective
+        self.method = str(method).upper()
+        self.approximation = approximation
+        self.move_limit = move_limit
+        self.threshold = threshold
+        self.maxiter = maxiter
+        self.step = step
+        self.chunk = chunk
+
+        dvids, xinit, xlb, xub = design_variables(optmodel)
+        self.dvids = dvids
+        # dependent design variables, x_all = L x + l0
+        pos = dict((dvid, i) for i, dvid in enumerate(dvids.tolist()))
+        dependent = [pos[dlink.ddvid] for dlink in optmodel.dlinks.values()]
+        self.free = np.setdiff1d(np.arange(dvids.shape[0]), dependent)
+        self.L = np.zeros((dvids.shape[0], self.free.shape[0]))
+        self.L[self.free, np.arange(self.free.shape[0])] = 1.
+        self.l0 = np.zeros(dvids.shape[0])
+        col = dict((i, j) for j, i in enumerate(self.free.tolist()))
+        for dlink in optmodel.dlinks.values():
+            i = pos[dlink.ddvid]
+            self.l0[i] = dlink.c0
+            for idv, c in zip(dlink.idvs, dlink.cs):
+                if pos[idv] not in col:
+                    raise ValueError('DLINK %d depends on a dependent '
+                                     'design variable' % dlink.id)
+                self.L[i, col[pos[idv]]] += dlink.cmult*c
+        self.x = np.clip(xinit[self.free], xlb[self.free], xub[self.free])
+        self.xlb = xlb[self.free]
+        self.xub = xub[self.free]
+
+        self.dconstrs = [optmodel.dconstrs[cid] for cid in
+                         sorted(optmodel.dconstrs.keys())]
+        self.property_map = PropertyMap(optmodel, dvids)
+        self.solution = None
+        self.history = []
+        self._x0 = None
+        self._active = None
+        backend.setup(optmodel, dvids)
+
+
+    def expand(self, X):
+        """Values of all design variables, including the dependent ones"""
+        return np.atleast_2d(X).dot(self.L.T) + self.l0
+
+
+    def _thickness(self, ef):
+        # elements whose thickness is designed
+        keys = self.property_map.find('PSHELL', 'T')
+        cols = np.array([keys.get(pid, -1) for pid in ef.pids.tolist()],
+                        dtype=np.int64)
+        t = np.asarray(ef.t, dtype=np.float64)
+        if t.ndim > 1:
+            t = t[0]
+        designed = (cols >= 0) & ~np.isnan(t)
+        return np.flatnonzero(designed), cols[designed], t
+
+
+    def analyze(self):
+        """Solve the current design with the backend
+
+        Returns
+        -------
+        record : dict
+            The exact objective and maximum normalized constraint, see
+            :attr:`.history`.
+
+        """
+        xall = self.expand(self.x)[0]
+        self.solution = self.backend.solve(xall)
+        self._x0 = self.x.copy()
+        self._elems, self._cols, self._t = self._thickness(self.solution.ef)
+        f, g = self.approximate(self.x[None, :])
+        record = dict(objective=f[0], gmax=np.nan, x=self.x.copy())
+        check = ~np.isnan(g[0])
+        if check.any():
+            record['gmax'] = g[0][check].max()
+        with np.errstate(invalid='ignore'):
+            self._active = check & (g[0] > self.threshold)
+        self.history.append(record)
+        return record
+
+
+    def approximate(self, X):
+        """Approximate objective and constraints of many designs
+
+        Parameters
+        ----------
+        X : array-like
+            The independent design variables, array of shape `(ndesigns,
+            nfree)`.
+
+        Returns
+        -------
+        f : np.ndarray
+            The objective of each design.
+        g : np.ndarray
+            Array of shape `(ndesigns, ncons*nsubcases)` with the normalized
+            constraints, see :func:`.constraint_margins`.
+
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        f, g = [], []
+        for i in range(0, X.shape[0], self.chunk):
+            fi, gi = self._approximate(X[i:i+self.chunk])
+            f.append(fi)
+            g.append(gi)
+        return np.concatenate(f), np.concatenate(g)
+
+
+    def _approximate(self, X):
+        sol = self.solution
+        ef = sol.ef
+        k = X.shape[0]
+        nsub = ef.forces.shape[0]
+        x0 = self.expand(self._x0)[0]
+        xall = self.expand(X)
+        forces = np.broadcast_to(ef.forces, (k,) + ef.forces.shape)
+        if sol.dforces is not None:
+            dx = xall - x0
+            if self.approximation == 'reciprocal':
+                pos = x0 > 0
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    dx[:, pos] = x0[pos]*(1. - x0[pos]/xall[:, pos])
+            forces = forces + np.einsum('senj,kj->ksen', sol.dforces, dx)
+        t = np.broadcast_to(self._t, (k, nsub) + self._t.shape).copy()
+        if self._elems.shape[0] > 0:
+            P = self.property_map(xall)
+            t[:, :, self._elems] = P[:, None, self._cols]
+        ef = ElementForces.from_arrays(np.tile(ef.subcases, k), ef.eids,
+                                       forces.reshape(k*nsub, -1, 8),
+                                       t.reshape(k*nsub, -1), ef.pids)
+        design = dict((dvid, np.repeat(xall[:, j], nsub)) for j, dvid in
+                      enumerate(self.dvids.tolist()))
+        values = evaluate_design(self.optmodel, ef, design)
+
+        if self.objective is None:
+            if sol.mass is None:
+                raise ValueError('The backend gives no mass, an objective '
+                                 'response is required')
+            f = sol.mass + (xall - x0).dot(sol.dmass)
+        else:
+            with np.errstate(invalid='ignore'):
+                f = np.nanmax(values[self.objective].reshape(k, nsub),
+                              axis=1)
+        if len(self.dconstrs) == 0:
+            return f, np.zeros((k, 0))
+        g = constraint_margins(self.dconstrs, values)
+        g = g.reshape(len(self.dconstrs), k, nsub).transpose(1, 0, 2)
+        return f, g.reshape(k, -1)
+
+
+    def _gradients(self, x):
+        h = self.step*np.maximum(np.abs(x), 1.)
+        X = np.vstack((x, x + np.diag(h)))
+        f, g = self.approximate(X)
+        g = g[:, self._active]
+        # constraints not evaluated in the perturbed designs
+        g[1:] = np.where(np.isnan(g[1:]), g[0], g[1:])
+        return (f[0], g[0], (f[1:] - f[0])/h,
+                ((g[1:] - g[0])/h[:, None]).T)
+
+
+    def bounds(self):
+        """Move limits of the current design cycle, within the bounds"""
+        x0 = self._x0
+        move = self.move_limit*np.where(x0 != 0, np.abs(x0),
+                                        self.xub - self.xlb)
+        return (np.maximum(x0 - move, self.xlb),
+                np.minimum(x0 + move, self.xub))
+
+
+    def improve(self):
+        """Optimize the approximate problem of the current design cycle
+
+        Returns
+        -------
+        x : np.ndarray
+            The new design, also set in :attr:`.x`.
+
+        """
+        lb, ub = self.bounds()
+        if self.method == 'SLSQP':
+            x = self._slsqp(lb, ub)
+        else:
+            x = self._slp(lb, ub)
+        self.x = np.clip(x, lb, ub)
+        return self.x
+
+
+    def _slsqp(self, lb, ub):
+        cache = {}
+
+        def evaluate(x):
+            key = x.tobytes()
+            if key not in cache:
+                cache.clear()
+                cache[key] = self._gradients(x)
+            return cache[key]
+
+        f0 = self.history[-1]['objective']
+        scale = abs(f0) if f0 != 0 else 1.
+        constraints = []
+        if self._active.any():
+            constraints.append(dict(
+                type='ineq',
+                fun=lambda x: -np.nan_to_num(evaluate(x)[1]),
+                jac=lambda x: -np.nan_to_num(evaluate(x)[3])))
+        res = minimize(lambda x: evaluate(x)[0]/scale, self._x0,
+                       jac=lambda x: evaluate(x)[2]/scale, method='SLSQP',
+                       bounds=list(zip(lb, ub)), constraints=constraints,
+                       options=dict(maxiter=self.maxiter))
+        return res.x
+
+
+    def _slp(self, lb, ub, penalty=1e3):
+        f0 = self.history[-1]['objective']
+        scale = abs(f0) if f0 != 0 else 1.
+        x = self._x0.copy()
+        # inner move limits, halved for the variables whose step reverses
+        move = 0.5*(ub - lb)
+        previous = np.zeros_like(x)
+        for _ in range(self.maxiter):
+            f, g, df, dg = self._gradients(x)
+            g = np.nan_to_num(g)
+            dg = np.nan_to_num(dg)
+            c = np.append(df/scale, penalty)
+            A = np.hstack((dg, -np.ones((g.shape[0], 1))))
+            bounds = list(zip(np.maximum(lb, x - move) - x,
+                              np.minimum(ub, x + move) - x)) + [(0, None)]
+            res = _linprog(c, A_ub=A if g.size else None,
+                           b_ub=-g if g.size else None, bounds=bounds)
+            if res.status != 0:
+                break
+            dx = res.x[:-1]
+            x = np.clip(x + dx, lb, ub)
+            if np.abs(dx).max() <= 1e-6*max(np.abs(x).max(), 1.):
+                break
+            move = np.where(dx*previous < 0, 0.5*move, move)
+            previous = dx
+        return x
+
+
+    def run(self, ncycles=10, tol=1e-3, verbose=False):
+        """Run design cycles until convergence
+
+        The design is converged when the relative change of the objective
+        is below `tol` with all constraints satisfied within `tol`. The move
+        limit is halved for the cycles increasing the constraint violation.
+        The initial values of the design variables of the optimization model
+        are updated with the last design.
+
+        Parameters
+        ----------
+        ncycles : int, optional
+            The maximum number of design cycles.
+        tol : float, optional
+            The convergence tolerance.
+        verbose : bool, optional
+            If the objective and the maximum constraint of each design cycle
+            are printed.
+
+        Returns
+        -------
+        history : list
+            See :attr:`.history`.
+
+        """
+        move_limit = self.move_limit
+        for cycle in range(ncycles + 1):
+            record = self.analyze()
+            if verbose:
+                print('Design cycle %d: objective %g, max constraint %g' %
+                      (cycle, record['objective'], record['gmax']))
+            if len(self.history) > 1:
+                previous = self.history[-2]
+                change = abs(record['objective'] - previous['objective'])
+                feasible = not record['gmax'] > tol
+                if (change <= tol*max(abs(previous['objective']), 1e-30)
+                        and feasible):
+                    break
+                # oscillating designs
+                if record['gmax'] > max(previous['gmax'], tol):
+                    self.move_limit *= 0.5
+            if cycle == ncycles:
+                print('WARNING - Driver not converged after %d cycles' %
+                      ncycles)
+                break
+            self.improve()
+        self.move_limit = move_limit
+        update_design(self.optmodel, self.dvids, self.expand(self.x)[0])
+        return self.history
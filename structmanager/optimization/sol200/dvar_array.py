@@ -0,0 +1,232 @@
+"""
+Array-backed design variables (:mod:`structmanager.sol200.dvar_array`)
+=======================================================================
+
+.. currentmodule:: structmanager.sol200.dvar_array
+
+Large sizing problems, such as the thickness sizing of a complete skin, create
+one :class:`.DESVAR` and one :class:`.DVPREL1` per property. The container
+defined in this module stores these homogeneous design variables as columns of
+NumPy arrays, such that they can be created and written in bulk.
+
+The ids are taken from the same counters used by :class:`.DESVAR` and
+:class:`.DVPREL1`, so that both representations can coexist in one
+:class:`.SOL200` model.
+
+"""
+import numpy as np
+
+from .cards_opt import DESVAR, DVPREL
+from .utils import format_float_array
+
+
+class DESVARArray(object):
+    """Array of design variables, each related to one property
+
+    Each design variable is linked to one property parameter through a
+    DVPREL1 with a single term::
+
+        property.pname = c0 + coeff*desvar
+
+    ==================  ======================================================
+    Attribute           Description
+    ==================  ======================================================
+    `ids`               `np.ndarray` of `int` with the DESVAR ids
+    `labels`            `np.ndarray` of `str` with the DESVAR labels
+    `xinit`             `np.ndarray` of `float` with the initial values
+    `xlb`               `np.ndarray` of `float` with the lower bounds
+    `xub`               `np.ndarray` of `float` with the upper bounds
+    `dvprel_ids`        `np.ndarray` of `int` with the DVPREL1 ids
+    `ptypes`            `np.ndarray` of `str` with the property types
+    `pids`              `np.ndarray` of `int` with the property ids
+    `pnames`            `np.ndarray` of `str` with the property parameters
+    `coeffs`            `np.ndarray` of `float` with the DVPREL1 multipliers
+    `c0s`               `np.ndarray` of `float` with the DVPREL1 constants
+    ==================  ======================================================
+
+    """
+    def __init__(self):
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.labels = np.zeros(0, dtype='U8')
+        self.xinit = np.zeros(0, dtype=np.float64)
+        self.xlb = np.zeros(0, dtype=np.float64)
+        self.xub = np.zeros(0, dtype=np.float64)
+        self.dvprel_ids = np.zeros(0, dtype=np.int64)
+        self.ptypes = np.zeros(0, dtype='U8')
+        self.pids = np.zeros(0, dtype=np.int64)
+        self.pnames = np.zeros(0, dtype='U8')
+        self.coeffs = np.zeros(0, dtype=np.float64)
+        self.c0s = np.zeros(0, dtype=np.float64)
+
+
+    def __len__(self):
+        return self.ids.shape[0]
+
+
+    def add(self, labels, xinit, xlb, xub, ptype, pids, pname, coeffs=1.,
+            c0=0.):
+        """Add many design variables at once
+
+        Scalar inputs are broadcast to the length of `pids`.
+
+        Parameters
+        ----------
+        labels : str or array-like
+            DESVAR labels (up to 8 characters).
+        xinit, xlb, xub : float or array-like
+            Initial values, lower and upper bounds. The initial values are
+            clipped to the bounds.
+        ptype : str or array-like
+            Property types, such as `'PSHELL'`.
+        pids : array-like
+            Property ids.
+        pname : str or array-like
+            Property parameter names, such as `'T'`.
+        coeffs : float or array-like, optional
+            DVPREL1 multipliers.
+        c0 : float or array-like, optional
+            DVPREL1 constant terms.
+
+        Returns
+        -------
+        ids : np.ndarray
+            The ids of the created design variables.
+
+        """
+        pids = np.atleast_1d(np.asarray(pids, dtype=np.int64))
+        n = pids.shape[0]
+
+        def column(value, dtype):
+            value = np.asarray(value, dtype=dtype)
+            if value.ndim > 1:
+                raise ValueError('Only scalars or 1D arrays are accepted')
+            return np.broadcast_to(value, (n,)).astype(dtype)
+
+        xlb = column(xlb, np.float64)
+        xub = column(xub, np.float64)
+        if np.any(xlb > xub):
+            raise ValueError('Lower bounds must not exceed upper bounds')
+        xinit = np.clip(column(xinit, np.float64), xlb, xub)
+
+        ids = np.arange(DESVAR.uniqueid, DESVAR.uniqueid + n, dtype=np.int64)
+        DESVAR.uniqueid += n
+        dvprel_ids = np.arange(DVPREL.uniqueid, DVPREL.uniqueid + n,
+                               dtype=np.int64)
+        DVPREL.uniqueid += n
+
+        self.ids = np.concatenate((self.ids, ids))
+        self.labels = np.concatenate((self.labels, column(labels, 'U8')))
+        self.xinit = np.concatenate((self.xinit, xinit))
+        self.xlb = np.concatenate((self.xlb, xlb))
+        self.xub = np.concatenate((self.xub, xub))
+        self.dvprel_ids = np.concatenate((self.dvprel_ids, dvprel_ids))
+        self.ptypes = np.concatenate((self.ptypes, column(ptype, 'U8')))
+        self.pids = np.concatenate((self.pids, pids))
+        self.pnames = np.concatenate((self.pnames, column(pname, 'U8')))
+        self.coeffs = np.concatenate((self.coeffs, column(coeffs,
+                                                          np.float64)))
+        self.c0s = np.concatenate((self.c0s, column(c0, np.float64)))
+
+        return ids
+
+
+    def add_thickness(self, pids, xinit, xlb, xub, ptype='PSHELL',
+                      label='t'):
+        """Add thickness design variables for many shell properties
+
+        Parameters
+        ----------
+        pids : array-like
+            Property ids.
+        xinit, xlb, xub : float or array-like
+            Initial thicknesses, lower and upper bounds.
+        ptype : str, optional
+            Property type.
+        label : str, optional
+            DESVAR label.
+
+        Returns
+        -------
+        ids : np.ndarray
+            The ids of the created design variables.
+
+        """
+        return self.add(label, xinit, xlb, xub, ptype, pids, 'T')
+
+
+    def find(self, pids, pname='T'):
+        """Find the design variables related to given properties
+
+        Parameters
+        ----------
+        pids : array-like
+            Property ids.
+        pname : str, optional
+            Property parameter name.
+
+        Returns
+        -------
+        ids : np.ndarray
+            The DESVAR ids, with `-1` where no design variable was found.
+
+        """
+        pids = np.atleast_1d(np.asarray(pids, dtype=np.int64))
+        check = self.pnames == pname
+        refpids = self.pids[check]
+        refids = self.ids[check]
+        order = np.argsort(refpids, kind='mergesort')
+        refpids = refpids[order]
+        refids = refids[order]
+        pos = np.searchsorted(refpids, pids)
+        pos = np.clip(pos, 0, max(refpids.shape[0] - 1, 0))
+        ids = -np.ones(pids.shape[0], dtype=np.int64)
+        if refpids.shape[0] > 0:
+            found = refpids[pos] == pids
+            ids[found] = refids[pos[found]]
+        return ids
+
+
+    def print_desvars(self, file):
+        """Print all DESVAR cards
+
+        Parameters
+        ----------
+        file : file
+            File object with a :meth:`write` method.
+
+        """
+        if len(self) == 0:
+            return
+        lines = np.char.add('DESVAR'.ljust(8),
+                            np.char.rjust(self.ids.astype('U16'), 8))
+        lines = np.char.add(lines, np.char.rjust(self.labels, 8))
+        lines = np.char.add(lines, format_float_array(self.xinit))
+        lines = np.char.add(lines, format_float_array(self.xlb))
+        lines = np.char.add(lines, format_float_array(self.xub))
+        lines = np.char.add(lines, ' '*16)
+        file.write('\n'.join(lines.tolist()) + '\n')
+
+
+    def print_dvprels(self, file):
+        """Print all DVPREL1 cards
+
+        Parameters
+        ----------
+        file : file
+            File object with a :meth:`write` method.
+
+        """
+        if len(self) == 0:
+            return
+        lines = np.char.add('DVPREL1'.ljust(8),
+                            np.char.rjust(self.dvprel_ids.astype('U16'), 8))
+        lines = np.char.add(lines, np.char.rjust(self.ptypes, 8))
+        lines = np.char.add(lines, np.char.rjust(self.pids.astype('U16'), 8))
+        lines = np.char.add(lines, np.char.rjust(self.pnames, 8))
+        lines = np.char.add(lines, ' '*16)
+        lines = np.char.add(lines, format_float_array(self.c0s))
+        conts = np.char.add('+'.ljust(8),
+                            np.char.rjust(self.ids.astype('U16'), 8))
+        conts = np.char.add(conts, format_float_array(self.coeffs))
+        cards = np.char.add(np.char.add(lines, '\n'), conts)
+        file.write('\n'.join(cards.tolist()) + '\n')
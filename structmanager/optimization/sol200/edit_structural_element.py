@@ -1,4 +1,5 @@
-from .opt_cards import DCONSTR
+from .cards_opt import DCONSTR, DRESP3
+
 
 def add_dtable(se, key, value):
     """Add a DTABLE entry to the SE and the optmodel
@@ -110,7 +111,14 @@ def add_constraint(se, dcid, dresp, lb, ub):
     ub : float or None
         Upper boundary for the constraint.
 
+    Returns
+    -------
+    dconstr : :class:`DCONSTR`
+        The constraint object.
+
     """
     dconstr = DCONSTR(dcid, dresp.id, lb, ub)
     se.dconstrs.append(dconstr)
     se.model.optmodel.dconstrs[dconstr.id] = dconstr
+    se.model.optmodel.dcids.add(dcid)
+    return dconstr
@@ -1,7 +1,13 @@
-from structmanager.sol200 import (DRESP1, DCONSTR, DEQATN, DRESP2, DESVAR,
-                              DVPREL1, DVPREL2)
+from ...cards_opt import DESVAR
+from ...sections import get_section
 
-import structmanager.sol200.output_codes as output_codes_SOL200
+
+# design variables of each profile, the remaining dimensions of the section
+# are constants
+PROFILES = {
+    't': ['t'],
+    't_b': ['t', 'b'],
+    }
 
 
 def create_dvars(flange):
@@ -15,82 +21,24 @@ def create_dvars(flange):
     flange.add_dtable('FLAE', flange.material.E)
     flange.add_dtable('FLAnu', flange.material.nu)
 
-    if flange.profile.lower() == 't':
-        dvar_t = DESVAR('FLAt', flange.t, flange.t_lb, flange.t_ub)
-        flange.add_dvar(dvar_t)
-        dtable_b = flange.add_dtable('FLAb', flange.b)
-        if ptype == 'PBAR':
-            # calculating A
-            deqatn = DEQATN('A(t,b) = t*b')
-            flange.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='A', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_t.id)
-            dvprel.add_dtable(dtable_b)
-            flange.add_dvprel(dvprel)
-            # assuming y-axis towards radial (normal) direction
-            # calculating I1 = Izz
-            deqatn = DEQATN('I1(t,b) = b*t**3/12.')
-            flange.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='I1', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_t.id)
-            dvprel.add_dtable(dtable_b)
-            flange.add_dvprel(dvprel)
-            # calculating I2 = Iyy
-            deqatn = DEQATN('I2(t,b) = t*b**3/12. + t*b*(b/2.)**2')
-            flange.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='I2', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_t.id)
-            dvprel.add_dtable(dtable_b)
-            flange.add_dvprel(dvprel)
-            # calculating J
-            deqatn = DEQATN('I1(t,b) = b*t**3/12.;'
-                            'I2 = t*b**3/12. + t*b*(b/2.)**2;'
-                            'J = I1 + I2')
-            flange.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='J', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_t.id)
-            dvprel.add_dtable(dtable_b)
-            flange.add_dvprel(dvprel)
-        else:
-            raise NotImplementedError('%s not supported!' % ptype)
-
-    elif flange.profile.lower() == 't_b':
-        dvar_t = DESVAR('FLAt', flange.t, flange.t_lb, flange.t_ub)
-        dvar_b = DESVAR('FLAb', flange.b, flange.b_lb, flange.b_ub)
-        flange.add_dvar(dvar_t)
-        flange.add_dvar(dvar_b)
-        if ptype == 'PBAR':
-            # calculating A
-            deqatn = DEQATN('A(t,b) = t*b')
-            flange.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='A', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_t.id)
-            dvprel.add_dvar(dvar_b.id)
-            flange.add_dvprel(dvprel)
-            # assuming y-axis towards radial (normal) direction
-            # calculating I1 = Izz
-            deqatn = DEQATN('I1(t,b) = b*t**3/12.')
-            flange.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='I1', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_t.id)
-            dvprel.add_dvar(dvar_b.id)
-            flange.add_dvprel(dvprel)
-            # calculating I2 = Iyy
-            deqatn = DEQATN('I2(t,b) = t*b**3/12. + t*b*(b/2.)**2')
-            flange.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='I2', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_t.id)
-            dvprel.add_dvar(dvar_b.id)
-            flange.add_dvprel(dvprel)
-            # calculating J
-            deqatn = DEQATN('I1(t,b) = b*t**3/12.;'
-                            'I2 = t*b**3/12. + t*b*(b/2.)**2;'
-                            'J = I1 + I2')
-            flange.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='J', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_t.id)
-            dvprel.add_dvar(dvar_b.id)
-            flange.add_dvprel(dvprel)
+    profile = flange.profile.lower()
+    if profile not in PROFILES:
+        raise NotImplementedError('Flange %s profile not supported!' %
+                                  flange.profile)
+    variables = PROFILES[profile]
+    section = get_section(profile)
+    dvars = [DESVAR('FLA' + arg, getattr(flange, arg),
+                    getattr(flange, arg + '_lb'),
+                    getattr(flange, arg + '_ub')) for arg in variables]
+    values = []
+    for arg in section.args:
+        if arg in variables:
+            dvar = dvars[variables.index(arg)]
+            flange.add_dvar(dvar)
+            values.append(dvar)
         else:
-            raise NotImplementedError('%s not supported!' % ptype)
-
+            values.append(flange.add_dtable('FLA' + arg,
+                                            getattr(flange, arg)))
+    # assuming y-axis towards radial (normal) direction, I1 = Izz and
+    # I2 = Iyy
+    section.create_dvprels(flange, ptype, pid, values)
@@ -1,10 +1,9 @@
-import structmanager.sol200.output_codes as output_codes_SOL200
+from ... import output_codes as output_codes_SOL200
+from ...cards_opt import DEQATN, DRESP1, DRESP2
+from .design_variables import create_dvars
 
-from structmanager.sol200 import (DRESP1, DCONSTR, DEQATN, DRESP2, DESVAR,
-                              DVPREL1, DVPREL2)
 
-
-def constrain_buckling(self, method=1, ms=0.1):
+def constrain_buckling(self, method=1, ms=0.1, load_factor=1.):
     """Add a buckling constraint
 
     Parameters
@@ -30,25 +29,31 @@ def constrain_buckling(self, method=1, ms=0.1):
 
     ms : float, optional
         Minimum margin of safety to be used as constraint.
+    load_factor : float, optional
+        Factor applied to the axial stress or force read from the analysis,
+        e.g. the ratio of the post-buckled to the linear stringer force
+        given by :func:`.super_stringer_load_factors`.
 
     """
-    self.create_dvars()
+    create_dvars(self)
     eltype = self.elements[0].type
 
     # reading constants
     dtable_E = self.dtables['STRE'][0]
     dtable_nu = self.dtables['STRnu'][0]
+    self.add_dtable('STRLF', load_factor)
+    dtable_LF = self.dtables['STRLF'][0]
 
     if method == 1 and self.profile.lower() == 'z_t':
         # buckling equation
         deqatn = DEQATN(
-            'bf(t, b, h, E, nu, FA) = b-t/2.;'
+            'bf(t, b, h, E, nu, LF, FA) = b-t/2.;'
             'bw = h-t;'
             'x = bf/bw;'
             'Kw = -206.08*x**5 + 588.3*x**4 - 596.43*x**3 '
                '+ 249.62*x**2 -41.924*x + 6.4545;'
             'SIGMAcr = Kw*PI(1)**2*E*t**2/(12.*(1.-nu**2)*bw**2);'
-            'MS = SIGMAcr/ABS(MIN(FA, 0.0001))-1.;')
+            'MS = SIGMAcr/ABS(MIN(LF*FA, 0.0001))-1.;')
         self.add_deqatn(deqatn)
         # reading variables
         dvar_t = self.dvars['STRZt']
@@ -70,7 +75,7 @@ def constrain_buckling(self, method=1, ms=0.1):
         # building DRESP2
         dresp2 = DRESP2('STRBUCK', deqatn.id)
         dresp2.dvars = [dvar_t.id]
-        dresp2.dtable = [dtable_b, dtable_h, dtable_E, dtable_nu]
+        dresp2.dtable = [dtable_b, dtable_h, dtable_E, dtable_nu, dtable_LF]
         dresp2.dresp1 = [dresp_FA.id]
         self.add_dresp(dresp2)
         # applying constraint
@@ -80,13 +85,13 @@ def constrain_buckling(self, method=1, ms=0.1):
     elif method == 1 and self.profile.lower() == 'z_t_b':
         # buckling equation
         deqatn = DEQATN(
-            'bf(t, b, h, E, nu, FA) = b-t/2.;'
+            'bf(t, b, h, E, nu, LF, FA) = b-t/2.;'
             'bw = h-t;'
             'x = bf/bw;'
             'Kw = -206.08*x**5 + 588.3*x**4 - 596.43*x**3 '
                '+ 249.62*x**2 -41.924*x + 6.4545;'
             'SIGMAcr = Kw*PI(1)**2*E*t**2/(12.*(1.-nu**2)*bw**2);'
-            'MS = SIGMAcr/ABS(MIN(FA, 0.0001))-1.;')
+            'MS = SIGMAcr/ABS(MIN(LF*FA, 0.0001))-1.;')
         self.add_deqatn(deqatn)
         # reading variables
         dvar_t = self.dvars['STRZt']
@@ -108,7 +113,7 @@ def constrain_buckling(self, method=1, ms=0.1):
         # building DRESP2
         dresp2 = DRESP2('STRBUCK', deqatn.id)
         dresp2.dvars = [dvar_t.id, dvar_b.id]
-        dresp2.dtable = [dtable_h, dtable_E, dtable_nu]
+        dresp2.dtable = [dtable_h, dtable_E, dtable_nu, dtable_LF]
         dresp2.dresp1 = [dresp_FA.id]
         self.add_dresp(dresp2)
         # applying constraint
@@ -118,13 +123,13 @@ def constrain_buckling(self, method=1, ms=0.1):
     elif method == 1 and self.profile.lower() == 'z_t_b_h':
         # buckling equation
         deqatn = DEQATN(
-            'bf(t, b, h, E, nu, FA) = b-t/2.;'
+            'bf(t, b, h, E, nu, LF, FA) = b-t/2.;'
             'bw = h-t;'
             'x = bf/bw;'
             'Kw = -206.08*x**5 + 588.3*x**4 - 596.43*x**3 '
                '+ 249.62*x**2 -41.924*x + 6.4545;'
             'SIGMAcr = Kw*PI(1)**2*E*t**2/(12.*(1.-nu**2)*bw**2);'
-            'MS = SIGMAcr/ABS(MIN(FA, 0.0001))-1.;')
+            'MS = SIGMAcr/ABS(MIN(LF*FA, 0.0001))-1.;')
         self.add_deqatn(deqatn)
         # reading variables
         dvar_t = self.dvars['STRZt']
@@ -145,7 +150,7 @@ def constrain_buckling(self, method=1, ms=0.1):
         # building DRESP2
         dresp2 = DRESP2('STRBUCK', deqatn.id)
         dresp2.dvars = [dvar_t.id, dvar_b.id, dvar_h.id]
-        dresp2.dtable = [dtable_E, dtable_nu]
+        dresp2.dtable = [dtable_E, dtable_nu, dtable_LF]
         dresp2.dresp1 = [dresp_FA.id]
         self.add_dresp(dresp2)
         # applying constraint
@@ -157,9 +162,9 @@ def constrain_buckling(self, method=1, ms=0.1):
         # - considers combined compression + shear
         # - disconsiders bending effects
         # - assumes 3 edges simply supported and one free unloaded edge
-        deqatn = DEQATN('kc(t, h, L, E, nu, PC, PS) = 0.456 + (h/L)**2;'
+        deqatn = DEQATN('kc(t, h, L, E, nu, LF, PC, PS) = 0.456 + (h/L)**2;'
                         'FCcr = kc*PI(1)**2*E*t**2/(12.*(1.-nu**2)*h**2);'
-                        'FC = PC/(t*h);'
+                        'FC = LF*PC/(t*h);'
                         'Rc = FC/FCcr;'
                         'x = L/h;'
                         'ks = 0.0648*x**6 - 1.2338*x**5 + 9.4869*x**4 -'
@@ -195,7 +200,7 @@ def constrain_buckling(self, method=1, ms=0.1):
         # building DRESP2
         dresp2 = DRESP2('STRBUCK', deqatn.id)
         dresp2.dvars = [dvar_t.id]
-        dresp2.dtable = [dtable_h, dtable_L, dtable_E, dtable_nu]
+        dresp2.dtable = [dtable_h, dtable_L, dtable_E, dtable_nu, dtable_LF]
         dresp2.dresp1 = [dresp_PC.id, dresp_PS.id]
         self.add_dresp(dresp2)
         # applying constraint
@@ -207,9 +212,9 @@ def constrain_buckling(self, method=1, ms=0.1):
         # - considers combined compression + shear
         # - disconsiders bending effects
         # - assumes 3 edges simply supported and one free unloaded edge
-        deqatn = DEQATN('kc(t, h, L, E, nu, PC, PS) = 0.456 + (h/L)**2;'
+        deqatn = DEQATN('kc(t, h, L, E, nu, LF, PC, PS) = 0.456 + (h/L)**2;'
                         'FCcr = kc*PI(1)**2*E*t**2/(12.*(1.-nu**2)*h**2);'
-                        'FC = PC/(t*h);'
+                        'FC = LF*PC/(t*h);'
                         'Rc = FC/FCcr;'
                         'x = L/h;'
                         'ks = 0.0648*x**6 - 1.2338*x**5 + 9.4869*x**4 -'
@@ -245,7 +250,7 @@ def constrain_buckling(self, method=1, ms=0.1):
         # building DRESP2
         dresp2 = DRESP2('STRBUCK', deqatn.id)
         dresp2.dvars = [dvar_t.id, dvar_h.id]
-        dresp2.dtable = [dtable_L, dtable_E, dtable_nu]
+        dresp2.dtable = [dtable_L, dtable_E, dtable_nu, dtable_LF]
         dresp2.dresp1 = [dresp_PC.id, dresp_PS.id]
         self.add_dresp(dresp2)
         # applying constraint
@@ -1,5 +1,17 @@
-from structmanager.sol200 import (DRESP1, DCONSTR, DEQATN, DRESP2, DESVAR,
-                              DVPREL1, DVPREL2)
+from ...cards_opt import DESVAR
+from ...sections import get_section
+
+
+# prefix of the card labels and design variables of each profile, the
+# remaining dimensions of the section are constants
+PROFILES = {
+    'z_t': ('STRZ', ['t']),
+    'z_t_b': ('STRZ', ['t', 'b']),
+    'z_t_b_h': ('STRZ', ['t', 'b', 'h']),
+    'z_tf_tw_b_h': ('STRZ', ['tf', 'tw', 'b', 'h']),
+    'b_t': ('STRB', ['t']),
+    'b_t_h': ('STRB', ['t', 'h']),
+    }
 
 
 def create_dvars(stringer):
@@ -12,339 +24,26 @@ def create_dvars(stringer):
     stringer.add_dtable('STRE', stringer.E)
     stringer.add_dtable('STRnu', stringer.nu)
 
-    if stringer.profile.lower() == 'z_t':
-        dvar_t = DESVAR('STRZt', stringer.t, stringer.t_lb, stringer.t_ub)
-        stringer.add_dvar(dvar_t)
-        dtable_b = stringer.add_dtable('STRZb', stringer.b)
-        dtable_h = stringer.add_dtable('STRZh', stringer.h)
-        if ptype == 'PBAR':
-            # calculating A
-            deqatn = DEQATN('A(t,b,h) = 2*t*b + t*h')
-            stringer.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='A', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_t.id)
-            dvprel.add_dtable(dtable_b)
-            dvprel.add_dtable(dtable_h)
-            stringer.add_dvprel(dvprel)
-            # assuming y-axis towards radial (normal) direction
-            # calculating I1 = Izz
-            deqatn = DEQATN('I1f(t,b,h) = t*b**3/12.;'
-                            'I1w = h*t**3/12.;'
-                            'd = t/2. + b/2.;'
-                            'Ad2f = t*b*d**2;'
-                            'I1 = 2*(I1f + Ad2f) + I1w')
-            stringer.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='I1', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_t.id)
-            dvprel.add_dtable(dtable_b)
-            dvprel.add_dtable(dtable_h)
-            stringer.add_dvprel(dvprel)
-            # calculating I2 = Iyy
-            deqatn = DEQATN('I2f(t,b,h) = b*t**3/12.;'
-                            'I2w = t*h**3/12.;'
-                            'd = h/2. - t/2.;'
-                            'Ad2f = t*b*d**2;'
-                            'I2 = 2*(I2f + Ad2f) + I2w')
-            stringer.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='I2', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_t.id)
-            dvprel.add_dtable(dtable_b)
-            dvprel.add_dtable(dtable_h)
-            stringer.add_dvprel(dvprel)
-            # calculating J
-            deqatn = DEQATN('I1f(t,b,h) = t*b**3/12.;'
-                            'I1w = h*t**3/12.;'
-                            'd = t/2. + b/2.;'
-                            'Ad2f = t*b*d**2;'
-                            'I1 = 2*(I1f + Ad2f) + I1w;'
-                            'I2f = b*t**3/12.;'
-                            'I2w = t*h**3/12.;'
-                            'd = h/2. - t/2.;'
-                            'Ad2f = t*b*d**2;'
-                            'I2 = 2*(I2f + Ad2f) + I2w;'
-                            'J = I1 + I2')
-            stringer.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='J', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_t.id)
-            dvprel.add_dtable(dtable_b)
-            dvprel.add_dtable(dtable_h)
-            stringer.add_dvprel(dvprel)
-        else:
-            raise NotImplementedError('%s not supported!' % ptype)
-
-    elif stringer.profile.lower() == 'z_t_b':
-        dvar_t = DESVAR('STRZt', stringer.t, stringer.t_lb, stringer.t_ub)
-        dvar_b = DESVAR('STRZb', stringer.b, stringer.b_lb, stringer.b_ub)
-        stringer.add_dvar(dvar_t)
-        stringer.add_dvar(dvar_b)
-        dtable_h = stringer.add_dtable('STRZh', stringer.h)
-        if ptype == 'PBAR':
-            # calculating A
-            deqatn = DEQATN('A(t,b,h) = 2*t*b + t*h')
-            stringer.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='A', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_t.id)
-            dvprel.add_dvar(dvar_b.id)
-            dvprel.add_dtable(dtable_h)
-            stringer.add_dvprel(dvprel)
-            # assuming y-axis towards radial (normal) direction
-            # calculating I1 = Izz
-            deqatn = DEQATN('I1f(t,b,h) = t*b**3/12.;'
-                            'I1w = h*t**3/12.;'
-                            'd = t/2. + b/2.;'
-                            'Ad2f = t*b*d**2;'
-                            'I1 = 2*(I1f + Ad2f) + I1w')
-            stringer.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='I1', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_t.id)
-            dvprel.add_dvar(dvar_b.id)
-            dvprel.add_dtable(dtable_h)
-            stringer.add_dvprel(dvprel)
-            # calculating I2 = Iyy
-            deqatn = DEQATN('I2f(t,b,h) = b*t**3/12.;'
-                            'I2w = t*h**3/12.;'
-                            'd = h/2. - t/2.;'
-                            'Ad2f = t*b*d**2;'
-                            'I2 = 2*(I2f + Ad2f) + I2w')
-            stringer.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='I2', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_t.id)
-            dvprel.add_dvar(dvar_b.id)
-            dvprel.add_dtable(dtable_h)
-            stringer.add_dvprel(dvprel)
-            # calculating J
-            deqatn = DEQATN('I1f(t,b,h) = t*b**3/12.;'
-                            'I1w = h*t**3/12.;'
-                            'd = t/2. + b/2.;'
-                            'Ad2f = t*b*d**2;'
-                            'I1 = 2*(I1f + Ad2f) + I1w;'
-                            'I2f = b*t**3/12.;'
-                            'I2w = t*h**3/12.;'
-                            'd = h/2. - t/2.;'
-                            'Ad2f = t*b*d**2;'
-                            'I2 = 2*(I2f + Ad2f) + I2w;'
-                            'J = I1 + I2')
-            stringer.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='J', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_t.id)
-            dvprel.add_dvar(dvar_b.id)
-            dvprel.add_dtable(dtable_h)
-            stringer.add_dvprel(dvprel)
-        else:
-            raise NotImplementedError('%s not supported!' % ptype)
-
-    elif stringer.profile.lower() == 'z_t_b_h':
-        dvar_t = DESVAR('STRZt', stringer.t, stringer.t_lb, stringer.t_ub)
-        dvar_b = DESVAR('STRZb', stringer.b, stringer.b_lb, stringer.b_ub)
-        dvar_h = DESVAR('STRZh', stringer.h, stringer.h_lb, stringer.h_ub)
-        stringer.add_dvar(dvar_t)
-        stringer.add_dvar(dvar_b)
-        stringer.add_dvar(dvar_h)
-        if ptype == 'PBAR':
-            # calculating A
-            deqatn = DEQATN('A(t,b,h) = 2*t*b + t*h')
-            stringer.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='A', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_t.id)
-            dvprel.add_dvar(dvar_b.id)
-            dvprel.add_dvar(dvar_h.id)
-            stringer.add_dvprel(dvprel)
-            # assuming y-axis towards radial (normal) direction
-            # calculating I1 = Izz
-            deqatn = DEQATN('I1f(t,b,h) = t*b**3/12.;'
-                            'I1w = h*t**3/12.;'
-                            'd = t/2. + b/2.;'
-                            'Ad2f = t*b*d**2;'
-                            'I1 = 2*(I1f + Ad2f) + I1w')
-            stringer.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='I1', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_t.id)
-            dvprel.add_dvar(dvar_b.id)
-            dvprel.add_dvar(dvar_h.id)
-            stringer.add_dvprel(dvprel)
-            # calculating I2 = Iyy
-            deqatn = DEQATN('I2f(t,b,h) = b*t**3/12.;'
-                            'I2w = t*h**3/12.;'
-                            'd = h/2. - t/2.;'
-                            'Ad2f = t*b*d**2;'
-                            'I2 = 2*(I2f + Ad2f) + I2w')
-            stringer.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='I2', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_t.id)
-            dvprel.add_dvar(dvar_b.id)
-            dvprel.add_dvar(dvar_h.id)
-            stringer.add_dvprel(dvprel)
-            # calculating J
-            deqatn = DEQATN('I1f(t,b,h) = t*b**3/12.;'
-                            'I1w = h*t**3/12.;'
-                            'd = t/2. + b/2.;'
-                            'Ad2f = t*b*d**2;'
-                            'I1 = 2*(I1f + Ad2f) + I1w;'
-                            'I2f = b*t**3/12.;'
-                            'I2w = t*h**3/12.;'
-                            'd = h/2. - t/2.;'
-                            'Ad2f = t*b*d**2;'
-                            'I2 = 2*(I2f + Ad2f) + I2w;'
-                            'J = I1 + I2')
-            stringer.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='J', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_t.id)
-            dvprel.add_dvar(dvar_b.id)
-            dvprel.add_dvar(dvar_h.id)
-            stringer.add_dvprel(dvprel)
-        else:
-            raise NotImplementedError('%s not supported!' % ptype)
-
-    elif stringer.profile.lower() == 'z_tf_tw_b_h':
-        dvar_tf = DESVAR('STRZtf', stringer.tf, stringer.tf_lb, stringer.tf_ub)
-        dvar_tw = DESVAR('STRZtw', stringer.tw, stringer.tw_lb, stringer.tw_ub)
-        dvar_b = DESVAR('STRZb', stringer.b, stringer.b_lb, stringer.b_ub)
-        dvar_h = DESVAR('STRZh', stringer.h, stringer.h_lb, stringer.h_ub)
-        stringer.add_dvar(dvar_tf)
-        stringer.add_dvar(dvar_tw)
-        stringer.add_dvar(dvar_b)
-        stringer.add_dvar(dvar_h)
-        if ptype == 'PBAR':
-            # calculating A
-            deqatn = DEQATN('A(tf,tw,b,h) = 2*tf*b + tw*h')
-            stringer.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='A', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_tf.id)
-            dvprel.add_dvar(dvar_tw.id)
-            dvprel.add_dvar(dvar_b.id)
-            dvprel.add_dvar(dvar_h.id)
-            stringer.add_dvprel(dvprel)
-            # assuming y-axis towards radial (normal) direction
-            # calculating I1 = Izz
-            deqatn = DEQATN('I1f(tf,tw,b,h) = tf*b**3/12.;'
-                            'I1w = h*tw**3/12.;'
-                            'd = tw/2. + b/2.;'
-                            'Ad2f = tf*b*d**2;'
-                            'I1 = 2*(I1f + Ad2f) + I1w')
-            stringer.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='I1', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_tf.id)
-            dvprel.add_dvar(dvar_tw.id)
-            dvprel.add_dvar(dvar_b.id)
-            dvprel.add_dvar(dvar_h.id)
-            stringer.add_dvprel(dvprel)
-            # calculating I2 = Iyy
-            deqatn = DEQATN('I2f(tf,tw,b,h) = b*tf**3/12.;'
-                            'I2w = tw*h**3/12.;'
-                            'd = h/2. - tf/2.;'
-                            'Ad2f = tf*b*d**2;'
-                            'I2 = 2*(I2f + Ad2f) + I2w')
-            stringer.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='I2', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_tf.id)
-            dvprel.add_dvar(dvar_tw.id)
-            dvprel.add_dvar(dvar_b.id)
-            dvprel.add_dvar(dvar_h.id)
-            stringer.add_dvprel(dvprel)
-            # calculating J
-            deqatn = DEQATN('I1f(tf,tw,b,h) = tf*b**3/12.;'
-                            'I1w = h*tw**3/12.;'
-                            'd = tw/2. + b/2.;'
-                            'Ad2f = tf*b*d**2;'
-                            'I1 = 2*(I1f + Ad2f) + I1w;'
-                            'I2f = b*tf**3/12.;'
-                            'I2w = tw*h**3/12.;'
-                            'd = h/2. - tf/2.;'
-                            'Ad2f = tf*b*d**2;'
-                            'I2 = 2*(I2f + Ad2f) + I2w;'
-                            'J = I1 + I2')
-            stringer.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='J', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_tf.id)
-            dvprel.add_dvar(dvar_tw.id)
-            dvprel.add_dvar(dvar_b.id)
-            dvprel.add_dvar(dvar_h.id)
-            stringer.add_dvprel(dvprel)
-        else:
-            raise NotImplementedError('%s not supported!' % ptype)
-
-    elif stringer.profile.lower() == 'b_t':
-        dvar_t = DESVAR('STRBt', stringer.t, stringer.t_lb, stringer.t_ub)
-        stringer.add_dvar(dvar_t)
-        dtable_h = stringer.add_dtable('STRBh', stringer.h)
-        stringer.add_dtable('STRBL', stringer.L)
-        if ptype == 'PBAR':
-            # calculating A
-            deqatn = DEQATN('A(t,h) = t*h')
-            stringer.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='A', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_t.id)
-            dvprel.add_dtable(dtable_h)
-            stringer.add_dvprel(dvprel)
-            # assuming y-axis towards radial (normal) direction
-            # calculating I1 = Izz
-            deqatn = DEQATN('I1(t,h) = t*h**3/12. + t*h*(h/2.)**2')
-            stringer.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='I1', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_t.id)
-            dvprel.add_dtable(dtable_h)
-            stringer.add_dvprel(dvprel)
-            # calculating I2 = Iyy
-            deqatn = DEQATN('I2(t,h) = h*t**3/12.')
-            stringer.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='I2', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_t.id)
-            dvprel.add_dtable(dtable_h)
-            stringer.add_dvprel(dvprel)
-            # calculating J
-            deqatn = DEQATN('I1(t,h) = t*h**3/12. + t*h*(h/2.)**2;'
-                            'I2 = h*t**3/12.;'
-                            'J = I1 + I2')
-            stringer.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='J', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_t.id)
-            dvprel.add_dtable(dtable_h)
-            stringer.add_dvprel(dvprel)
-        else:
-            raise NotImplementedError('%s not supported!' % ptype)
-
-    elif stringer.profile.lower() == 'b_t_h':
-        dvar_t = DESVAR('STRBt', stringer.t, stringer.t_lb, stringer.t_ub)
-        dvar_h = DESVAR('STRBh', stringer.h, stringer.h_lb, stringer.h_ub)
-        stringer.add_dvar(dvar_t)
-        stringer.add_dvar(dvar_h)
-        stringer.add_dtable('STRBL', stringer.L)
-        if ptype == 'PBAR':
-            # calculating A
-            deqatn = DEQATN('A(t,h) = t*h')
-            stringer.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='A', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_t.id)
-            dvprel.add_dvar(dvar_h.id)
-            stringer.add_dvprel(dvprel)
-            # assuming y-axis towards radial (normal) direction
-            # calculating I1 = Izz
-            deqatn = DEQATN('I1(t,h) = t*h**3/12. + t*h*(h/2.)**2')
-            stringer.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='I1', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_t.id)
-            dvprel.add_dvar(dvar_h.id)
-            stringer.add_dvprel(dvprel)
-            # calculating I2 = Iyy
-            deqatn = DEQATN('I2(t,h) = h*t**3/12.')
-            stringer.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='I2', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_t.id)
-            dvprel.add_dvar(dvar_h.id)
-            stringer.add_dvprel(dvprel)
-            # calculating J
-            deqatn = DEQATN('I1(t,h) = t*h**3/12. + t*h*(h/2.)**2;'
-                            'I2 = h*t**3/12.;'
-                            'J = I1 + I2')
-            stringer.add_deqatn(deqatn)
-            dvprel = DVPREL2('PBAR', pid=pid, pname='J', eqid=deqatn.id)
-            dvprel.add_dvar(dvar_t.id)
-            dvprel.add_dvar(dvar_h.id)
-            stringer.add_dvprel(dvprel)
-        else:
-            raise NotImplementedError('%s not supported!' % ptype)
-
-    else:
+    profile = stringer.profile.lower()
+    if profile not in PROFILES:
         raise NotImplementedError('Stringer %s profile not supported!' %
                                   stringer.profile)
-
+    prefix, variables = PROFILES[profile]
+    section = get_section(profile)
+    dvars = [DESVAR(prefix + arg, getattr(stringer, arg),
+                    getattr(stringer, arg + '_lb'),
+                    getattr(stringer, arg + '_ub')) for arg in variables]
+    values = []
+    for arg in section.args:
+        if arg in variables:
+            dvar = dvars[variables.index(arg)]
+            stringer.add_dvar(dvar)
+            values.append(dvar)
+        else:
+            values.append(stringer.add_dtable(prefix + arg,
+                                              getattr(stringer, arg)))
+    if prefix == 'STRB':
+        stringer.add_dtable('STRBL', stringer.L)
+    # assuming y-axis towards radial (normal) direction, I1 = Izz and
+    # I2 = Iyy
+    section.create_dvprels(stringer, ptype, pid, values)
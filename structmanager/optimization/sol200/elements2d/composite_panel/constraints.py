@@ -1,4 +1,5 @@
-import structmanager.sol200.output_codes as output_codes_SOL200
+from ... import output_codes as output_codes_SOL200
+from ...cards_opt import DRESP1, DRESP3
 
 
 def constrain_buckling(panelcomp, eig=1.0):
@@ -29,10 +30,10 @@ def constrain_buckling(panelcomp, eig=1.0):
 
     # calculating buckling eigenvalue using an external subroutine
     # all parameters (desvars, dtables, dresp's) that this DRESP3 needs to run are listed below
-    # creating DRESP3
+    # creating DRESP3, see structmanager.analysis.pcbuck.ARGS
     dresp = DRESP3('PCBUCK1', 'PCBUCK', 'BUCK_PC')
     dresp.add_dvar(panelcomp.dvars['PCt'].id)
-    #dresp.add_dvar(dvar_t.id)
+    dresp.add_dvar(panelcomp.dvars['PCp45'].id)
     dresp.add_dtable(panelcomp.dtables['PCa'][0])
     dresp.add_dtable(panelcomp.dtables['PCb'][0])
     dresp.add_dtable(panelcomp.dtables['PCr'][0])
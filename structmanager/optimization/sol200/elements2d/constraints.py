@@ -1,9 +1,11 @@
 from ..cards_opt import (DRESP1, DCONSTR, DEQATN, DRESP2, DRESP3, DESVAR,
         DVPREL1, DVPREL2)
-import ..output_codes as output_codes_SOL200
+from .. import output_codes as output_codes_SOL200
+from ..aggregation import aggregate_responses
 
 
-def constrain_vonMises(panel, Fcy, average=False, dcid=1):
+def constrain_vonMises(panel, Fcy, average=False, dcid=1, aggregate=None,
+                       param=None, chunk=32):
     """Add a von Mises stress constraint
 
     Parameters
@@ -15,44 +17,61 @@ def constrain_vonMises(panel, Fcy, average=False, dcid=1):
         If False the center element is chosen, otherwise it will check each
         element individually and compute the average von Mises stress of
         the panel.
+    aggregate : str or None, optional
+        `'KS'` or `'PNORM'` to constrain a smooth upper bound of the von
+        Mises stresses of all elements at once, see
+        :func:`.aggregate_responses`. Overrides `average`.
+    param : float or None, optional
+        The aggregation parameter, `rho` for `'KS'` or `p` for `'PNORM'`.
+    chunk : int, optional
+        The maximum number of responses aggregated by one DRESP2.
 
     """
     panel.create_dvars()
-    if not average:
+    OUTC = output_codes_SOL200.OUTC
+    atta_bot = OUTC['STRESS']['CQUAD4']['von Mises or maximum shear at Z1']
+    atta_top = OUTC['STRESS']['CQUAD4']['von Mises or maximum shear at Z2']
+    if aggregate is not None:
+        rids = []
+        for eid in panel.eids:
+            for label, atta in (('PANZ1VM', atta_bot), ('PANZ2VM', atta_top)):
+                dresp1 = DRESP1(label, 'STRESS', 'ELEM', None, atta=atta,
+                                attb=None, atti=eid)
+                panel.add_dresp(dresp1)
+                rids.append(dresp1.id)
+        dresps = aggregate_responses(panel.model.optmodel, rids, Fcy,
+                                     kind=aggregate, param=param, chunk=chunk,
+                                     label='PANVMAG')
+        for dresp2 in dresps:
+            panel.add_dresp(dresp2)
+        panel.add_constraint(dcid, dresps[-1], None, 1.)
+
+    elif not average:
         eid = panel.get_central_element().eid
 
-        dcid = dcid
-        OUTC = output_codes_SOL200.OUTC
-
-        atta = OUTC['STRESS']['CQUAD4']['von Mises or maximum shear at Z1']
-        dresp1 = DRESP1('PANZ1VM', 'STRESS', 'ELEM', None, atta=atta,
+        dresp1 = DRESP1('PANZ1VM', 'STRESS', 'ELEM', None, atta=atta_bot,
                         attb=None, atti=eid)
         panel.add_dresp(dresp1)
         panel.add_constraint(dcid, dresp1, None, Fcy)
 
-        atta = OUTC['STRESS']['CQUAD4']['von Mises or maximum shear at Z2']
-        dresp1 = DRESP1('PANZ2VM', 'STRESS', 'ELEM', None, atta=atta,
+        dresp1 = DRESP1('PANZ2VM', 'STRESS', 'ELEM', None, atta=atta_top,
                         attb=None, atti=eid)
         panel.add_dresp(dresp1)
         panel.add_constraint(dcid, dresp1, None, Fcy)
 
     else:
-        dcid = dcid
-        OUTC = output_codes_SOL200.OUTC
-        atta = OUTC['STRESS']['CQUAD4']['von Mises or maximum shear at Z1']
         dresp1_bot = []
         dresp1_top = []
         for eid in panel.eids:
-            dresp1 = DRESP1('PANZ1VM', 'STRESS', 'ELEM', None, atta=atta,
+            dresp1 = DRESP1('PANZ1VM', 'STRESS', 'ELEM', None, atta=atta_bot,
                             attb=None, atti=eid)
             panel.add_dresp(dresp1)
-            dresp1_bot.append(dresp1)
+            dresp1_bot.append(dresp1.id)
 
-            atta = OUTC['STRESS']['CQUAD4']['von Mises or maximum shear at Z2']
-            dresp1 = DRESP1('PANZ2VM', 'STRESS', 'ELEM', None, atta=atta,
+            dresp1 = DRESP1('PANZ2VM', 'STRESS', 'ELEM', None, atta=atta_top,
                             attb=None, atti=eid)
             panel.add_dresp(dresp1)
-            dresp1_top.append(dresp1)
+            dresp1_top.append(dresp1.id)
 
         dresp2_bot = DRESP2('PANZ1VMA', eqid='AVG')
         dresp2_bot.dresp1 = dresp1_bot[:]
@@ -0,0 +1,136 @@
+"""
+Equation evaluation (:mod:`structmanager.sol200.equations`)
+============================================================
+
+.. currentmodule:: structmanager.sol200.equations
+
+The equations of :class:`.DEQATN` cards are translated into vectorized NumPy
+expressions, such that the DRESP2 responses can be evaluated outside the
+solver. Names are case insensitive, as in NASTRAN.
+
+"""
+from __future__ import division
+import re
+from functools import reduce
+
+import numpy as np
+
+
+def _avg(*args):
+    return sum(args) / len(args)
+
+
+def _ssq(*args):
+    return sum([a**2 for a in args])
+
+
+FUNCTIONS = dict(
+    ABS=np.abs,
+    ACOS=np.arccos,
+    ASIN=np.arcsin,
+    ATAN=np.arctan,
+    ATAN2=np.arctan2,
+    COS=np.cos,
+    COSH=np.cosh,
+    DIM=lambda x, y: x - np.minimum(x, y),
+    EXP=np.exp,
+    LOG=np.log,
+    LOG10=np.log10,
+    MAX=lambda *args: reduce(np.maximum, args),
+    MIN=lambda *args: reduce(np.minimum, args),
+    MOD=np.mod,
+    PI=lambda x: np.pi*x,
+    SIN=np.sin,
+    SINH=np.sinh,
+    SQRT=np.sqrt,
+    TAN=np.tan,
+    TANH=np.tanh,
+    AVG=_avg,
+    SUM=lambda *args: sum(args),
+    SSQ=_ssq,
+    RSS=lambda *args: np.sqrt(_ssq(*args)),
+    )
+
+# functions that can be given as EQID of a DRESP2
+BUILTINS = dict((name, FUNCTIONS[name]) for name in ['AVG', 'SUM', 'MAX',
+                                                     'MIN', 'SSQ', 'RSS'])
+
+_HEADER = re.compile(r'^\s*(\w+)\s*\(([^)]*)\)\s*=(.*)$')
+
+
+class Equation(object):
+    """Vectorized equation compiled from a :class:`.DEQATN` string
+
+    ==================  ======================================================
+    Attribute           Description
+    ==================  ======================================================
+    `name`              `str` with the name of the function
+    `args`              `list` with the names of the arguments
+    `statements`        `list` of `(name, code)` tuples, evaluated in order
+    ==================  ======================================================
+
+    Parameters
+    ----------
+    eq : str
+        The equation, for example ``'T(x,y)=SQRT(x**2+y**2)'``, where further
+        statements can follow separated by `;`. The value of the last
+        statement is returned.
+
+    """
+    def __init__(self, eq):
+        eq = eq.strip().upper()
+        statements = [s.strip() for s in eq.split(';') if s.strip() != '']
+        if len(statements) == 0:
+            raise ValueError('Empty equation')
+        header = _HEADER.match(statements[0])
+        if header is None:
+            raise ValueError('Invalid equation: %s' % eq)
+        self.name = header.group(1)
+        self.args = [a.strip() for a in header.group(2).split(',')
+                     if a.strip() != '']
+        statements[0] = '%s=%s' % (self.name, header.group(3))
+        self.statements = []
+        known = set(self.args) | set(FUNCTIONS.keys())
+        for statement in statements:
+            name, sep, expr = statement.partition('=')
+            name = name.strip()
+            if sep == '' or not re.match(r'^[A-Z]\w*$', name):
+                raise ValueError('Invalid statement: %s' % statement)
+            code = compile(expr.strip(), '<DEQATN>', 'eval')
+            unknown = [n for n in code.co_names if n not in known]
+            if len(unknown) > 0:
+                raise ValueError('Undefined names in statement %s: %s' %
+                                 (statement, ', '.join(unknown)))
+            self.statements.append((name, code))
+            known.add(name)
+
+
+    def __call__(self, *values):
+        if len(values) != len(self.args):
+            raise ValueError('Equation %s takes %d arguments, %d given' %
+                             (self.name, len(self.args), len(values)))
+        namespace = dict(FUNCTIONS)
+        namespace.update(zip(self.args, values))
+        namespace['__builtins__'] = {}
+        value = None
+        for name, code in self.statements:
+            value = eval(code, namespace)
+            namespace[name] = value
+        return value
+
+
+def compile_deqatn(eq):
+    """Compile the equation of a :class:`.DEQATN` card
+
+    Parameters
+    ----------
+    eq : str or :class:`.DEQATN`
+        The equation string or the card.
+
+    Returns
+    -------
+    equation : :class:`.Equation`
+        The callable equation, accepting NumPy arrays as arguments.
+
+    """
+    return Equation(getattr(eq, 'eq', eq))
@@ -0,0 +1,180 @@
+"""
+External responses (:mod:`structmanager.sol200.external`)
+===========================================================
+
+.. currentmodule:: structmanager.sol200.external
+
+Native Python evaluators of the external responses referenced by
+:class:`.DRESP3` cards, identified by their group and type. They are used by
+:func:`.evaluate_responses` and can be served to other processes, such that
+sizing loops can run without the compiled NASTRAN subroutines.
+
+==================  ==================  ======================================
+Group               Type                Evaluator
+==================  ==================  ======================================
+`'PCBUCK'`          `'BUCK_PC'`         :func:`.buck_pc`
+`'WINGBAY'`         `'BUCK_WB'`         :func:`.buck_wb`
+==================  ==================  ======================================
+
+The server reads one JSON request per line from the standard input and
+writes one JSON reply per line to the standard output::
+
+    python -m structmanager.optimization.sol200.external
+
+    {"group": "PCBUCK", "type": "BUCK_PC", "args": [[...], ...]}
+    {"values": [...]}
+
+where `args` has one list per argument, each with one value per response.
+Errors are replied as ``{"error": "message"}``. See :class:`.Client` to
+start and use a server from Python.
+
+"""
+from __future__ import division, print_function
+
+import json
+import subprocess
+import sys
+
+import numpy as np
+
+from ...analysis.pcbuck import buck_pc
+from ...analysis.wingbay import buck_wb
+
+
+EVALUATORS = {
+    ('PCBUCK', 'BUCK_PC'): buck_pc,
+    ('WINGBAY', 'BUCK_WB'): buck_wb,
+    }
+
+
+def register_dresp3(group, type, func):
+    """Register the evaluator of an external response
+
+    Parameters
+    ----------
+    group : str
+        The group name, as in :class:`.DRESP3`.
+    type : str
+        The external response type.
+    func : function
+        Called with an array of shape `(nargs, nresp)` with the arguments in
+        the order of the :class:`.DRESP3` card, returning an array of shape
+        `(nresp,)`.
+
+    """
+    EVALUATORS[(str(group).upper(), str(type).upper())] = func
+
+
+def get_evaluator(group, type):
+    """Return the evaluator of an external response, `None` if unknown"""
+    return EVALUATORS.get((str(group).upper(), str(type).upper()))
+
+
+def evaluate_dresp3(group, type, args):
+    """Evaluate many external responses of the same type
+
+    Parameters
+    ----------
+    group, type : str
+        The group name and the external response type.
+    args : array-like
+        The arguments, array of shape `(nargs, nresp)`.
+
+    Returns
+    -------
+    values : np.ndarray
+        The responses, `NaN` where any argument is not finite.
+
+    """
+    func = get_evaluator(group, type)
+    if func is None:
+        raise ValueError('Unknown external response %s %s' % (group, type))
+    args = np.atleast_2d(np.asarray(args, dtype=np.float64).T).T
+    values = np.full(args.shape[1], np.nan)
+    check = np.isfinite(args).all(axis=0)
+    if check.any():
+        values[check] = func(args[:, check])
+    return values
+
+
+def serve(infile=None, outfile=None):
+    """Answer requests until the end of `infile`
+
+    Parameters
+    ----------
+    infile, outfile : file or None, optional
+        By default the standard input and output.
+
+    """
+    if infile is None:
+        infile = sys.stdin
+    if outfile is None:
+        outfile = sys.stdout
+    for line in iter(infile.readline, ''):
+        if line.strip() == '':
+            continue
+        try:
+            request = json.loads(line)
+            values = evaluate_dresp3(request['group'], request['type'],
+                                     request['args'])
+            reply = {'values': [None if np.isnan(v) else v
+                                for v in values.tolist()]}
+        except (ValueError, KeyError, TypeError, IndexError,
+                ArithmeticError) as e:
+            # invalid requests and failed evaluations, the server continues
+            reply = {'error': '%s: %s' % (e.__class__.__name__, e)}
+        outfile.write(json.dumps(reply) + '\n')
+        outfile.flush()
+
+
+class Client(object):
+    """Client of an external response server running in another process
+
+    Parameters
+    ----------
+    cmd : list or None, optional
+        The command starting the server, by default this module run with the
+        current Python interpreter.
+
+    """
+    def __init__(self, cmd=None):
+        if cmd is None:
+            cmd = [sys.executable, '-m', __name__]
+        self.process = subprocess.Popen(cmd, stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE,
+                                        universal_newlines=True)
+
+
+    def evaluate(self, group, type, args):
+        """Evaluate responses in the server, see :func:`.evaluate_dresp3`"""
+        args = np.atleast_2d(np.asarray(args, dtype=np.float64).T).T
+        request = {'group': group, 'type': type,
+                   'args': np.where(np.isfinite(args), args, 0.).tolist()}
+        self.process.stdin.write(json.dumps(request) + '\n')
+        self.process.stdin.flush()
+        reply = json.loads(self.process.stdout.readline())
+        if 'error' in reply:
+            raise RuntimeError(reply['error'])
+        values = np.array([np.nan if v is None else v
+                           for v in reply['values']], dtype=np.float64)
+        values[~np.isfinite(args).all(axis=0)] = np.nan
+        return values
+
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.stdin.close()
+            self.process.wait()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+if __name__ == '__main__':
+    serve()
@@ -5,6 +5,10 @@ Nastran's Output codes (:mod:`atd.sol200.output_codes`)
 .. currentmodule:: atd.sol200.output_codes
 
 """
+import numpy as np
+
+from ...token_index import build_index
+
 OUTC = {}
 # STRESS output codes
 # ===================
@@ -256,17 +260,61 @@ force['CTRIA3'] = force[74] = force[33]
 # element CTRIA3_comp (97)
 force['CTRIA3_comp'] = force[97] = force[95]
 
-def get_output_code(rtype, eltype, name):
-    el = OUTC[rtype][eltype]
-    comps = name.split()
-    for k in el.keys():
-        check = 0
-        for comp in comps:
-            if comp in k:
-                check += 1
-        if check == len(comps):
-            return el[k]
-    print comps
-    raise ValueError('Matching output code not found')
+INDEX = build_index(OUTC)
 
 
+def get_output_code(rtype, eltype, name):
+    """Translate an output name into a code
+
+    Names not found exactly are matched by their words, all of which must be
+    found in the name of the output, e.g. `'Z1 von Mises'` matches `'von
+    Mises or maximum shear at Z1'`. This lookup is done through
+    :data:`.INDEX` and memoized.
+
+    Parameters
+    ----------
+    rtype : str
+        Response type, such as `'STRESS'` or `'FORCE'`.
+    eltype : str or int
+        Element type, such as `'CQUAD4'` or `33`.
+    name : str
+        String corresponding to the desired output.
+
+    Returns
+    -------
+    code : int
+        The output code.
+
+    """
+    table = OUTC[rtype][eltype]
+    if name in table:
+        return table[name]
+    code = INDEX[rtype][eltype].find(name)
+    if code is None:
+        raise ValueError('Matching output code not found for "%s"' % name)
+    return code
+
+
+def get_output_codes(rtype, eltype, names):
+    """Translate many output names into codes at once
+
+    Parameters
+    ----------
+    rtype : str
+        Response type, such as `'STRESS'` or `'FORCE'`.
+    eltype : str or int
+        Element type, such as `'CQUAD4'` or `33`.
+    names : array-like
+        The output names, see :func:`.get_output_code`.
+
+    Returns
+    -------
+    codes : np.ndarray
+        The output codes.
+
+    """
+    names = np.atleast_1d(np.asarray(names, dtype=str))
+    unames, inverse = np.unique(names, return_inverse=True)
+    ucodes = [get_output_code(rtype, eltype, name)
+              for name in unames.tolist()]
+    return np.array(ucodes, dtype=np.int64)[inverse.ravel()]
@@ -0,0 +1,297 @@
+"""
+Screening regions (:mod:`structmanager.sol200.regions`)
+========================================================
+
+.. currentmodule:: structmanager.sol200.regions
+
+NASTRAN retains at most `NSTR` constraints of each region and load case, as
+given in the :class:`.DSCREEN` cards. The functions in this module assign the
+`region` of the constrained :class:`.DRESP1` and :class:`.DRESP2` responses
+from the SE owning each response, grouping the SEs by:
+
+- SE, one region per SE
+- SA, one region per structural assembly
+- position, one region per cluster of SE centroids
+
+such that the number of retained constraints is bounded by the number of
+regions.
+
+"""
+from __future__ import division
+
+import numpy as np
+
+from .cards_opt import DRESP1, DRESP2, DRESP3, DSCREEN
+
+
+def response_owners(optmodel, ses):
+    """Find the SE owning each design response
+
+    The owner of a :class:`.DRESP1` of type `'ELEM'` is the SE containing the
+    element, and of a :class:`.DRESP1` of type `'PSHELL'` the first SE with
+    that property. The owner of a :class:`.DRESP2` or a :class:`.DRESP3` is
+    the owner of the first referenced response having one.
+
+    Parameters
+    ----------
+    optmodel : :class:`.SOL200`
+        The optimization model.
+    ses : list
+        The SEs.
+
+    Returns
+    -------
+    owners : dict
+        The index in `ses` of the SE owning each response, `-1` when not
+        known, with the DRESP ids as keys.
+
+    """
+    sizes = np.array([len(se.eids) for se in ses], dtype=np.int64)
+    if sizes.sum() > 0:
+        all_eids = np.concatenate([np.asarray(se.eids, dtype=np.int64)
+                                   for se in ses])
+    else:
+        all_eids = np.zeros(0, dtype=np.int64)
+    all_seids = np.repeat(np.arange(len(ses)), sizes)
+    eids, first = np.unique(all_eids, return_index=True)
+    seids = all_seids[first]
+    pids = np.array([-1 if se.pid is None else se.pid for se in ses],
+                    dtype=np.int64)
+    upids, pid_first = np.unique(pids, return_index=True)
+
+    owners = dict((rid, -1) for rid in optmodel.dresps)
+    dresp1s = [(rid, d) for rid, d in optmodel.dresps.items()
+               if isinstance(d, DRESP1)]
+    r1_ids = np.array([rid for rid, d in dresp1s], dtype=np.int64)
+    ptypes = np.array([str(d.ptype).upper() for rid, d in dresp1s], dtype=str)
+    atti = np.array([_attr_int(d.atti) for rid, d in dresp1s], dtype=np.int64)
+    for ptype, keys, values in (('ELEM', eids, seids),
+                                ('PSHELL', upids, pid_first)):
+        if keys.shape[0] == 0:
+            continue
+        check = ptypes == ptype
+        pos = np.clip(np.searchsorted(keys, atti[check]), 0,
+                      keys.shape[0] - 1)
+        found = keys[pos] == atti[check]
+        for rid, seid in zip(r1_ids[check][found].tolist(),
+                             values[pos[found]].tolist()):
+            owners[rid] = seid
+
+    def owner(rid, visiting=()):
+        dresp = optmodel.dresps.get(rid)
+        if owners.get(rid, -1) >= 0 or dresp is None or rid in visiting:
+            return owners.get(rid, -1)
+        if isinstance(dresp, (DRESP2, DRESP3)):
+            for ref in list(dresp.dresp1) + list(dresp.dresp2):
+                if owner(ref, visiting + (rid,)) >= 0:
+                    owners[rid] = owners[ref]
+                    break
+        return owners.get(rid, -1)
+
+    for rid in optmodel.dresps:
+        owner(rid)
+    return owners
+
+
+def _attr_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return -1
+
+
+def se_centroids(ses):
+    """Centroids of the SEs, see :meth:`.SE.get_centroid`
+
+    Parameters
+    ----------
+    ses : list
+        The SEs.
+
+    Returns
+    -------
+    centroids : np.ndarray
+        Array of shape `(len(ses), 3)`, `NaN` for SEs without elements from
+        a loaded FE model.
+
+    """
+    centroids = np.full((len(ses), 3), np.nan)
+    for i, se in enumerate(ses):
+        centroids[i] = se.get_centroid()
+    return centroids
+
+
+def kmeans(x, k, niter=20):
+    """Cluster points using k-means
+
+    The initial clusters are obtained by recursive coordinate bisection, such
+    that the result is deterministic. The points are assigned to the nearest
+    center using a KD-tree.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        The points, array of shape `(n, ndim)`.
+    k : int
+        The number of clusters.
+    niter : int, optional
+        The maximum number of iterations.
+
+    Returns
+    -------
+    labels : np.ndarray
+        The cluster of each point, numbered consecutively from `0`.
+
+    """
+    try:
+        from scipy.spatial import cKDTree
+    except ImportError:
+        raise ImportError('Python "scipy" module required')
+    n = x.shape[0]
+    k = max(1, min(int(k), n))
+    centers = np.array([x[idx].mean(axis=0)
+                        for idx in _bisect(x, np.arange(n), k)
+                        if idx.shape[0] > 0])
+    labels = np.full(n, -1, dtype=np.int64)
+    for it in range(niter):
+        new = cKDTree(centers).query(x)[1]
+        if np.all(new == labels):
+            break
+        labels = new
+        counts = np.bincount(labels, minlength=centers.shape[0])
+        for dim in range(x.shape[1]):
+            sums = np.bincount(labels, weights=x[:, dim],
+                               minlength=centers.shape[0])
+            centers[counts > 0, dim] = sums[counts > 0]/counts[counts > 0]
+    return np.unique(labels, return_inverse=True)[1].ravel()
+
+
+def _bisect(x, idx, k):
+    """Split the points `x[idx]` into `k` groups of similar sizes"""
+    if k == 1:
+        return [idx]
+    xi = x[idx]
+    dim = np.argmax(xi.max(axis=0) - xi.min(axis=0))
+    order = idx[np.argsort(xi[:, dim], kind='mergesort')]
+    k1 = k//2
+    split = int(round(idx.shape[0]*k1/float(k)))
+    return _bisect(x, order[:split], k1) + _bisect(x, order[split:], k - k1)
+
+
+def se_regions(ses, by='se', sas=None, centroids=None, nregions=None,
+               ses_per_region=50, region0=1):
+    """Region id of each SE
+
+    Parameters
+    ----------
+    ses : list
+        The SEs.
+    by : str, optional
+        `'se'` for one region per SE, `'sa'` for one region per SA and
+        `'spatial'` for one region per cluster of SE centroids.
+    sas : list or None, optional
+        The SAs, required with `by='sa'`, with their SEs as attributes or in
+        list attributes. SEs not belonging to any SA get one region each.
+    centroids : np.ndarray or None, optional
+        The SE centroids used with `by='spatial'`, by default computed with
+        :func:`.se_centroids`. SEs without centroid get one region each.
+    nregions : int or None, optional
+        The number of clusters with `by='spatial'`.
+    ses_per_region : int, optional
+        With `by='spatial'` and `nregions=None` the number of clusters is
+        chosen to have this average number of SEs per region.
+    region0 : int, optional
+        The first region id.
+
+    Returns
+    -------
+    regions : np.ndarray
+        The region id of each SE.
+
+    """
+    n = len(ses)
+    regions = np.full(n, -1, dtype=np.int64)
+    if n == 0:
+        return regions
+    if by == 'se':
+        return region0 + np.arange(n)
+    elif by == 'sa':
+        if sas is None:
+            raise ValueError('The SAs are required to assign regions by SA')
+        index = dict((id(se), i) for i, se in enumerate(ses))
+        for i, sa in enumerate(sas):
+            # SEs as single attributes or in lists, e.g. WingBay.panels
+            values = []
+            for v in vars(sa).values():
+                if isinstance(v, (list, tuple)):
+                    values.extend(v)
+                else:
+                    values.append(v)
+            members = [index[id(v)] for v in values if id(v) in index]
+            members = [j for j in members if regions[j] < 0]
+            regions[members] = i
+    elif by == 'spatial':
+        if centroids is None:
+            centroids = se_centroids(ses)
+        centroids = np.asarray(centroids, dtype=np.float64)
+        check = ~np.isnan(centroids).any(axis=1)
+        if check.any():
+            if nregions is None:
+                nregions = int(np.ceil(check.sum()/float(ses_per_region)))
+            regions[check] = kmeans(centroids[check], nregions)
+    else:
+        raise ValueError('Invalid grouping: %s' % by)
+    # one region for each remaining SE
+    missing = regions < 0
+    regions[missing] = regions.max() + 1 + np.arange(missing.sum())
+    return region0 + regions
+
+
+def plan_regions(optmodel, ses, by='se', sas=None, centroids=None,
+                 nregions=None, ses_per_region=50, region0=1,
+                 overwrite=False, nstr=None, trs=-0.5):
+    """Assign screening regions to the constrained responses
+
+    Parameters
+    ----------
+    optmodel : :class:`.SOL200`
+        The optimization model.
+    ses : list
+        The SEs.
+    by, sas, centroids, nregions, ses_per_region, region0 :
+        See :func:`.se_regions`.
+    overwrite : bool, optional
+        If ``False`` the responses that already have a region are kept
+        unchanged.
+    nstr : int or None, optional
+        If given, one :class:`.DSCREEN` card is created for each response
+        type with an assigned region, retaining `nstr` constraints per region
+        and load case.
+    trs : float, optional
+        The truncation threshold of the :class:`.DSCREEN` cards.
+
+    Returns
+    -------
+    regions : dict
+        The region assigned to each response, with the DRESP ids as keys.
+
+    """
+    seregions = se_regions(ses, by=by, sas=sas, centroids=centroids,
+                           nregions=nregions, ses_per_region=ses_per_region,
+                           region0=region0)
+    owners = response_owners(optmodel, ses)
+    regions = {}
+    rtypes = set()
+    for rid in set(c.rid for c in optmodel.dconstrs.values()):
+        dresp = optmodel.dresps.get(rid)
+        if not isinstance(dresp, (DRESP1, DRESP2)) or owners[rid] < 0:
+            continue
+        if not overwrite and dresp.region not in ('', None):
+            continue
+        dresp.region = int(seregions[owners[rid]])
+        regions[rid] = dresp.region
+        rtypes.add(dresp.rtype if isinstance(dresp, DRESP1) else 'EQUA')
+    if nstr is not None:
+        for rtype in sorted(rtypes):
+            optmodel.dscreens[rtype] = DSCREEN(rtype, trs, nstr)
+    return regions
@@ -0,0 +1,589 @@
+"""
+Constraint screening (:mod:`structmanager.sol200.screening`)
+=============================================================
+
+.. currentmodule:: structmanager.sol200.screening
+
+The responses of an optimization model are evaluated using the element forces
+of the previous design cycle, read into the SEs by
+:meth:`.StructModel.read_forces`. Constraints far from being active are then
+removed from the model or moved to screening regions before the cards are
+written, reducing the size of the sensitivity analysis.
+
+Responses that cannot be evaluated from the element forces, such as DRESP3
+responses without a native evaluator in :mod:`.external` or responses
+depending on unsupported output codes, are always retained.
+
+"""
+from __future__ import division, print_function
+
+import numpy as np
+
+from ...structelem.base import SE2D
+from .cards_opt import DRESP1, DRESP2, DRESP3
+from .equations import BUILTINS, compile_deqatn
+from .external import evaluate_dresp3, get_evaluator
+from .output_codes import get_output_code
+from .regions import _attr_int, response_owners
+
+
+OBJECTIVE_RTYPES = ('MASS', 'VOLUME', 'WEIGHT')
+
+
+class ElementForces(object):
+    """Element forces of many SEs gathered in one array
+
+    ==================  ======================================================
+    Attribute           Description
+    ==================  ======================================================
+    `subcases`          `np.ndarray` with the subcase ids
+    `eids`              `np.ndarray` with the sorted element ids of all SEs
+    `forces`            `np.ndarray` of shape `(nsubcases, nelem, 8)` with
+                        the element forces, `NaN` when not available
+    `seids`             `np.ndarray` with the index of the SE of each element
+    `t`                 `np.ndarray` with the thickness of each 2D element,
+                        `NaN` for the other elements, or of shape
+                        `(nsubcases, nelem)` when it varies per column
+    `pids`              `np.ndarray` with the property id of each element,
+                        `-1` when not known
+    ==================  ======================================================
+
+    Parameters
+    ----------
+    ses : list
+        The SEs, with the forces read by :meth:`.StructModel.read_forces`.
+
+    """
+    def __init__(self, ses):
+        from ...outreader.forces1d import Forces1D
+
+        sizes = np.array([len(se.eids) for se in ses], dtype=np.int64)
+        if sizes.sum() > 0:
+            all_eids = np.concatenate([np.asarray(se.eids, dtype=np.int64)
+                                       for se in ses])
+        else:
+            all_eids = np.zeros(0, dtype=np.int64)
+        all_seids = np.repeat(np.arange(len(ses)), sizes)
+        self.eids, first = np.unique(all_eids, return_index=True)
+        self.seids = all_seids[first]
+        t = np.array([np.nan if getattr(se, 't', None) is None else se.t
+                      for se in ses] + [np.nan], dtype=np.float64)
+        pids = np.array([-1 if se.pid is None else se.pid for se in ses] +
+                        [-1], dtype=np.int64)
+        is2d = np.array([isinstance(se, SE2D) for se in ses] + [False])
+        self.t = np.where(is2d[self.seids], t[self.seids], np.nan)
+        self.pids = pids[self.seids]
+
+        subcases = set()
+        for se in ses:
+            if se.forces is None:
+                continue
+            if isinstance(se.forces, Forces1D):
+                subcases.update(se.forces.subcases)
+            else:
+                subcases.update(se.forces.forces.keys())
+        self.subcases = np.array(sorted(subcases), dtype=np.int64)
+
+        self.forces = np.full((self.subcases.shape[0], self.eids.shape[0], 8),
+                              np.nan)
+        isubs, eids, data = [], [], []
+        for se in ses:
+            if se.forces is None:
+                continue
+            if isinstance(se.forces, Forces1D):
+                forces = np.asarray(se.forces.forces)
+                for i, subcase in enumerate(se.forces.subcases):
+                    isubs.append(np.full(len(se.eids), subcase))
+                    eids.append(np.asarray(se.eids, dtype=np.int64))
+                    data.append(forces[:8, :, i].T)
+                continue
+            if se.forces.eids is None:
+                print('WARNING - Element ids of SE "{0}" not available, '
+                      'forces ignored'.format(se.name))
+                continue
+            for subcase, forces in se.forces.forces.items():
+                subcase_eids = np.asarray(se.forces.eids[subcase],
+                                          dtype=np.int64)
+                isubs.append(np.full(subcase_eids.shape[0], subcase))
+                eids.append(subcase_eids)
+                data.append(np.asarray(forces)[-1, :, :8])
+        if len(eids) > 0:
+            isubs = np.searchsorted(self.subcases, np.concatenate(isubs))
+            pos = self.find(np.concatenate(eids))
+            self.forces[isubs, pos] = np.concatenate(data)
+
+
+    @classmethod
+    def from_arrays(cls, subcases, eids, forces, t=None, pids=None):
+        """Create the element forces from arrays
+
+        Parameters
+        ----------
+        subcases : array-like
+            The subcase ids.
+        eids : array-like
+            The sorted element ids.
+        forces : array-like
+            Array of shape `(nsubcases, nelem, 8)`.
+        t : array-like or None, optional
+            The thickness of the 2D elements, `NaN` for the others.
+        pids : array-like or None, optional
+            The property ids, by default `-1`.
+
+        Returns
+        -------
+        ef : :class:`.ElementForces`
+            The new object.
+
+        """
+        ef = cls.__new__(cls)
+        ef.subcases = np.asarray(subcases, dtype=np.int64)
+        ef.eids = np.asarray(eids, dtype=np.int64)
+        nelem = ef.eids.shape[0]
+        ef.forces = np.asarray(forces, dtype=np.float64).reshape(
+            ef.subcases.shape[0], nelem, 8)
+        ef.seids = np.zeros(nelem, dtype=np.int64)
+        ef.t = (np.full(nelem, np.nan) if t is None else
+                np.asarray(t, dtype=np.float64))
+        ef.pids = (np.full(nelem, -1, dtype=np.int64) if pids is None else
+                   np.asarray(pids, dtype=np.int64))
+        return ef
+
+
+    def find(self, eids):
+        """Positions of given elements, `-1` when not found"""
+        eids = np.atleast_1d(np.asarray(eids, dtype=np.int64))
+        if self.eids.shape[0] == 0:
+            return np.full(eids.shape[0], -1, dtype=np.int64)
+        pos = np.clip(np.searchsorted(self.eids, eids), 0,
+                      self.eids.shape[0] - 1)
+        return np.where(self.eids[pos] == eids, pos, -1)
+
+
+    def von_mises(self, pos, z):
+        """von Mises stress of 2D elements computed from the forces
+
+        Parameters
+        ----------
+        pos : np.ndarray
+            The element positions, see :meth:`.find`.
+        z : float
+            `-1.` for the bottom (Z1) and `1.` for the top (Z2) fibers.
+
+        Returns
+        -------
+        vm : np.ndarray
+            Array of shape `(nsubcases, len(pos))`.
+
+        """
+        f = self.forces[:, pos]
+        t = self.t[..., pos]
+        bending = z*6./t**2
+        sx = f[..., 0]/t + bending*f[..., 3]
+        sy = f[..., 1]/t + bending*f[..., 4]
+        sxy = f[..., 2]/t + bending*f[..., 5]
+        return np.sqrt(sx**2 - sx*sy + sy**2 + 3.*sxy**2)
+
+
+def evaluate_responses(optmodel, ses):
+    """Evaluate the design responses using the SE forces
+
+    Supported are DRESP1 responses of type `'FORCE'` for elements, the von
+    Mises stresses at Z1 and Z2 of 2D elements or PSHELL properties, DRESP3
+    responses with an evaluator registered in :mod:`.external`, and DRESP2
+    responses depending on these, on design variables and on DTABLE
+    constants. The DRESP2 responses sharing one equation and the DRESP3
+    responses of one type are evaluated at once.
+
+    Parameters
+    ----------
+    optmodel : :class:`.SOL200`
+        The optimization model.
+    ses : list
+        The SEs, with the forces read by :meth:`.StructModel.read_forces`.
+
+    Returns
+    -------
+    subcases : np.ndarray
+        The subcase ids.
+    values : dict
+        The response values, arrays of shape `(nsubcases,)` with the DRESP ids
+        as keys. Responses that could not be evaluated are `NaN`.
+    owners : dict
+        The index in `ses` of the SE owning each response, see
+        :func:`.response_owners`.
+
+    """
+    ef = ElementForces(ses)
+    values = evaluate_design(optmodel, ef)
+    return ef.subcases, values, response_owners(optmodel, ses)
+
+
+def evaluate_design(optmodel, ef, design=None):
+    """Evaluate the design responses for given element forces and design
+
+    See :func:`.evaluate_responses` for the supported responses. Many designs
+    can be evaluated at once, giving one column of `ef` per design and
+    subcase.
+
+    Parameters
+    ----------
+    optmodel : :class:`.SOL200`
+        The optimization model.
+    ef : :class:`.ElementForces`
+        The element forces, with one column per subcase or design.
+    design : dict or None, optional
+        The design variable values, floats or arrays with one value per
+        column, with the DESVAR ids as keys. By default the initial values of
+        the design variables.
+
+    Returns
+    -------
+    values : dict
+        The response values, arrays of shape `(ncolumns,)` with the DRESP ids
+        as keys. Responses that could not be evaluated are `NaN`.
+
+    Raises
+    ------
+    ValueError
+        If a DEQATN or an external response fails for the given arguments,
+        with the ids of the responses involved.
+
+    """
+    if design is None:
+        design = {}
+    nsub = ef.forces.shape[0]
+    rids = sorted(optmodel.dresps.keys())
+
+    # one row per value: NaN, design variables, DTABLE constants and DRESPs
+    rows = {}
+    values = [np.full(nsub, np.nan)]
+    for dvid, dvar in optmodel.dvars.items():
+        rows[('DESVAR', dvid)] = len(values)
+        values.append(np.broadcast_to(design.get(dvid, float(dvar.xinit)),
+                                      (nsub,)))
+    for dvar_array in optmodel.dvar_arrays:
+        for dvid, xinit in zip(dvar_array.ids.tolist(),
+                               dvar_array.xinit.tolist()):
+            rows[('DESVAR', dvid)] = len(values)
+            values.append(np.broadcast_to(design.get(dvid, xinit), (nsub,)))
+    for key, value in optmodel.dtables.items():
+        rows[('DTABLE', key)] = len(values)
+        values.append(np.full(nsub, float(value)))
+    offset = len(values)
+    for i, rid in enumerate(rids):
+        rows[('DRESP', rid)] = offset + i
+    V = np.full((offset + len(rids), nsub), np.nan)
+    V[:offset] = values
+
+    # DRESP1, gathered in arrays and evaluated at once
+    code_z1 = get_output_code('STRESS', 'CQUAD4',
+                              'von Mises or maximum shear at Z1')
+    code_z2 = get_output_code('STRESS', 'CQUAD4',
+                              'von Mises or maximum shear at Z2')
+    dresp1s = [(rid, optmodel.dresps[rid]) for rid in rids
+               if isinstance(optmodel.dresps[rid], DRESP1)]
+    r1_rows = np.array([rows[('DRESP', rid)] for rid, d in dresp1s],
+                       dtype=np.int64)
+    rtypes = np.array([str(d.rtype).upper() for rid, d in dresp1s], dtype=str)
+    ptypes = np.array([str(d.ptype).upper() for rid, d in dresp1s], dtype=str)
+    atta = np.array([_attr_int(d.atta) for rid, d in dresp1s], dtype=np.int64)
+    atti = np.array([_attr_int(d.atti) for rid, d in dresp1s], dtype=np.int64)
+    z = np.where(atta == code_z1, -1., np.where(atta == code_z2, 1., 0.))
+
+    elem = ptypes == 'ELEM'
+    pos = np.full(r1_rows.shape[0], -1, dtype=np.int64)
+    pos[elem] = ef.find(atti[elem])
+    found = pos >= 0
+    check = found & (rtypes == 'FORCE') & (atta >= 2) & (atta <= 9)
+    if check.any():
+        V[r1_rows[check]] = ef.forces[:, pos[check], atta[check] - 2].T
+    for zi in (-1., 1.):
+        check = found & (rtypes == 'STRESS') & (z == zi)
+        if check.any():
+            V[r1_rows[check]] = ef.von_mises(pos[check], zi).T
+
+    # PSHELL responses from all elements of the property
+    pid_order = np.argsort(ef.pids, kind='mergesort')
+    upids, pid_starts = np.unique(ef.pids[pid_order], return_index=True)
+    pshell = (ptypes == 'PSHELL') & (rtypes == 'STRESS')
+    ipid = np.clip(np.searchsorted(upids, atti), 0,
+                   max(upids.shape[0] - 1, 0))
+    if upids.shape[0] > 0:
+        pshell &= upids[ipid] == atti
+    else:
+        pshell[:] = False
+    for zi in (-1., 1.):
+        check = pshell & (z == zi)
+        if not check.any():
+            continue
+        vm = ef.von_mises(pid_order, zi)
+        # NaN for properties where any element has no forces
+        vmax = np.maximum.reduceat(vm, pid_starts, axis=1)
+        V[r1_rows[check]] = vmax[:, ipid[check]].T
+
+    # DRESP3 not depending on DRESP2, grouped by external response type
+    groups = {}
+    for rid in rids:
+        dresp = optmodel.dresps[rid]
+        if (not isinstance(dresp, DRESP3) or len(dresp.dresp2) > 0 or
+                get_evaluator(dresp.group, dresp.type) is None):
+            continue
+        args = ([rows.get(('DESVAR', i), 0) for i in dresp.dvars] +
+                [rows.get(('DTABLE', k), 0) for k in dresp.dtable] +
+                [rows.get(('DRESP', i), 0) for i in dresp.dresp1])
+        key = (str(dresp.group).upper(), str(dresp.type).upper(), len(args))
+        groups.setdefault(key, ([], []))
+        groups[key][0].append(rows[('DRESP', rid)])
+        groups[key][1].append(args)
+    for key in sorted(groups.keys()):
+        out, args = groups[key]
+        args = V[np.array(args, dtype=np.int64)].transpose(1, 0, 2)
+        try:
+            result = evaluate_dresp3(key[0], key[1],
+                                     args.reshape(args.shape[0], -1))
+            V[out] = result.reshape(len(out), nsub)
+        except (ValueError, TypeError, IndexError, ArithmeticError) as e:
+            failed = [rids[i - offset] for i in out]
+            raise ValueError('DRESP3 {0} {1} of responses {2} cannot be '
+                             'evaluated: {3}'.format(key[0], key[1], failed,
+                                                     e))
+
+    # DRESP2, level by level and grouped by equation
+    levels = {}
+
+    def level(rid, visiting=()):
+        if rid in levels:
+            return levels[rid]
+        dresp = optmodel.dresps.get(rid)
+        if not isinstance(dresp, DRESP2) or rid in visiting:
+            return -1
+        refs = [level(r, visiting + (rid,)) for r in dresp.dresp2]
+        if any(r < 0 for r in refs):
+            levels[rid] = -1
+        else:
+            levels[rid] = 1 + max(refs + [-1])
+        return levels[rid]
+
+    equations = {}
+    groups = {}
+    for rid in rids:
+        dresp = optmodel.dresps[rid]
+        if not isinstance(dresp, DRESP2) or level(rid) < 0:
+            continue
+        args = ([rows.get(('DESVAR', i), 0) for i in dresp.dvars] +
+                [rows.get(('DTABLE', k), 0) for k in dresp.dtable] +
+                [rows.get(('DRESP', i), 0) for i in dresp.dresp1] +
+                [rows.get(('DRESP', i), 0) for i in dresp.dresp2])
+        key = (levels[rid], dresp.eqid, len(args))
+        groups.setdefault(key, ([], []))
+        groups[key][0].append(rows[('DRESP', rid)])
+        groups[key][1].append(args)
+    for key in sorted(groups.keys(), key=lambda k: (k[0], str(k[1]), k[2])):
+        eqid = key[1]
+        if eqid not in equations:
+            if str(eqid).upper() in BUILTINS:
+                equations[eqid] = BUILTINS[str(eqid).upper()]
+            elif eqid in optmodel.deqatns:
+                try:
+                    equations[eqid] = compile_deqatn(optmodel.deqatns[eqid])
+                except (ValueError, SyntaxError):
+                    print('WARNING - DEQATN {0} cannot be evaluated'.format(
+                          eqid))
+                    equations[eqid] = None
+            else:
+                equations[eqid] = None
+        if equations[eqid] is None:
+            continue
+        out, args = groups[key]
+        args = V[np.array(args, dtype=np.int64)].transpose(1, 0, 2)
+        try:
+            with np.errstate(all='ignore'):
+                result = equations[eqid](*args)
+            V[out] = np.broadcast_to(result, (len(out), nsub))
+        except (ValueError, TypeError, NameError, ArithmeticError) as e:
+            failed = [rids[i - offset] for i in out]
+            raise ValueError('DEQATN {0} of responses {1} cannot be '
+                             'evaluated: {2}'.format(eqid, failed, e))
+
+    return dict((rid, V[rows[('DRESP', rid)]]) for rid in rids)
+
+
+def _allowables(dconstrs, attr):
+    return np.array([np.nan if getattr(c, attr) in ('', None)
+                     else float(getattr(c, attr)) for c in dconstrs])
+
+
+def constraint_margins(dconstrs, values):
+    """Normalized constraint values
+
+    For a lower allowable `l` and an upper allowable `u` the normalized
+    constraint of the response `r` is the larger of `(l - r)/|l|` and
+    `(r - u)/|u|`, positive values indicating violated constraints.
+
+    Parameters
+    ----------
+    dconstrs : list
+        The :class:`.DCONSTR` objects.
+    values : dict
+        The response values, see :func:`.evaluate_responses`.
+
+    Returns
+    -------
+    g : np.ndarray
+        Array of shape `(len(dconstrs), nsubcases)`, `NaN` when the response
+        could not be evaluated.
+
+    """
+    nsub = len(next(iter(values.values()))) if len(values) > 0 else 0
+    nan = np.full(nsub, np.nan)
+    r = np.array([values.get(c.rid, nan) for c in dconstrs]).reshape(
+        len(dconstrs), nsub)
+    lallow = _allowables(dconstrs, 'lallow')[:, None]
+    uallow = _allowables(dconstrs, 'uallow')[:, None]
+    with np.errstate(invalid='ignore'):
+        gl = (lallow - r)/np.where(lallow == 0, 1., np.abs(lallow))
+        gu = (r - uallow)/np.where(uallow == 0, 1., np.abs(uallow))
+    g = np.fmax(gl, gu)
+    # responses that could not be evaluated
+    g[np.isnan(r)] = np.nan
+    return g
+
+
+def screen_constraints(optmodel, ses, retain=20, threshold=-0.5,
+                       mode='drop', region0=1):
+    """Remove or regionalize the constraints far from being active
+
+    The constraints are grouped by the type of the SE owning their responses.
+    Within each group and for each subcase the `retain` most critical
+    constraints are kept, together with all constraints whose normalized
+    value, see :func:`.constraint_margins`, is above `threshold`.
+
+    Parameters
+    ----------
+    optmodel : :class:`.SOL200`
+        The optimization model.
+    ses : list
+        The SEs, with the forces read by :meth:`.StructModel.read_forces`.
+    retain : int or dict, optional
+        The number of constraints kept per SE type and subcase. A `dict`
+        with the SE types (e.g. `'panel'`) as keys can be given, where SE
+        types not in the `dict` keep all their constraints.
+    threshold : float, optional
+        Constraints with a normalized value above `threshold` in any subcase
+        are always kept.
+    mode : str, optional
+        With `'drop'` the remaining constraints are removed, together with
+        the responses and equations that are no longer used. With `'region'`
+        the responses of the remaining constraints are assigned to one
+        screening region per SE type, numbered from `region0`, such that only
+        the most critical ones are retained by the solver.
+    region0 : int, optional
+        The first region id, used with `mode='region'`.
+
+    Returns
+    -------
+    kept, screened : np.ndarray
+        The ids of the kept and of the dropped or regionalized DCONSTRs.
+
+    """
+    if mode not in ('drop', 'region'):
+        raise ValueError('Invalid mode: %s' % mode)
+    cids = np.array(sorted(optmodel.dconstrs.keys()), dtype=np.int64)
+    if cids.shape[0] == 0:
+        return cids, cids
+    subcases, values, owners = evaluate_responses(optmodel, ses)
+    if subcases.shape[0] == 0:
+        print('WARNING - No forces available, constraint screening skipped')
+        return cids, np.zeros(0, dtype=np.int64)
+    dconstrs = [optmodel.dconstrs[cid] for cid in cids.tolist()]
+    g = constraint_margins(dconstrs, values)
+
+    setypes = np.array([ses[owners.get(c.rid, -1)].__class__.__name__.lower()
+                        if owners.get(c.rid, -1) >= 0 else ''
+                        for c in dconstrs])
+    # subcases without forces for a response are ignored
+    keep = np.isnan(g).all(axis=1) | (setypes == '')
+    with np.errstate(invalid='ignore'):
+        keep |= (g > threshold).any(axis=1)
+    for setype in np.unique(setypes[setypes != '']).tolist():
+        if isinstance(retain, dict):
+            if setype not in retain:
+                keep[setypes == setype] = True
+                continue
+            nretain = retain[setype]
+        else:
+            nretain = retain
+        members = np.flatnonzero(setypes == setype)
+        if nretain <= 0 or g.shape[1] == 0:
+            continue
+        # most critical first in each subcase
+        order = np.argsort(-g[members], axis=0, kind='mergesort')
+        keep[members[np.unique(order[:nretain])]] = True
+
+    kept = cids[keep]
+    screened = cids[~keep]
+    print('Constraint screening: %d of %d constraints kept' %
+          (kept.shape[0], cids.shape[0]))
+    if mode == 'region':
+        kept_rids = set(optmodel.dconstrs[cid].rid for cid in kept.tolist())
+        regions = dict((setype, region0 + i) for i, setype in
+                       enumerate(np.unique(setypes[setypes != '']).tolist()))
+        for i in np.flatnonzero(~keep).tolist():
+            rid = dconstrs[i].rid
+            if rid in kept_rids or rid not in optmodel.dresps:
+                continue
+            optmodel.dresps[rid].region = regions[setypes[i]]
+        return kept, screened
+
+    for cid in screened.tolist():
+        del optmodel.dconstrs[cid]
+    prune_responses(optmodel)
+    kept_ids = set(optmodel.dconstrs.keys())
+    for se in ses:
+        se.dconstrs = [c for c in se.dconstrs
+                       if getattr(c, 'id', c) in kept_ids]
+        se.dresps = [r for r in se.dresps
+                     if getattr(r, 'id', r) in optmodel.dresps]
+    return kept, screened
+
+
+def prune_responses(optmodel):
+    """Remove the responses and equations that are no longer used
+
+    Responses referenced by constraints, by the objective or by other used
+    responses are kept, as well as the mass, volume and weight responses.
+    Equations referenced by used DRESP2 or by DVPREL2 cards are kept.
+
+    Parameters
+    ----------
+    optmodel : :class:`.SOL200`
+        The optimization model.
+
+    """
+    used = set(c.rid for c in optmodel.dconstrs.values())
+    if optmodel.dobj is not None:
+        used.add(getattr(optmodel.dobj, 'rid', None))
+    for rid, dresp in optmodel.dresps.items():
+        if (isinstance(dresp, DRESP1)
+                and str(dresp.rtype).upper() in OBJECTIVE_RTYPES):
+            used.add(rid)
+    stack = list(used)
+    while len(stack) > 0:
+        dresp = optmodel.dresps.get(stack.pop())
+        if not isinstance(dresp, (DRESP2, DRESP3)):
+            continue
+        for ref in list(dresp.dresp1) + list(dresp.dresp2):
+            if ref not in used:
+                used.add(ref)
+                stack.append(ref)
+    for rid in list(optmodel.dresps.keys()):
+        if rid not in used:
+            del optmodel.dresps[rid]
+
+    eqids = set(d.eqid for d in optmodel.dresps.values()
+                if isinstance(d, DRESP2))
+    eqids.update(getattr(d, 'eqid', None) for d in optmodel.dvprels.values())
+    for eqid in list(optmodel.deqatns.keys()):
+        if eqid not in eqids:
+            del optmodel.deqatns[eqid]
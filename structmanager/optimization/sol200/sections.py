@@ -0,0 +1,443 @@
+"""
+Cross-section properties (:mod:`structmanager.sol200.sections`)
+================================================================
+
+.. currentmodule:: structmanager.sol200.sections
+
+The area `A`, the moments of inertia `I1`, `I2` and the torsion constant `J`
+of the bar cross sections are written once, as :class:`.DEQATN` statements.
+The same statements are printed in the DVPREL2 equations of the profiles
+sized in SOL 200 and compiled by :func:`.compile_deqatn` into vectorized
+NumPy expressions for post-processing, such that both always agree.
+
+Sections of the profiles of :class:`.Stringer`, :class:`.InnerFlange` and
+:class:`.OuterFlange`, see :data:`.PROFILE_SECTIONS`:
+
+==================  ==================  ======================================
+Section             Arguments           Description
+==================  ==================  ======================================
+`'Z_T'`             `t, b, h`           Z with equal flange and web thickness
+`'Z_TF_TW'`         `tf, tw, b, h`      Z with flange thickness `tf` and web
+                                        thickness `tw`
+`'BLADE'`           `t, h`              blade of height `h`
+`'FLAT'`            `t, b`              flat bar of width `b`
+==================  ==================  ======================================
+
+For these sections `J = I1 + I2`, as adopted when sizing the profiles. They
+also define the properties :data:`.SKIN_PROPERTIES` used when the profile is
+attached to a skin, by the bottom flange of the `Z`, the base of the blade or
+a face of the flat bar:
+
+==================  ==========================================================
+Property            Description
+==================  ==========================================================
+`ZC`                distance from the attached face to the centroid
+`IN`                moment of inertia about the centroidal axis parallel to
+                    the attached face
+==================  ==========================================================
+
+The sections of ``SDATA['PBARL']`` are also available, with the dimensions
+`d1, d2, ...` defined in :mod:`.sizing_data`: `'SQUARE'`, `'RECT'`,
+`'CIRCLE'`, `'TUBE'`, `'BOX3'`, `'BOX4'`, `'IBEAM'`, `'TEE'`, `'ANGLE'`,
+`'I'`, `'I1'`, `'H'` and `'Z'`. Their `I1` and `I2` are taken about the
+horizontal and vertical centroidal axes and `J` is the thin-walled torsion
+constant. The walls are assumed not to overlap.
+
+"""
+from __future__ import division
+
+import numpy as np
+
+from .cards_opt import DEQATN, DVPREL2
+from .equations import compile_deqatn
+
+
+PROPERTIES = ['A', 'I1', 'I2', 'J']
+
+SKIN_PROPERTIES = ['ZC', 'IN']
+
+
+class Section(object):
+    """Cross section with properties given as DEQATN statements
+
+    ==================  ======================================================
+    Attribute           Description
+    ==================  ======================================================
+    `name`              `str` with the section name
+    `args`              `list` with the names of the dimensions
+    `statements`        `dict` with the `list` of statements of each property
+    ==================  ======================================================
+
+    Parameters
+    ----------
+    name : str
+        The section name.
+    args : list
+        The names of the dimensions, in the order of the equation arguments.
+    properties : str
+        One keyword argument for each of :data:`.PROPERTIES`, and optionally
+        other properties, with the statements separated by `;`, the last one
+        assigning the property.
+
+    """
+    def __init__(self, name, args, **properties):
+        self.name = name
+        self.args = list(args)
+        self.statements = {}
+        for prop in PROPERTIES:
+            if prop not in properties:
+                raise ValueError('Property %s of section %s not given' %
+                                 (prop, name))
+        for prop, statements in properties.items():
+            self.statements[prop] = [s.strip() for s in statements.split(';')
+                                     if s.strip() != '']
+        self._equations = {}
+
+
+    def deqatn(self, prop, args=None):
+        """Return the equation string of a property, for a :class:`.DEQATN`
+
+        Parameters
+        ----------
+        prop : str
+            The property.
+        args : list or None, optional
+            The equation arguments, a permutation of :attr:`args`, by
+            default :attr:`args`.
+
+        """
+        if args is None:
+            args = self.args
+        elif sorted(args) != sorted(self.args):
+            raise ValueError('Arguments %s of section %s expected' %
+                             (self.args, self.name))
+        statements = list(self.statements[prop])
+        name, sep, expr = statements[0].partition('=')
+        statements[0] = '%s(%s) =%s' % (name.strip(), ','.join(args), expr)
+        return ';'.join(statements)
+
+
+    def equation(self, prop):
+        """Return the compiled equation of a property"""
+        if prop not in self._equations:
+            self._equations[prop] = compile_deqatn(self.deqatn(prop))
+        return self._equations[prop]
+
+
+    def properties(self, dims, props=PROPERTIES):
+        """Evaluate the properties of many sections at once
+
+        Parameters
+        ----------
+        dims : array-like
+            The dimensions in the order of :attr:`args`, an array of shape
+            `(nargs,)` for one section or `(nargs, nsections)`.
+        props : list, optional
+            The properties to evaluate.
+
+        Returns
+        -------
+        properties : dict
+            The properties with the names in :data:`.PROPERTIES` as keys.
+
+        """
+        dims = np.asarray(dims, dtype=np.float64)
+        if dims.shape[0] != len(self.args):
+            raise ValueError('Section %s takes %d dimensions, %d given' %
+                             (self.name, len(self.args), dims.shape[0]))
+        return dict((prop, self.equation(prop)(*dims)) for prop in props)
+
+
+    def create_dvprels(self, se, ptype, pid, values, props=PROPERTIES):
+        """Create the DEQATN and DVPREL2 cards of the properties of an SE
+
+        Parameters
+        ----------
+        se : :class:`.SE`
+            The structural element.
+        ptype : str
+            The property type, currently only `'PBAR'`.
+        pid : int
+            The property id.
+        values : list
+            For each of :attr:`args` the :class:`.DESVAR` or the DTABLE key.
+            The DVPREL2 cards list the design variables before the DTABLE
+            keys, the equation arguments are reordered the same way.
+        props : list, optional
+            The properties to size.
+
+        """
+        if ptype != 'PBAR':
+            raise NotImplementedError('%s not supported!' % ptype)
+        if len(values) != len(self.args):
+            raise ValueError('Section %s takes %d dimensions, %d given' %
+                             (self.name, len(self.args), len(values)))
+        order = ([i for i, v in enumerate(values) if not isinstance(v, str)]
+                 + [i for i, v in enumerate(values) if isinstance(v, str)])
+        args = [self.args[i] for i in order]
+        values = [values[i] for i in order]
+        for prop in props:
+            deqatn = DEQATN(self.deqatn(prop, args))
+            se.add_deqatn(deqatn)
+            dvprel = DVPREL2(ptype, pid=pid, pname=prop, eqid=deqatn.id)
+            for value in values:
+                if isinstance(value, str):
+                    dvprel.add_dtable(value)
+                else:
+                    dvprel.add_dvar(value.id)
+            se.add_dvprel(dvprel)
+
+
+def _composite(I1, I2):
+    # the statements of J = I1 + I2
+    return I1 + ';' + I2 + ';J = I1 + I2'
+
+
+_Z_I1 = ('I1f = t*b**3/12.;'
+         'I1w = h*t**3/12.;'
+         'd = t/2. + b/2.;'
+         'Ad2f = t*b*d**2;'
+         'I1 = 2*(I1f + Ad2f) + I1w')
+_Z_I2 = ('I2f = b*t**3/12.;'
+         'I2w = t*h**3/12.;'
+         'd = h/2. - t/2.;'
+         'Ad2f = t*b*d**2;'
+         'I2 = 2*(I2f + Ad2f) + I2w')
+_ZTT_I1 = ('I1f = tf*b**3/12.;'
+           'I1w = h*tw**3/12.;'
+           'd = tw/2. + b/2.;'
+           'Ad2f = tf*b*d**2;'
+           'I1 = 2*(I1f + Ad2f) + I1w')
+_ZTT_I2 = ('I2f = b*tf**3/12.;'
+           'I2w = tw*h**3/12.;'
+           'd = h/2. - tf/2.;'
+           'Ad2f = tf*b*d**2;'
+           'I2 = 2*(I2f + Ad2f) + I2w')
+_BLADE_I1 = 'I1 = t*h**3/12. + t*h*(h/2.)**2'
+_BLADE_I2 = 'I2 = h*t**3/12.'
+_FLAT_I1 = 'I1 = b*t**3/12.'
+_FLAT_I2 = 'I2 = t*b**3/12. + t*b*(b/2.)**2'
+
+
+SECTIONS = {}
+
+
+def add_section(section):
+    """Add a :class:`.Section` to :data:`.SECTIONS`"""
+    SECTIONS[section.name.upper()] = section
+
+
+add_section(Section('Z_T', ['t', 'b', 'h'], A='A = 2*t*b + t*h', I1=_Z_I1,
+                    I2=_Z_I2, J=_composite(_Z_I1, _Z_I2), ZC='ZC = h/2.',
+                    IN=_Z_I2))
+add_section(Section('Z_TF_TW', ['tf', 'tw', 'b', 'h'],
+                    A='A = 2*tf*b + tw*h', I1=_ZTT_I1, I2=_ZTT_I2,
+                    J=_composite(_ZTT_I1, _ZTT_I2), ZC='ZC = h/2.',
+                    IN=_ZTT_I2))
+add_section(Section('BLADE', ['t', 'h'], A='A = t*h', I1=_BLADE_I1,
+                    I2=_BLADE_I2, J=_composite(_BLADE_I1, _BLADE_I2),
+                    ZC='ZC = h/2.', IN='IN = t*h**3/12.'))
+add_section(Section('FLAT', ['t', 'b'], A='A = t*b', I1=_FLAT_I1,
+                    I2=_FLAT_I2, J=_composite(_FLAT_I1, _FLAT_I2),
+                    ZC='ZC = t/2.', IN=_FLAT_I1))
+
+# PBARL sections, CSLIB1
+add_section(Section('SQUARE', ['d1'], A='A = d1**2', I1='I1 = d1**4/12.',
+                    I2='I2 = d1**4/12.', J='J = 0.1406*d1**4'))
+add_section(Section(
+    'RECT', ['d1', 'd2'], A='A = d1*d2', I1='I1 = d1*d2**3/12.',
+    I2='I2 = d2*d1**3/12.',
+    J=('a = MAX(d1, d2);'
+       'b = MIN(d1, d2);'
+       'J = a*b**3*(1./3. - 0.21*b/a*(1. - b**4/(12.*a**4)))')))
+add_section(Section('CIRCLE', ['d1'], A='A = PI(1)*d1**2/4.',
+                    I1='I1 = PI(1)*d1**4/64.', I2='I2 = PI(1)*d1**4/64.',
+                    J='J = PI(1)*d1**4/32.'))
+add_section(Section(
+    'TUBE', ['d1', 'd2'],
+    A='do = d1 + 2*d2;A = PI(1)*(do**2 - d1**2)/4.',
+    I1='do = d1 + 2*d2;I1 = PI(1)*(do**4 - d1**4)/64.',
+    I2='do = d1 + 2*d2;I2 = PI(1)*(do**4 - d1**4)/64.',
+    J='do = d1 + 2*d2;J = PI(1)*(do**4 - d1**4)/32.'))
+add_section(Section(
+    'BOX3', ['d1', 'd2', 'd3'],
+    A='A = d1*d3 - (d1 - 2*d2)*(d3 - 2*d2)',
+    I1='I1 = (d1*d3**3 - (d1 - 2*d2)*(d3 - 2*d2)**3)/12.',
+    I2='I2 = (d3*d1**3 - (d3 - 2*d2)*(d1 - 2*d2)**3)/12.',
+    J=('Am = (d1 - d2)*(d3 - d2);'
+       'S = 2*(d1 - d2)/d2 + 2*(d3 - d2)/d2;'
+       'J = 4*Am**2/S')))
+add_section(Section(
+    'BOX4', ['d1', 'd2', 'd3', 'd4'],
+    A='A = d1*d3 - (d1 - 2*d4)*(d3 - 2*d2)',
+    I1='I1 = (d1*d3**3 - (d1 - 2*d4)*(d3 - 2*d2)**3)/12.',
+    I2='I2 = (d3*d1**3 - (d3 - 2*d2)*(d1 - 2*d4)**3)/12.',
+    J=('Am = (d1 - d4)*(d3 - d2);'
+       'S = 2*(d1 - d4)/d2 + 2*(d3 - d2)/d4;'
+       'J = 4*Am**2/S')))
+add_section(Section(
+    'IBEAM', ['d1', 'd2', 'd3', 'd4'],
+    A='A = 4*d1*d2 + d3*d4',
+    I1='H = d3 + 2*d2;I1 = (2*d1*H**3 - (2*d1 - d4)*d3**3)/12.',
+    I2='I2 = d2*(2*d1)**3/6. + d3*d4**3/12.',
+    J='J = (4*d1*d2**3 + d3*d4**3)/3.'))
+add_section(Section(
+    'TEE', ['d1', 'd2', 'd3', 'd4'],
+    A='A = 2*d1*d2 + d3*d4',
+    I1=('Af = 2*d1*d2;'
+        'Aw = d3*d4;'
+        'zf = d2/2.;'
+        'zw = d2 + d3/2.;'
+        'zc = (Af*zf + Aw*zw)/(Af + Aw);'
+        'I1 = (2*d1*d2**3 + d4*d3**3)/12. + Af*(zf - zc)**2 + '
+        'Aw*(zw - zc)**2'),
+    I2='I2 = d2*(2*d1)**3/12. + d3*d4**3/12.',
+    J='J = (2*d1*d2**3 + d3*d4**3)/3.'))
+add_section(Section(
+    'ANGLE', ['d1', 'd2', 'd3', 'd4'],
+    A='A = d1*d2 + d3*d4',
+    I1=('Ay = d1*d2;'
+        'Az = d3*d4;'
+        'zy = d2/2.;'
+        'zz = d2 + d3/2.;'
+        'zc = (Ay*zy + Az*zz)/(Ay + Az);'
+        'I1 = (d1*d2**3 + d4*d3**3)/12. + Ay*(zy - zc)**2 + '
+        'Az*(zz - zc)**2'),
+    I2=('Ay = d1*d2;'
+        'Az = d3*d4;'
+        'yy = d1/2.;'
+        'yz = d4/2.;'
+        'yc = (Ay*yy + Az*yz)/(Ay + Az);'
+        'I2 = (d2*d1**3 + d3*d4**3)/12. + Ay*(yy - yc)**2 + '
+        'Az*(yz - yc)**2'),
+    J='J = (d1*d2**3 + d3*d4**3)/3.'))
+# PBARL sections, CSLIB2
+add_section(Section(
+    'I', ['d1', 'd2', 'd3', 'd4', 'd5', 'd6'],
+    A='A = d2*d5 + d3*d6 + (d1 - d5 - d6)*d4',
+    I1=('hw = d1 - d5 - d6;'
+        'Ab = d2*d5;'
+        'At = d3*d6;'
+        'Aw = hw*d4;'
+        'zb = d5/2.;'
+        'zt = d1 - d6/2.;'
+        'zw = d5 + hw/2.;'
+        'zc = (Ab*zb + At*zt + Aw*zw)/(Ab + At + Aw);'
+        'I1 = (d2*d5**3 + d3*d6**3 + d4*hw**3)/12. + Ab*(zb - zc)**2 + '
+        'At*(zt - zc)**2 + Aw*(zw - zc)**2'),
+    I2='I2 = (d5*d2**3 + d6*d3**3 + (d1 - d5 - d6)*d4**3)/12.',
+    J='J = (d2*d5**3 + d3*d6**3 + (d1 - d5 - d6)*d4**3)/3.'))
+add_section(Section(
+    'I1', ['d1', 'd2', 'd3', 'd4'],
+    A='A = (2*d1 + d2)*d4 - 2*d1*d3',
+    I1='I1 = ((2*d1 + d2)*d4**3 - 2*d1*d3**3)/12.',
+    I2='tf = (d4 - d3)/2.;I2 = tf*(2*d1 + d2)**3/6. + d3*d2**3/12.',
+    J='tf = (d4 - d3)/2.;J = (2*(2*d1 + d2)*tf**3 + d3*d2**3)/3.'))
+add_section(Section(
+    'H', ['d1', 'd2', 'd3', 'd4'],
+    A='A = d2*d3 + d1*d4',
+    I1='I1 = (d2*d3**3 + d1*d4**3)/12.',
+    I2='I2 = (d3*((d1 + d2)**3 - d1**3) + d4*d1**3)/12.',
+    J='J = (d3*d2**3/4. + d1*d4**3)/3.'))
+add_section(Section(
+    'Z', ['d1', 'd2', 'd3', 'd4'],
+    A='tf = (d4 - d3)/2.;A = 2*d1*tf + d2*d4',
+    I1=('tf = (d4 - d3)/2.;'
+        'I1 = d2*d4**3/12. + 2*(d1*tf**3/12. + d1*tf*((d4 - tf)/2.)**2)'),
+    I2=('tf = (d4 - d3)/2.;'
+        'I2 = d4*d2**3/12. + 2*(tf*d1**3/12. + d1*tf*((d1 + d2)/2.)**2)'),
+    J='tf = (d4 - d3)/2.;J = (2*d1*tf**3 + d4*d2**3)/3.'))
+
+
+# section of each profile of the 1D SEs
+PROFILE_SECTIONS = {
+    'z_t': 'Z_T',
+    'z_t_b': 'Z_T',
+    'z_t_b_h': 'Z_T',
+    'z_tf_tw_b_h': 'Z_TF_TW',
+    'b_t': 'BLADE',
+    'b_t_h': 'BLADE',
+    't': 'FLAT',
+    't_b': 'FLAT',
+    }
+
+
+def get_section(name):
+    """Return the :class:`.Section` of a section name, a profile or a PBARL
+    type"""
+    key = PROFILE_SECTIONS.get(name.lower(), name.upper())
+    if key not in SECTIONS:
+        raise NotImplementedError('Section %s not supported!' % name)
+    return SECTIONS[key]
+
+
+def section_properties(names, dims, props=PROPERTIES):
+    """Evaluate the properties of many sections of any type
+
+    The sections are grouped by type and each group is evaluated at once.
+
+    Parameters
+    ----------
+    names : list
+        The section of each item, see :func:`.get_section`.
+    dims : list
+        The dimensions of each item, in the order of :attr:`.Section.args`.
+    props : list, optional
+        The properties to evaluate.
+
+    Returns
+    -------
+    properties : dict
+        Arrays of shape `(len(names),)` with the property names as keys.
+
+    """
+    out = dict((prop, np.full(len(names), np.nan)) for prop in props)
+    groups = {}
+    for i, name in enumerate(names):
+        groups.setdefault(get_section(name).name, []).append(i)
+    for name, index in groups.items():
+        section = SECTIONS[name]
+        values = np.array([dims[i] for i in index], dtype=np.float64).T
+        for prop, value in section.properties(values, props).items():
+            out[prop][index] = value
+    return out
+
+
+def se_section_properties(ses, props=PROPERTIES):
+    """Evaluate the section properties of many 1D SEs
+
+    The dimensions are read from the SE attributes named as the
+    :attr:`.Section.args` of the `profile` of each SE.
+
+    Parameters
+    ----------
+    ses : list
+        The SEs, those without a known `profile` or with missing dimensions
+        get `NaN`.
+    props : list, optional
+        The properties to evaluate.
+
+    Returns
+    -------
+    properties : dict
+        Arrays of shape `(len(ses),)` with the property names as keys.
+
+    """
+    index = []
+    names = []
+    dims = []
+    for i, se in enumerate(ses):
+        profile = getattr(se, 'profile', None)
+        if profile is None or profile.lower() not in PROFILE_SECTIONS:
+            continue
+        section = get_section(profile)
+        values = [getattr(se, arg, None) for arg in section.args]
+        if any(v is None for v in values):
+            continue
+        index.append(i)
+        names.append(profile)
+        dims.append(values)
+    out = dict((prop, np.full(len(ses), np.nan)) for prop in props)
+    for prop, value in section_properties(names, dims, props).items():
+        out[prop][index] = value
+    return out
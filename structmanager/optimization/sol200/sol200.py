@@ -12,6 +12,7 @@ from collections import Iterable
 from .output_codes import OUTC, get_output_code
 from .cards_opt import *
 from .cards_solver import *
+from .dvar_array import DESVARArray
 
 
 def section(text, file):
@@ -43,12 +44,18 @@ class SOL200(object):
     `groups`            `set` containing the externl subroutines that are used
                         in the current optimization model
     `dconstrs`          `dict` of :class:`.DCONSTR` objects
+    `dscreens`          `dict` of :class:`.DSCREEN` objects, with the
+                        response types as keys
     `dvars`             `dict` of :class:`.DVAR` objects
+    `dvar_arrays`       `list` of :class:`.DESVARArray` objects, holding
+                        design variables created in bulk
     `dvar_codes`        `dict` classifying the :class:`.DVAR` objects by
                           their unique codes
     `dlinks`            `dict` of :class:`.DLINK` objects
     `newprops`          `dict` with different NASTRAN cards, see
                         :meth:`.reset_newprops`
+    `newpids`           `dict` with the new property ids of the elements,
+                        see :meth:`.reset_newprops`
     `nodal_displ`       `dict` with the nodal displacements constraints as
                         detailed in :meth:`.nodal_displ_from_excel`
     `loads_list`        `list` containing the load cases' ids
@@ -64,14 +71,18 @@ class SOL200(object):
         self.dvprels = {}
         self.reset_newprops()
         self.deqatns = {}
+        self._shared_deqatns = {}
         self.dtable = None
         self.dtables = {}
         self.dtable_prefixes = {}
+        self._shared_dtables = {}
         self.dresps = {}
         self.groups = set()
         self.dconstrs = {}
+        self.dscreens = {}
         self.dcids = set()
         self.dvars = {}
+        self.dvar_arrays = []
         self.dvar_codes = {}
         self.dlinks = {}
         #TODO future implementation
@@ -119,7 +130,7 @@ class SOL200(object):
         self.sol200file = open(self.sol200filepath, 'wb')
 
         if len(self.dtables) > 0:
-            section('DESIGN CONSTRAINTS', self.sol200file)
+            section('DESIGN TABLE CONSTANTS', self.sol200file)
             self.dtable = DTABLE(self.dtables)
             self.dtable.print_card(self.sol200file)
         self._print_dvars()
@@ -128,6 +139,7 @@ class SOL200(object):
         self._print_dresps()
         self._print_deqatns()
         self._print_dcons()
+        self._print_dscreens()
         self._print_dobj()
         self._print_newprops()
 
@@ -138,7 +150,8 @@ class SOL200(object):
         """Reset the dictionary `newprops`.
 
         This dictionary contains NASTRAN property cards that should be created
-        along with the optimization model.
+        along with the optimization model. The dictionary `newpids` maps the
+        element ids to the new property ids of the elements moved to them.
 
         The supported cards are those corresponding to the classes defined in
         :mod:`.cards_solver`.
@@ -151,6 +164,7 @@ class SOL200(object):
         self.newprops['PBEAM'] = {}
         self.newprops['PBEAML'] = {}
         self.newprops['PCOMP'] = {}
+        self.newpids = {}
 
 
     def constrain_pshell(self, dcid, pid, eltype, rtype, names, lallow=None,
@@ -344,6 +358,61 @@ class SOL200(object):
         self.dconstrs[dconstr.id] = dconstr
 
 
+    def _shared_deqatn(self, eq):
+        deqatn = self._shared_deqatns.get(eq)
+        if deqatn is None or deqatn.id not in self.deqatns:
+            deqatn = DEQATN(eq)
+            self.deqatns[deqatn.id] = deqatn
+            self._shared_deqatns[eq] = deqatn
+        return deqatn
+
+
+    def _shared_dtable(self, prefix, value):
+        key = self._shared_dtables.get((prefix, value))
+        if key is None or key not in self.dtables:
+            count = self.dtable_prefixes.get(prefix, -1) + 1
+            key = prefix + str(count).rjust(8 - len(prefix), '0')
+            if len(key) > 8:
+                raise ValueError('Too many DTABLE entries for prefix %s' %
+                                 prefix)
+            self.dtable_prefixes[prefix] = count
+            self.dtables[key] = float(value)
+            self._shared_dtables[(prefix, value)] = key
+        return key
+
+
+    def create_thickness_dvars(self, pids, xinit, xlb, xub, ptype='PSHELL',
+            label='t'):
+        """Create thickness design variables for many properties at once
+
+        The design variables and the corresponding DVPREL1 relations are
+        stored in a :class:`.DESVARArray`, which is much faster to create and
+        to print than one :class:`.DESVAR` object per property.
+
+        Parameters
+        ----------
+        pids : array-like
+            Property ids.
+        xinit, xlb, xub : float or array-like
+            Initial thicknesses, lower and upper bounds.
+        ptype : str, optional
+            Property type.
+        label : str, optional
+            DESVAR label.
+
+        Returns
+        -------
+        dvar_array : :class:`.DESVARArray`
+            The container holding the new design variables.
+
+        """
+        dvar_array = DESVARArray()
+        dvar_array.add_thickness(pids, xinit, xlb, xub, ptype=ptype,
+                                 label=label)
+        self.dvar_arrays.append(dvar_array)
+        return dvar_array
+
+
     def create_dobj(self):
         """Create the design objective.
 
@@ -363,6 +432,38 @@ class SOL200(object):
                     self.spcs_list.append(self.spcs_list[0])
 
 
+    def screen_constraints(self, ses, **kwargs):
+        """Remove or regionalize the constraints far from being active
+
+        See :func:`.screen_constraints` for the additional parameters.
+
+        Parameters
+        ----------
+        ses : list
+            The SEs, with the forces read by :meth:`.StructModel.read_forces`.
+
+        """
+        from .screening import screen_constraints
+
+        return screen_constraints(self, list(ses), **kwargs)
+
+
+    def plan_regions(self, ses, **kwargs):
+        """Assign screening regions to the constrained responses
+
+        See :func:`.plan_regions` for the additional parameters.
+
+        Parameters
+        ----------
+        ses : list
+            The SEs owning the responses.
+
+        """
+        from .regions import plan_regions
+
+        return plan_regions(self, list(ses), **kwargs)
+
+
     def _print_newprops(self):
         for pcard in self.newprops.values():
             for newprop in pcard.values():
@@ -370,17 +471,23 @@ class SOL200(object):
 
 
     def _print_dvars(self):
-        if len(self.dvars) > 0:
+        num_arrays = sum(map(len, self.dvar_arrays))
+        if len(self.dvars) > 0 or num_arrays > 0:
             section('DESIGN VARIABLES', self.sol200file)
         for dvar in self.dvars.values():
             dvar.print_card(self.sol200file)
+        for dvar_array in self.dvar_arrays:
+            dvar_array.print_desvars(self.sol200file)
 
 
     def _print_dvprels(self):
-        if len(self.dvprels) > 0:
+        num_arrays = sum(map(len, self.dvar_arrays))
+        if len(self.dvprels) > 0 or num_arrays > 0:
             section('DESIGN VARIABLE-TO-PROPERTY RELATIONS', self.sol200file)
         for dvprel in self.dvprels.values():
             dvprel.print_card(self.sol200file)
+        for dvar_array in self.dvar_arrays:
+            dvar_array.print_dvprels(self.sol200file)
 
 
     def _print_dresps(self):
@@ -404,6 +511,13 @@ class SOL200(object):
             dconstr.print_card(self.sol200file)
 
 
+    def _print_dscreens(self):
+        if len(self.dscreens) > 0:
+            section('CONSTRAINT SCREENING', self.sol200file)
+        for dscreen in self.dscreens.values():
+            dscreen.print_card(self.sol200file)
+
+
     def _print_dobj(self):
         if self.dobj is not None:
             section('DESIGN OBJECTIVE', self.sol200file)
@@ -0,0 +1,95 @@
+import numpy as np
+
+from structmanager.optimization.sol200 import SOL200
+from structmanager.optimization.sol200.aggregation import aggregate_responses
+from structmanager.optimization.sol200.cards_opt import DRESP1
+from structmanager.optimization.sol200.equations import compile_deqatn
+
+
+def model(values):
+    optmodel = SOL200()
+    rids = []
+    for eid in range(len(values)):
+        dresp1 = DRESP1('SVM', 'STRESS', 'ELEM', None, atta=9, attb=None,
+                        atti=eid + 1)
+        optmodel.dresps[dresp1.id] = dresp1
+        rids.append(dresp1.id)
+    return optmodel, rids
+
+
+def evaluate(optmodel, values, dresp):
+    # NASTRAN order of the DRESP2 arguments
+    args = [optmodel.dtables[key] for key in dresp.dtable]
+    args += [values[rid] for rid in dresp.dresp1]
+    args += [evaluate(optmodel, values, optmodel.dresps[rid])
+             for rid in dresp.dresp2]
+    eq = compile_deqatn(optmodel.deqatns[dresp.eqid].eq.strip())
+    return float(eq(*args))
+
+
+def test_upper_bounds():
+    x = np.random.RandomState(1).uniform(-300., 250., 100)
+    allow = 200.
+    for kind, param in (('KS', 50.), ('PNORM', 20.)):
+        optmodel, rids = model(x)
+        values = dict(zip(rids, x))
+        dresps = aggregate_responses(optmodel, rids, allow, kind=kind,
+                                     chunk=8)
+        value = evaluate(optmodel, values, dresps[-1])
+        if kind == 'KS':
+            # one level of 13, one of 2 and the last DRESP2
+            assert x.max()/allow <= value
+            assert value <= x.max()/allow + 3*np.log(8)/param
+        else:
+            m = np.abs(x).max()/allow
+            assert m <= value <= m*100**(1./param)
+
+
+def test_chunks():
+    x = np.linspace(-100., 100., 100)
+    optmodel, rids = model(x)
+    dresps = aggregate_responses(optmodel, rids, 200., chunk=8,
+                                 label='VMAG')
+    assert len(dresps) == 13 + 2 + 1
+    assert all(d.label == 'VMAG' for d in dresps)
+    assert all(len(d.dresp1) + len(d.dresp2) <= 8 for d in dresps)
+    # the responses are divided by the allowable at the first level only
+    first, upper = dresps[:13], dresps[13:]
+    assert sum([d.dresp1 for d in first], []) == rids
+    assert all(len(d.dtable) == 1 for d in first)
+    assert all(len(d.dtable) == 0 and len(d.dresp1) == 0 for d in upper)
+    assert optmodel.dtables[first[0].dtable[0]] == 200.
+    # the last DRESP2 aggregates all the previous chunks
+    assert dresps[-1].dresp2 == [d.id for d in upper[:2]]
+    assert sum([d.dresp2 for d in upper[:2]], []) == [d.id for d in first]
+    # one equation for each number of arguments and scaling: 8 and 4
+    # scaled, 8, 5 and 2 unscaled
+    assert len(optmodel.deqatns) == 5
+
+
+def test_single_response():
+    optmodel, rids = model([150.])
+    dresps = aggregate_responses(optmodel, rids, 200., kind='PNORM')
+    assert len(dresps) == 1
+    assert np.isclose(evaluate(optmodel, {rids[0]: 150.}, dresps[0]),
+                      0.75)
+
+
+def test_invalid_aggregations():
+    optmodel, rids = model([1., 2., 3.])
+    for args, kwargs in [((rids, 1., 'MEAN'), {}),
+                         (([], 1.), {}),
+                         ((rids, 1.), {'chunk': 1})]:
+        try:
+            aggregate_responses(optmodel, *args, **kwargs)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError('%s %s accepted' % (args, kwargs))
+
+
+if __name__ == '__main__':
+    test_upper_bounds()
+    test_chunks()
+    test_single_response()
+    test_invalid_aggregations()
@@ -0,0 +1,178 @@
+import numpy as np
+
+from structmanager.optimization.sol200.bulk_sizing import (DEQATNS_BUCKLING,
+                                                           KB, KC, KS,
+                                                           apply_sizing_table,
+                                                           buckling_equation)
+from structmanager.optimization.sol200.cards_opt import DRESP2, DRESP3
+from structmanager.optimization.sol200.equations import compile_deqatn
+from structmanager.optimization.sol200 import SOL200
+from structmanager.structelem.base import MaterialIsotropic
+from structmanager.structelem.panel import Panel
+from structmanager.structelem.web import Web
+
+
+def test_compression_buckling_equation():
+    eq = compile_deqatn(DEQATNS_BUCKLING[1])
+    t, b, E, nu = 2., 100., 70000., 0.3
+    Nxx = np.array([-50., -200., 10.])
+    ms = eq(t, b, E, nu, Nxx)
+    FCcr = KC*np.pi**2*E*t**2/(12.*(1. - nu**2)*b**2)
+    assert np.allclose(ms[:2], FCcr*t/np.array([50., 200.]) - 1.)
+    # tension does not buckle
+    assert ms[2] > 1e6
+
+
+def test_shear_buckling_equation():
+    eq = compile_deqatn(DEQATNS_BUCKLING[2])
+    t, b, E, nu = 2., 100., 70000., 0.3
+    D = 12.*(1. - nu**2)*b**2
+    FCcr = KC*np.pi**2*E*t**2/D
+    FScr = KS*np.pi**2*E*t**2/D
+    Nxx = np.array([-100., 100., 100.])
+    Nxy = np.array([50., 50., -50.])
+    ms = eq(t, b, E, nu, Nxx, Nxy)
+    RC = np.array([100./(FCcr*t), 0., 0.])
+    RS = Nxy/(FScr*t)
+    assert np.allclose(ms, 2./(RC + np.sqrt(RC**2 + 4.*RS**2)) - 1.)
+    # tension does not reduce the shear margin
+    assert np.isclose(ms[1], 1./abs(RS[1]) - 1.)
+    assert ms[0] < ms[1]
+
+
+def test_bending_buckling_equations():
+    t, b, E, nu = 2., 100., 70000., 0.3
+    D = 12.*(1. - nu**2)*b**2
+    FCcr = KC*np.pi**2*E*t**2/D
+    FScr = KS*np.pi**2*E*t**2/D
+    FBcr = KB*np.pi**2*E*t**2/D
+    # pure compression, pure bending and both
+    Nx1 = np.array([-100., -500., -600.])
+    Nx2 = np.array([-100., 500., 400.])
+    RC = np.array([100., 0., 100.])/(FCcr*t)
+    RB = np.array([0., 500., 500.])/(FBcr*t)
+    eq = compile_deqatn(buckling_equation(3))
+    ms = eq(t, b, E, nu, Nx1, Nx2)
+    assert np.allclose(ms, 1./(RC + RB**1.75) - 1.)
+    assert np.isclose(ms[0], FCcr*t/100. - 1.)
+    # the load factor 1 + ms satisfies RC + RB**2 + RS**2 = 1
+    eq = compile_deqatn(buckling_equation(4))
+    Nxy = np.array([0., 200., 200.])
+    RS = Nxy/(FScr*t)
+    ms = eq(t, b, E, nu, Nx1, Nx2, Nxy)
+    lf = 1. + ms
+    assert np.allclose(lf*RC + lf**2*(RB**2 + RS**2), 1.)
+    # without bending method 4 is method 2
+    eq2 = compile_deqatn(DEQATNS_BUCKLING[2])
+    assert np.isclose(eq(t, b, E, nu, -100., -100., 200.),
+                      eq2(t, b, E, nu, -100., 200.))
+
+
+class Element(object):
+    def __init__(self, eid, x, y=0.):
+        self.eid = eid
+        self.x = np.array([x, y, 0.])
+
+    def get_node_positions(self):
+        return self.x + np.array([[0., 0., 0.], [1., 0., 0.], [1., 1., 0.],
+                                  [0., 1., 0.]])
+
+
+class StructModel(object):
+    def __init__(self, ses):
+        self.ses = {}
+        for se in ses:
+            self.ses.setdefault(se.__class__.__name__.lower(), {})[
+                se.name] = se
+        self.optmodel = SOL200()
+
+
+def sized_se(cls, name, eids, pid):
+    se = cls(name, eids)
+    se.elements = [Element(eid, float(i)) for i, eid in enumerate(eids)]
+    se.ptype = 'PSHELL'
+    se.pid = pid
+    se.material = MaterialIsotropic(70000., 0.3)
+    se.r, se.a, se.b = 2000., 500., 150.
+    return se
+
+
+def test_apply_sizing_table():
+    ses = [sized_se(Web, 'W1', [1, 2, 3], 10),
+           sized_se(Web, 'W2', [4, 5], 10),
+           sized_se(Panel, 'P1', [6, 7, 8], 20)]
+    model = StructModel(ses)
+    table = np.array([('W1', 1., 10., 300., 2, 0.2),
+                      ('W2', 1., 10., 300., 1, 0.1),
+                      ('P1', 2., 8., 0., 1, 0.1),
+                      ('X1', 1., 10., 300., 1, 0.1)],
+                     dtype=[('name', 'U8'), ('t_lb', float),
+                            ('t_ub', float), ('Fcy', float),
+                            ('method', int), ('ms', float)])
+    sized = apply_sizing_table(model, table)
+    optmodel = model.optmodel
+    assert [se.name for se in sized] == ['W1', 'W2', 'P1']
+    # initial thickness from the lower bound, one variable per property
+    assert [se.t for se in sized] == [1., 1., 2.]
+    dvar_array = optmodel.dvar_arrays[0]
+    assert dvar_array.pids.tolist() == [10, 20]
+    assert sized[0].dvar_ids['WEBt'] == sized[1].dvar_ids['WEBt']
+    # von Mises at Z1 and Z2 of property 10 only
+    vm = [d for d in optmodel.dresps.values()
+          if getattr(d, 'rtype', None) == 'STRESS']
+    assert sorted((d.ptype, d.atti) for d in vm) == [('PSHELL', 10)]*2
+    # one shared equation per web buckling method
+    webs = [d for d in optmodel.dresps.values() if isinstance(d, DRESP2)]
+    assert len(webs) == 2
+    eqs = dict((d.eqid, optmodel.deqatns[d.eqid]) for d in webs)
+    assert len(eqs) == 2
+    assert len([d for d in optmodel.dresps.values()
+                if isinstance(d, DRESP3)]) == 1
+    # buckling margins of the central elements
+    for web, method, eid in zip(webs, [2, 1], [2, 4]):
+        nxx = [optmodel.dresps[i] for i in web.dresp1]
+        assert len(nxx) == method
+        assert nxx[0].atti == eid
+        assert web.dtable[0] in optmodel.dtables
+        assert optmodel.dtables[web.dtable[0]] == 150.
+        assert (optmodel.deqatns[web.eqid].eq.strip() ==
+                DEQATNS_BUCKLING[method])
+    lbs = sorted(c.lallow for c in optmodel.dconstrs.values()
+                 if c.lallow not in (None, ''))
+    assert np.allclose(lbs, [0.1, 0.1, 0.2])
+
+
+def test_web_bending_buckling():
+    # web of three elements along its length and two across its height
+    web = sized_se(Web, 'W1', [1, 2, 3, 4, 5, 6], 10)
+    web.elements = [Element(eid, float(i % 3), float(i//3))
+                    for i, eid in enumerate(web.eids)]
+    web.t, web.t_lb, web.t_ub = 2., 1., 10.
+    web.model = StructModel([web])
+    web.create_dvars()
+    bottom, top = web.get_edge_elements()
+    assert sorted([bottom.eid in (1, 2, 3), top.eid in (1, 2, 3)]) == [
+        False, True]
+    web.constrain_buckling(method=4)
+    optmodel = web.model.optmodel
+    dresp2 = [d for d in optmodel.dresps.values() if isinstance(d, DRESP2)]
+    assert len(dresp2) == 1
+    assert (optmodel.deqatns[dresp2[0].eqid].eq.strip() ==
+            buckling_equation(4, 4., 5.6, 23.9))
+    eids = [optmodel.dresps[i].atti for i in dresp2[0].dresp1]
+    assert sorted(eids[:2]) == sorted([bottom.eid, top.eid])
+    assert eids[2] == web.get_central_element().eid
+    try:
+        web.constrain_buckling(method=5)
+    except NotImplementedError:
+        pass
+    else:
+        raise AssertionError('method 5 accepted')
+
+
+if __name__ == '__main__':
+    test_compression_buckling_equation()
+    test_shear_buckling_equation()
+    test_bending_buckling_equations()
+    test_apply_sizing_table()
+    test_web_bending_buckling()
@@ -0,0 +1,90 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from structmanager.analysis.linearfe import LinearFE
+from structmanager.optimization.sol200 import cards_opt
+from structmanager.optimization.sol200.backends import LinearFEBackend
+from structmanager.optimization.sol200 import driver
+from structmanager.optimization.sol200.driver import Driver
+
+
+class OptModel(object):
+    def __init__(self):
+        self.dvars = OrderedDict()
+        self.dvar_arrays = []
+        self.dtables = {}
+        self.dvprels = OrderedDict()
+        self.deqatns = OrderedDict()
+        self.dresps = OrderedDict()
+        self.dconstrs = OrderedDict()
+        self.dlinks = OrderedDict()
+        self.dobj = None
+
+
+def three_bar_truss():
+    """Classic three-bar truss with two load cases and stresses below 20"""
+    fe = LinearFE([[-100., 0.], [0., 0.], [100., 0.], [0., -100.]])
+    fe.add_rods([1, 2, 3], [[0, 3], [1, 3], [2, 3]], [1, 2, 3], 1e4,
+                rho=1.)
+    fe.add_spc([0, 1, 2])
+    P = 20./np.sqrt(2)
+    fe.add_load(1, 3, P, -P)
+    fe.add_load(2, 3, -P, -P)
+
+    optmodel = OptModel()
+    stress = cards_opt.DEQATN('S(A,F)=F/A')
+    optmodel.deqatns[stress.id] = stress
+    for pid in (1, 2, 3):
+        dvar = cards_opt.DESVAR('A%d' % pid, 1., 0.1, 5.)
+        optmodel.dvars[dvar.id] = dvar
+        dvprel = cards_opt.DVPREL1('PROD', pid, 'A', [dvar.id], [1.])
+        optmodel.dvprels[dvprel.id] = dvprel
+        force = cards_opt.DRESP1('F%d' % pid, 'FORCE', 'ELEM', None, 2, None,
+                                 pid)
+        dresp2 = cards_opt.DRESP2('S%d' % pid, stress.id)
+        dresp2.dvars = [dvar.id]
+        dresp2.dresp1 = [force.id]
+        dconstr = cards_opt.DCONSTR(1, dresp2.id, -20., 20.)
+        optmodel.dresps[force.id] = force
+        optmodel.dresps[dresp2.id] = dresp2
+        optmodel.dconstrs[dconstr.id] = dconstr
+    dvids = list(optmodel.dvars.keys())
+    dlink = cards_opt.DLINK(dvids[2], [dvids[0]], [1.])
+    optmodel.dlinks[dlink.id] = dlink
+    return fe, optmodel
+
+
+def test_three_bar_truss():
+    # optimum A1 = A3 = 0.7887, A2 = 0.4082, mass 2*sqrt(2)*A1 + A2
+    for method in ('SLSQP', 'SLP'):
+        fe, optmodel = three_bar_truss()
+        driver = Driver(optmodel, LinearFEBackend(fe), method=method,
+                        move_limit=0.3)
+        history = driver.run(ncycles=30, tol=1e-5)
+        assert len(history) < 31, method
+        assert history[-1]['gmax'] < 1e-4, method
+        assert np.isclose(history[-1]['objective'], 263.896, rtol=1e-4), (
+            method, history[-1]['objective'])
+        A1, A2, A3 = [dvar.xinit for dvar in optmodel.dvars.values()]
+        assert np.isclose(A1, A3)
+        assert np.isclose(A1, 0.7887, rtol=5e-3), (method, A1)
+        assert np.isclose(A2, 0.4082, rtol=1e-2), (method, A2)
+
+
+def test_linprog_fallback():
+    methods = list(driver.LINPROG_METHODS)
+    driver.LINPROG_METHODS[:] = ['unknown'] + methods
+    try:
+        fe, optmodel = three_bar_truss()
+        history = Driver(optmodel, LinearFEBackend(fe), method='SLP',
+                         move_limit=0.3).run(ncycles=30, tol=1e-5)
+        assert np.isclose(history[-1]['objective'], 263.896, rtol=1e-4)
+        assert driver.LINPROG_METHODS[0] != 'unknown'
+    finally:
+        driver.LINPROG_METHODS[:] = methods
+
+
+if __name__ == '__main__':
+    test_three_bar_truss()
+    test_linprog_fallback()
@@ -0,0 +1,29 @@
+import json
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+from structmanager.optimization.sol200.external import serve
+
+
+def test_serve_errors():
+    requests = [{'group': 'PCBUCK', 'type': 'BUCK_PC', 'args': [[1.]]},
+                {'group': 'PCBUCK'},
+                {'group': 'UNKNOWN', 'type': 'X', 'args': [[1.]]}]
+    infile = StringIO('\n'.join(json.dumps(r) for r in requests) +
+                      '\nnot json\n')
+    outfile = StringIO()
+    serve(infile, outfile)
+    replies = [json.loads(line) for line in
+               outfile.getvalue().splitlines()]
+    assert len(replies) == 4
+    assert replies[0]['error'].startswith('ValueError')
+    assert replies[1]['error'].startswith('KeyError')
+    assert 'Unknown external response' in replies[2]['error']
+    assert 'error' in replies[3]
+
+
+if __name__ == '__main__':
+    test_serve_errors()
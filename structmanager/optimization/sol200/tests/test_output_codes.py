@@ -0,0 +1,25 @@
+from structmanager.optimization.sol200.output_codes import (OUTC,
+                                                            get_output_code,
+                                                            get_output_codes)
+
+
+def test_all_names():
+    for rtype, tables in OUTC.items():
+        for eltype, table in tables.items():
+            for name, code in table.items():
+                assert get_output_code(rtype, eltype, name) == code, (
+                    rtype, eltype, name)
+
+
+def test_token_match():
+    assert get_output_code('STRESS', 'CQUAD4', 'Z1 von Mises') == 9
+    assert get_output_code('FORCE', 'CBAR', 'Bending End B plane 1') == 4
+    codes = get_output_codes('FORCE', 'CQUAD4', ['Membrane force x',
+                                                 'Membrane force xy',
+                                                 'Membrane force x'])
+    assert codes.tolist() == [2, 4, 2]
+
+
+if __name__ == '__main__':
+    test_all_names()
+    test_token_match()
@@ -0,0 +1,24 @@
+import numpy as np
+
+from structmanager.sas import FrameAssembly, WingBay
+from structmanager.structelem.base import SE1D, SE2D
+from structmanager.optimization.sol200.regions import se_regions
+
+
+def test_se_regions_by_sa():
+    panels = [SE2D('Panel.%d' % i, [i], None) for i in range(3)]
+    stringers = [SE1D('Stringer.%d' % i, [10 + i], None) for i in range(2)]
+    flanges = [SE1D('Flange.%d' % i, [20 + i], None) for i in range(2)]
+    web = SE2D('Web.1', [30], None)
+    alone = SE2D('Panel.9', [40], None)
+    bay = WingBay('Bay.1', panels + stringers)
+    frame = FrameAssembly('Frame.1', (flanges[0], web, flanges[1]))
+    ses = panels + stringers + flanges + [web, alone]
+    regions = se_regions(ses, by='sa', sas=[bay, frame], region0=1)
+    assert np.all(regions[:5] == 1)
+    assert np.all(regions[5:8] == 2)
+    assert regions[8] == 3
+
+
+if __name__ == '__main__':
+    test_se_regions_by_sa()
@@ -0,0 +1,60 @@
+import numpy as np
+
+from structmanager.optimization.sol200 import cards_opt
+from structmanager.optimization.sol200.screening import (ElementForces,
+                                                         evaluate_design)
+
+
+class OptModel(object):
+    def __init__(self):
+        self.dresps = {}
+        self.dconstrs = {}
+        self.deqatns = {}
+        self.dvars = {}
+        self.dvar_arrays = []
+        self.dtables = {}
+
+
+def model_forces():
+    optmodel = OptModel()
+    fx = cards_opt.DRESP1('fx', 'FORCE', 'ELEM', None, 2, None, 11)
+    fy = cards_opt.DRESP1('fy', 'FORCE', 'ELEM', None, 3, None, 11)
+    for dresp in (fx, fy):
+        optmodel.dresps[dresp.id] = dresp
+    forces = np.zeros((2, 1, 8))
+    forces[:, 0, :2] = [[3., -4.], [6., 8.]]
+    ef = ElementForces.from_arrays([1, 2], [11], forces)
+    return optmodel, ef, fx, fy
+
+
+def test_deqatn():
+    optmodel, ef, fx, fy = model_forces()
+    eq = cards_opt.DEQATN('F(a,b)=SQRT(a**2+b**2)')
+    optmodel.deqatns[eq.id] = eq
+    dresp2 = cards_opt.DRESP2('f', eq.id)
+    dresp2.add_dresp1(fx.id)
+    dresp2.add_dresp1(fy.id)
+    optmodel.dresps[dresp2.id] = dresp2
+    values = evaluate_design(optmodel, ef)
+    assert np.allclose(values[dresp2.id], [5., 10.])
+
+
+def test_deqatn_error():
+    optmodel, ef, fx, fy = model_forces()
+    eq = cards_opt.DEQATN('F(a,b)=a+b')
+    optmodel.deqatns[eq.id] = eq
+    dresp2 = cards_opt.DRESP2('f', eq.id)
+    dresp2.add_dresp1(fx.id)
+    optmodel.dresps[dresp2.id] = dresp2
+    try:
+        evaluate_design(optmodel, ef)
+    except ValueError as e:
+        assert 'DEQATN %s' % eq.id in str(e)
+        assert str(dresp2.id) in str(e)
+    else:
+        raise AssertionError('ValueError not raised')
+
+
+if __name__ == '__main__':
+    test_deqatn()
+    test_deqatn_error()
@@ -0,0 +1,173 @@
+import numpy as np
+
+from structmanager.optimization.sol200.cards_opt import DESVAR
+from structmanager.optimization.sol200.equations import compile_deqatn
+from structmanager.optimization.sol200.sections import (get_section,
+                                                        se_section_properties)
+
+
+def rectangles(rects):
+    """A, I1 and I2 of rectangles `(y, z, width, height, sign)`"""
+    y, z, w, h, sign = np.array(rects, dtype=np.float64).T
+    area = sign*w*h
+    A = area.sum()
+    yc = (area*y).sum()/A
+    zc = (area*z).sum()/A
+    I1 = (sign*w*h**3/12.).sum() + (area*(z - zc)**2).sum()
+    I2 = (sign*h*w**3/12.).sum() + (area*(y - yc)**2).sum()
+    return A, I1, I2
+
+
+def pbarl_rectangles(name, d):
+    d1, d2, d3, d4, d5, d6 = list(d) + [0.]*(6 - len(d))
+    if name == 'SQUARE':
+        return [(0., 0., d1, d1, 1)]
+    if name == 'RECT':
+        return [(0., 0., d1, d2, 1)]
+    if name == 'BOX3':
+        return [(0., 0., d1, d3, 1), (0., 0., d1 - 2*d2, d3 - 2*d2, -1)]
+    if name == 'BOX4':
+        return [(0., 0., d1, d3, 1), (0., 0., d1 - 2*d4, d3 - 2*d2, -1)]
+    if name == 'IBEAM':
+        zf = (d3 + d2)/2.
+        return [(0., -zf, 2*d1, d2, 1), (0., zf, 2*d1, d2, 1),
+                (0., 0., d4, d3, 1)]
+    if name == 'TEE':
+        return [(0., d2/2., 2*d1, d2, 1), (0., d2 + d3/2., d4, d3, 1)]
+    if name == 'ANGLE':
+        return [(d1/2., d2/2., d1, d2, 1), (d4/2., d2 + d3/2., d4, d3, 1)]
+    if name == 'I':
+        hw = d1 - d5 - d6
+        return [(0., d5/2., d2, d5, 1), (0., d1 - d6/2., d3, d6, 1),
+                (0., d5 + hw/2., d4, hw, 1)]
+    if name == 'I1':
+        tf = (d4 - d3)/2.
+        zf = (d3 + tf)/2.
+        return [(0., -zf, 2*d1 + d2, tf, 1), (0., zf, 2*d1 + d2, tf, 1),
+                (0., 0., d2, d3, 1)]
+    if name == 'H':
+        yc = (d1 + d2/2.)/2.
+        return [(-yc, 0., d2/2., d3, 1), (yc, 0., d2/2., d3, 1),
+                (0., 0., d1, d4, 1)]
+    if name == 'Z':
+        tf = (d4 - d3)/2.
+        yf = (d1 + d2)/2.
+        zf = (d4 - tf)/2.
+        return [(-yf, -zf, d1, tf, 1), (yf, zf, d1, tf, 1),
+                (0., 0., d2, d4, 1)]
+
+
+PBARL_DIMS = {
+    'SQUARE': [3.],
+    'RECT': [3., 5.],
+    'BOX3': [20., 2., 30.],
+    'BOX4': [20., 2., 30., 3.],
+    'IBEAM': [10., 2., 30., 3.],
+    'TEE': [10., 2., 30., 3.],
+    'ANGLE': [20., 2., 30., 3.],
+    'I': [40., 20., 15., 3., 2., 4.],
+    'I1': [10., 3., 30., 36.],
+    'H': [20., 6., 30., 3.],
+    'Z': [10., 3., 30., 36.],
+    }
+
+
+def test_pbarl_sections():
+    for name, dims in PBARL_DIMS.items():
+        props = get_section(name).properties(dims)
+        A, I1, I2 = rectangles(pbarl_rectangles(name, dims))
+        assert np.isclose(props['A'], A), name
+        assert np.isclose(props['I1'], I1), name
+        assert np.isclose(props['I2'], I2), name
+        assert props['J'] > 0, name
+
+
+def test_round_sections():
+    d, t = 20., 2.
+    props = get_section('CIRCLE').properties([d])
+    assert np.isclose(props['A'], np.pi*d**2/4.)
+    assert np.isclose(props['I1'], np.pi*d**4/64.)
+    assert np.isclose(props['J'], props['I1'] + props['I2'])
+    props = get_section('TUBE').properties([d, t])
+    do = d + 2*t
+    assert np.isclose(props['A'], np.pi*(do**2 - d**2)/4.)
+    assert np.isclose(props['I2'], np.pi*(do**4 - d**4)/64.)
+    assert np.isclose(props['J'], props['I1'] + props['I2'])
+    # the rectangle torsion constant of a square
+    square = get_section('SQUARE').properties([3.])['J']
+    rect = get_section('RECT').properties([3., 3.])['J']
+    assert np.isclose(square, rect, rtol=2e-3)
+
+
+def test_many_sections():
+    dims = np.array([[3., 4., 5.], [5., 6., 7.]])
+    props = get_section('RECT').properties(dims)
+    assert np.allclose(props['A'], dims[0]*dims[1])
+    assert np.allclose(props['I1'], dims[0]*dims[1]**3/12.)
+    try:
+        get_section('RECT').properties([3.])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('wrong number of dimensions accepted')
+    try:
+        get_section('RAIL')
+    except NotImplementedError:
+        pass
+    else:
+        raise AssertionError('RAIL section returned')
+
+
+class SE(object):
+    def __init__(self, **kwargs):
+        self.deqatns = []
+        self.dvprels = []
+        self.__dict__.update(kwargs)
+
+    def add_deqatn(self, deqatn):
+        self.deqatns.append(deqatn)
+
+    def add_dvprel(self, dvprel):
+        self.dvprels.append(dvprel)
+
+
+def test_se_section_properties():
+    ses = [SE(profile='b_t_h', t=2., h=30.),
+           SE(profile='t_b', t=2., b=30.),
+           SE(profile='b_t_h', t=2.),
+           SE(profile='unknown', t=2., h=30.),
+           None]
+    props = se_section_properties(ses, ['A', 'ZC', 'IN'])
+    assert np.allclose(props['A'][:2], 60.)
+    assert np.allclose(props['ZC'][:2], [15., 1.])
+    assert np.allclose(props['IN'][:2], [2.*30.**3/12., 30.*2.**3/12.])
+    assert np.isnan(props['A'][2:]).all()
+
+
+def test_dvprel_arguments():
+    # the DVPREL2 cards list the DESVARs before the DTABLEs
+    section = get_section('I')
+    dims = [40., 20., 15., 3., 2., 4.]
+    dvars = dict((i, DESVAR('D%d' % (i + 1), dims[i], 1., 50.))
+                 for i in (1, 3, 4))
+    tables = dict((i, 'TBL%d' % (i + 1)) for i in (0, 2, 5))
+    values = [dvars[i] if i in dvars else tables[i] for i in range(6)]
+    se = SE()
+    section.create_dvprels(se, 'PBAR', 7, values)
+    expected = section.properties(dims)
+    assert [d.pname for d in se.dvprels] == ['A', 'I1', 'I2', 'J']
+    for deqatn, dvprel in zip(se.deqatns, se.dvprels):
+        assert dvprel.eqid == deqatn.id
+        assert dvprel.dvars == [dvars[i].id for i in (1, 3, 4)]
+        assert dvprel.dtable == [tables[i] for i in (0, 2, 5)]
+        args = [dims[i] for i in (1, 3, 4, 0, 2, 5)]
+        value = compile_deqatn(deqatn.eq.strip())(*args)
+        assert np.isclose(value, expected[dvprel.pname]), dvprel.pname
+
+
+if __name__ == '__main__':
+    test_pbarl_sections()
+    test_round_sections()
+    test_many_sections()
+    test_se_section_properties()
+    test_dvprel_arguments()
@@ -0,0 +1,47 @@
+import os
+import tempfile
+
+import numpy as np
+
+from structmanager.optimization.sol200.topometry import TopometryResults
+
+
+class SE(object):
+    def __init__(self, name, eids):
+        self.name = name
+        self.eids = eids
+
+
+class OptModel(object):
+    def __init__(self):
+        self.newprops = {}
+
+
+def test_create_properties():
+    eids = np.arange(1, 11)
+    t = np.array([1., 1.1, 1.2, 3., 3.1, 2., 2.1, 5., 5.05, 5.1])
+    fd, path = tempfile.mkstemp(suffix='.pch')
+    with os.fdopen(fd, 'w') as pch:
+        pch.write('$ thicknesses\n')
+        for eid, ti in zip(eids, t):
+            pch.write('%d %f\n' % (eid, ti))
+    try:
+        res = TopometryResults(path)
+    finally:
+        os.remove(path)
+    ses = [SE('a', [1, 2, 3, 4, 5]), SE('b', [6, 7, 8, 9, 10])]
+    optmodel = OptModel()
+    new_eids, pids = res.create_properties(ses, optmodel, topo_max_elem=3,
+                                             maxgrad=10., pid0=100, mid=1)
+    pshells = optmodel.newprops['PSHELL']
+    assert sorted(pshells.keys()) == [100, 101, 102, 103]
+    assert np.allclose([pshells[pid].t for pid in range(100, 104)],
+                       [1.2, 3.1, 2.1, 5.1])
+    thick = dict(zip(new_eids.tolist(), pids.tolist()))
+    assert ([thick[eid] for eid in eids.tolist()] ==
+            [100]*3 + [101]*2 + [102]*2 + [103]*3)
+    assert optmodel.newpids == thick
+
+
+if __name__ == '__main__':
+    test_create_properties()
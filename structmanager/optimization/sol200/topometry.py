@@ -1,19 +1,343 @@
-class TopometryResults():
-    """TODO add summary
+"""
+Topometry results (:mod:`structmanager.sol200.topometry`)
+==========================================================
 
-    TODO add description
+.. currentmodule:: structmanager.sol200.topometry
+
+Reader for the element thicknesses written to punch files by topometry runs,
+with the results grouped by SE.
+
+"""
+from itertools import islice
+
+import numpy as np
+
+
+def read_punch(path, chunksize=1000000):
+    """Read element ids and thicknesses from a topometry punch file
+
+    The file is parsed in chunks of lines, each one converted at once to
+    NumPy arrays. Empty lines and lines starting with `$` are ignored.
+
+    Parameters
+    ----------
+    path : str
+        The path to the punch file.
+    chunksize : int, optional
+        The number of lines parsed at once.
+
+    Returns
+    -------
+    eids, t : np.ndarray
+        The element ids and the corresponding thicknesses, in the order of
+        the file.
 
     """
-    def __init__(self, path):
-        self.maxgrad = 1.
-        pchfile = open(path, 'r')
-        lines = pchfile.readlines(1000000)
-        self.elem_t = []
-        for line in lines:
-            if line.strip() == '' or line[:1] == '$':
+    eids = []
+    t = []
+    with open(path, 'r') as pchfile:
+        while True:
+            lines = list(islice(pchfile, chunksize))
+            if len(lines) == 0:
+                break
+            lines = [line for line in lines
+                     if line[:1] != '$' and line.strip() != '']
+            if len(lines) == 0:
                 continue
-            self.elem_t.append([  int(line.split()[0]) ,
-                                   float(line.split()[1])  ])
-        pchfile.close()
-        self.elem_t.sort(key = i : i[1])
+            data = np.loadtxt(lines, usecols=(0, 1), ndmin=2)
+            eids.append(data[:, 0].astype(np.int64))
+            t.append(data[:, 1])
+    if len(eids) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+    return np.concatenate(eids), np.concatenate(t)
+
+
+def kmeans_1d(t, k, niter=100):
+    """One-dimensional k-means of sorted values
+
+    For sorted values each cluster is a contiguous slice, such that the
+    Lloyd iterations reduce to cumulative sums and binary searches.
+
+    Parameters
+    ----------
+    t : np.ndarray
+        The values sorted in ascending order.
+    k : int
+        The number of clusters.
+    niter : int, optional
+        The maximum number of iterations.
+
+    Returns
+    -------
+    bounds : np.ndarray
+        Cluster `i` is the slice `t[bounds[i]:bounds[i+1]]`. Empty clusters
+        are removed, such that there may be less than `k` clusters.
+
+    """
+    n = t.shape[0]
+    k = max(1, min(int(k), n))
+    csum = np.concatenate(([0.], np.cumsum(t)))
+    bounds = np.unique(np.linspace(0, n, k + 1).round().astype(np.int64))
+    for i in range(niter):
+        centers = (csum[bounds[1:]] - csum[bounds[:-1]]) / np.diff(bounds)
+        mids = 0.5*(centers[1:] + centers[:-1])
+        new = np.unique(np.concatenate(([0], np.searchsorted(t, mids, 'right'),
+                                        [n])))
+        if new.shape[0] == bounds.shape[0] and np.all(new == bounds):
+            break
+        bounds = new
+    return bounds
+
+
+def cluster_thickness(t, max_elem=None, maxgrad=None, niter=100):
+    """Cluster sorted thicknesses respecting size and spread limits
+
+    The number of clusters of :func:`.kmeans_1d` is increased until no
+    cluster has more than `max_elem` values or a thickness spread larger than
+    `maxgrad`.
+
+    Parameters
+    ----------
+    t : np.ndarray
+        The thicknesses sorted in ascending order.
+    max_elem : int or None, optional
+        The maximum number of elements in each cluster.
+    maxgrad : float or None, optional
+        The maximum difference between the thicknesses of one cluster.
+    niter : int, optional
+        The maximum number of k-means iterations.
+
+    Returns
+    -------
+    bounds : np.ndarray
+        Cluster `i` is the slice `t[bounds[i]:bounds[i+1]]`.
+
+    """
+    n = t.shape[0]
+    if n == 0:
+        return np.zeros(1, dtype=np.int64)
+    k = 1
+    if max_elem:
+        k = max(k, int(np.ceil(n/float(max_elem))))
+    if maxgrad:
+        k = max(k, int(np.ceil((t[-1] - t[0])/maxgrad)))
+    while True:
+        bounds = kmeans_1d(t, k, niter)
+        extra = np.zeros(bounds.shape[0] - 1, dtype=np.int64)
+        if max_elem:
+            extra += np.ceil(np.diff(bounds)/float(max_elem)).astype(
+                np.int64) - 1
+        if maxgrad:
+            spread = t[bounds[1:] - 1] - t[bounds[:-1]]
+            extra += np.ceil(spread/maxgrad).astype(np.int64) - 1
+        extra = np.clip(extra, 0, None)
+        if extra.sum() == 0 or k >= n:
+            return bounds
+        k = min(n, max(bounds.shape[0] - 1, k) + int(extra.sum()))
+
+
+class TopometryResults(object):
+    """Element thicknesses from a topometry run
+
+    ==================  ======================================================
+    Attribute           Description
+    ==================  ======================================================
+    `eids`              `np.ndarray` with the element ids, sorted by
+                        thickness
+    `t`                 `np.ndarray` with the sorted element thicknesses
+    `maxgrad`           `float` with the maximum thickness gradient
+    ==================  ======================================================
+
+    Parameters
+    ----------
+    path : str
+        The path to the punch file.
+    chunksize : int, optional
+        The number of lines parsed at once, see :func:`.read_punch`.
 
+    """
+    def __init__(self, path, chunksize=1000000):
+        self.maxgrad = 1.
+        eids, t = read_punch(path, chunksize)
+        order = np.argsort(t, kind='mergesort')
+        self.eids = eids[order]
+        self.t = t[order]
+        self._eid_order = np.argsort(self.eids, kind='mergesort')
+        self._sorted_eids = self.eids[self._eid_order]
+
+
+    @property
+    def elem_t(self):
+        """Element ids and thicknesses as rows of a `(n, 2)` array"""
+        return np.column_stack((self.eids, self.t))
+
+
+    def get_thickness(self, eids):
+        """Get the thicknesses of given elements
+
+        Parameters
+        ----------
+        eids : array-like
+            The element ids.
+
+        Returns
+        -------
+        t : np.ndarray
+            The thicknesses, `NaN` for elements not found in the results.
+
+        """
+        eids = np.atleast_1d(np.asarray(eids, dtype=np.int64))
+        t = np.full(eids.shape[0], np.nan)
+        if self._sorted_eids.shape[0] == 0:
+            return t
+        pos = np.searchsorted(self._sorted_eids, eids)
+        pos = np.clip(pos, 0, self._sorted_eids.shape[0] - 1)
+        found = self._sorted_eids[pos] == eids
+        t[found] = self.t[self._eid_order[pos[found]]]
+        return t
+
+
+    def group_by_se(self, ses):
+        """Join the results with the elements of each SE
+
+        Parameters
+        ----------
+        ses : list
+            The SEs, each with an attribute `eids`.
+
+        Returns
+        -------
+        offsets : np.ndarray
+            The results of `ses[i]` are in the slice
+            `offsets[i]:offsets[i+1]` of the other outputs.
+        eids, t : np.ndarray
+            The element ids and thicknesses, sorted by thickness within each
+            SE. Elements without results are not included.
+
+        """
+        sizes = np.array([len(se.eids) for se in ses], dtype=np.int64)
+        if sizes.sum() == 0:
+            return (np.zeros(len(ses) + 1, dtype=np.int64),
+                    np.zeros(0, dtype=np.int64), np.zeros(0))
+        eids = np.concatenate([np.asarray(se.eids, dtype=np.int64)
+                               for se in ses])
+        seids = np.repeat(np.arange(len(ses)), sizes)
+        t = self.get_thickness(eids)
+        found = ~np.isnan(t)
+        eids, seids, t = eids[found], seids[found], t[found]
+        order = np.lexsort((t, seids))
+        eids, seids, t = eids[order], seids[order], t[order]
+        offsets = np.searchsorted(seids, np.arange(len(ses) + 1))
+        return offsets, eids, t
+
+
+    def se_thickness(self, ses):
+        """Aggregate the thicknesses of each SE
+
+        Parameters
+        ----------
+        ses : list
+            The SEs, each with an attribute `eids`.
+
+        Returns
+        -------
+        stats : np.recarray
+            One row per SE with the fields `name`, `nelem`, `tmin`, `tmax`
+            and `tmean`. SEs without results have `nelem=0` and `NaN`
+            thicknesses.
+
+        """
+        offsets, eids, t = self.group_by_se(ses)
+        nelem = np.diff(offsets)
+        tmin = np.full(len(ses), np.nan)
+        tmax = np.full(len(ses), np.nan)
+        tmean = np.full(len(ses), np.nan)
+        check = nelem > 0
+        if check.any():
+            starts = offsets[:-1][check]
+            ends = offsets[1:][check] - 1
+            tmin[check] = t[starts]
+            tmax[check] = t[ends]
+            tmean[check] = np.add.reduceat(t, starts) / nelem[check]
+        names = np.array([se.name for se in ses], dtype=str)
+        return np.rec.fromarrays([names, nelem, tmin, tmax, tmean],
+                                 names='name,nelem,tmin,tmax,tmean')
+
+
+    def create_properties(self, ses, optmodel, topo_max_elem=None,
+                          maxgrad=None, pid0=9000000, tvalue='max',
+                          mid=None):
+        """Collapse the element thicknesses into new PSHELL properties
+
+        The sorted thicknesses of each SE are clustered using
+        :func:`.cluster_thickness` and one :class:`.PSHELL` is created per
+        cluster in `optmodel.newprops['PSHELL']`, created when missing. The
+        new property ids of the elements are added to `optmodel.newpids`,
+        such that the element cards are updated when the decks are merged,
+        see :func:`.copy_bulk_data`.
+
+        Parameters
+        ----------
+        ses : list
+            The SEs, each with an attribute `eids`.
+        optmodel : :class:`.SOL200` or :class:`.Genesis`
+            The optimization model receiving the new properties.
+        topo_max_elem : int or None, optional
+            The maximum number of elements of each new property. By default
+            `optmodel.topo_max_elem` is used, when defined.
+        maxgrad : float or None, optional
+            The maximum thickness difference within each new property. By
+            default the attribute `maxgrad` is used.
+        pid0 : int, optional
+            The id of the first new property.
+        tvalue : str, optional
+            The thickness of each new property, the `'max'` or the `'mean'`
+            thickness of its elements.
+        mid : int or None, optional
+            The material id of the new properties. By default the material of
+            the first element of each SE is used.
+
+        Returns
+        -------
+        eids, pids : np.ndarray
+            The element ids and the corresponding new property ids.
+
+        """
+        from .cards_solver import PSHELL
+
+        if topo_max_elem is None:
+            topo_max_elem = getattr(optmodel, 'topo_max_elem', None)
+        if maxgrad is None:
+            maxgrad = self.maxgrad
+        if tvalue not in ('max', 'mean'):
+            raise ValueError('Invalid tvalue: %s' % tvalue)
+        newprops = optmodel.newprops.setdefault('PSHELL', {})
+        offsets, eids, t = self.group_by_se(ses)
+        pids = np.zeros(eids.shape[0], dtype=np.int64)
+        pid = pid0
+        for i, se in enumerate(ses):
+            start, end = offsets[i], offsets[i+1]
+            if end == start:
+                continue
+            if mid is None:
+                se_mid = se.elements[0].pid.Mid()
+            else:
+                se_mid = mid
+            tse = t[start:end]
+            bounds = cluster_thickness(tse, topo_max_elem, maxgrad)
+            if tvalue == 'max':
+                tnew = tse[bounds[1:] - 1]
+            else:
+                csum = np.concatenate(([0.], np.cumsum(tse)))
+                tnew = (csum[bounds[1:]] - csum[bounds[:-1]])/np.diff(bounds)
+            newpids = pid + np.arange(tnew.shape[0])
+            pids[start:end] = np.repeat(newpids, np.diff(bounds))
+            for newpid, ti in zip(newpids.tolist(), tnew.tolist()):
+                newprops[newpid] = PSHELL(newpid, se_mid, ti)
+            pid += tnew.shape[0]
+        if getattr(optmodel, 'newpids', None) is None:
+            optmodel.newpids = {}
+        check = pids > 0
+        optmodel.newpids.update(zip(eids[check].tolist(),
+                                    pids[check].tolist()))
+        return eids, pids
@@ -31,3 +31,36 @@ def format_float(x, size=8, lr='>'):
         raise ValueError('Float %f does not fit in size = %d' % (x, size))
     return y
 
+
+
+def format_float_array(x, size=8):
+    """Format an array of float numbers, right aligned
+
+    Vectorized counterpart of :func:`format_float`, used by the bulk card
+    writers.
+
+    Parameters
+    ----------
+    x : array-like
+        The float numbers.
+    size : int, optional
+        Desired size of each output string.
+
+    Returns
+    -------
+    out : np.ndarray
+        Array of formatted strings.
+
+    """
+    import numpy as np
+
+    full = np.array([str(xi) for xi in np.asarray(x, dtype=float).ravel()
+                     .tolist()])
+    if full.size == 0:
+        return full.astype('U%d' % size)
+    out = np.char.rjust(full, size).astype('U%d' % size)
+    lost = (np.char.find(full, '.') > -1) & (np.char.find(out, '.') == -1)
+    if lost.any():
+        raise ValueError('Float %s does not fit in size = %d' %
+                         (full[lost][0], size))
+    return out
@@ -0,0 +1,103 @@
+"""
+Wing bay constraints (:mod:`structmanager.sol200.wingbay`)
+===========================================================
+
+.. currentmodule:: structmanager.sol200.wingbay
+
+Global buckling constraint of a :class:`.WingBay`, using the `'BUCK_WB'`
+external response of the `WINGBAY` group, see :mod:`.analysis.wingbay`.
+The cards are added to the first panel of the bay.
+
+"""
+from __future__ import division
+
+import numpy as np
+
+from . import output_codes as output_codes_SOL200
+from .cards_opt import DRESP1, DRESP3
+from ...analysis.assemblies import bay_properties
+
+
+def constrain_global_buckling(bay, eig=1.0):
+    """Add the global buckling constraint of a wing bay
+
+    The thickness of the panels with a `'PANt'` design variable is taken
+    from the design variable, the other properties from DTABLEs with the
+    current values. The membrane forces are read at the central element of
+    the bay, with `Nxx` along the stringers.
+
+    Parameters
+    ----------
+    bay : :class:`.WingBay`
+        The wing bay.
+    eig : float, optional
+        The minimum buckling eigenvalue.
+
+    Returns
+    -------
+    dresp : :class:`.DRESP3`
+        The buckling response.
+
+    """
+    if not bay.panels:
+        raise ValueError('WingBay {0} has no panels'.format(bay.name))
+    owner = bay.panels[0]
+    props = bay_properties([bay])
+    keys = ['E', 'nu', 'As', 'Es', 'ZC', 'IN', 'ds', 'a', 'b']
+    missing = [k for k in keys if not np.isfinite(props[k][0])]
+    if props['nstr'][0] == 0:
+        missing.remove('ds')
+    if missing:
+        raise ValueError('WingBay {0} missing properties: {1}'.format(
+                         bay.name, ', '.join(missing)))
+
+    OUTC = output_codes_SOL200.OUTC
+    dcid = bay.constraints['global_buckling']
+
+    eids = [eid for panel in bay.panels for eid in panel.eids]
+    eid = None
+    index = getattr(owner.model, 'element_index', None)
+    if index is not None:
+        eid = index.central_element(eids)
+    if eid is None:
+        eid = owner.get_central_element().eid
+
+    dresps = []
+    for label, name in (('WBfNxx', 'Membrane force x'),
+                        ('WBfNyy', 'Membrane force y'),
+                        ('WBfNxy', 'Membrane force xy')):
+        dresp1 = DRESP1(label, 'FORCE', 'ELEM', region=None,
+                        atta=OUTC['FORCE']['CQUAD4'][name], attb=None,
+                        atti=eid)
+        owner.add_dresp(dresp1)
+        dresps.append(dresp1)
+
+    # see structmanager.analysis.wingbay.ARGS
+    dresp = DRESP3('WBBUCK', 'WINGBAY', 'BUCK_WB')
+    for panel in bay.panels:
+        dvar = panel.dvars.get('PANt')
+        if dvar is not None:
+            dresp.add_dvar(dvar.id)
+    for panel in bay.panels:
+        if panel.dvars.get('PANt') is None:
+            if 'WBt' not in panel.dtables:
+                panel.add_dtable('WBt', panel.t)
+            dresp.add_dtable(panel.dtables['WBt'][0])
+    for k in keys:
+        value = props[k][0]
+        if not np.isfinite(value):
+            # unstiffened bay, any finite pitch
+            value = props['b'][0]
+        if 'WB' + k in owner.dtables:
+            owner.dtables['WB' + k][1] = float(value)
+            owner.model.optmodel.dtables[owner.dtables['WB' + k][0]] = \
+                float(value)
+        else:
+            owner.add_dtable('WB' + k, value)
+        dresp.add_dtable(owner.dtables['WB' + k][0])
+    for dresp1 in dresps:
+        dresp.add_dresp1(dresp1.id)
+    owner.add_dresp(dresp)
+    # lower eigenvalue >= eig
+    owner.add_constraint(dcid, dresp, eig, None)
+    return dresp
@@ -1,4 +1,414 @@
+"""
+Optimization Model (:mod:`structmanager.optmodel`)
+==================================================
+
+.. currentmodule:: structmanager.optmodel
+
+Solver-neutral representation of a sizing problem: design variables,
+property relations, equations, tables, responses, constraints, links and
+screening parameters. The model is written to the input deck of a given
+solver by the writers of :mod:`.optwriters`, such that the constraints are
+generated once and the decks for many solvers are emitted from the same
+model, possibly in parallel, see :meth:`.OptimizationModel.write_decks`.
+
+The constraints are currently generated by the SE methods into a
+:class:`.SOL200` model, converted with :meth:`.OptimizationModel.from_sol200`.
+The ids of the original cards are kept.
+
+The design variables and the linear property relations, which dominate large
+sizing problems, are stored as columns of NumPy arrays as in
+:class:`.DESVARArray`. A linear relation with many terms takes one row per
+term, all with the same id.
+
+"""
+from __future__ import division
+
+import multiprocessing
+from collections import OrderedDict
+
+import numpy as np
+
+
+class DesignVariables(object):
+    """Design variables stored as arrays
+
+    ==================  ======================================================
+    Attribute           Description
+    ==================  ======================================================
+    `ids`               `np.ndarray` of `int` with the variable ids
+    `labels`            `np.ndarray` of `str` with the labels
+    `init`              `np.ndarray` of `float` with the initial values
+    `lb`                `np.ndarray` of `float` with the lower bounds
+    `ub`                `np.ndarray` of `float` with the upper bounds
+    ==================  ======================================================
+
+    """
+    def __init__(self):
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.labels = np.zeros(0, dtype='U8')
+        self.init = np.zeros(0, dtype=np.float64)
+        self.lb = np.zeros(0, dtype=np.float64)
+        self.ub = np.zeros(0, dtype=np.float64)
+
+
+    def __len__(self):
+        return self.ids.shape[0]
+
+
+    def add(self, ids, labels, init, lb, ub):
+        """Add many design variables, scalars are broadcast to `ids`"""
+        ids = np.atleast_1d(np.asarray(ids, dtype=np.int64))
+        n = ids.shape[0]
+
+        def column(value, dtype):
+            return np.broadcast_to(np.asarray(value, dtype=dtype),
+                                   (n,)).astype(dtype)
+
+        self.ids = np.concatenate((self.ids, ids))
+        self.labels = np.concatenate((self.labels, column(labels, 'U8')))
+        self.init = np.concatenate((self.init, column(init, np.float64)))
+        self.lb = np.concatenate((self.lb, column(lb, np.float64)))
+        self.ub = np.concatenate((self.ub, column(ub, np.float64)))
+
+
+class PropertyRelations(object):
+    """Linear design variable-to-property relations stored as arrays
+
+    Each relation is `property.pname = c0 + sum(coeff*variable)`, with one
+    row per term.
+
+    ==================  ======================================================
+    Attribute           Description
+    ==================  ======================================================
+    `ids`               `np.ndarray` of `int` with the relation ids
+    `ptypes`            `np.ndarray` of `str` with the property types
+    `pids`              `np.ndarray` of `int` with the property ids
+    `pnames`            `np.ndarray` of `str` with the property parameters
+    `c0s`               `np.ndarray` of `float` with the constant terms
+    `dvids`             `np.ndarray` of `int` with the variable ids
+    `coeffs`            `np.ndarray` of `float` with the multipliers
+    ==================  ======================================================
+
+    """
+    def __init__(self):
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.ptypes = np.zeros(0, dtype='U8')
+        self.pids = np.zeros(0, dtype=np.int64)
+        self.pnames = np.zeros(0, dtype='U8')
+        self.c0s = np.zeros(0, dtype=np.float64)
+        self.dvids = np.zeros(0, dtype=np.int64)
+        self.coeffs = np.zeros(0, dtype=np.float64)
+
+
+    def __len__(self):
+        return self.ids.shape[0]
+
+
+    def add(self, ids, ptypes, pids, pnames, dvids, coeffs=1., c0s=0.):
+        """Add many relation terms, scalars are broadcast to `ids`"""
+        ids = np.atleast_1d(np.asarray(ids, dtype=np.int64))
+        n = ids.shape[0]
+
+        def column(value, dtype):
+            return np.broadcast_to(np.asarray(value, dtype=dtype),
+                                   (n,)).astype(dtype)
+
+        self.ids = np.concatenate((self.ids, ids))
+        self.ptypes = np.concatenate((self.ptypes, column(ptypes, 'U8')))
+        self.pids = np.concatenate((self.pids, column(pids, np.int64)))
+        self.pnames = np.concatenate((self.pnames, column(pnames, 'U8')))
+        self.c0s = np.concatenate((self.c0s, column(c0s, np.float64)))
+        self.dvids = np.concatenate((self.dvids, column(dvids, np.int64)))
+        self.coeffs = np.concatenate((self.coeffs,
+                                      column(coeffs, np.float64)))
+
+
+class PropertyEquation(object):
+    """Property given by an equation of variables and table constants"""
+    def __init__(self, id, ptype, pid, pname, eqid, dvids=(), tables=()):
+        self.id = id
+        self.ptype = ptype
+        self.pid = pid
+        self.pname = pname
+        self.eqid = eqid
+        self.dvids = list(dvids)
+        self.tables = list(tables)
+
+
+class Response(object):
+    """Analysis response, such as a stress or a force of one element
+
+    The attributes follow the NASTRAN DRESP1 card, `None` for empty fields.
+
+    """
+    def __init__(self, id, label, rtype, ptype=None, region=None, atta=None,
+                 attb=None, atti=None):
+        self.id = id
+        self.label = label
+        self.rtype = rtype
+        self.ptype = ptype
+        self.region = region
+        self.atta = atta
+        self.attb = attb
+        self.atti = atti
+
+
+class EquationResponse(object):
+    """Response given by an equation
+
+    The arguments are taken in the order: variables, table constants,
+    analysis responses and equation responses. `eqid` is an equation id or
+    the name of a built-in function, such as `'AVG'`.
+
+    """
+    def __init__(self, id, label, eqid, dvids=(), tables=(), responses=(),
+                 eq_responses=(), region=None):
+        self.id = id
+        self.label = label
+        self.eqid = eqid
+        self.dvids = list(dvids)
+        self.tables = list(tables)
+        self.responses = list(responses)
+        self.eq_responses = list(eq_responses)
+        self.region = region
+
+
+class ExternalResponse(EquationResponse):
+    """Response given by an external routine, see :mod:`.external`"""
+    def __init__(self, id, label, group, type, dvids=(), tables=(),
+                 responses=(), eq_responses=(), region=None):
+        super(ExternalResponse, self).__init__(id, label, None, dvids,
+                                               tables, responses,
+                                               eq_responses, region)
+        self.group = group
+        self.type = type
+
+
+class Constraint(object):
+    """Bounds on a response, `None` for no bound"""
+    def __init__(self, id, dcid, rid, lb=None, ub=None):
+        self.id = id
+        self.dcid = dcid
+        self.rid = rid
+        self.lb = lb
+        self.ub = ub
+
+
+class Link(object):
+    """Dependent variable `c0 + cmult*sum(c_i*variable_i)`"""
+    def __init__(self, id, ddvid, idvs, cs, c0=0., cmult=1.):
+        self.id = id
+        self.ddvid = ddvid
+        self.idvs = list(idvs)
+        self.cs = list(cs)
+        self.c0 = c0
+        self.cmult = cmult
+
+
+class Screen(object):
+    """Constraint screening parameters of one response type"""
+    def __init__(self, rtype, trs=-0.5, nstr=20):
+        self.rtype = rtype
+        self.trs = trs
+        self.nstr = nstr
+
+
+def _blank(value):
+    return None if value is None or value == '' else value
+
+
+def _bound(value, card):
+    value = _blank(value)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError('Invalid allowable {0!r} of DCONSTR {1:d}'.format(
+                         value, card.id))
+
+
+def _write_deck(args):
+    model, path, solver, options = args
+    model.write(path, solver, **options)
+    return path
+
+
 class OptimizationModel(object):
+    """Solver-neutral optimization model
+
+    ==================  ======================================================
+    Attribute           Description
+    ==================  ======================================================
+    `variables`         :class:`.DesignVariables`
+    `relations`         :class:`.PropertyRelations`
+    `prop_equations`    `dict` of :class:`.PropertyEquation` objects
+    `equations`         `dict` with the equations as `str`, such as
+                        `'F(a,b)=a+b'`
+    `tables`            `dict` with the table constants
+    `responses`         `dict` of :class:`.Response`,
+                        :class:`.EquationResponse` and
+                        :class:`.ExternalResponse` objects
+    `constraints`       `dict` of :class:`.Constraint` objects
+    `links`             `dict` of :class:`.Link` objects
+    `screens`           `dict` of :class:`.Screen` objects, with the
+                        response types as keys
+    `objective`         `tuple` `(rid, 'MIN' or 'MAX')` or `None`
+    ==================  ======================================================
+
+    All the `dict` attributes have the ids as keys and keep the insertion
+    order.
+
+    """
     def __init__(self):
-        self.optmodel = SOL200()
-        self.optsolver = 'SOL200'
+        self.variables = DesignVariables()
+        self.relations = PropertyRelations()
+        self.prop_equations = OrderedDict()
+        self.equations = OrderedDict()
+        self.tables = OrderedDict()
+        self.responses = OrderedDict()
+        self.constraints = OrderedDict()
+        self.links = OrderedDict()
+        self.screens = OrderedDict()
+        self.objective = None
+
+
+    @classmethod
+    def from_sol200(cls, optmodel):
+        """Create the model from the cards of a :class:`.SOL200` model
+
+        Parameters
+        ----------
+        optmodel : :class:`.SOL200`
+            The SOL200 model.
+
+        Returns
+        -------
+        model : :class:`.OptimizationModel`
+            The new model.
+
+        """
+        from .optimization.sol200.cards_opt import (DRESP1, DRESP2, DRESP3,
+                                                    DVPREL1, DVPREL2)
+
+        model = cls()
+        dvars = list(optmodel.dvars.values())
+        if dvars:
+            model.variables.add([d.id for d in dvars],
+                                [d.label for d in dvars],
+                                [d.xinit for d in dvars],
+                                [d.xlb for d in dvars],
+                                [d.xub for d in dvars])
+        for arr in optmodel.dvar_arrays:
+            model.variables.add(arr.ids, arr.labels, arr.xinit, arr.xlb,
+                                arr.xub)
+            model.relations.add(arr.dvprel_ids, arr.ptypes, arr.pids,
+                                arr.pnames, arr.ids, arr.coeffs, arr.c0s)
+        model.tables.update((k, float(v)) for k, v in
+                            sorted(optmodel.dtables.items()))
+
+        for dvprel in optmodel.dvprels.values():
+            if isinstance(dvprel, DVPREL1):
+                model.relations.add([dvprel.id]*len(dvprel.dvids),
+                                    dvprel.type, dvprel.pid, dvprel.pname,
+                                    dvprel.dvids, dvprel.coeffs, dvprel.c0)
+            elif isinstance(dvprel, DVPREL2):
+                model.prop_equations[dvprel.id] = PropertyEquation(
+                    dvprel.id, dvprel.type, dvprel.pid, dvprel.pname,
+                    dvprel.eqid, dvprel.dvars, dvprel.dtable)
+        for deqatn in optmodel.deqatns.values():
+            model.equations[deqatn.id] = deqatn.eq.strip()
+
+        for dresp in optmodel.dresps.values():
+            region = _blank(dresp.region)
+            if isinstance(dresp, DRESP1):
+                resp = Response(dresp.id, dresp.label, dresp.rtype,
+                                _blank(dresp.ptype), region,
+                                _blank(dresp.atta), _blank(dresp.attb),
+                                _blank(dresp.atti))
+            elif isinstance(dresp, DRESP3):
+                resp = ExternalResponse(dresp.id, dresp.label, dresp.group,
+                                        dresp.type, dresp.dvars,
+                                        dresp.dtable, dresp.dresp1,
+                                        dresp.dresp2, region)
+            elif isinstance(dresp, DRESP2):
+                resp = EquationResponse(dresp.id, dresp.label, dresp.eqid,
+                                        dresp.dvars, dresp.dtable,
+                                        dresp.dresp1, dresp.dresp2, region)
+            else:
+                raise NotImplementedError('%s not supported!' %
+                                          type(dresp).__name__)
+            model.responses[resp.id] = resp
+
+        for dconstr in optmodel.dconstrs.values():
+            model.constraints[dconstr.id] = Constraint(
+                dconstr.id, dconstr.dcid, dconstr.rid,
+                _bound(dconstr.lallow, dconstr),
+                _bound(dconstr.uallow, dconstr))
+        for dlink in optmodel.dlinks.values():
+            model.links[dlink.id] = Link(dlink.id, dlink.ddvid, dlink.idvs,
+                                         dlink.cs, dlink.c0, dlink.cmult)
+        for dscreen in optmodel.dscreens.values():
+            model.screens[dscreen.rtype] = Screen(dscreen.rtype,
+                                                  dscreen.trs, dscreen.nstr)
+        dobj = getattr(optmodel, 'dobj', None)
+        if dobj is not None:
+            model.objective = (dobj.rid, getattr(dobj, 'minmax', 'MIN'))
+        return model
+
+
+    def write(self, path, solver='SOL200', **options):
+        """Write the input deck of one solver
+
+        Parameters
+        ----------
+        path : str
+            The output file.
+        solver : str, optional
+            The writer name, see :data:`.optwriters.WRITERS`.
+        options : optional
+            Passed to the writer.
+
+        """
+        from .optwriters import get_writer
+
+        writer = get_writer(solver, **options)
+        with open(path, 'w') as f:
+            writer.write(self, f)
+
+
+    def write_decks(self, targets, processes=None):
+        """Write the input decks of many solvers
+
+        Parameters
+        ----------
+        targets : dict
+            The output files as keys and the solver names or tuples `(solver,
+            options)` as values, see :meth:`.write`.
+        processes : int or None, optional
+            The number of worker processes, by default one per deck up to
+            the number of CPUs. With `1` the decks are written in this
+            process.
+
+        Returns
+        -------
+        paths : list
+            The written files.
+
+        """
+        jobs = []
+        for path, solver in targets.items():
+            options = {}
+            if isinstance(solver, tuple):
+                solver, options = solver
+            jobs.append((self, path, solver, options))
+        if processes is None:
+            processes = min(len(jobs), multiprocessing.cpu_count())
+        if processes <= 1 or len(jobs) <= 1:
+            return [_write_deck(job) for job in jobs]
+        pool = multiprocessing.Pool(processes)
+        try:
+            return pool.map(_write_deck, jobs)
+        finally:
+            pool.close()
+            pool.join()
@@ -0,0 +1,573 @@
+"""
+Optimization deck writers (:mod:`structmanager.optwriters`)
+===========================================================
+
+.. currentmodule:: structmanager.optwriters
+
+Writers of the bulk data of an :class:`.OptimizationModel` for each solver:
+
+==================  ==========================================================
+Solver              Writer
+==================  ==========================================================
+`'SOL200'`          :class:`.SOL200Writer`, NASTRAN small field cards
+`'OPTISTRUCT'`      :class:`.OptiStructWriter`, as SOL200 with the external
+                    responses in `LIBRARY` routines
+`'GENESIS'`         :class:`.GenesisWriter`, GENESIS free field cards
+==================  ==========================================================
+
+Other writers can be added with :func:`.register_writer`. The case control
+entries, such as the design objective of NASTRAN and OptiStruct, are not
+written.
+
+"""
+from __future__ import division
+
+from collections import OrderedDict
+
+import numpy as np
+
+from .optimization.sol200.utils import format_float as ff
+from .optimization.sol200.utils import format_float_array
+from .optmodel import ExternalResponse, EquationResponse
+
+
+# GENESIS equations replacing the NASTRAN built-in functions
+BUILTINS = {
+    'SUM': lambda x: '+'.join(x),
+    'AVG': lambda x: '(%s)/%d.' % ('+'.join(x), len(x)),
+    'SSQ': lambda x: '+'.join('%s**2' % xi for xi in x),
+    'RSS': lambda x: 'SQRT(%s)' % '+'.join('%s**2' % xi for xi in x),
+    'MAX': lambda x: 'MAX(%s)' % ','.join(x),
+    'MIN': lambda x: 'MIN(%s)' % ','.join(x),
+    }
+
+# NASTRAN element types of the designed property types, used to translate
+# the output codes of the responses to GENESIS
+ELTYPES = {
+    'PBAR': 'CBAR',
+    'PBARL': 'CBAR',
+    'PSHELL': 'CQUAD4',
+    'PCOMP': 'CQUAD4',
+    'ELEM': 'CQUAD4',
+    }
+
+
+def _relation_groups(relations):
+    """Rows of each linear relation, in the order of first appearance
+
+    Returns the first row of the single term relations and a list with the
+    rows of each relation with many terms.
+
+    """
+    ids, first, counts = np.unique(relations.ids, return_index=True,
+                                   return_counts=True)
+    single = np.sort(first[counts == 1])
+    many = []
+    if (counts > 1).any():
+        order = np.argsort(relations.ids, kind='mergesort')
+        ends = np.cumsum(counts)
+        for i in np.flatnonzero(counts > 1):
+            many.append((first[i], order[ends[i] - counts[i]:ends[i]]))
+        many = [rows for _, rows in sorted(many, key=lambda x: x[0])]
+    return single, many
+
+
+def _nargs(resp):
+    return (len(resp.dvids) + len(resp.tables) + len(resp.responses) +
+            len(resp.eq_responses))
+
+
+def _text(value):
+    return '' if value is None else str(value)
+
+
+class SOL200Writer(object):
+    """NASTRAN SOL200 bulk data, as written by :meth:`.SOL200.print_model`
+    """
+    def __init__(self):
+        pass
+
+
+    def write(self, model, file):
+        """Write the model
+
+        Parameters
+        ----------
+        model : :class:`.OptimizationModel`
+            The model.
+        file : file
+            File object with a :meth:`write` method.
+
+        """
+        self.write_header(model, file)
+        if len(model.tables) > 0:
+            self.section('DESIGN TABLE CONSTANTS', file)
+            self.write_tables(model.tables, file)
+        if len(model.variables) > 0:
+            self.section('DESIGN VARIABLES', file)
+            self.write_variables(model.variables, file)
+        if len(model.links) > 0:
+            self.section('DESIGN LINKS', file)
+            for link in model.links.values():
+                self.write_link(link, file)
+        if len(model.relations) > 0 or len(model.prop_equations) > 0:
+            self.section('DESIGN VARIABLE-TO-PROPERTY RELATIONS', file)
+            self.write_relations(model.relations, file)
+            for prop in model.prop_equations.values():
+                self.write_prop_equation(prop, file)
+        if len(model.responses) > 0:
+            self.section('DESIGN RESPONSES', file)
+            for resp in model.responses.values():
+                if isinstance(resp, ExternalResponse):
+                    self.write_external_response(resp, file)
+                elif isinstance(resp, EquationResponse):
+                    self.write_equation_response(resp, file)
+                else:
+                    self.write_response(resp, file)
+        if len(model.equations) > 0:
+            self.section('DESIGN EQUATIONS', file)
+            for eqid, eq in model.equations.items():
+                self.write_equation(eqid, eq, file)
+        if len(model.constraints) > 0:
+            self.section('DESIGN CONSTRAINTS', file)
+            for cons in model.constraints.values():
+                self.write_constraint(cons, file)
+        if len(model.screens) > 0:
+            self.section('CONSTRAINT SCREENING', file)
+            for screen in model.screens.values():
+                self.write_screen(screen, file)
+
+
+    def write_header(self, model, file):
+        pass
+
+
+    def section(self, text, file):
+        file.write('$ %s\n' % ('_'*72))
+        file.write('$ %s\n' % (' '*72))
+        file.write('$ %s\n' % text)
+        file.write('$\n')
+
+
+    def aux(self, label, values, file):
+        auxstr = '+'.ljust(8) + label.ljust(8)
+        count = 2
+        for value in values:
+            count += 1
+            if count == 10:
+                file.write(auxstr + '\n')
+                count = 3
+                auxstr = '+'.ljust(16)
+            auxstr += str(value).rjust(8)
+        file.write(auxstr + '\n')
+
+
+    def write_tables(self, tables, file):
+        dtable_str = 'DTABLE'.ljust(8)
+        count = 0
+        for k in sorted(tables.keys()):
+            count += 2
+            if count == 10:
+                file.write(dtable_str + '\n')
+                dtable_str = '+'.ljust(8)
+                count = 2
+            dtable_str += '% 8s%s' % (str(k), ff(tables[k]))
+        file.write(dtable_str + '\n')
+
+
+    def write_variables(self, variables, file):
+        lines = np.char.add('DESVAR'.ljust(8),
+                            np.char.rjust(variables.ids.astype('U16'), 8))
+        lines = np.char.add(lines, np.char.rjust(variables.labels, 8))
+        lines = np.char.add(lines, format_float_array(variables.init))
+        lines = np.char.add(lines, format_float_array(variables.lb))
+        lines = np.char.add(lines, format_float_array(variables.ub))
+        lines = np.char.add(lines, ' '*16)
+        file.write('\n'.join(lines.tolist()) + '\n')
+
+
+    def write_relations(self, relations, file):
+        if len(relations) == 0:
+            return
+        single, many = _relation_groups(relations)
+        if single.shape[0] > 0:
+            r = relations
+            lines = np.char.add('DVPREL1'.ljust(8),
+                                np.char.rjust(r.ids[single].astype('U16'), 8))
+            lines = np.char.add(lines, np.char.rjust(r.ptypes[single], 8))
+            lines = np.char.add(lines, np.char.rjust(
+                r.pids[single].astype('U16'), 8))
+            lines = np.char.add(lines, np.char.rjust(r.pnames[single], 8))
+            lines = np.char.add(lines, ' '*16)
+            lines = np.char.add(lines, format_float_array(r.c0s[single]))
+            conts = np.char.add('+'.ljust(8), np.char.rjust(
+                r.dvids[single].astype('U16'), 8))
+            conts = np.char.add(conts, format_float_array(r.coeffs[single]))
+            cards = np.char.add(np.char.add(lines, '\n'), conts)
+            file.write('\n'.join(cards.tolist()) + '\n')
+        for rows in many:
+            self.write_relation(relations, rows, file)
+
+
+    def write_relation(self, relations, rows, file):
+        r = relations
+        i = rows[0]
+        file.write('%s% 8d% 8s% 8d% 8s% 8s% 8s%s\n' %
+                   ('DVPREL1'.ljust(8), r.ids[i], r.ptypes[i], r.pids[i],
+                    r.pnames[i], '', '', ff(r.c0s[i])))
+        fieldnum = 0
+        dvprel1str = '+'.ljust(8)
+        for j in rows:
+            fieldnum += 2
+            if fieldnum == 10:
+                file.write(dvprel1str + '\n')
+                dvprel1str = '+'.ljust(8)
+                fieldnum = 2
+            dvprel1str += ('% 8d%s' % (r.dvids[j], ff(r.coeffs[j])))
+        file.write(dvprel1str + '\n')
+
+
+    def write_prop_equation(self, prop, file):
+        file.write('%s% 8d% 8s% 8d% 8s% 8s% 8s% 8s\n' %
+                   ('DVPREL2'.ljust(8), prop.id, prop.ptype, prop.pid,
+                    prop.pname, '', '', str(prop.eqid)))
+        if prop.dvids:
+            self.aux('DESVAR', prop.dvids, file)
+        if prop.tables:
+            self.aux('DTABLE', prop.tables, file)
+
+
+    def write_response(self, resp, file):
+        dresp1str = ('%s% 8d% 8s% 8s% 8s% 8s% 8s% 8s' %
+                     ('DRESP1'.ljust(8), resp.id, resp.label, resp.rtype,
+                      _text(resp.ptype), _text(resp.region),
+                      _text(resp.atta), _text(resp.attb)))
+        atti = resp.atti
+        if isinstance(atti, list):
+            atticount = 8
+            for value in atti:
+                atticount += 1
+                if atticount == 10:
+                    file.write(dresp1str + '\n')
+                    dresp1str = '+'.ljust(8)
+                    atticount = 2
+                dresp1str += str(value).rjust(8)
+        elif atti is not None:
+            dresp1str += str(atti).rjust(8)
+        file.write(dresp1str + '\n')
+
+
+    def write_arguments(self, resp, file):
+        if resp.dvids:
+            self.aux('DESVAR', resp.dvids, file)
+        if resp.tables:
+            self.aux('DTABLE', resp.tables, file)
+        if resp.responses:
+            self.aux('DRESP1', resp.responses, file)
+        if resp.eq_responses:
+            self.aux('DRESP2', resp.eq_responses, file)
+
+
+    def write_equation_response(self, resp, file):
+        file.write('%s% 8d% 8s% 8s% 8s\n' % ('DRESP2'.ljust(8), resp.id,
+                   resp.label, str(resp.eqid), _text(resp.region)))
+        self.write_arguments(resp, file)
+
+
+    def write_external_response(self, resp, file):
+        file.write('%s% 8d% 8s% 8s% 8s% 8s\n' % ('DRESP3'.ljust(8), resp.id,
+                   resp.label, resp.group, resp.type, _text(resp.region)))
+        self.write_arguments(resp, file)
+
+
+    def write_equation(self, eqid, eq, file):
+        eq = '  ' + eq
+        deqatn_str = '%s% 8d' % ('DEQATN'.ljust(8), eqid)
+        check = eq[:56].find(';')
+        if check == -1:
+            check = 55
+        file.write(deqatn_str + eq[:check+1] + '\n')
+        eq = eq[check+1:]
+        while len(eq) > 0:
+            check = eq[:64].find(';')
+            if check == -1:
+                check = 63
+            file.write('+       ' + eq[:check+1].ljust(64) + '\n')
+            eq = eq[check+1:]
+
+
+    def write_constraint(self, cons, file):
+        file.write('%s% 8d% 8d% 8s% 8s\n' % ('DCONSTR'.ljust(8), cons.dcid,
+                   cons.rid, _text(cons.lb), _text(cons.ub)))
+
+
+    def write_screen(self, screen, file):
+        file.write('%s% 8s%s% 8d\n' % ('DSCREEN'.ljust(8), screen.rtype,
+                   ff(screen.trs), screen.nstr))
+
+
+    def write_link(self, link, file):
+        dlinkstr = ('%s% 8d% 8d%s%s' % ('DLINK'.ljust(8), link.id,
+                    link.ddvid, ff(link.c0), ff(link.cmult)))
+        count = 4
+        for idv, c in zip(link.idvs, link.cs):
+            count += 2
+            if count == 10:
+                file.write(dlinkstr + '\n')
+                dlinkstr = '+'.ljust(8)
+                count = 2
+            dlinkstr += ('% 8d%s' % (idv, ff(c)))
+        file.write(dlinkstr + '\n')
+
+
+class OptiStructWriter(SOL200Writer):
+    """OptiStruct bulk data
+
+    The cards are those of NASTRAN except for the external responses, whose
+    groups are given as `LIBRARY` entries and types as function names.
+
+    Parameters
+    ----------
+    libraries : dict or None, optional
+        The path of the shared library of each group, by default the group
+        name.
+
+    """
+    def __init__(self, libraries=None):
+        super(OptiStructWriter, self).__init__()
+        self.libraries = libraries or {}
+        self.libids = {}
+
+
+    def write_header(self, model, file):
+        groups = []
+        for resp in model.responses.values():
+            if (isinstance(resp, ExternalResponse) and
+                    resp.group not in groups):
+                groups.append(resp.group)
+        self.libids = dict((group, i + 1) for i, group in enumerate(groups))
+        if groups:
+            self.section('EXTERNAL LIBRARIES', file)
+        for group in groups:
+            file.write('LIBRARY,%d,%s,%s\n' % (self.libids[group], group,
+                       self.libraries.get(group, group)))
+
+
+    def write_external_response(self, resp, file):
+        file.write('%s% 8d% 8s% 8d% 8s% 8s\n' % ('DRESP3'.ljust(8), resp.id,
+                   resp.label, self.libids[resp.group], resp.type,
+                   _text(resp.region)))
+        self.write_arguments(resp, file)
+
+
+class GenesisWriter(object):
+    """GENESIS bulk data, in free field format
+
+    The constraint set ids are not used, each constraint is a `DCONS` of
+    its response for all load cases. The `'attb'` attribute of the
+    responses and the screening parameters have no GENESIS counterpart and
+    are ignored. The NASTRAN built-in functions of the equation responses
+    are replaced by equations, see :data:`.BUILTINS`. The output codes
+    `'atta'` of the displacement, stress and force responses are translated
+    to GENESIS, see :func:`.from_nastran`, raising a `ValueError` for the
+    outputs GENESIS does not support.
+
+    Parameters
+    ----------
+    libraries : dict or None, optional
+        The library id of each external response, with the tuples `(group,
+        type)` as keys, by default numbered from `1`.
+    eltypes : dict or None, optional
+        The NASTRAN element type of the responses, with the response ids as
+        keys, such as `'CBAR'` for the `'ELEM'` responses of bars. By
+        default taken from the property type, see :data:`.ELTYPES`.
+
+    """
+    def __init__(self, libraries=None, eltypes=None):
+        self.libraries = dict(libraries or {})
+        self.eltypes = dict(eltypes or {})
+
+
+    def write(self, model, file):
+        """Write the model
+
+        Parameters
+        ----------
+        model : :class:`.OptimizationModel`
+            The model.
+        file : file
+            File object with a :meth:`write` method.
+
+        """
+        equations = OrderedDict(model.equations)
+        builtins = {}
+        next_eqid = max(list(equations.keys()) + [0]) + 1
+        for resp in model.responses.values():
+            if isinstance(resp, ExternalResponse):
+                key = (resp.group, resp.type)
+                if key not in self.libraries:
+                    self.libraries[key] = len(self.libraries) + 1
+            elif isinstance(resp, EquationResponse):
+                if isinstance(resp.eqid, str):
+                    key = (resp.eqid.upper(), _nargs(resp))
+                    if key not in builtins:
+                        args = ['x%d' % (i + 1) for i in range(key[1])]
+                        equations[next_eqid] = 'F(%s)=%s' % (
+                            ','.join(args), BUILTINS[key[0]](args))
+                        builtins[key] = next_eqid
+                        next_eqid += 1
+
+        if len(model.tables) > 0:
+            self.write_tables(model.tables, file)
+        if len(model.variables) > 0:
+            v = model.variables
+            for i in range(len(v)):
+                file.write('DVAR,%d,%s,%r,%r,%r\n' % (v.ids[i], v.labels[i],
+                           float(v.init[i]), float(v.lb[i]),
+                           float(v.ub[i])))
+        for link in model.links.values():
+            self.write_link(link, file)
+        if len(model.relations) > 0:
+            single, many = _relation_groups(model.relations)
+            for rows in sorted([[i] for i in single] + many,
+                               key=lambda rows: rows[0]):
+                self.write_relation(model.relations, rows, file)
+        for prop in model.prop_equations.values():
+            file.write('DVPROP2,%d,%s,%d,%s,,,%d\n' % (prop.id, prop.ptype,
+                       prop.pid, prop.pname, prop.eqid))
+            if prop.dvids:
+                self.aux('DVAR', prop.dvids, file)
+            if prop.tables:
+                self.aux('DTABLE', prop.tables, file)
+        for resp in model.responses.values():
+            if isinstance(resp, ExternalResponse):
+                file.write('DRESP3,%d,%s,%d,%s\n' % (resp.id, resp.label,
+                           self.libraries[(resp.group, resp.type)],
+                           _text(resp.region)))
+                self.write_arguments(resp, file)
+            elif isinstance(resp, EquationResponse):
+                eqid = resp.eqid
+                if isinstance(eqid, str):
+                    eqid = builtins[(eqid.upper(), _nargs(resp))]
+                file.write('DRESP2,%d,%s,%d,%s\n' % (resp.id, resp.label,
+                           eqid, _text(resp.region)))
+                self.write_arguments(resp, file)
+            else:
+                self.write_response(resp, file)
+        for eqid, eq in equations.items():
+            self.write_equation(eqid, eq, file)
+        for cons in model.constraints.values():
+            file.write('DCONS,%d,ALL,%s,%s\n' % (cons.rid, _text(cons.lb),
+                       _text(cons.ub)))
+        if model.objective is not None:
+            rid, minmax = model.objective
+            file.write('DOBJ,%d,%s,,%s\n' % (rid,
+                       model.responses[rid].label, minmax))
+
+
+    def aux(self, label, values, file):
+        values = [str(v) for v in values]
+        for i in range(0, len(values), 8):
+            file.write('+,%s,%s\n' % (label if i == 0 else '',
+                                      ','.join(values[i:i+8])))
+
+
+    def write_tables(self, tables, file):
+        items = ['%s,%r' % (k, float(tables[k])) for k in sorted(tables)]
+        for i in range(0, len(items), 4):
+            file.write('%s,%s\n' % ('DTABLE' if i == 0 else '+',
+                                    ','.join(items[i:i+4])))
+
+
+    def write_relation(self, relations, rows, file):
+        r = relations
+        i = rows[0]
+        file.write('DVPROP1,%d,%s,%d,%s,,,%r\n' % (r.ids[i], r.ptypes[i],
+                   r.pids[i], r.pnames[i], float(r.c0s[i])))
+        terms = ['%d,%r' % (r.dvids[j], float(r.coeffs[j])) for j in rows]
+        for k in range(0, len(terms), 4):
+            file.write('+,%s\n' % ','.join(terms[k:k+4]))
+
+
+    def write_response(self, resp, file):
+        atti = resp.atti
+        if not isinstance(atti, list):
+            atti = [] if atti is None else [atti]
+        atta = resp.atta
+        if atta is not None and resp.rtype in ('DISP', 'STRESS', 'FORCE'):
+            from .optimization.genesis.output_codes import from_nastran
+            eltype = self.eltypes.get(resp.id,
+                                      ELTYPES.get(str(resp.ptype).upper()))
+            if resp.rtype != 'DISP' and eltype is None:
+                raise ValueError('Element type of %s response %d with '
+                                 'property type %s not known' %
+                                 (resp.rtype, resp.id, resp.ptype))
+            atta = from_nastran(resp.rtype, eltype, atta)
+        fields = ['DRESP1', str(resp.id), resp.label, resp.rtype,
+                  _text(resp.ptype), _text(resp.region), _text(atta)]
+        fields += [str(a) for a in atti[:2]]
+        file.write(','.join(fields) + '\n')
+        for k in range(2, len(atti), 8):
+            file.write('+,%s\n' % ','.join(str(a) for a in atti[k:k+8]))
+
+
+    def write_arguments(self, resp, file):
+        if resp.dvids:
+            self.aux('DVAR', resp.dvids, file)
+        if resp.tables:
+            self.aux('DTABLE', resp.tables, file)
+        if resp.responses:
+            self.aux('DRESP1', resp.responses, file)
+        if resp.eq_responses:
+            self.aux('DRESP2', resp.eq_responses, file)
+
+
+    def write_equation(self, eqid, eq, file):
+        head = 'DEQATN,%d,' % eqid
+        while len(eq) > 0:
+            width = 72 - len(head)
+            check = eq[:width].find(';')
+            if check == -1:
+                check = width - 1
+            file.write(head + eq[:check+1] + '\n')
+            eq = eq[check+1:]
+            head = '+,'
+
+
+    def write_link(self, link, file):
+        file.write('DLINK,%d,%r,%r\n' % (link.ddvid, float(link.c0),
+                                         float(link.cmult)))
+        terms = ['%d,%r' % (idv, float(c)) for idv, c in zip(link.idvs,
+                                                             link.cs)]
+        for k in range(0, len(terms), 4):
+            file.write('+,%s\n' % ','.join(terms[k:k+4]))
+
+
+WRITERS = {
+    'SOL200': SOL200Writer,
+    'OPTISTRUCT': OptiStructWriter,
+    'GENESIS': GenesisWriter,
+    }
+
+
+def register_writer(name, cls):
+    """Register the writer of a solver
+
+    Parameters
+    ----------
+    name : str
+        The solver name.
+    cls : type
+        The writer class, instantiated with the writer options and providing
+        a `write(model, file)` method.
+
+    """
+    WRITERS[str(name).upper()] = cls
+
+
+def get_writer(name, **options):
+    """Return a new writer of a solver, see :data:`.WRITERS`"""
+    cls = WRITERS.get(str(name).upper())
+    if cls is None:
+        raise ValueError('Invalid solver: %s' % name)
+    return cls(**options)
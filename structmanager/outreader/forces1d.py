@@ -6,9 +6,14 @@ class Forces1D(object):
 
     TODO add explanations about each force vector
 
+    The `forces` array has the shape `(8, nelem, nsubcases)`, with the
+    elements in the order of `se.eids` and the subcases in the order of
+    `subcases`.
+
     """
-    def __init__(self, forces):
+    def __init__(self, forces, subcases=None):
         self.forces = forces
+        self.subcases = subcases
         self.bending_moment_a1 = forces[0]
         self.bending_moment_a2 = forces[1]
         self.bending_moment_b1 = forces[2]
@@ -35,8 +40,8 @@ def read_forces_1d(op2, se):
     # CBAR
     subcases = op2.subcases
     num_subcases = len(subcases)
-    forces = op2.cbar_force
-    force1 = forces[subcases[0]]
+    op2_forces = op2.cbar_force
+    force1 = op2_forces[subcases[0]]
     num_vectors = force1.data.shape[2]
 
     forces = np.zeros((num_vectors, len(se.eids), num_subcases))
@@ -45,7 +50,7 @@ def read_forces_1d(op2, se):
     i_panel = np.in1d(se.eids, force1.element)
 
     for i, subcase in enumerate(subcases):
-        data = forces[subcase].data
+        data = op2_forces[subcase].data
         forces[:, i_panel, i] = data[-1, i_op2, :].swapaxes(-1, -2)
 
-    return Forces1D(forces)
+    return Forces1D(forces, subcases)
@@ -9,9 +9,14 @@ class Forces2D(object):
 
     TODO add explanations about each force vector
 
+    The arrays in `forces` have the shape `(ntimes, nelem, 8)`, with the
+    elements in the order given in `eids`, both dictionaries having the
+    subcases as keys.
+
     """
-    def __init__(self, forces):
+    def __init__(self, forces, eids=None):
         self.forces = forces
+        self.eids = eids
         self.mx = dict((sub, force[..., 0]) for sub, force in forces.items())
         self.my = dict((sub, force[..., 1]) for sub, force in forces.items())
         self.mxy = dict((sub, force[..., 2]) for sub, force in forces.items())
@@ -35,15 +40,25 @@ def read_forces_2d(op2, se):
 
     """
     se_forces = {}
+    se_eids = {}
 
+    # CQUAD4 and CTRIA3 forces are appended for each subcase
     for vecname in ['cquad4_force', 'ctria3_force']:
         vectors = getattr(op2, vecname)
         for subcase, vector in vectors.items():
             eids = get_eids_from_op2_vector(vector)
             check = np.in1d(eids, se.eids)
-            se_forces[subcase] = vector.data[:, check]
-
-    return Forces2D(se_forces)
+            if subcase in se_forces:
+                se_forces[subcase] = np.concatenate((se_forces[subcase],
+                                                     vector.data[:, check]),
+                                                    axis=1)
+                se_eids[subcase] = np.concatenate((se_eids[subcase],
+                                                   eids[check]))
+            else:
+                se_forces[subcase] = vector.data[:, check]
+                se_eids[subcase] = eids[check]
+
+    return Forces2D(se_forces, se_eids)
 
 
 def read_forces_2d_hdf5():
@@ -4,12 +4,24 @@ Structural Assemblies - SAs (:mod:`structmanager.sas`)
 
 .. currentmodule:: structmanager.sas
 
+
+The margins of safety computed by :func:`.analyze_assemblies` are stored in
+the `margins` attribute of each assembly.
+
 """
+import warnings
+
+import numpy as np
+
+from .structelem.base import SE1D, SE2D
+
+
 class FrameAssembly(object):
     """Frame Assembly"""
     def __init__(self, name, args):
-        args = outerflange, web, innerflange
+        outerflange, web, innerflange = args
         self.name = name
+        self.margins = {}
         self.outerflange = outerflange
         self.web = web
         self.innerflange = innerflange
@@ -30,6 +42,7 @@ class FrameShearClipAssembly(object):
     def __init__(self, name, args):
         shearclipskin, shearclipframe, outerflange, web, innerflange = args
         self.name = name
+        self.margins = {}
         self.shearclipskin = shearclipskin
         self.shearclipframe = shearclipframe
         self.outerflange = outerflange
@@ -54,6 +67,7 @@ class StiffenedPanelAssembly(object):
     def __init__(self, name, args):
         panel, fr1, fr2, str1, str2 = args
         self.name = name
+        self.margins = {}
         self.panel = panel
         self.fr1 = fr1
         self.fr2 = fr2
@@ -71,11 +85,48 @@ class StiffenedPanelAssembly(object):
     def __repr__(self):
         return str(self)
 
+class ThreePocketAssembly(object):
+    """Three-Pocket Assembly
+
+    Three adjacent skin panels (pockets) between the frames `fr1` and
+    `fr2`, separated by the stringers `str1`, between `panel1` and
+    `panel2`, and `str2`, between `panel2` and `panel3`. Used to load the
+    stringers of the central pocket with the diagonal tension of the skin
+    on both sides, see :func:`.three_pocket_diagonal_tension`.
+
+    """
+    def __init__(self, name, args):
+        panel1, panel2, panel3, str1, str2, fr1, fr2 = args
+        self.name = name
+        self.margins = {}
+        self.panel1 = panel1
+        self.panel2 = panel2
+        self.panel3 = panel3
+        self.str1 = str1
+        self.str2 = str2
+        self.fr1 = fr1
+        self.fr2 = fr2
+
+    def __str__(self):
+        return ('Three-Pocket Assembly: ' + self.name +
+                '\n-' + str(self.panel1) +
+                '\n-' + str(self.panel2) +
+                '\n-' + str(self.panel3) +
+                '\n-' + str(self.str1) +
+                '\n-' + str(self.str2) +
+                '\n-' + str(self.fr1) +
+                '\n-' + str(self.fr2))
+
+    def __repr__(self):
+        return str(self)
+
+
 class StiffenedPanelCutout(object):
     """Stiffened Panel Cutout"""
     def __init__(self, name, args):
         panelcutout, str1, str2 = args
         self.name = name
+        self.margins = {}
         self.panelcutout = panelcutout
         self.str1 = str1
         self.str2 = str2
@@ -89,10 +140,176 @@ class StiffenedPanelCutout(object):
     def __repr__(self):
         return str(self)
 
+
+class SuperStringer(object):
+    """Super Stringer
+
+    A stringer with its two adjacent skin panels, used to redistribute the
+    load of buckled skins onto the stringer, see
+    :func:`.super_stringer_column_buckling`.
+
+    """
+    def __init__(self, name, args):
+        stringer, panel1, panel2 = args
+        self.name = name
+        self.margins = {}
+        self.stringer = stringer
+        self.panel1 = panel1
+        self.panel2 = panel2
+
+    def constrain_buckling(self, method=1, ms=0.1, load_factor=None):
+        """Stringer buckling constraint with the redistributed load
+
+        The force read by the constraint of the stringer is scaled by
+        `load_factor`, by default computed from the forces already read
+        with :func:`.super_stringer_load_factors`. See
+        :func:`.stringer.constraints.constrain_buckling` for the other
+        parameters.
+
+        """
+        from .analysis.assemblies import super_stringer_load_factors
+        from .optimization.sol200.elements1d.stringer.constraints import (
+            constrain_buckling)
+        if load_factor is None:
+            load_factor = super_stringer_load_factors([self])[0]
+        return constrain_buckling(self.stringer, method, ms, load_factor)
+
+    def __str__(self):
+        return ('Super Stringer: ' + self.name +
+                '\n-' + str(self.stringer) +
+                '\n-' + str(self.panel1) +
+                '\n-' + str(self.panel2))
+
+    def __repr__(self):
+        return str(self)
+
+
+class WingBay(object):
+    """Wing Bay
+
+    The skin panels and stringers between two ribs, given in any order. The
+    bay length `a` is measured along the stringers and the width `b`
+    across them, on the best-fit plane of the panels.
+
+    Attributes
+    ----------
+
+    ==================  ======================================================
+    Attribute           Description
+    ==================  ======================================================
+    `panels`            `list` of 2D SEs
+    `stringers`         `list` of 1D SEs
+    `a`                 `float`, bay length, `None` without FE model
+    `b`                 `float`, bay width, `None` without FE model
+    `constraints`       `dict` with the constraint ids, see
+                        :meth:`.constrain_global_buckling`
+    ==================  ======================================================
+
+    """
+    def __init__(self, name, args):
+        self.name = name
+        self.margins = {}
+        self.panels = [se for se in args if isinstance(se, SE2D)]
+        self.stringers = [se for se in args if isinstance(se, SE1D)]
+        self.a = None
+        self.b = None
+        self.constraints = {'global_buckling': 1}
+        self.calc_dimensions()
+
+
+    def calc_dimensions(self):
+        """Compute `a` and `b` from the node positions"""
+        x = [e.get_node_positions() for se in self.panels if se.elements
+             for e in se.elements]
+        if not x:
+            return
+        x = np.concatenate(x)
+        x = x - x.mean(axis=0)
+        # best-fit plane of the skin
+        axes = np.linalg.svd(x, full_matrices=False)[2]
+        normal = axes[-1]
+        u = np.zeros(3)
+        for se in self.stringers:
+            for e in (se.elements or []):
+                pos = e.get_node_positions()
+                vec = pos[-1] - pos[0]
+                u += vec if vec.dot(u) >= 0 else -vec
+        u -= u.dot(normal)*normal
+        if np.linalg.norm(u) == 0:
+            u = axes[0]
+        u /= np.linalg.norm(u)
+        v = np.cross(normal, u)
+        self.a = float(np.ptp(x.dot(u)))
+        self.b = float(np.ptp(x.dot(v)))
+
+
+    def constrain_global_buckling(self, eig=1.0):
+        """See :func:`.constrain_global_buckling`"""
+        from .optimization.sol200.wingbay import constrain_global_buckling
+        return constrain_global_buckling(self, eig)
+
+
+    def __str__(self):
+        return ('Wing Bay: ' + self.name +
+                ''.join('\n-' + str(se) for se in self.panels +
+                        self.stringers))
+
+
+    def __repr__(self):
+        return str(self)
+
 sa_classes = [
         FrameAssembly,
         FrameShearClipAssembly,
         StiffenedPanelAssembly,
+        ThreePocketAssembly,
         StiffenedPanelCutout,
+        SuperStringer,
+        WingBay,
         ]
 
+
+def read_assemblies(path, ses, sas):
+    """Read the structural assemblies of a file
+
+    Each line gives the assembly class, the assembly name and the names of
+    its SEs, separated by `;`. Empty lines and lines starting with `#` are
+    skipped. A warning is issued for each SE not found, passed to the
+    assembly as ``None``.
+
+    Parameters
+    ----------
+    path : str
+        The path to the file.
+    ses : dict
+        The SEs of all types with their names as keys.
+    sas : dict
+        The `dict` receiving the assemblies of each class, with the class
+        names in lower case as keys, see :data:`.sa_classes`.
+
+    """
+    classes = dict((c.__name__.lower(), c) for c in sa_classes)
+    with open(path) as f:
+        lines = f.readlines()
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith('#'):
+            continue
+        fields = [field.strip() for field in line.split(';')]
+        saname, name = fields[:2]
+        saname = saname.lower()
+
+        saClass = classes.get(saname)
+        if saClass is None:
+            print('ERROR - Ivalid Structural Assembly: {0}'.format(saname))
+            continue
+
+        senames = fields[2:]
+        args = [ses.get(sename) for sename in senames]
+        for sename, se in zip(senames, args):
+            if se is None:
+                warnings.warn('SE {0} of SA {1} not found'.format(sename,
+                                                                  name))
+        sas.setdefault(saname, {})[name] = saClass(name, args)
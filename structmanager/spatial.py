@@ -0,0 +1,197 @@
+"""
+Spatial index of elements (:mod:`structmanager.spatial`)
+========================================================
+
+.. currentmodule:: structmanager.spatial
+
+The element centroids of the whole FE model are computed once and stored in
+one array, with a KD-tree built on demand for nearest-element and radius
+queries. The SEs use this index to find their central elements and their
+neighbors, see :meth:`.SE.get_central_element`.
+
+"""
+import numpy as np
+
+
+def element_centroids(bdf):
+    """Centroids of all the elements of a NASTRAN model
+
+    Parameters
+    ----------
+    bdf : PyNastran's BDF
+        The bulk data of the model.
+
+    Returns
+    -------
+    eids : np.ndarray
+        The sorted element ids.
+    centroids : np.ndarray
+        Array of shape `(len(eids), 3)` with the centroids in the basic
+        coordinate system, `NaN` for elements without grids.
+
+    """
+    nids = np.array(sorted(bdf.nodes.keys()), dtype=np.int64)
+    xyz = np.array([bdf.nodes[nid].get_position() for nid in nids.tolist()],
+                   dtype=np.float64).reshape(-1, 3)
+    eids = np.array(sorted(bdf.elements.keys()), dtype=np.int64)
+    counts = np.zeros(eids.shape[0], dtype=np.int64)
+    node_ids = []
+    for i, eid in enumerate(eids.tolist()):
+        ids = [nid for nid in bdf.elements[eid].node_ids if nid is not None]
+        counts[i] = len(ids)
+        node_ids.extend(ids)
+    node_ids = np.array(node_ids, dtype=np.int64)
+    elem = np.repeat(np.arange(eids.shape[0]), counts)
+    pos = np.clip(np.searchsorted(nids, node_ids), 0,
+                  max(nids.shape[0] - 1, 0))
+    found = nids[pos] == node_ids if nids.shape[0] > 0 else \
+        np.zeros(node_ids.shape[0], dtype=bool)
+    nfound = np.bincount(elem[found], minlength=eids.shape[0])
+    centroids = np.full((eids.shape[0], 3), np.nan)
+    check = nfound > 0
+    for dim in range(3):
+        sums = np.bincount(elem[found], weights=xyz[pos[found], dim],
+                           minlength=eids.shape[0])
+        centroids[check, dim] = sums[check]/nfound[check]
+    return eids, centroids
+
+
+class ElementIndex(object):
+    """Element centroids with a KD-tree
+
+    ==================  ======================================================
+    Attribute           Description
+    ==================  ======================================================
+    `eids`              `np.ndarray` with the sorted element ids
+    `centroids`         `np.ndarray` of shape `(len(eids), 3)` with the
+                        element centroids
+    `tree`              `scipy.spatial.cKDTree` of the centroids, built on the
+                        first query
+    ==================  ======================================================
+
+    Parameters
+    ----------
+    eids : array-like
+        The element ids.
+    centroids : array-like
+        The corresponding centroids, see :func:`.element_centroids`.
+
+    """
+    def __init__(self, eids, centroids):
+        eids = np.asarray(eids, dtype=np.int64)
+        centroids = np.asarray(centroids, dtype=np.float64).reshape(-1, 3)
+        order = np.argsort(eids, kind='mergesort')
+        self.eids = eids[order]
+        self.centroids = centroids[order]
+        self._tree = None
+        self._valid = None
+
+
+    @property
+    def tree(self):
+        if self._tree is None:
+            try:
+                from scipy.spatial import cKDTree
+            except ImportError:
+                raise ImportError('Python "scipy" module required')
+            self._valid = np.flatnonzero(~np.isnan(self.centroids).any(
+                axis=1))
+            self._tree = cKDTree(self.centroids[self._valid])
+        return self._tree
+
+
+    def find(self, eids):
+        """Positions of given elements in `eids`, `-1` when not found"""
+        eids = np.atleast_1d(np.asarray(eids, dtype=np.int64))
+        if self.eids.shape[0] == 0:
+            return np.full(eids.shape[0], -1, dtype=np.int64)
+        pos = np.clip(np.searchsorted(self.eids, eids), 0,
+                      self.eids.shape[0] - 1)
+        return np.where(self.eids[pos] == eids, pos, -1)
+
+
+    def get_centroids(self, eids):
+        """Centroids of given elements, `NaN` when not found"""
+        pos = self.find(eids)
+        centroids = self.centroids[pos]
+        centroids[pos < 0] = np.nan
+        return centroids
+
+
+    def central_element(self, eids):
+        """Element closest to the mean centroid of a group of elements
+
+        Parameters
+        ----------
+        eids : array-like
+            The element ids of the group.
+
+        Returns
+        -------
+        eid : int or None
+            The id of the central element, ``None`` if no element of the
+            group has a centroid.
+
+        """
+        eids = np.atleast_1d(np.asarray(eids, dtype=np.int64))
+        x = self.get_centroids(eids)
+        check = ~np.isnan(x).any(axis=1)
+        if not check.any():
+            return None
+        cg = x[check].mean(axis=0)
+        i = np.argmin(((x[check] - cg)**2).sum(axis=1))
+        return int(eids[check][i])
+
+
+    def nearest(self, x, k=1):
+        """Elements nearest to given points
+
+        Parameters
+        ----------
+        x : array-like
+            One point or an array of shape `(n, 3)` with many points.
+        k : int, optional
+            The number of elements found for each point.
+
+        Returns
+        -------
+        eids : np.ndarray
+            The element ids ordered by distance, of shape `(k,)` for one
+            point or `(n, k)` for many points.
+        dist : np.ndarray
+            The corresponding distances.
+
+        """
+        x = np.asarray(x, dtype=np.float64)
+        k = min(int(k), self.tree.n)
+        dist, pos = self.tree.query(np.atleast_2d(x), k=np.arange(1, k + 1))
+        eids = self.eids[self._valid[pos]]
+        if x.ndim == 1:
+            return eids[0], dist[0]
+        return eids, dist
+
+
+    def within(self, x, radius):
+        """Elements within a distance from given points
+
+        Parameters
+        ----------
+        x : array-like
+            One point or an array of shape `(n, 3)` with many points.
+        radius : float
+            The distance.
+
+        Returns
+        -------
+        eids : np.ndarray or list
+            The sorted element ids, a `list` with one array per point when
+            many points are given.
+
+        """
+        x = np.asarray(x, dtype=np.float64)
+        found = self.tree.query_ball_point(np.atleast_2d(x), radius)
+        eids = [np.sort(self.eids[self._valid[np.asarray(f, dtype=np.int64)]])
+                for f in found]
+        if x.ndim == 1:
+            return eids[0]
+        return eids
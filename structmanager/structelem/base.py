@@ -49,6 +49,7 @@ class SE(object):
         self.dvars_created = False
         self.dresps = []
         self.dvars = {}
+        self.dvar_ids = {}
         self.dvprels = []
         self.deqatns = []
         self.dtables = {}
@@ -56,6 +57,7 @@ class SE(object):
         self.dconstrs = []
         # outputs
         self.forces = None
+        self._central_element = None
 
         # information from FE model
         self.eids = eids
@@ -124,16 +126,145 @@ class SE(object):
         return str(self)
 
 
+    def _element_index(self):
+        if self.model is None:
+            return None
+        return getattr(self.model, 'element_index', None)
+
+
     def get_central_element(self):
         """Return the element closest to the SE center of gravity
 
+        The element centroids are taken from the model-wide
+        :class:`.ElementIndex`, when available. The result is cached for
+        the current `eids`, `elements` and element index, see
+        :meth:`.StructModel.reset_element_index` after moving grids.
+
         """
         if self.elements is None:
             return
-        x = np.array([e.get_node_positions().mean(axis=0) for e in
-            self.elements])
-        cg = x.mean(axis=0)
-        return self.elements[np.argmin(((x-cg)**2).sum(axis=1))]
+        index = self._element_index()
+        eids = tuple(self.eids)
+        if self._central_element is not None:
+            key, element = self._central_element
+            if (key[0] == eids and key[1] is self.elements and
+                    key[2] is index):
+                return element
+        eid = None
+        if index is not None:
+            eid = index.central_element(eids)
+        if eid is not None:
+            element = dict(zip(eids, self.elements))[eid]
+        else:
+            x = np.array([e.get_node_positions().mean(axis=0) for e in
+                self.elements])
+            cg = x.mean(axis=0)
+            element = self.elements[np.argmin(((x-cg)**2).sum(axis=1))]
+        self._central_element = ((eids, self.elements, index), element)
+        return element
+
+
+    def get_centroid(self):
+        """Return the SE center of gravity
+
+        The mean of the element centroids, `NaN` without FE model.
+
+        """
+        index = self._element_index()
+        if index is not None:
+            x = index.get_centroids(self.eids)
+            x = x[~np.isnan(x).any(axis=1)]
+            if x.shape[0] > 0:
+                return x.mean(axis=0)
+        if not self.elements:
+            return np.full(3, np.nan)
+        return np.array([e.get_node_positions().mean(axis=0) for e in
+            self.elements]).mean(axis=0)
+
+
+    def get_nearest_elements(self, k, x=None):
+        """Return the elements of the model nearest to the SE
+
+        Parameters
+        ----------
+        k : int
+            The number of elements.
+        x : array-like or None, optional
+            The reference point, by default the SE center of gravity.
+
+        Returns
+        -------
+        eids : np.ndarray
+            The element ids, ordered by distance.
+
+        """
+        index = self._element_index()
+        if index is None:
+            raise RuntimeError('The FE model is required')
+        if x is None:
+            x = self.get_centroid()
+        return index.nearest(x, k)[0]
+
+
+    def get_elements_within(self, radius, x=None):
+        """Return the elements of the model close to the SE
+
+        Parameters
+        ----------
+        radius : float
+            The maximum distance between the element centroids and `x`.
+        x : array-like or None, optional
+            The reference point, by default the SE center of gravity.
+
+        Returns
+        -------
+        eids : np.ndarray
+            The sorted element ids.
+
+        """
+        index = self._element_index()
+        if index is None:
+            raise RuntimeError('The FE model is required')
+        if x is None:
+            x = self.get_centroid()
+        return index.within(x, radius)
+
+
+    def add_dtable(self, key, value):
+        """See :func:`.edit_structural_element.add_dtable`"""
+        from ..optimization.sol200 import edit_structural_element
+        return edit_structural_element.add_dtable(self, key, value)
+
+
+    def add_dresp(self, dresp):
+        """See :func:`.edit_structural_element.add_dresp`"""
+        from ..optimization.sol200 import edit_structural_element
+        return edit_structural_element.add_dresp(self, dresp)
+
+
+    def add_deqatn(self, deqatn):
+        """See :func:`.edit_structural_element.add_deqatn`"""
+        from ..optimization.sol200 import edit_structural_element
+        return edit_structural_element.add_deqatn(self, deqatn)
+
+
+    def add_dvar(self, dvar):
+        """See :func:`.edit_structural_element.add_dvar`"""
+        from ..optimization.sol200 import edit_structural_element
+        return edit_structural_element.add_dvar(self, dvar)
+
+
+    def add_dvprel(self, dvprel):
+        """See :func:`.edit_structural_element.add_dvprel`"""
+        from ..optimization.sol200 import edit_structural_element
+        return edit_structural_element.add_dvprel(self, dvprel)
+
+
+    def add_constraint(self, dcid, dresp, lb, ub):
+        """See :func:`.edit_structural_element.add_constraint`"""
+        from ..optimization.sol200 import edit_structural_element
+        return edit_structural_element.add_constraint(self, dcid, dresp, lb,
+                                                      ub)
 
 
 class SE1D(SE):
@@ -144,6 +275,24 @@ class SE1D(SE):
         super(SE1D, self).__init__(name, eids, model)
 
 
+    def get_section_properties(self):
+        """Return the section properties from the `profile` dimensions
+
+        See :func:`.se_section_properties` to evaluate many SEs at once.
+
+        Returns
+        -------
+        properties : dict
+            The values of `A`, `I1`, `I2` and `J`, `NaN` without a known
+            `profile` or with missing dimensions.
+
+        """
+        from ..optimization.sol200.sections import se_section_properties
+
+        props = se_section_properties([self])
+        return dict((k, float(v[0])) for k, v in props.items())
+
+
 class SE2D(SE):
     """Base class for all 2D Structural Elements
 
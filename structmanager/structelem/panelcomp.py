@@ -8,6 +8,8 @@ Composite Panel (:mod:`structmanager.structelem.panelcomp`)
 import numpy as np
 
 from .base import SE2D
+from ..analysis.laminate import se_laminates
+from ..analysis.ply_failure import CRITERIA, se_failure_indices
 
 
 class PanelComp(SE2D):
@@ -20,6 +22,11 @@ class PanelComp(SE2D):
 
     Attributes
     ----------
+    abd : tuple or None
+        The `A`, `B` and `D` matrices of the laminate, see :meth:`.get_abd`.
+    failure_indices : dict or None
+        The critical ply failure index of each criterion and subcase, see
+        :meth:`.get_failure_indices`.
 
     """
     def __init__(self, name, eids, model=None):
@@ -37,6 +44,19 @@ class PanelComp(SE2D):
         self.p90 = 0.1
         # material properties
         # all material properties are got from FE model at ses.py
+        self.E1 = None
+        self.E2 = None
+        self.G12 = None
+        self.nu12 = None
+        self.nu21 = None
+        if self.material is not None and self.mtype == 'MAT8':
+            self.E1 = self.material.E1
+            self.E2 = self.material.E2
+            self.G12 = self.material.G12
+            self.nu12 = self.material.nu12
+            self.nu21 = self.nu12*self.E2/self.E1
+        self.abd = None
+        self.failure_indices = None
 
         self.is_isotropic = None #change to orthotropic?
         # optimization constraints
@@ -73,5 +93,45 @@ class PanelComp(SE2D):
             self.p45 = self.t45/self.t
 
 
+    def get_abd(self):
+        """Return the `A`, `B` and `D` matrices of the laminate
 
+        The matrices are shared by all SEs with the same ply stack, see
+        :func:`.se_laminates`. Use :meth:`.StructModel.compute_laminates` to
+        compute the matrices of many SEs at once.
 
+        Returns
+        -------
+        abd : tuple or None
+            The tuple `(A, B, D)`, ``None`` without a PCOMP property.
+
+        """
+        if self.abd is None:
+            self.abd = se_laminates([self]).get(0)
+        return self.abd
+
+
+    def get_failure_indices(self, criteria=CRITERIA):
+        """Return the critical ply failure indices for the current forces
+
+        The maximum among all plies and elements is taken, see
+        :func:`.se_failure_indices`. Use
+        :meth:`.StructModel.compute_failure_indices` to evaluate many SEs at
+        once.
+
+        Parameters
+        ----------
+        criteria : list, optional
+            The criteria, see :data:`.ply_failure.CRITERIA`.
+
+        Returns
+        -------
+        failure_indices : dict
+            For each criterion a `dict` with the subcases as keys.
+
+        """
+        subcases, indices = se_failure_indices([self], criteria)
+        self.failure_indices = dict(
+            (c, dict(zip(subcases.tolist(), index[0].tolist())))
+            for c, index in indices.items())
+        return self.failure_indices
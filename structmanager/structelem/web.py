@@ -8,6 +8,11 @@ Web (:mod:`structMan.structelem.web`)
 import numpy as np
 
 from .base import SE2D
+from ..optimization.sol200 import output_codes as output_codes_SOL200
+from ..optimization.sol200.aggregation import aggregate_responses
+from ..optimization.sol200.bulk_sizing import buckling_equation
+from ..optimization.sol200.cards_opt import (DEQATN, DESVAR, DRESP1, DRESP2,
+                                             DVPREL1)
 
 
 class Web(SE2D):
@@ -39,13 +44,35 @@ class Web(SE2D):
             self.add_dvprel(dvprel)
             self.add_dtable('WEBa', self.a)
             self.add_dtable('WEBb', self.b)
-            self.add_dtable('WEBE', self.E)
-            self.add_dtable('WEBnu', self.nu)
+            self.add_dtable('WEBE', self.material.E)
+            self.add_dtable('WEBnu', self.material.nu)
         else:
             raise NotImplementedError('%s not supported!' % ptype)
 
 
-    def constrain_vonMises(self, Fcy, average=False):
+    def get_edge_elements(self):
+        """Return the elements at both edges of the web height
+
+        The web length is taken along the largest in-plane dimension of the
+        element centroids and the height across it.
+
+        Returns
+        -------
+        elements : tuple
+            The elements with the lowest and the highest centroid along the
+            height.
+
+        """
+        x = np.array([e.get_node_positions().mean(axis=0) for e in
+            self.elements])
+        x = x - x.mean(axis=0)
+        height = np.linalg.svd(x)[2][1]
+        h = x.dot(height)
+        return self.elements[np.argmin(h)], self.elements[np.argmax(h)]
+
+
+    def constrain_vonMises(self, Fcy, average=False, aggregate=None,
+                           param=None, chunk=32):
         """Add a von Mises stress constraint
 
         Parameters
@@ -57,44 +84,64 @@ class Web(SE2D):
             If False the center element is chosen, otherwise it will check each
             element individually and compute the average von Mises stress of
             the panel.
+        aggregate : str or None, optional
+            `'KS'` or `'PNORM'` to constrain a smooth upper bound of the von
+            Mises stresses of all elements at once, see
+            :func:`.aggregate_responses`. Overrides `average`.
+        param : float or None, optional
+            The aggregation parameter, `rho` for `'KS'` or `p` for
+            `'PNORM'`.
+        chunk : int, optional
+            The maximum number of responses aggregated by one DRESP2.
 
         """
         self.create_dvars()
-        if not average:
+        dcid = self.constraints['vonMises']
+        OUTC = output_codes_SOL200.OUTC
+        atta_bot = OUTC['STRESS']['CQUAD4']['von Mises or maximum shear at Z1']
+        atta_top = OUTC['STRESS']['CQUAD4']['von Mises or maximum shear at Z2']
+        if aggregate is not None:
+            rids = []
+            for eid in self.eids:
+                for label, atta in (('WEBZ1VM', atta_bot),
+                                    ('WEBZ2VM', atta_top)):
+                    dresp1 = DRESP1(label, 'STRESS', 'ELEM', None, atta=atta,
+                                    attb=None, atti=eid)
+                    self.add_dresp(dresp1)
+                    rids.append(dresp1.id)
+            dresps = aggregate_responses(self.model.optmodel, rids, Fcy,
+                                         kind=aggregate, param=param,
+                                         chunk=chunk, label='WEBVMAG')
+            for dresp2 in dresps:
+                self.add_dresp(dresp2)
+            self.add_constraint(dcid, dresps[-1], None, 1.)
+
+        elif not average:
             eid = self.get_central_element().eid
 
-            dcid = self.constraints['vonMises']
-            OUTC = output_codes_SOL200.OUTC
-
-            atta = OUTC['STRESS']['CQUAD4']['von Mises or maximum shear at Z1']
-            dresp1 = DRESP1('WEBZ1VM', 'STRESS', 'ELEM', None, atta=atta,
+            dresp1 = DRESP1('WEBZ1VM', 'STRESS', 'ELEM', None, atta=atta_bot,
                             attb=None, atti=eid)
             self.add_dresp(dresp1)
             self.add_constraint(dcid, dresp1, None, Fcy)
 
-            atta = OUTC['STRESS']['CQUAD4']['von Mises or maximum shear at Z2']
-            dresp1 = DRESP1('WEBZ2VM', 'STRESS', 'ELEM', None, atta=atta,
+            dresp1 = DRESP1('WEBZ2VM', 'STRESS', 'ELEM', None, atta=atta_top,
                             attb=None, atti=eid)
             self.add_dresp(dresp1)
             self.add_constraint(dcid, dresp1, None, Fcy)
 
         else:
-            dcid = self.constraints['vonMises']
-            OUTC = output_codes_SOL200.OUTC
-            atta = OUTC['STRESS']['CQUAD4']['von Mises or maximum shear at Z1']
             dresp1_bot = []
             dresp1_top = []
             for eid in self.eids:
-                dresp1 = DRESP1('WEBZ1VM', 'STRESS', 'ELEM', None, atta=atta,
-                                attb=None, atti=eid)
+                dresp1 = DRESP1('WEBZ1VM', 'STRESS', 'ELEM', None,
+                                atta=atta_bot, attb=None, atti=eid)
                 self.add_dresp(dresp1)
-                dresp1_bot.append(dresp1)
+                dresp1_bot.append(dresp1.id)
 
-                atta = OUTC['STRESS']['CQUAD4']['von Mises or maximum shear at Z2']
-                dresp1 = DRESP1('WEBZ2VM', 'STRESS', 'ELEM', None, atta=atta,
-                                attb=None, atti=eid)
+                dresp1 = DRESP1('WEBZ2VM', 'STRESS', 'ELEM', None,
+                                atta=atta_top, attb=None, atti=eid)
                 self.add_dresp(dresp1)
-                dresp1_top.append(dresp1)
+                dresp1_top.append(dresp1.id)
 
             dresp2_bot = DRESP2('WEBZ1VMA', eqid='AVG')
             dresp2_bot.dresp1 = dresp1_bot[:]
@@ -138,36 +185,38 @@ class Web(SE2D):
                 - considers compressive, shear and transverse bending loads
                 - no plasticity correction has been implemented
 
-
+            For methods `3` and `4` the compression and the bending are
+            obtained from the membrane force `Nxx` of the elements at both
+            edges of the web, see :meth:`.get_edge_elements` and
+            :func:`.buckling_equation`.
 
         ms : float, optional
             Minimum margin of safety to be used as constraint.
 
         """
-        if method not in [1, 2]:
-            raise NotImplementedError('Only methods 1 and 2 are implemented!')
+        if method not in [1, 2, 3, 4]:
+            raise NotImplementedError('Only methods 1 to 4 are implemented!')
 
         OUTC = output_codes_SOL200.OUTC
 
         # kc: taking most critical kc from Bruhn's Fig. C5.2
         # ks: taking most critical kc from Bruhn's Fig. C5.11
+        # kb: taking most critical kb from Bruhn's Fig. C5.15
         if simply_supported:
             kc = 4.
             ks = 5.6
+            kb = 23.9
         else:
             kc = 7.4
             ks = 9.3
+            kb = 41.8
 
         if method == 1:
             eid = self.get_central_element().eid
             # calculating the critical buckling stresses
             # using Bruhn's Eq. C5.12 in Page C5.8 for the margin of safety
             # (MS) calculation
-            deqatn = DEQATN('D(t,b,E,nu,Nxx) = 12.*(1.-nu**2)*b**2;' +
-                            ('FCcr = %0.3f*PI(1)**2*E*t**2/D;' % kc) +
-                            'Nxx = MIN(MAX, 0.00000001);' +
-                            'MS = FCcr*t/Nxx - 1.'
-                           )
+            deqatn = DEQATN(buckling_equation(1, kc, ks))
             self.add_deqatn(deqatn)
             # reading variables
             dvar_t = self.dvars['WEBt']
@@ -197,13 +246,7 @@ class Web(SE2D):
             # calculating the critical buckling stresses
             # using Bruhn's Eq. C5.12 in Page C5.8 for the margin of safety
             # (MS) calculation
-            deqatn = DEQATN('D(t,b,E,nu,Nxx,Nxy) = 12.*(1.-nu**2)*b**2;' +
-                            ('FCcr = %0.3f*PI(1)**2*E*t**2/D;' % kc) +
-                            ('FScr = %0.3f*PI(1)**2*E*t**2/D;' % ks) +
-                            'RC = Nxx/(FCcr*t);' +
-                            'RS = Nxy/(FScr*t);' +
-                            'MS = 2./(RC + SQRT(RC**2 + 4.*RS**2)) - 1.'
-                           )
+            deqatn = DEQATN(buckling_equation(2, kc, ks))
             self.add_deqatn(deqatn)
             # reading variables
             dvar_t = self.dvars['WEBt']
@@ -232,7 +275,45 @@ class Web(SE2D):
             dcid = self.constraints['buckling']
             dconstr = self.add_constraint(dcid, dresp2, ms, None)
 
+        else:
+            eid = self.get_central_element().eid
+            eid1, eid2 = [e.eid for e in self.get_edge_elements()]
 
+            # calculating the critical buckling stresses
+            # using Bruhn's Eq. C5.12 in Page C5.8 and the interaction
+            # equation of the chosen method for the margin of safety (MS)
+            # calculation
+            deqatn = DEQATN(buckling_equation(method, kc, ks, kb))
+            self.add_deqatn(deqatn)
+            # reading variables
+            dvar_t = self.dvars['WEBt']
+            # reading constants
+            dtable_b = self.dtables['WEBb'][0]
+            dtable_E = self.dtables['WEBE'][0]
+            dtable_nu = self.dtables['WEBnu'][0]
+            # reading membrane forces Nxx at both edges
+            code_Nxx = OUTC['FORCE']['CQUAD4']['Membrane force x']
+            dresp_Nx1 = DRESP1('WEBfNx1', 'FORCE', 'ELEM', region=None,
+                               atta=code_Nxx, attb=None, atti=eid1)
+            self.add_dresp(dresp_Nx1)
+            dresp_Nx2 = DRESP1('WEBfNx2', 'FORCE', 'ELEM', region=None,
+                               atta=code_Nxx, attb=None, atti=eid2)
+            self.add_dresp(dresp_Nx2)
+            dresp1 = [dresp_Nx1.id, dresp_Nx2.id]
+            if method == 4:
+                # reading membrane force Nxy
+                code_Nxy = OUTC['FORCE']['CQUAD4']['Membrane force xy']
+                dresp_Nxy = DRESP1('WEBfNxy', 'FORCE', 'ELEM', region=None,
+                                   atta=code_Nxy, attb=None, atti=eid)
+                self.add_dresp(dresp_Nxy)
+                dresp1.append(dresp_Nxy.id)
+            # creating DRESP2
+            dresp2 = DRESP2('WEBBUCK', deqatn.id)
+            dresp2.dvars = [dvar_t.id]
+            dresp2.dtable = [dtable_b, dtable_E, dtable_nu]
+            dresp2.dresp1 = dresp1
+            self.add_dresp(dresp2)
 
-
-
+            # applying constraint
+            dcid = self.constraints['buckling']
+            dconstr = self.add_constraint(dcid, dresp2, ms, None)
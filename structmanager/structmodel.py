@@ -13,8 +13,9 @@ import numpy as np
 
 from .structelem.base import SE1D, SE2D
 from .structelem import se_classes
-from .sas import sa_classes
+from .sas import read_assemblies, sa_classes
 from .nastranmodel import NastranModel
+from .spatial import ElementIndex, element_centroids
 
 from .outreader import read_forces_1d, read_forces_2d
 
@@ -35,6 +36,11 @@ class StructModel(object):
     ses : dict
         All types of supported structural element classes are grouped in this
         dictionary.
+    optmodel : :class:`.SOL200` or None
+        The optimization model receiving the cards created for the SEs.
+    element_index : :class:`.ElementIndex` or None
+        The element centroids of the FE model, computed on first access,
+        see :meth:`.reset_element_index`.
 
     """
     def __init__(self, sefilepath, safilepath=None, bdfpath=None):
@@ -48,9 +54,31 @@ class StructModel(object):
         self.sa_classes = dictX((c.__name__.lower(), c) for c in sa_classes)
         self.ses = dictX((c.__name__.lower(), dictX()) for c in se_classes)
         self.sas = dictX((c.__name__.lower(), dictX()) for c in sa_classes)
+        self.optmodel = None
+        self._element_index = None
         self.build()
 
 
+    @property
+    def element_index(self):
+        if self._element_index is None:
+            if self.nastranmodel is None or self.nastranmodel.bdf is None:
+                return None
+            eids, centroids = element_centroids(self.nastranmodel.bdf)
+            self._element_index = ElementIndex(eids, centroids)
+        return self._element_index
+
+
+    def reset_element_index(self):
+        """Recompute the element centroids on the next access
+
+        Required after moving grids of the FE model, the central elements
+        of the SEs are updated as well.
+
+        """
+        self._element_index = None
+
+
     def read_forces(self):
         if self.nastranmodel.op2 is None:
             print('ERROR - No op2 file loaded')
@@ -71,6 +99,143 @@ class StructModel(object):
                     already_print = True
 
 
+    def apply_sizing_table(self, table, optmodel=None, **kwargs):
+        """Size many Panel and Web SEs at once from a table
+
+        See :func:`.apply_sizing_table` for the table format and the
+        additional parameters.
+
+        """
+        from .optimization.sol200.bulk_sizing import apply_sizing_table
+
+        if optmodel is None:
+            optmodel = self.optmodel
+        return apply_sizing_table(self, table, optmodel=optmodel, **kwargs)
+
+
+    def compute_laminates(self):
+        """Compute the laminate matrices of all PCOMP SEs at once
+
+        The `abd` attribute of each SE is set, see :meth:`.PanelComp.get_abd`.
+
+        """
+        from .analysis.laminate import se_laminates
+
+        ses = [se for d in self.ses.values() for se in d.values()]
+        for i, abd in se_laminates(ses).items():
+            ses[i].abd = abd
+
+
+    def compute_failure_indices(self, criteria=None, chunk=2048):
+        """Compute the critical ply failure indices of all PCOMP SEs at once
+
+        The forces must have been read with :meth:`.read_forces`. The
+        `failure_indices` attribute of each SE is set, see
+        :meth:`.PanelComp.get_failure_indices`.
+
+        Parameters
+        ----------
+        criteria : list or None, optional
+            The criteria, by default all in :data:`.ply_failure.CRITERIA`.
+        chunk : int, optional
+            The maximum number of elements evaluated at once.
+
+        Returns
+        -------
+        subcases : np.ndarray
+            The subcase ids.
+        indices : dict
+            Arrays of shape `(nses, nsubcases)` with the criteria as keys,
+            the SEs ordered as in :attr:`.ses` with `NaN` for the SEs
+            without a PCOMP property.
+
+        """
+        from .analysis.ply_failure import CRITERIA, se_failure_indices
+
+        if criteria is None:
+            criteria = CRITERIA
+        ses = [se for d in self.ses.values() for se in d.values()]
+        subcases, indices = se_failure_indices(ses, criteria, chunk)
+        for i, se in enumerate(ses):
+            if se.ptype != 'PCOMP':
+                continue
+            se.failure_indices = dict(
+                (c, dict(zip(subcases.tolist(), index[i].tolist())))
+                for c, index in indices.items())
+        return subcases, indices
+
+
+    def compute_diagonal_tension(self, **kwargs):
+        """Compute the diagonal tension of all Web and Panel SEs at once
+
+        The forces must have been read with :meth:`.read_forces`. The SEs
+        are taken without stiffening members, see
+        :func:`.analyze_assemblies` to include those of the SAs and
+        :func:`.se_diagonal_tension` for the additional parameters.
+
+        Returns
+        -------
+        ses : list
+            The Web and Panel SEs.
+        subcases : np.ndarray
+            The subcase ids.
+        results : dict
+            See :func:`.se_diagonal_tension`.
+
+        """
+        from .analysis.diagonal_tension import se_diagonal_tension
+
+        ses = list(self.ses.web.values()) + list(self.ses.panel.values())
+        subcases, results = se_diagonal_tension(ses, **kwargs)
+        return ses, subcases, results
+
+
+    def analyze_assemblies(self, **kwargs):
+        """Evaluate the checks of all SAs at once using the current forces
+
+        The forces must have been read with :meth:`.read_forces`. See
+        :func:`.analyze_assemblies` for the additional parameters.
+
+        """
+        from .analysis.assemblies import analyze_assemblies
+
+        sas = [sa for d in self.sas.values() for sa in d.values()]
+        return analyze_assemblies(sas, **kwargs)
+
+
+    def screen_constraints(self, optmodel=None, **kwargs):
+        """Screen the constraints of all SEs using the current forces
+
+        The forces must have been read with :meth:`.read_forces`. See
+        :func:`.screen_constraints` for the additional parameters.
+
+        """
+        if optmodel is None:
+            optmodel = self.optmodel
+        if optmodel is None:
+            raise ValueError('An optimization model is required')
+        ses = [se for d in self.ses.values() for se in d.values()]
+        return optmodel.screen_constraints(ses, **kwargs)
+
+
+    def plan_regions(self, optmodel=None, by='se', **kwargs):
+        """Assign screening regions to the responses of all SEs
+
+        With `by='sa'` the SAs of this model are used. See
+        :func:`.plan_regions` for the additional parameters.
+
+        """
+        if optmodel is None:
+            optmodel = self.optmodel
+        if optmodel is None:
+            raise ValueError('An optimization model is required')
+        ses = [se for d in self.ses.values() for se in d.values()]
+        if by == 'sa':
+            kwargs['sas'] = [sa for d in self.sas.values() for sa in
+                             d.values()]
+        return optmodel.plan_regions(ses, by=by, **kwargs)
+
+
     def build(self):
         if self.bdfpath is not None:
             if os.path.isfile(str(self.bdfpath)):
@@ -107,23 +272,6 @@ class StructModel(object):
         # reading structural assemblies
         if self.safilepath is None:
             return
-        with open(self.safilepath) as f:
-            lines = f.readlines()
-        for line in lines:
-            line = strip(line)
-            if not line:
-                continue
-            if line.startswith('#'):
-                continue
-            fields = line.split(';')
-            saname, name = map(strip, fields[:2])
-            saname = saname.lower()
-
-            saClass = self.sa_classes.get(saname)
-            if saClass is None:
-                print('ERROR - Ivalid Structural Assembly: {0}'.format(saname))
-                continue
-
-            senames = fields[2:]
-            args = [self.ses.get(sename) for sename in senames]
-            self.sas[saname][name] = saClass(name, args)
+        all_ses = dict((se.name, se) for d in self.ses.values()
+                       for se in d.values())
+        read_assemblies(self.safilepath, all_ses, self.sas)
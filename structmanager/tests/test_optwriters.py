@@ -0,0 +1,123 @@
+import os
+import shutil
+import tempfile
+
+from structmanager.optmodel import (Constraint, EquationResponse, Link,
+                                    OptimizationModel, Response)
+from structmanager.optwriters import GenesisWriter
+
+
+class Output(list):
+    write = list.append
+
+    def getvalue(self):
+        return ''.join(self)
+
+
+def written(resp, **options):
+    out = Output()
+    GenesisWriter(**options).write_response(resp, out)
+    return out.getvalue().strip().split(',')
+
+
+def test_genesis_output_codes():
+    # NASTRAN CBAR stress at end B point D is GENESIS bar point 10
+    fields = written(Response(1, 'SB', 'STRESS', 'PBAR', atta=11, atti=7))
+    assert fields[6] == '10', fields
+    # NASTRAN CBAR axial force is GENESIS code 1
+    fields = written(Response(2, 'FX', 'FORCE', 'PBARL', atta=8, atti=7))
+    assert fields[6] == '1', fields
+    fields = written(Response(3, 'M1', 'FORCE', 'PBAR',
+                              atta='Bending End B plane 1', atti=7))
+    assert fields[6] == '12', fields
+    fields = written(Response(4, 'UZ', 'DISP', atta=3, atti=100))
+    assert fields[6] == '3', fields
+    # bar responses given by element
+    fields = written(Response(5, 'FX', 'FORCE', 'ELEM', atta=8, atti=7),
+                     eltypes={5: 'CBAR'})
+    assert fields[6] == '1', fields
+
+
+def test_genesis_panel_outputs():
+    # NASTRAN CQUAD4 von Mises at Z1 and Z2 are GENESIS bottom and top
+    fields = written(Response(1, 'PANZ1VM', 'STRESS', 'ELEM', atta=9,
+                              atti=[11, 12]))
+    assert fields[6:] == ['2', '11', '12'], fields
+    fields = written(Response(2, 'PANZ2VM', 'STRESS', 'PSHELL', atta=17,
+                              atti=5))
+    assert fields[6] == '9', fields
+    fields = written(Response(3, 'PANfNxy', 'FORCE', 'ELEM', atta=4,
+                              atti=11))
+    assert fields[6] == '3', fields
+
+
+def test_genesis_unsupported_outputs():
+    for resp in [Response(1, 'SMAX', 'STRESS', 'PBAR', atta=7, atti=7),
+                 Response(2, 'SANG', 'STRESS', 'PSHELL', atta=6, atti=7),
+                 Response(3, 'SX', 'STRESS', 'PROD', atta=2, atti=7)]:
+        try:
+            written(resp)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError('%s written' % resp.label)
+
+
+def test_genesis_long_equation():
+    eq = 'F(%s)=%s' % (','.join('x%d' % i for i in range(30)),
+                       '+'.join('x%d' % i for i in range(30)))
+    out = Output()
+    GenesisWriter().write_equation(7, eq, out)
+    lines = out.getvalue().splitlines()
+    assert lines[0].startswith('DEQATN,7,F(x0,'), lines
+    assert len(lines) > 1
+    assert all(line.startswith('+,') for line in lines[1:]), lines
+    assert all(len(line) <= 72 for line in lines), lines
+    assert ''.join(line.split(',', 2)[2] if i == 0 else line[2:]
+                   for i, line in enumerate(lines)) == eq
+
+
+def model_with_links():
+    model = OptimizationModel()
+    model.variables.add([1, 2, 3], ['T1', 'T2', 'T3'], 2., 0.5, 10.)
+    model.relations.add([11, 12, 13], 'PSHELL', [1, 2, 3], 'T', [1, 2, 3])
+    model.links[1] = Link(1, 3, [1, 2], [0.5, 0.5])
+    model.tables['SALL'] = 300.
+    model.equations[5] = 'F(s,a)=s/a'
+    model.responses[21] = Response(21, 'PANZ1VM', 'STRESS', 'ELEM', atta=9,
+                                   atti=[101, 102])
+    model.responses[22] = EquationResponse(22, 'RF', 5, tables=['SALL'],
+                                           responses=[21])
+    model.responses[23] = Response(23, 'WEIGHT', 'WEIGHT')
+    model.constraints[31] = Constraint(31, 1, 22, ub=1.)
+    model.objective = (23, 'MIN')
+    return model
+
+
+def test_write_solvers():
+    model = model_with_links()
+    tmpdir = tempfile.mkdtemp()
+    try:
+        nastran = ('DLINK          1       3',
+                   'DRESP1        21 PANZ1VM  STRESS    ELEM')
+        genesis = ('DLINK,3,0.0,1.0',
+                   'DRESP1,21,PANZ1VM,STRESS,ELEM,,2,101,102')
+        for solver, (link, card) in [('SOL200', nastran),
+                                     ('OPTISTRUCT', nastran),
+                                     ('GENESIS', genesis)]:
+            path = os.path.join(tmpdir, solver.lower() + '.bdf')
+            model.write(path, solver=solver)
+            with open(path) as f:
+                text = f.read()
+            assert link in text, (solver, text)
+            assert card in text, (solver, text)
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    test_genesis_output_codes()
+    test_genesis_panel_outputs()
+    test_genesis_unsupported_outputs()
+    test_genesis_long_equation()
+    test_write_solvers()
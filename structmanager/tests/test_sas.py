@@ -0,0 +1,47 @@
+import os
+import shutil
+import tempfile
+import warnings
+
+from structmanager.sas import (StiffenedPanelAssembly, SuperStringer,
+                               read_assemblies)
+
+
+class SE(object):
+    def __init__(self, name):
+        self.name = name
+
+
+def test_read_assemblies():
+    ses = dict((name, SE(name)) for name in ['PAN1', 'PAN2', 'FR1', 'FR2',
+                                             'STR1', 'STR2'])
+    tmpdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmpdir, 'sas.txt')
+        with open(path, 'w') as f:
+            f.write('# type; name; SEs\n'
+                    '\n'
+                    'StiffenedPanelAssembly; SPA1; PAN1; FR1; FR2; STR1; '
+                    'STR2\n'
+                    ' superstringer ;SS1;STR2 ; PAN1;PAN3\n')
+        sas = {}
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            read_assemblies(path, ses, sas)
+        # SEs of any type are found by name
+        spa = sas['stiffenedpanelassembly']['SPA1']
+        assert isinstance(spa, StiffenedPanelAssembly)
+        assert [spa.panel, spa.fr1, spa.fr2, spa.str1, spa.str2] == [
+            ses[name] for name in ['PAN1', 'FR1', 'FR2', 'STR1', 'STR2']]
+        ss = sas['superstringer']['SS1']
+        assert isinstance(ss, SuperStringer)
+        assert ss.stringer is ses['STR2'] and ss.panel1 is ses['PAN1']
+        assert ss.panel2 is None
+        assert len(w) == 1
+        assert 'PAN3' in str(w[0].message) and 'SS1' in str(w[0].message)
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    test_read_assemblies()
@@ -0,0 +1,76 @@
+import numpy as np
+
+from structmanager.spatial import ElementIndex
+from structmanager.structelem.base import SE2D
+
+
+class Element(object):
+    def __init__(self, eid, x):
+        self.eid = eid
+        self.x = np.array([x, 0., 0.])
+
+    def get_node_positions(self):
+        return self.x + np.array([[-0.5, 0., 0.], [0.5, 0., 0.]])
+
+
+class Model(object):
+    nastranmodel = None
+
+    def __init__(self, eids, x):
+        self.centroids = np.zeros((len(eids), 3))
+        self.centroids[:, 0] = x
+        self.eids = eids
+        self.reset_element_index()
+
+    def reset_element_index(self):
+        self.element_index = ElementIndex(self.eids, self.centroids)
+
+
+def se_row(eids, model=None):
+    se = SE2D('SE', list(eids), model)
+    se.elements = [Element(eid, float(i)) for i, eid in enumerate(eids)]
+    return se
+
+
+def test_element_index():
+    index = ElementIndex([5, 1, 3, 4], [[4., 0., 0.], [1., 0., 0.],
+                                        [np.nan]*3, [2., 0., 0.]])
+    assert index.find([1, 4, 2]).tolist() == [0, 2, -1]
+    assert np.isnan(index.get_centroids([3, 7])).all()
+    # the element without centroid is skipped
+    assert index.central_element([1, 3, 4, 5]) == 4
+    assert index.central_element([3]) is None
+    eids, dist = index.nearest([1.9, 0., 0.], k=2)
+    assert eids.tolist() == [4, 1]
+    assert np.allclose(dist, [0.1, 0.9])
+    assert index.within([2., 0., 0.], 2.).tolist() == [1, 4, 5]
+
+
+def test_central_element_cache():
+    eids = [10, 11, 12, 13, 14]
+    model = Model(eids, np.arange(5.))
+    se = se_row(eids, model)
+    assert se.get_central_element().eid == 12
+    assert se.get_central_element() is se.get_central_element()
+    # new elements
+    se.eids = eids[:3]
+    se.elements = se.elements[:3]
+    assert se.get_central_element().eid == 11
+    # moved grids
+    model.centroids[:, 0] = [0., 10., 6., 3., 4.]
+    model.reset_element_index()
+    assert se.get_central_element().eid == 12
+
+
+def test_central_element_without_index():
+    se = se_row([1, 2, 3, 4, 5])
+    assert se.get_central_element().eid == 3
+    se.eids = [4, 5, 6]
+    se.elements = [Element(eid, float(eid)) for eid in se.eids]
+    assert se.get_central_element().eid == 5
+
+
+if __name__ == '__main__':
+    test_element_index()
+    test_central_element_cache()
+    test_central_element_without_index()
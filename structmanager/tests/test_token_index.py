@@ -0,0 +1,17 @@
+from structmanager.token_index import TokenIndex
+
+
+def test_ambiguous_names():
+    entries = [('End B maximum', 14), ('End A maximum', 7), ('Axial', 6),
+               ('End A minimum', 8)]
+    for table in (dict(entries), dict(reversed(entries))):
+        index = TokenIndex(table)
+        # the lowest code wins whatever the order of the keys
+        assert index.find('maximum') == 7
+        assert index.find('End') == 7
+        assert index.find('B max') == 14
+        assert index.find('torque') is None
+
+
+if __name__ == '__main__':
+    test_ambiguous_names()
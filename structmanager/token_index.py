@@ -0,0 +1,84 @@
+"""
+Output name index (:mod:`structmanager.token_index`)
+====================================================
+
+.. currentmodule:: structmanager.token_index
+
+Inverted index of the output names of the output code tables, shared by the
+`output_codes` modules of the optimization solvers.
+
+"""
+
+
+class TokenIndex(object):
+    """Inverted index from name tokens to the entries of one output table
+
+    The entries matched by each token are stored as bits of an integer, such
+    that a name is resolved intersecting the masks of its tokens. When more
+    entries match, the one with the lowest code is returned, ties broken by
+    name, independently of the order of the table keys.
+
+    """
+    def __init__(self, table):
+        self.names = sorted((k for k in table.keys() if isinstance(k, str)),
+                            key=lambda k: (table[k], k))
+        self.codes = [table[k] for k in self.names]
+        self.all = (1 << len(self.names)) - 1
+        self.masks = {}
+        self.cache = {}
+        for name in self.names:
+            for token in name.split():
+                self.mask(token)
+
+    def mask(self, token):
+        mask = self.masks.get(token)
+        if mask is None:
+            mask = 0
+            for i, name in enumerate(self.names):
+                if token in name:
+                    mask |= 1 << i
+            self.masks[token] = mask
+        return mask
+
+    def find(self, name):
+        if name in self.cache:
+            return self.cache[name]
+        mask = self.all
+        for token in name.split():
+            mask &= self.mask(token)
+            if mask == 0:
+                break
+        code = None
+        if mask != 0:
+            code = self.codes[(mask & -mask).bit_length() - 1]
+        self.cache[name] = code
+        return code
+
+
+def build_index(outc):
+    """Index all tables of an output code `dict`
+
+    Parameters
+    ----------
+    outc : dict
+        The tables, with the response types and element types as keys, as
+        `OUTC` of the `output_codes` modules. Tables shared by many element
+        types are indexed once.
+
+    Returns
+    -------
+    index : dict
+        The :class:`.TokenIndex` of each table, with the same keys.
+
+    """
+    index = {}
+    shared = {}
+    for rtype, tables in outc.items():
+        index[rtype] = {}
+        for eltype, table in tables.items():
+            if not isinstance(table, dict):
+                continue
+            if id(table) not in shared:
+                shared[id(table)] = TokenIndex(table)
+            index[rtype][eltype] = shared[id(table)]
+    return index